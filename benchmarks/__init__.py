@@ -0,0 +1,8 @@
+"""
+Benchmarks de UPTALINK (estilo asv).
+
+Cada módulo bench_*.py define clases con métodos time_* y, opcionalmente,
+setup/teardown y params/param_names. Se ejecutan con:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks [--filter texto] [--save] [--set-baseline]
+"""
@@ -0,0 +1,31 @@
+import argparse
+import os
+import sys
+
+# Los benchmarks de UI se ejecutan sin pantalla salvo que se indique lo contrario
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks import runner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Benchmarks de UPTALINK.")
+    parser.add_argument("--filter", help="Ejecutar solo benchmarks cuyo nombre contenga este texto.")
+    parser.add_argument("--save", action="store_true", help="Añadir resultados a results/history.jsonl.")
+    parser.add_argument("--set-baseline", action="store_true", help="Guardar resultados como línea base.")
+    parser.add_argument("--baseline", default=runner.BASELINE_PATH,
+                        help="Fichero de la línea base (por defecto benchmarks/baseline.json, versionado).")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Factor sobre la mediana base que se considera regresión (por defecto 1.2).")
+    args = parser.parse_args(argv)
+
+    regressions = runner.run(args.filter, args.save, args.set_baseline, args.threshold,
+                             baseline_path=args.baseline)
+    if regressions:
+        print(f"\n{len(regressions)} regresión(es) respecto a la línea base.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import numpy as np
+
+from uptalink.calculator import LinkBudgetCalculator
+
+def _random_links(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'freq': rng.uniform(1, 30, n),
+        'dist': rng.uniform(0.5, 80, n),
+        'p_tx': rng.uniform(10, 30, n),
+        'g_a': rng.uniform(10, 40, n),
+        'g_b': rng.uniform(10, 40, n),
+        'cable_loss': rng.uniform(0, 5, n),
+        'sens': rng.uniform(-90, -60, n),
+        'cost_eq': rng.uniform(0, 5000, n),
+        'hours': rng.uniform(0, 40, n),
+    }
+
+
+class ScalarCalculate:
+    """LinkBudgetCalculator.calculate en bucle Python (referencia del modo batch)."""
+
+    def setup(self):
+        links = _random_links(10000)
+        self.rows = list(zip(*(links[name].tolist() for name in LinkBudgetCalculator.BATCH_FIELDS)))
+
+    def time_calculate_10k(self):
+        for row in self.rows:
+            LinkBudgetCalculator.calculate(*row)
+
+
+class BatchCalculate:
+    params = [10000, 1000000]
+    param_names = ['rows']
+
+    def setup(self, rows):
+        self.links = _random_links(rows)
+
+    def time_calculate_table(self, rows):
+        LinkBudgetCalculator.calculate_table(self.links)
+
@@ -0,0 +1,33 @@
+import numpy as np
+
+from uptalink.catalog import EquipmentCatalog
+
+BANDS = [4.9, 5.7, 10.0, 17.0, 23.0]
+
+
+class SelectEquipment:
+    """Equipo más barato viable con 10k radios x 10k antenas en el catálogo."""
+
+    params = [1000, 10000]
+    param_names = ['items']
+
+    def setup(self, items):
+        rng = np.random.default_rng(0)
+        self.catalog = EquipmentCatalog(':memory:')
+        self.catalog.add_radios(
+            {'model': f'R{k}', 'band_min': band, 'band_max': band + 1.5, 'p_tx': p_tx, 'sens': sens, 'cost': cost}
+            for k, (band, p_tx, sens, cost) in enumerate(zip(
+                rng.choice(BANDS, items), rng.uniform(10, 30, items), rng.uniform(-95, -65, items),
+                rng.uniform(100, 3000, items)))
+        )
+        self.catalog.add_antennas(
+            {'model': f'A{k}', 'band_min': band, 'band_max': band + 1.5, 'gain': gain, 'cost': cost}
+            for k, (band, gain, cost) in enumerate(zip(
+                rng.choice(BANDS, items), rng.uniform(10, 40, items), rng.uniform(50, 2000, items)))
+        )
+
+    def teardown(self, items):
+        self.catalog.close()
+
+    def time_select(self, items):
+        self.catalog.select(5.8, 40.0, cable_loss=1.0)
@@ -0,0 +1,21 @@
+import numpy as np
+
+from uptalink import coverage
+
+
+class Coverage:
+    """Barrido radial de cobertura sobre una ventana DEM cuadrada."""
+
+    params = [501, 2001]
+    param_names = ['cells']
+
+    def setup(self, cells):
+        self.lat, self.lon = 10.0, -67.0
+        self.bounds, shape = coverage.coverage_window(self.lat, self.lon, (cells // 2) * 0.0125, 12.5)
+        lats = np.linspace(self.bounds[0], self.bounds[1], shape[0])
+        lons = np.linspace(self.bounds[2], self.bounds[3], shape[1])
+        self.elevations = 200 + 150 * np.sin(lats * 300)[:, None] * np.cos(lons * 250)[None, :]
+
+    def time_coverage(self, cells):
+        coverage.compute_coverage(self.elevations, self.bounds, self.lat, self.lon,
+                                  freq=5.0, p_tx=20.0, g_tx=24.0, workers=1)
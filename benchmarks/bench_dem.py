@@ -0,0 +1,29 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from uptalink import dem, terrain
+
+
+class DemLookup:
+    params = [1000, 10000]
+    param_names = ['points']
+
+    def setup(self, points):
+        self.directory = tempfile.mkdtemp(prefix="uptalink-bench-")
+        rng = np.random.default_rng(0)
+        for lat0 in (10, 11):
+            for lon0 in (-67, -66):
+                tile = rng.integers(0, 3000, (1201, 1201)).astype('>i2')
+                tile.tofile(os.path.join(self.directory, dem.tile_name(lat0, lon0) + ".hgt"))
+        self.store = dem.DemTileStore(self.directory)
+        self.lats, self.lons = terrain.sample_path(10.2, -66.9, 11.7, -65.1, points)
+
+    def teardown(self, points):
+        self.store.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_lookup(self, points):
+        self.store.lookup(self.lats, self.lons)
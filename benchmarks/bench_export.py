@@ -0,0 +1,36 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from uptalink import export
+from uptalink.store import LinkStore
+
+
+class ExportLinks:
+    """Exportación en streaming de 50000 enlaces guardados."""
+
+    params = ['csv', 'kml', 'pdf']
+    param_names = ['format']
+
+    def setup(self, fmt):
+        self.directory = tempfile.mkdtemp(prefix="uptalink-bench-")
+        self.store = LinkStore(os.path.join(self.directory, "links.sqlite"))
+        rng = np.random.default_rng(0)
+        self.store.insert_many(
+            {'link_id': f"LNK-{k:08X}", 'lat_a': 10 + rng.random(), 'lon_a': -67 + rng.random(),
+             'lat_b': 10 + rng.random(), 'lon_b': -67 + rng.random(), 'freq': 5.8, 'dist': k % 70 + 1.0,
+             'rssi': -60.0, 'margin': k % 50 - 10.0, 'availability': 99.99, 'total_cost': 1234.5,
+             'status': 'VIABLE' if k % 3 else 'CRÍTICO'}
+            for k in range(50000)
+        )
+        self.path = os.path.join(self.directory, "export." + fmt)
+
+    def teardown(self, fmt):
+        self.store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_export(self, fmt):
+        for _ in export.export_links(self.store.iter_pages(), self.path):
+            pass
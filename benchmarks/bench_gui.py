@@ -0,0 +1,105 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Línea de print_startup_profile en ya.py
+FIRST_PAINT = re.compile(r"total (\d+) ms hasta el primer pintado")
+
+INPUTS = {0: '5', 1: '10', 2: '20', 3: '30', 4: '30', 5: '2', 6: '-80', 11: '30', 12: '30', 13: '15', 14: '1000', 15: '8'}
+
+
+def _app():
+    return QApplication.instance() or QApplication([])
+
+
+class MainWindowConstruction:
+
+    def setup(self):
+        self.app = _app()
+        import ya
+        self.ya = ya
+
+    def time_construct(self):
+        window = self.ya.MainWindow()
+        window.deleteLater()
+        self.app.processEvents()
+
+
+class CalculateToWidgets:
+    """Latencia de extremo a extremo: entradas -> hilo de cálculo -> widgets de salida."""
+
+    def setup(self):
+        self.app = _app()
+        import ya
+        self.window = ya.MainWindow()
+        self.window.ensure_panels()
+        for index, text in INPUTS.items():
+            self.window.input_widgets[index].setText(text)
+        self.toggle = False
+
+    def teardown(self):
+        self.window.deleteLater()
+        self.app.processEvents()
+
+    def time_calculate(self):
+        # Alternar la distancia obliga a recalcular y a actualizar widgets
+        self.toggle = not self.toggle
+        self.window.input_widgets[1].setText('10' if self.toggle else '12')
+        self.window.submit_calculation(explicit=False)
+        deadline = time.perf_counter() + 5
+        while self.window.calc_task is not None and time.perf_counter() < deadline:
+            self.app.processEvents()
+
+
+class ColdStartup:
+    """Arranque en frío: proceso nuevo hasta el primer pintado, según ya.py --profile-startup."""
+    repeat = 3
+
+    def track_first_paint(self):
+        # --profile-startup informa al primer pintado y cierra la aplicación
+        done = subprocess.run([sys.executable, "ya.py", "--profile-startup"], cwd=ROOT,
+                              capture_output=True, text=True, check=True, timeout=60)
+        return int(FIRST_PAINT.search(done.stderr).group(1)) / 1000
+
+
+class SavedLinksScroll:
+    """Desplazamiento del listado de enlaces guardados: 20 páginas con repintado."""
+
+    def setup(self):
+        self.app = _app()
+        import ya
+        from PySide6.QtWidgets import QTableView
+        from uptalink.store import LinkStore
+        self.store = LinkStore(':memory:')
+        self.store.insert_many(
+            {'link_id': f"LNK-{k:08X}", 'freq': 5.8, 'dist': k % 70 + 1.0, 'margin': (k * 7919) % 600 / 10 - 20,
+             'status': 'VIABLE' if (k * 7919) % 600 > 300 else 'CRÍTICO'}
+            for k in range(100000)
+        )
+        self.model = ya.SavedLinksModel(self.store)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegateForColumn(ya.SavedLinksModel.STATUS_COLUMN, ya.StatusDelegate(self.view))
+        self.view.resize(900, 500)
+        self.view.show()
+        self.app.processEvents()
+
+    def teardown(self):
+        self.view.deleteLater()
+        self.app.processEvents()
+        self.store.close()
+
+    def time_scroll(self):
+        self.model.refresh()
+        bar = self.view.verticalScrollBar()
+        for _ in range(20):
+            bar.setValue(bar.maximum())
+            self.app.processEvents()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from uptalink.interference import InterferenceMatrix
+
+
+def _links(n, seed=1):
+    rng = np.random.default_rng(seed)
+    lat_a = rng.uniform(-2, 2, n)
+    lon_a = rng.uniform(-79, -75, n)
+    angle = rng.uniform(0, 2 * np.pi, n)
+    dist = rng.uniform(2, 30, n) / 111.32
+    return {
+        'lat_a': lat_a, 'lon_a': lon_a,
+        'lat_b': lat_a + dist * np.cos(angle), 'lon_b': lon_a + dist * np.sin(angle),
+        'freq': rng.choice([5.18, 5.2, 5.22, 5.24, 5.745, 5.765], n),
+        'bandwidth': rng.choice([20.0, 40.0], n),
+        'p_tx': np.full(n, 20.0), 'g_a': np.full(n, 25.0), 'g_b': np.full(n, 25.0),
+        'cable_loss': np.full(n, 1.0), 'noise_figure': np.full(n, 5.0),
+    }
+
+
+class BuildMatrix:
+    """Matriz de interferencia completa para una red aleatoria de enlaces."""
+
+    params = [1000, 10000]
+    param_names = ['links']
+
+    def setup(self, links):
+        self.links = _links(links)
+
+    def time_build(self, links):
+        InterferenceMatrix(self.links)
+
+
+class UpdateLink:
+    """Recálculo incremental al cambiar la frecuencia de un enlace."""
+
+    def setup(self):
+        self.matrix = InterferenceMatrix(_links(10000))
+        self.freqs = [5.5, 5.18]
+
+    def time_update_link(self):
+        for freq in self.freqs:
+            self.matrix.update_link(123, freq=freq)
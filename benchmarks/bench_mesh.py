@@ -0,0 +1,46 @@
+from uptalink import mesh
+
+A = (40.0, -3.0)
+B = (40.2, -2.7)
+
+
+class BuildMesh:
+    """Vértices, colores, normales e índices LOD de una malla completa."""
+
+    params = [257, 1024]
+    param_names = ['grid']
+
+    def setup(self, grid):
+        self.bounds = mesh.grid_bounds(*A, *B)
+        self.elevations = mesh.simulated_grid(self.bounds, (grid, grid))
+
+    def time_build(self, grid):
+        terrain_mesh = mesh.TerrainMesh(self.elevations, self.bounds, 3.0)
+        terrain_mesh.update_lod(A, B)
+
+
+class MoveEndpoint:
+    """Re-triangulación al mover un extremo (buffers reutilizados)."""
+
+    def setup(self):
+        bounds = mesh.grid_bounds(*A, *B)
+        self.mesh = mesh.TerrainMesh(mesh.simulated_grid(bounds, (1024, 1024)), bounds, 3.0)
+        self.mesh.update_lod(A, B)
+        self.toggle = False
+
+    def time_update_lod(self):
+        self.toggle = not self.toggle
+        self.mesh.update_lod((A[0] + (0.01 if self.toggle else 0.0), A[1]), B)
+
+
+class RenderTriangles:
+    """Proyección, recorte y orden de pintado para el render por CPU."""
+
+    def setup(self):
+        elevations, bounds, a, b = mesh.synthetic_link_grid(10.0, 40.0)
+        self.mesh = mesh.TerrainMesh(elevations, bounds, mesh.default_z_scale(10.0))
+        self.mesh.update_lod(a, b)
+        self.camera = mesh.default_camera(self.mesh, a, b)
+
+    def time_render_triangles(self):
+        mesh.render_triangles(self.mesh, self.camera, 900, 600)
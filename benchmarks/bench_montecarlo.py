@@ -0,0 +1,14 @@
+from uptalink import montecarlo, rain
+
+
+class SimulateChunk:
+    """Un bloque de 2^20 muestras (multitrayecto + lluvia + interferencia)."""
+
+    def setup(self):
+        self.a001 = float(rain.attenuation_001(18, 10))
+
+    def time_chunk_fading_rain(self):
+        montecarlo.simulate_chunk(0, 0, montecarlo.DEFAULT_CHUNK_SIZE, 30.0, self.a001)
+
+    def time_chunk_with_interference(self):
+        montecarlo.simulate_chunk(0, 0, montecarlo.DEFAULT_CHUNK_SIZE, 30.0, self.a001, interference=(-6.0, 4.0))
@@ -0,0 +1,26 @@
+import numpy as np
+
+from uptalink import network
+
+
+def _random_sites(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'id': [f"S{k}" for k in range(n)],
+        'lat': rng.uniform(-4, 4, n),
+        'lon': rng.uniform(-64, -56, n),
+        'height': rng.uniform(10, 60, n),
+        'p_tx': rng.uniform(15, 27, n),
+        'gain': rng.uniform(15, 34, n),
+        'sens': rng.uniform(-85, -70, n),
+    }
+
+
+class PlanNetwork:
+    """Todos los pares viables de 5000 emplazamientos con alcance de equipo de 50 Km."""
+
+    def setup(self):
+        self.sites = _random_sites(5000)
+
+    def time_plan_5k(self):
+        network.plan_network(self.sites, 18, max_range_km=50, workers=1)
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from uptalink.project import ProjectFile
+
+
+def _write_project(path, links=100000, profiles=5000, rasters=16):
+    rng = np.random.default_rng(0)
+    project = ProjectFile(path)
+    project.set_links({
+        'link_id': [f"LNK-{k:08X}" for k in range(links)],
+        'freq': rng.uniform(1, 30, links),
+        'dist': rng.uniform(0.5, 80, links),
+        'margin': rng.uniform(-20, 40, links),
+        'status': ['VIABLE' if k % 3 else 'CRÍTICO' for k in range(links)],
+    })
+    for k in range(profiles):
+        project.put(f"profiles/LNK-{k:08X}", rng.uniform(0, 500, 201))
+    for k in range(rasters):
+        project.put(f"rasters/coverage-{k}", rng.normal(-80, 10, (2000, 2000)).astype(np.float32), bounds=[0, 1, 0, 1])
+    project.save()
+    project.close()
+
+
+class OpenProject:
+    """Abrir un proyecto de ~300 MB y leer una fila, un perfil y una celda de ráster."""
+
+    def setup(self):
+        self.directory = tempfile.mkdtemp(prefix="uptalink-bench-")
+        self.path = os.path.join(self.directory, "bench.uptp")
+        _write_project(self.path)
+
+    def teardown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_open(self):
+        project = ProjectFile(self.path)
+        project.link(54321)
+        project.array("profiles/LNK-00000777")[100]
+        project.array("rasters/coverage-3")[1000, 1000]
+
+
+class IncrementalSave:
+    """Guardar tras cambiar un perfil y una columna: solo se escriben esas secciones."""
+
+    def setup(self):
+        self.directory = tempfile.mkdtemp(prefix="uptalink-bench-")
+        self.path = os.path.join(self.directory, "bench.uptp")
+        _write_project(self.path)
+        self.project = ProjectFile(self.path)
+        self.margin = np.asarray(self.project.link_column('margin'))
+        self.k = 0
+
+    def teardown(self):
+        self.project.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_save(self):
+        self.k += 1
+        self.project.put("profiles/LNK-00000001", np.full(201, float(self.k)))
+        self.project.put("links/margin", self.margin + self.k)
+        self.project.save()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from uptalink import rain
+
+
+class Availability:
+    """Disponibilidad ITU-R P.838/P.530 vectorizada."""
+
+    params = [100000]
+    param_names = ['links']
+
+    def setup(self, links):
+        rng = np.random.default_rng(0)
+        self.freq = rng.uniform(2, 40, links)
+        self.dist = rng.uniform(1, 50, links)
+        self.margin = rng.uniform(-5, 60, links)
+
+    def time_availability(self, links):
+        rain.availability(self.freq, self.dist, self.margin)
+
+
+class LinkAvailability:
+    """Ruta escalar que usa calculate."""
+
+    def time_link_availability_1k(self):
+        for _ in range(1000):
+            rain.link_availability(18.0, 10.0, 30.0)
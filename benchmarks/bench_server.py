@@ -0,0 +1,76 @@
+import asyncio
+import json
+import threading
+
+from uptalink.server import LinkService
+
+LINK = {'freq': 5.8, 'dist': 12.0, 'p_tx': 20, 'g_a': 30, 'g_b': 30, 'cable_loss': 2, 'sens': -80}
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    headers = dict(line.split(': ', 1) for line in head.decode('latin-1').split('\r\n')[1:] if ': ' in line)
+    if headers.get('Transfer-Encoding') == 'chunked':
+        body = []
+        while True:
+            size = int(await reader.readuntil(b'\r\n'), 16)
+            body.append(await reader.readexactly(size + 2))
+            if size == 0:
+                return b''.join(body)
+    return await reader.readexactly(int(headers['Content-Length']))
+
+
+async def _client(port, requests, body, path='/calculate'):
+    # Una conexión keep-alive con peticiones en secuencia
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    request = (f'POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+               f'Content-Length: {len(body)}\r\n\r\n').encode('latin-1') + body
+    for _ in range(requests):
+        writer.write(request)
+        await _read_response(reader)
+    writer.close()
+
+
+class _ServiceThread:
+    """Servicio en un hilo con su propio bucle; las mediciones usan otro bucle como generador de carga."""
+
+    def setup(self, *params):
+        self.loop = asyncio.new_event_loop()
+        self.service = LinkService(workers=2)
+        self.server = self.loop.run_until_complete(self.service.start(port=0))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run(_client(self.port, 1, json.dumps(LINK).encode()))
+
+    def teardown(self, *params):
+        asyncio.run_coroutine_threadsafe(self.service.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class CalculateRequests(_ServiceThread):
+    """5000 peticiones /calculate desde 64 conexiones keep-alive (agrupadas por el Coalescer)."""
+
+    def setup(self):
+        super().setup()
+        self.body = json.dumps(LINK).encode()
+
+    def time_calculate_5k(self):
+        async def load():
+            await asyncio.gather(*(_client(self.port, 5000 // 64 + 1, self.body) for _ in range(64)))
+        asyncio.run(load())
+
+
+class BatchRequest(_ServiceThread):
+    """Una petición /batch con respuesta NDJSON en streaming."""
+    params = [10000, 100000]
+    param_names = ['links']
+
+    def setup(self, links):
+        super().setup()
+        self.body = json.dumps({'links': [LINK] * links}).encode()
+
+    def time_batch(self, links):
+        asyncio.run(_client(self.port, 1, self.body, '/batch'))
@@ -0,0 +1,36 @@
+import numpy as np
+
+from uptalink import solver
+
+
+class FeasibilityGrid:
+    """Región viable sobre 10^6 puntos (frecuencia x distancia x equipo)."""
+
+    def setup(self):
+        rng = np.random.default_rng(0)
+        self.axes = {
+            'freq': np.linspace(1, 30, 100),
+            'dist': np.linspace(0.5, 80, 100),
+            'equipo': {
+                'p_tx': rng.uniform(10, 30, 100),
+                'g_a': rng.uniform(10, 40, 100),
+                'g_b': rng.uniform(10, 40, 100),
+                'sens': rng.uniform(-90, -60, 100),
+            },
+        }
+
+    def time_grid_1m(self):
+        solver.feasibility_grid(self.axes, fixed={'cable_loss': 2})
+
+
+class Inversions:
+    params = [1000000]
+    param_names = ['rows']
+
+    def setup(self, rows):
+        rng = np.random.default_rng(0)
+        self.freq = rng.uniform(1, 30, rows)
+        self.p_tx = rng.uniform(10, 30, rows)
+
+    def time_max_distance(self, rows):
+        solver.max_distance(self.freq, self.p_tx, 30, 30, 2, -80)
@@ -0,0 +1,27 @@
+import numpy as np
+
+from uptalink import terrain
+
+
+class ProfileAnalysis:
+    params = [50, 1000, 10000, 100000]
+    param_names = ['samples']
+
+    def setup(self, samples):
+        self.elevations = np.random.default_rng(0).uniform(0, 300, samples)
+
+    def time_analyze_profile(self, samples):
+        terrain.analyze_profile(self.elevations, 30, 6, 40, 40)
+
+
+class ProfileExtraction:
+    params = [50, 1000, 10000]
+    param_names = ['samples']
+
+    def setup(self, samples):
+        grid = np.random.default_rng(0).uniform(0, 500, (1201, 1201))
+        self.source = terrain.GridElevationSource(grid, 10, 11, -67, -66)
+        self.samples = samples
+
+    def time_extract_profile(self, samples):
+        terrain.extract_profile(self.source, 10.1, -66.9, 10.8, -66.2, samples)
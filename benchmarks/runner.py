@@ -0,0 +1,162 @@
+"""
+Ejecutor mínimo de benchmarks estilo asv, sin dependencias externas.
+
+Descubre clases en benchmarks/bench_*.py, calibra el número de
+iteraciones de cada método time_* para que una repetición dure al menos
+MIN_REPEAT_TIME, y guarda el mínimo y la mediana por iteración. Los
+métodos track_* miden por su cuenta y devuelven la duración en segundos
+(p. ej. el primer pintado de un proceso nuevo); se llaman una vez por
+repetición. Los resultados se añaden a results/history.jsonl (local, no
+versionado) y se comparan con baseline.json (versionado) para marcar
+regresiones.
+"""
+
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import statistics
+import subprocess
+import time
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+HISTORY_PATH = os.path.join(RESULTS_DIR, "history.jsonl")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+MIN_REPEAT_TIME = 0.1  # s
+REPEATS = 5
+
+
+def discover(name_filter=None):
+    """
+    Yields:
+        tuple: (nombre, clase, método, parámetros) por cada caso a medir.
+    """
+    package = importlib.import_module("benchmarks")
+    for info in pkgutil.iter_modules(package.__path__):
+        if not info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"benchmarks.{info.name}")
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            params = getattr(cls, "params", None)
+            if params is None:
+                combos = [()]
+            elif params and isinstance(params[0], (list, tuple)):
+                combos = list(itertools.product(*params))
+            else:
+                combos = [(p,) for p in params]
+            for method_name, _ in inspect.getmembers(cls, inspect.isfunction):
+                if not method_name.startswith(("time_", "track_")):
+                    continue
+                for combo in combos:
+                    suffix = f"({', '.join(map(str, combo))})" if combo else ""
+                    name = f"{info.name[len('bench_'):]}.{cls_name}.{method_name}{suffix}"
+                    if name_filter and name_filter not in name:
+                        continue
+                    yield name, cls, method_name, combo
+
+
+def measure(cls, method_name, combo):
+    """Devuelve (mínimo, mediana) en segundos por iteración."""
+    bench = cls()
+    if hasattr(bench, "setup"):
+        bench.setup(*combo)
+    try:
+        func = getattr(bench, method_name)
+        if method_name.startswith("track_"):
+            samples = [func(*combo) for _ in range(getattr(cls, "repeat", REPEATS))]
+            return min(samples), statistics.median(samples)
+        number = getattr(cls, "number", 0)
+        if not number:
+            # Calibración: duplicar hasta que una repetición dure lo suficiente
+            number = 1
+            while True:
+                start = time.perf_counter()
+                for _ in range(number):
+                    func(*combo)
+                if time.perf_counter() - start >= MIN_REPEAT_TIME or number >= 1 << 20:
+                    break
+                number *= 2
+        samples = []
+        for _ in range(getattr(cls, "repeat", REPEATS)):
+            start = time.perf_counter()
+            for _ in range(number):
+                func(*combo)
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if hasattr(bench, "teardown"):
+            bench.teardown(*combo)
+    return min(samples), statistics.median(samples)
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def run(name_filter=None, save=False, set_baseline=False, threshold=1.2, out=print, baseline_path=BASELINE_PATH):
+    """
+    Ejecuta los benchmarks y compara con la línea base.
+
+    Args:
+        name_filter: Subcadena para seleccionar benchmarks.
+        save: Añadir los resultados al histórico.
+        set_baseline: Guardar estos resultados como nueva línea base.
+        threshold: Factor sobre la mediana base a partir del cual hay regresión.
+        out: Función que recibe cada línea del informe.
+        baseline_path: Fichero de la línea base (lectura y --set-baseline).
+
+    Returns:
+        list: Nombres de los benchmarks con regresión.
+    """
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as fh:
+            baseline = json.load(fh).get("results", {})
+
+    results = {}
+    regressions = []
+    for name, cls, method_name, combo in discover(name_filter):
+        best, median = measure(cls, method_name, combo)
+        results[name] = {"min": best, "median": median}
+        line = f"{name:<60} {_format_time(median)}"
+        base = baseline.get(name)
+        if base:
+            ratio = median / base["median"]
+            line += f"  x{ratio:5.2f}"
+            if ratio > threshold:
+                regressions.append(name)
+                line += "  REGRESIÓN"
+        out(line)
+
+    record = {
+        "timestamp": time.time(),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "results": results,
+    }
+    if save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(HISTORY_PATH, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record) + "\n")
+    if set_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as fh:
+            json.dump(record, fh, indent=2)
+            fh.write("\n")
+    return regressions
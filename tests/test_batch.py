@@ -0,0 +1,79 @@
+import csv
+import io
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from uptalink import batch
+from uptalink.calculator import LinkBudgetCalculator
+
+HEADER = "id,freq,dist,p_tx,g_a,g_b,cable_loss,sens,cost_eq,hours,rain_margin\n"
+
+
+def _csv(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lines = [HEADER]
+    for k in range(n):
+        freq = 0.0 if k % 41 == 0 else rng.uniform(1, 40)
+        lines.append(f"L{k},{freq:.3f},{rng.uniform(0.5, 60):.3f},{rng.uniform(10, 30):.1f},30,30,2,-80,1000,8,"
+                     f"{rng.choice(['', '10'])}\n")
+        if k % 100 == 50:
+            lines.append("\n")
+    return ''.join(lines)
+
+
+def _run(text, **kwargs):
+    out = io.StringIO()
+    total = batch.run_batch(io.StringIO(text), out, **kwargs)
+    return total, out.getvalue()
+
+
+def test_results_match_calculate_batch():
+    text = _csv(500)
+    total, output = _run(text, chunk_size=64, workers=1)
+    assert total == 500
+    header, *rows = list(csv.reader(io.StringIO(output)))
+    assert header == HEADER.strip().split(',') + list(batch.RESULT_FIELDS)
+    source = list(csv.DictReader(io.StringIO(text)))
+    columns = [np.array([float(row[name]) for row in source]) for name in LinkBudgetCalculator.BATCH_FIELDS]
+    rain_margin = np.array([float(row['rain_margin'] or 0) for row in source])
+    expected = LinkBudgetCalculator.calculate_batch(*columns, rain_margin=rain_margin)
+    for k, row in enumerate(rows):
+        assert row[0] == f"L{k}"
+        if not expected['valid'][k]:
+            assert row[11:] == [''] * 9 + ['INVÁLIDO']
+            continue
+        for name, cell in zip(batch.RESULT_FIELDS, row[11:]):
+            if name == 'status':
+                assert cell == ('VIABLE' if expected['is_good'][k] else 'CRÍTICO')
+            else:
+                assert float(cell) == pytest.approx(expected[name][k], abs=1e-4)
+
+
+def test_pool_output_is_identical_and_in_order():
+    text = _csv(3000, seed=1)
+    progress = []
+    serial = _run(text, chunk_size=250, workers=1)
+    pooled = _run(text, chunk_size=250, workers=2, progress=progress.append)
+    assert pooled == serial
+    assert progress == list(range(250, 3001, 250))
+
+
+def test_missing_columns_bad_cells_and_empty_input():
+    with pytest.raises(ValueError, match="Faltan columnas obligatorias en el CSV: dist"):
+        _run("freq,p_tx\n5.8,20\n", workers=1)
+    assert _run("", workers=1) == (0, "")
+    # Celdas vacías o no numéricas valen 0; las columnas ausentes, también
+    total, output = _run("freq,dist,p_tx\n5.8,10,x\n5.8,10,\n", workers=1)
+    first, second = output.splitlines()[1:]
+    assert total == 2 and first.split(',')[3:] == second.split(',')[3:]
+
+
+def test_module_does_not_import_numpy_or_qt():
+    code = ("import sys, io; from uptalink import batch; "
+            "assert 'numpy' not in sys.modules; "
+            "batch.run_batch(io.StringIO('freq,dist\\n5.8,10\\n'), io.StringIO(), workers=1); "
+            "assert not any(name.startswith('PySide6') for name in sys.modules)")
+    subprocess.run([sys.executable, "-c", code], check=True)
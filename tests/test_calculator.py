@@ -0,0 +1,97 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from uptalink.calculator import LinkBudgetCalculator
+
+NUMERIC_RESULTS = LinkBudgetCalculator.BATCH_RESULTS
+
+# Aceleración mínima de calculate_batch frente al bucle escalar (1M filas)
+MIN_SPEEDUP = 50
+
+
+def _random_links(n, seed=3):
+    rng = np.random.default_rng(seed)
+    columns = [
+        rng.uniform(-2, 30, n), rng.uniform(-1, 80, n), rng.uniform(10, 30, n), rng.uniform(10, 40, n),
+        rng.uniform(10, 40, n), rng.uniform(0, 5, n), rng.uniform(-90, -60, n), rng.uniform(0, 5000, n),
+        rng.uniform(0, 40, n),
+    ]
+    # Filas inválidas explícitas además de las negativas del sorteo
+    columns[0][::50] = 0
+    columns[1][::70] = 0
+    optional = {
+        'rain_margin': np.where(rng.random(n) < 0.3, rng.uniform(0, 30, n), 0.0),
+        'bandwidth': np.where(rng.random(n) < 0.5, rng.uniform(1, 80, n), 0.0),
+        'noise_figure': rng.uniform(0, 8, n),
+        'temperature': rng.uniform(-20, 50, n),
+    }
+    return columns, optional
+
+
+def test_batch_matches_scalar_including_invalid_rows():
+    columns, optional = _random_links(3000)
+    batch = LinkBudgetCalculator.calculate_batch(*columns, **optional)
+    invalid = 0
+    for k in range(len(columns[0])):
+        row = [float(c[k]) for c in columns]
+        kwargs = {name: float(v[k]) for name, v in optional.items()}
+        if row[0] <= 0 or row[1] <= 0:
+            invalid += 1
+            with pytest.raises(ValueError):
+                LinkBudgetCalculator.calculate(*row, **kwargs)
+            assert not batch['valid'][k] and not batch['is_good'][k]
+            assert all(math.isnan(batch[name][k]) for name in NUMERIC_RESULTS)
+            continue
+        scalar = LinkBudgetCalculator.calculate(*row, **kwargs)
+        assert batch['valid'][k]
+        assert batch['is_good'][k] == scalar['is_good']
+        for name in NUMERIC_RESULTS:
+            assert batch[name][k] == pytest.approx(scalar[name], rel=1e-12, abs=1e-9), name
+    assert invalid > 0
+
+
+def test_batch_keeps_input_shape_and_scalar_options():
+    freq = np.full((4, 5), 5.8)
+    result = LinkBudgetCalculator.calculate_batch(freq, 12.0, 20, 30, 30, 2, -80, 100, 10, rain_margin=5.0)
+    assert result['rssi'].shape == (4, 5)
+    scalar = LinkBudgetCalculator.calculate(5.8, 12.0, 20, 30, 30, 2, -80, 100, 10, rain_margin=5.0)
+    assert np.allclose(result['availability'], scalar['availability'])
+
+
+def test_calculate_table_uses_optional_columns():
+    columns, optional = _random_links(200, seed=5)
+    table = dict(zip(LinkBudgetCalculator.BATCH_FIELDS, columns)) | optional
+    direct = LinkBudgetCalculator.calculate_batch(*columns, **optional)
+    via_table = LinkBudgetCalculator.calculate_table(table)
+    for name in NUMERIC_RESULTS:
+        np.testing.assert_array_equal(direct[name], via_table[name])
+
+
+def test_batch_is_50x_faster_than_scalar_loop():
+    # Mejor de varias repeticiones para que una pausa de la máquina no
+    # decida el resultado; el bucle escalar se mide sobre 100k filas y se
+    # escala al millón (su coste es lineal)
+    rows, scalar_rows = 1_000_000, 100_000
+    rng = np.random.default_rng(0)
+    columns = [
+        rng.uniform(1, 30, rows), rng.uniform(0.5, 80, rows), rng.uniform(10, 30, rows), rng.uniform(10, 40, rows),
+        rng.uniform(10, 40, rows), rng.uniform(0, 5, rows), rng.uniform(-90, -60, rows), rng.uniform(0, 5000, rows),
+        rng.uniform(0, 40, rows),
+    ]
+    scalar_input = list(zip(*(column[:scalar_rows].tolist() for column in columns)))
+    scalar = batch = math.inf
+    for _ in range(3):
+        start = time.perf_counter()
+        for row in scalar_input:
+            LinkBudgetCalculator.calculate(*row)
+        scalar = min(scalar, (time.perf_counter() - start) * rows / scalar_rows)
+    # El lote es barato: más repeticiones para que no pese la primera
+    # reserva de memoria de los arrays de salida
+    for _ in range(8):
+        start = time.perf_counter()
+        LinkBudgetCalculator.calculate_batch(*columns)
+        batch = min(batch, time.perf_counter() - start)
+    assert scalar / batch >= MIN_SPEEDUP, f"{scalar / batch:.1f}x ({scalar:.2f} s frente a {batch * 1000:.1f} ms)"
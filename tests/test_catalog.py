@@ -0,0 +1,64 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from uptalink.catalog import RADIOS_PER_LINK, EquipmentCatalog, select_equipment
+from uptalink.solver import FSPL_CONSTANT
+
+
+def _brute_force(freq, dist, radios, antennas, cable_loss, margin):
+    fspl = 20 * np.log10(dist) + 20 * np.log10(freq) + FSPL_CONSTANT
+    best = None
+    n_antennas = len(antennas['cost'])
+    for r, a, b in itertools.product(range(len(radios['cost'])), range(n_antennas), range(n_antennas)):
+        link_margin = radios['p_tx'][r] - radios['sens'][r] + antennas['gain'][a] + antennas['gain'][b] - fspl - cable_loss
+        if link_margin <= margin:
+            continue
+        cost = RADIOS_PER_LINK * radios['cost'][r] + antennas['cost'][a] + antennas['cost'][b]
+        if best is None or cost < best:
+            best = cost
+    return best
+
+
+def _equipment(rng, radios, antennas):
+    return (
+        {'p_tx': rng.integers(10, 30, radios).astype(float), 'sens': -rng.integers(65, 95, radios).astype(float),
+         'cost': rng.integers(100, 2000, radios).astype(float)},
+        {'gain': rng.integers(10, 40, antennas).astype(float), 'cost': rng.integers(50, 1500, antennas).astype(float)},
+    )
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_selection_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    radios, antennas = _equipment(rng, 25, 20)
+    for freq, dist in [(5.8, 5.0), (11.0, 30.0), (18.0, 60.0), (24.0, 150.0)]:
+        best = select_equipment(freq, dist, radios, antennas, cable_loss=2.0, margin=10.0)
+        expected = _brute_force(freq, dist, radios, antennas, 2.0, 10.0)
+        if expected is None:
+            assert best is None
+            continue
+        assert best['cost'] == pytest.approx(expected)
+        r, a, b = best['radio'], best['antenna_a'], best['antenna_b']
+        assert best['cost'] == pytest.approx(
+            RADIOS_PER_LINK * radios['cost'][r] + antennas['cost'][a] + antennas['cost'][b])
+        assert best['margin'] > 10.0
+
+
+def test_catalog_select_filters_by_band(tmp_path):
+    catalog = EquipmentCatalog(str(tmp_path / "catalog.sqlite"))
+    catalog.add_radios([
+        {'model': 'R5', 'band_min': 5.0, 'band_max': 6.0, 'p_tx': 20, 'sens': -80, 'cost': 300},
+        {'model': 'R11-barata', 'band_min': 10.0, 'band_max': 12.0, 'p_tx': 25, 'sens': -90, 'cost': 10},
+    ])
+    catalog.add_antennas([
+        {'model': 'A5', 'band_min': 5.0, 'band_max': 6.0, 'gain': 30, 'cost': 200},
+        {'model': 'A11', 'band_min': 10.0, 'band_max': 12.0, 'gain': 40, 'cost': 1},
+    ])
+    best = catalog.select(5.8, 10.0)
+    assert best['radio']['model'] == 'R5'
+    assert best['antenna_a']['model'] == best['antenna_b']['model'] == 'A5'
+    assert best['cost'] == 2 * 300 + 2 * 200
+    assert catalog.select(5.8, 1e7) is None
+    catalog.close()
@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+import pytest
+
+from uptalink import coverage, dem, solver
+
+SITE = (10.5, -66.9)
+BUDGET = {'freq': 5.8, 'p_tx': 20.0, 'g_tx': 24.0, 'g_rx': 10.0, 'cable_loss': 2.0}
+
+
+def _window(radius_km=3.0, resolution_m=50.0):
+    bounds, shape = coverage.coverage_window(*SITE, radius_km, resolution_m)
+    return bounds, shape
+
+
+def _cell_distance(bounds, shape, site):
+    """Distancia (m) de cada celda al emplazamiento en la ventana."""
+    min_lat, max_lat, min_lon, max_lon = bounds
+    rows, cols = shape
+    dy = math.radians((max_lat - min_lat) / (rows - 1)) * 6371000
+    dx = math.radians((max_lon - min_lon) / (cols - 1)) * 6371000 * math.cos(math.radians(SITE[0]))
+    r = (np.arange(rows) - site[0])[:, None] * dy
+    c = (np.arange(cols) - site[1])[None, :] * dx
+    return np.hypot(r, c)
+
+
+def test_window_and_diffraction_loss():
+    bounds, shape = coverage.coverage_window(*SITE, 3.0, 50.0)
+    assert shape == (121, 121)
+    assert (bounds[0] + bounds[1]) / 2 == pytest.approx(SITE[0])
+    assert (bounds[2] + bounds[3]) / 2 == pytest.approx(SITE[1])
+    # J(0) = 6.03 dB; sin pérdida por debajo de v = -0.78
+    assert float(coverage.diffraction_loss(0.0)) == pytest.approx(6.03, abs=0.01)
+    assert coverage.diffraction_loss(np.array([-1.0, -0.8])).tolist() == [0.0, 0.0]
+    assert np.all(np.diff(coverage.diffraction_loss(np.linspace(-0.7, 5, 50))) > 0)
+
+
+def test_flat_terrain_is_clear_and_follows_free_space():
+    bounds, shape = _window()
+    result = coverage.compute_coverage(np.zeros(shape), bounds, *SITE, workers=1, **BUDGET)
+    site = result['site']
+    assert site == (60, 60) and np.isnan(result['rssi'][site])
+    assert (result['visibility'] == coverage.CLEAR).all()
+
+    distance = _cell_distance(bounds, shape, site)
+    far = distance > 1000
+    eirp = BUDGET['p_tx'] + BUDGET['g_tx'] + BUDGET['g_rx'] - BUDGET['cable_loss']
+    free_space = eirp - (20 * np.log10(distance[far] / 1000) + 20 * math.log10(BUDGET['freq']) + solver.FSPL_CONSTANT)
+    # La muestra del rayo está a menos de media celda de la celda
+    np.testing.assert_allclose(result['rssi'][far], free_space, atol=0.25)
+
+
+def test_a_ridge_shadows_the_cells_behind_it():
+    bounds, shape = _window()
+    elevations = np.zeros(shape)
+    elevations[:, 80:83] = 150.0            # cresta norte-sur al este del emplazamiento
+    flat = coverage.compute_coverage(np.zeros(shape), bounds, *SITE, workers=1, **BUDGET)
+    ridge = coverage.compute_coverage(elevations, bounds, *SITE, workers=1, **BUDGET)
+    behind = (slice(50, 71), slice(90, 121))
+    front = (slice(50, 71), slice(62, 78))
+    assert (ridge['visibility'][behind] == coverage.OBSTRUCTED).all()
+    assert (ridge['visibility'][front] == coverage.CLEAR).all()
+    # La difracción resta al espacio libre detrás de la cresta, y delante no cambia nada
+    assert (ridge['rssi'][behind] < flat['rssi'][behind] - 6).all()
+    np.testing.assert_array_equal(ridge['rssi'][front], flat['rssi'][front])
+
+
+def test_pool_and_sector_size_do_not_change_the_result():
+    bounds, shape = _window(2.0, 50.0)
+    rng = np.random.default_rng(3)
+    elevations = rng.uniform(0, 80, shape)
+    serial = coverage.compute_coverage(elevations, bounds, *SITE, workers=1, **BUDGET)
+    pooled = coverage.compute_coverage(elevations, bounds, *SITE, workers=2, sector_rays=40, **BUDGET)
+    np.testing.assert_array_equal(serial['rssi'], pooled['rssi'])
+    np.testing.assert_array_equal(serial['visibility'], pooled['visibility'])
+
+
+def test_save_and_invalid_arguments(tmp_path):
+    bounds, shape = _window(1.0, 100.0)
+    result = coverage.compute_coverage(np.zeros(shape), bounds, *SITE, workers=1, **BUDGET)
+    coverage.save_coverage(result, str(tmp_path / "rssi.tif"), str(tmp_path / "vis.tif"))
+    # Primera fila del TIFF = norte
+    np.testing.assert_array_equal(dem._open_geotiff(str(tmp_path / "rssi.tif")).data[::-1], result['rssi'])
+    np.testing.assert_array_equal(dem._open_geotiff(str(tmp_path / "vis.tif")).data[::-1], result['visibility'])
+
+    with pytest.raises(ValueError, match="Frecuencia"):
+        coverage.compute_coverage(np.zeros(shape), bounds, *SITE, **dict(BUDGET, freq=0.0))
+    with pytest.raises(ValueError, match="fuera de la ventana"):
+        coverage.compute_coverage(np.zeros(shape), bounds, 20.0, SITE[1], **BUDGET)
+    with pytest.raises(ValueError, match="3x3"):
+        coverage.compute_coverage(np.zeros((2, 5)), bounds, *SITE, **BUDGET)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from uptalink import dem, terrain
+
+
+def _plane(lats, lons):
+    return 200 + 300 * lats - 100 * lons
+
+
+def _write_hgt(directory, lat0, lon0, n=121, voids=()):
+    # Fila 0 = borde norte, como en SRTM
+    lats = lat0 + 1 - np.arange(n) / (n - 1)
+    lons = lon0 + np.arange(n) / (n - 1)
+    data = np.rint(_plane(lats[:, None], lons[None, :])).astype('>i2')
+    for row, col in voids:
+        data[row, col] = dem.SRTM_VOID
+    data.tofile(str(directory / (dem.tile_name(lat0, lon0) + ".hgt")))
+    return data
+
+
+def test_tile_names():
+    assert dem.tile_name(10.5, -66.9) == 'N10W067'
+    assert dem.tile_name(-0.5, 0.5) == 'S01E000'
+    assert dem.tile_name(45.0, 7.25) == 'N45E007'
+    assert dem.tile_name(-33.9, 151.2) == 'S34E151'
+
+
+def test_hgt_lookup_matches_the_tile_samples(tmp_path):
+    data = _write_hgt(tmp_path, 10, -67)
+    store = dem.DemTileStore(str(tmp_path))
+    n = data.shape[0]
+    rows, cols = np.meshgrid(np.arange(1, n - 1, 7), np.arange(1, n - 1, 5), indexing='ij')
+    lats = 11 - rows / (n - 1)
+    lons = -67 + cols / (n - 1)
+    np.testing.assert_allclose(store.lookup(lats, lons), data[rows, cols], atol=1e-9)
+    # Entre muestras, interpolación bilineal de las cuatro vecinas
+    lat, lon = 11 - 10.25 / (n - 1), -67 + 20.5 / (n - 1)
+    expected = np.mean([[0.75 * data[10, c] + 0.25 * data[11, c] for c in (20, 21)]])
+    assert store.lookup(lat, lon) == pytest.approx(expected)
+
+
+def test_voids_and_missing_tiles(tmp_path):
+    _write_hgt(tmp_path, 10, -67, voids=[(60, 60)])
+    store = dem.DemTileStore(str(tmp_path), fill_value=-1.0)
+    assert store.lookup(10.5, -66.5) == 0.0            # hueco SRTM -> 0, como el JS
+    np.testing.assert_array_equal(store.lookup([12.5, 10.5], [-66.5, -80.0]), [-1.0, -1.0])
+    assert store.lookup(np.empty((0, 3)), np.empty((0, 3))).shape == (0, 3)
+
+
+def test_points_across_tiles_with_a_bounded_cache(tmp_path):
+    tiles = [(10, -67), (10, -66), (11, -67), (-1, 0), (-1, -1)]
+    for lat0, lon0 in tiles:
+        _write_hgt(tmp_path, lat0, lon0)
+    rng = np.random.default_rng(5)
+    lat0, lon0 = np.array(tiles)[rng.integers(0, len(tiles), 2000)].T
+    lats = lat0 + rng.uniform(0.01, 0.99, 2000)
+    lons = lon0 + rng.uniform(0.01, 0.99, 2000)
+    full = dem.DemTileStore(str(tmp_path)).lookup(lats, lons)
+    # El redondeo a int16 deja menos de 1 m de diferencia con el plano
+    np.testing.assert_allclose(full, _plane(lats, lons), atol=1.0)
+
+    small = dem.DemTileStore(str(tmp_path), max_open_tiles=2)
+    np.testing.assert_array_equal(small.lookup(lats.reshape(40, 50), lons.reshape(40, 50)), full.reshape(40, 50))
+    assert len(small._tiles) <= 2
+    small.clear()
+    assert not small._tiles
+
+
+@pytest.mark.parametrize('dtype', ['float32', 'int16'])
+def test_geotiff_round_trip(tmp_path, dtype):
+    shape = (41, 61)
+    lats = np.linspace(10.0, 11.0, shape[0])
+    lons = np.linspace(-67.0, -66.0, shape[1])
+    values = _plane(lats[:, None], lons[None, :])
+    data = values.astype(dtype) if dtype == 'float32' else np.rint(values).astype(dtype)
+    dem.write_geotiff(str(tmp_path / "N10W067.tif"), data, (10.0, 11.0, -67.0, -66.0))
+    store = dem.DemTileStore(str(tmp_path))
+    grid = terrain.sample_grid(store, (10.0, 11.0, -67.0, -66.0), shape)
+    # La fila lat = 11 y la columna lon = -66 son ya de las teselas vecinas
+    np.testing.assert_allclose(grid[:-1, :-1], data[:-1, :-1], rtol=1e-6)
+
+    with pytest.raises(ValueError, match="2x2"):
+        dem.write_geotiff(str(tmp_path / "linea.tif"), np.zeros((1, 5)), (10.0, 11.0, -67.0, -66.0))
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pytest
+
+from uptalink.elevation_client import ElevationClient
+
+
+class StandInApi:
+    """API de elevación local (asyncio.start_server): elevación = lat * 1000 + lon."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.requests = []   # (instante, puntos pedidos)
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/v1/test"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        head = await reader.readuntil(b'\r\n\r\n')
+        target = head.split(b' ', 2)[1].decode()
+        points = [tuple(map(float, p.split(','))) for p in parse_qs(urlsplit(target).query)['locations'][0].split('|')]
+        self.requests.append((time.monotonic(), points))
+        if len(self.requests) <= self.failures:
+            body = {'status': 'INVALID_REQUEST', 'error': 'falla simulada'}
+        else:
+            body = {'status': 'OK', 'results': [{'elevation': lat * 1000 + lon} for lat, lon in points]}
+        data = json.dumps(body).encode()
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n'
+                     b'Connection: close\r\n\r\n%b' % (len(data), data))
+        await writer.drain()
+        writer.close()
+
+
+def _expected(lats, lons):
+    return np.round(np.asarray(lats), 5) * 1000 + np.round(np.asarray(lons), 5)
+
+
+def test_concurrent_fetches_share_one_request():
+    async def run():
+        async with StandInApi() as api:
+            client = ElevationClient(api.url, batch_size=100, batch_delay=0.02)
+            a_lats, a_lons = [10.0, 10.1, 10.2], [-66.0, -66.1, -66.2]
+            b_lats, b_lons = [10.2, 10.3, 10.0], [-66.2, -66.3, -66.0]
+            a, b = await asyncio.gather(client.fetch(a_lats, a_lons), client.fetch(b_lats, b_lons))
+            client.close()
+            return api, client, a, b, (a_lats, a_lons), (b_lats, b_lons)
+
+    api, client, a, b, a_pts, b_pts = asyncio.run(run())
+    assert len(api.requests) == 1
+    assert len(api.requests[0][1]) == 4   # puntos únicos de los dos enlaces
+    assert client.stats['requests'] == 1
+    np.testing.assert_allclose(a, _expected(*a_pts))
+    np.testing.assert_allclose(b, _expected(*b_pts))
+
+
+def test_duplicates_after_rounding_are_requested_once():
+    async def run():
+        async with StandInApi() as api:
+            client = ElevationClient(api.url)
+            out = await client.fetch([[10.000001, 10.0], [10.5, 10.000004]], [[-66.0, -66.0], [-66.5, -66.0]])
+            client.close()
+            return api, out
+
+    api, out = asyncio.run(run())
+    assert len(api.requests[0][1]) == 2
+    assert out.shape == (2, 2)
+    np.testing.assert_allclose(out, [[10000 - 66.0] * 2, [10500 - 66.5, 10000 - 66.0]])
+
+
+def test_large_requests_split_in_batches():
+    async def run():
+        async with StandInApi() as api:
+            client = ElevationClient(api.url, batch_size=10)
+            out = await client.fetch(np.arange(25) / 100, np.zeros(25))
+            client.close()
+            return api, out
+
+    api, out = asyncio.run(run())
+    assert sorted(len(points) for _, points in api.requests) == [5, 10, 10]
+    np.testing.assert_allclose(out, _expected(np.arange(25) / 100, np.zeros(25)))
+
+
+def test_retries_with_exponential_backoff():
+    async def run():
+        async with StandInApi(failures=2) as api:
+            client = ElevationClient(api.url, max_retries=3, backoff=0.05)
+            out = await client.fetch([1.0], [2.0])
+            client.close()
+            return api, client, out
+
+    api, client, out = asyncio.run(run())
+    assert out.tolist() == [1002.0]
+    assert len(api.requests) == 3
+    assert client.stats['retries'] == 2
+    first, second = (b[0] - a[0] for a, b in zip(api.requests, api.requests[1:]))
+    assert first >= 0.05
+    assert second >= 0.1
+
+
+def test_gives_up_after_max_retries():
+    async def run():
+        async with StandInApi(failures=10) as api:
+            client = ElevationClient(api.url, max_retries=1, backoff=0.01)
+            try:
+                with pytest.raises(RuntimeError, match="falla simulada"):
+                    await client.fetch([1.0], [2.0])
+            finally:
+                client.close()
+            return api
+
+    assert len(asyncio.run(run()).requests) == 2
+
+
+def test_persistent_cache_avoids_the_network(tmp_path):
+    cache = str(tmp_path / "elevaciones.sqlite")
+    lats, lons = [10.0, 10.1, 10.2], [-66.0, -66.1, -66.2]
+
+    async def run(points):
+        async with StandInApi() as api:
+            client = ElevationClient(api.url, cache_path=cache)
+            out = await client.fetch(*points)
+            client.close()
+            return api, client, out
+
+    api, client, first = asyncio.run(run((lats, lons)))
+    assert len(api.requests) == 1 and client.stats['cache_hits'] == 0
+
+    # Otro cliente sobre la misma caché: un punto nuevo, el resto de SQLite
+    api, client, second = asyncio.run(run((lats + [10.3], lons + [-66.3])))
+    assert [len(points) for _, points in api.requests] == [1]
+    assert client.stats['cache_hits'] == 3
+    np.testing.assert_allclose(second[:3], first)
+
+
+def test_cache_is_written_off_the_event_loop(monkeypatch):
+    writers = []
+    cache_put = ElevationClient._cache_put
+
+    def record(self, items):
+        writers.append(threading.current_thread())
+        cache_put(self, items)
+
+    monkeypatch.setattr(ElevationClient, '_cache_put', record)
+
+    async def run():
+        async with StandInApi() as api:
+            client = ElevationClient(api.url)
+            await client.fetch([10.0, 10.1], [-66.0, -66.1])
+            cached = client._cache_get([(1000000, -6600000), (1010000, -6610000)])
+            client.close()
+            return cached
+
+    cached = asyncio.run(run())
+    assert writers and threading.main_thread() not in writers
+    assert len(cached) == 2
+
+
+def test_lookup_is_synchronous_fetch():
+    async def start():
+        api = StandInApi()
+        await api.__aenter__()
+        return api
+
+    # El servidor necesita su propio bucle en otro hilo mientras lookup ejecuta el suyo
+    loop = asyncio.new_event_loop()
+    api = loop.run_until_complete(start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        client = ElevationClient(api.url)
+        assert client.lookup([1.0, 1.5], [2.0, 2.5]).tolist() == [1002.0, 1502.5]
+        client.close()
+    finally:
+        asyncio.run_coroutine_threadsafe(api.__aexit__(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def test_lookup_rejects_running_loop():
+    async def run():
+        client = ElevationClient("http://127.0.0.1:9/")
+        try:
+            with pytest.raises(RuntimeError, match="await fetch"):
+                client.lookup([1.0], [2.0])
+        finally:
+            client.close()
+
+    asyncio.run(run())
@@ -0,0 +1,96 @@
+import csv
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from uptalink import export
+from uptalink.store import COLUMNS, LinkStore
+
+KML = '{http://www.opengis.net/kml/2.2}'
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LinkStore(str(tmp_path / "links.sqlite"))
+    links = []
+    for k in range(250):
+        link = {'link_id': f"LNK-{k:04d} <&ñ>", 'freq': 5.8 + k / 100, 'dist': 1.0 + k,
+                'margin': 30.0 - k / 5, 'status': 'VIABLE' if k % 3 else 'CRÍTICO', 'total_cost': 100.0 * k}
+        if k % 10:
+            link.update(lat_a=10.0 + k / 1000, lon_a=-66.0, lat_b=10.1, lon_b=-66.0 - k / 1000)
+        links.append(link)
+    store.insert_many(links)
+    yield store
+    store.close()
+
+
+def test_iter_pages_returns_every_link_in_creation_order(store):
+    pages = list(store.iter_pages(columns=('link_id', 'margin'), batch_size=100))
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert [row[0] for page in pages for row in page] == [link['link_id'] for link in store.iter_links()]
+
+
+def test_csv_round_trip(store, tmp_path):
+    path = str(tmp_path / "enlaces.csv")
+    assert list(export.export_links(store.iter_pages(batch_size=100), path)) == [100, 200, 250]
+    with open(path, encoding='utf-8', newline='') as fh:
+        header, *rows = list(csv.reader(fh))
+    assert tuple(header) == COLUMNS
+    expected = [row for page in store.iter_pages() for row in page]
+    assert rows == [['' if v is None else str(v) for v in row] for row in expected]
+
+
+def test_kml_has_one_line_per_located_link(store, tmp_path):
+    path = str(tmp_path / "enlaces.kml")
+    list(export.export_links(store.iter_pages(batch_size=64), path))
+    placemarks = ET.parse(path).getroot().iter(f'{KML}Placemark')
+    names = [p.find(f'{KML}name').text for p in placemarks]
+    assert names == [f"LNK-{k:04d} <&ñ>" for k in range(250) if k % 10]
+    first = next(ET.parse(path).getroot().iter(f'{KML}Placemark'))
+    assert first.find(f'{KML}styleUrl').text == '#viable'
+    assert first.find(f'{KML}LineString/{KML}coordinates').text == '-66.0,10.001,0 -66.001,10.1,0'
+
+
+def test_pdf_is_paginated_with_a_valid_xref(store, tmp_path):
+    path = str(tmp_path / "resumen.pdf")
+    list(export.export_links(store.iter_pages(batch_size=100), path))
+    data = open(path, 'rb').read()
+    assert data.startswith(b'%PDF-1.4') and data.endswith(b'%%EOF\n')
+    xref = int(re.search(rb'startxref\n(\d+)', data).group(1))
+    assert data[xref:xref + 4] == b'xref'
+    entries = re.findall(rb'(\d{10}) 00000 n ', data[xref:])
+    for number, offset in enumerate(entries, start=1):
+        assert data[int(offset):].startswith(b'%d 0 obj' % number)
+    # 250 filas a 72 por página más la página de totales
+    pages = -(-250 // export.PdfSummaryWriter.ROWS_PER_PAGE) + 1
+    assert re.search(rb'/Type /Pages /Kids \[[^\]]*\] /Count (\d+)', data).group(1) == str(pages).encode()
+    assert b'Enlaces: 250' in data
+
+
+@pytest.mark.parametrize('fmt', export.FORMATS)
+def test_closing_the_generator_deletes_the_partial_file(store, tmp_path, fmt):
+    path = tmp_path / f"parcial.{fmt}"
+    stream = export.export_links(store.iter_pages(batch_size=100), str(path))
+    assert next(stream) == 100
+    assert path.exists()
+    stream.close()
+    assert not path.exists()
+
+
+def test_failed_open_keeps_the_existing_file(tmp_path, monkeypatch):
+    path = tmp_path / "ajeno.csv"
+    path.write_text("no es nuestro")
+
+    def denied(*args, **kwargs):
+        raise PermissionError("solo lectura")
+
+    monkeypatch.setattr(export, 'open', denied, raising=False)
+    with pytest.raises(PermissionError):
+        list(export.export_links([[]], str(path)))
+    assert path.read_text() == "no es nuestro"
+
+
+def test_unknown_extension():
+    with pytest.raises(ValueError, match="no soportado"):
+        export.format_from_path("enlaces.xlsx")
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from uptalink.calculator import LinkBudgetCalculator, build_link_graph, evaluate_link
+from uptalink.store import INPUT_DEFAULTS, INPUT_FIELDS
+
+NUMERIC_RESULTS = LinkBudgetCalculator.BATCH_RESULTS
+
+
+def _inputs(rng):
+    inputs = dict.fromkeys(INPUT_FIELDS, 0.0) | INPUT_DEFAULTS
+    inputs.update(
+        freq=float(rng.uniform(1, 30)), dist=float(rng.uniform(1, 60)), p_tx=float(rng.uniform(10, 30)),
+        g_a=float(rng.uniform(10, 40)), g_b=float(rng.uniform(10, 40)), cable_loss=float(rng.uniform(0, 4)),
+        sens=float(rng.uniform(-90, -60)), bandwidth=float(rng.choice([0.0, 20.0, 40.0])),
+        noise_figure=float(rng.uniform(0, 6)), rain_margin=float(rng.choice([0.0, 10.0])),
+        height_a=30.0, height_b=30.0, obstacle=float(rng.uniform(0, 20)),
+        cost_eq=float(rng.uniform(0, 5000)), hours=float(rng.uniform(0, 40)),
+    )
+    return inputs
+
+
+def test_graph_incremental_matches_full_recompute():
+    rng = np.random.default_rng(11)
+    graph = build_link_graph(profile_samples=51)
+    inputs = _inputs(rng)
+    graph.update(inputs)
+    for _ in range(40):
+        # Cambia entre una y tres entradas cada vez
+        for name in rng.choice(list(inputs), size=int(rng.integers(1, 4)), replace=False):
+            inputs[name] = _inputs(rng)[name]
+        graph.update(inputs)
+        fresh = build_link_graph(profile_samples=51)
+        fresh.update(inputs)
+        assert graph.values == fresh.values
+        expected = evaluate_link(inputs, profile_samples=51)
+        for name in NUMERIC_RESULTS + ('clearance', 'status'):
+            assert graph[name] == pytest.approx(expected[name], rel=1e-12), name
+
+
+def test_graph_only_reevaluates_downstream_nodes():
+    graph = build_link_graph(profile_samples=51)
+    graph.update(_inputs(np.random.default_rng(2)))
+    before = graph.evaluations
+    changed = graph.update({'hours': 123.0})
+    assert 'fspl' not in changed and 'rssi' not in changed
+    assert 'total_cost' in changed
+    assert graph.evaluations - before < 5
+
+
+def test_graph_blank_temperature_defaults_to_290_kelvin():
+    graph = build_link_graph(profile_samples=51)
+    assert graph['temperature'] == LinkBudgetCalculator.DEFAULT_TEMPERATURE
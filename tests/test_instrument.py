@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+from uptalink import instrument
+
+
+@instrument.probe("pruebas.cuadrado")
+def square(x):
+    return x * x
+
+
+@instrument.probe("pruebas.muestreada", sample_every=10)
+def sampled():
+    pass
+
+
+class Model:
+    @staticmethod
+    @instrument.probe("pruebas.estatico")
+    def double(x):
+        return 2 * x
+
+
+@pytest.fixture
+def enabled():
+    instrument.reset()
+    instrument.enable()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def _spans():
+    return instrument.snapshot()['spans']
+
+
+def test_probes_only_wrap_while_enabled():
+    original = square
+    instrument.enable()
+    try:
+        assert globals()['square'] is not original
+        assert square(3) == 9 and Model.double(4) == 8
+        spans = _spans()
+        assert spans['pruebas.cuadrado']['count'] == 1
+        assert spans['pruebas.estatico']['count'] == 1
+    finally:
+        instrument.disable()
+        instrument.reset()
+    assert globals()['square'] is original
+    assert isinstance(Model.__dict__['double'], staticmethod)
+    square(2)
+    assert 'pruebas.cuadrado' not in _spans()
+
+
+def test_spans_and_counters(enabled):
+    for _ in range(3):
+        with instrument.span("pruebas.bloque"):
+            pass
+    instrument.count("pruebas.eventos", 2)
+    instrument.count("pruebas.eventos")
+    snap = instrument.snapshot()
+    span = snap['spans']['pruebas.bloque']
+    assert span['count'] == 3
+    assert 0 <= span['p50_s'] <= span['p99_s'] <= span['max_s']
+    assert snap['counters']['pruebas.eventos'] == 3
+    text = instrument.to_prometheus(snap)
+    assert 'uptalink_span_seconds_count{span="pruebas.bloque"} 3' in text
+    assert 'uptalink_pruebas_eventos_total 3' in text
+
+
+def test_disabled_span_records_nothing():
+    instrument.reset()
+    with instrument.span("pruebas.apagado"):
+        pass
+    instrument.count("pruebas.apagado")
+    snap = instrument.snapshot()
+    assert 'pruebas.apagado' not in snap['spans'] and 'pruebas.apagado' not in snap['counters']
+
+
+def test_sample_every_counts_every_call_across_threads(enabled):
+    def run():
+        for _ in range(1000):
+            sampled()
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 1 de cada 10 llamadas se mide y representa a las 10
+    assert _spans()['pruebas.muestreada']['count'] == 8000
+
+
+def test_finished_threads_are_merged_and_dropped(enabled):
+    def run():
+        with instrument.span("pruebas.hilo"):
+            pass
+        instrument.count("pruebas.hilos")
+
+    for _ in range(50):
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+    snap = instrument.snapshot()
+    assert snap['spans']['pruebas.hilo']['count'] == 50
+    assert snap['counters']['pruebas.hilos'] == 50
+    # Solo quedan las tablas de hilos vivos
+    assert all(thread.is_alive() for thread, _, _ in instrument._tables)
+    instrument.reset()
+    assert 'pruebas.hilo' not in _spans()
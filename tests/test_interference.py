@@ -0,0 +1,61 @@
+import numpy as np
+
+from uptalink.interference import InterferenceMatrix
+
+
+def _links(n, seed=1, span=0.3):
+    rng = np.random.default_rng(seed)
+    lat_a, lon_a = rng.uniform(10, 10 + span, n), rng.uniform(-67, -67 + span, n)
+    angle, dist = rng.uniform(0, 2 * np.pi, n), rng.uniform(2, 15, n) / 111
+    return {
+        'link_id': [f"L{k}" for k in range(n)],
+        'lat_a': lat_a, 'lon_a': lon_a,
+        'lat_b': lat_a + dist * np.cos(angle), 'lon_b': lon_a + dist * np.sin(angle),
+        'freq': rng.choice([5.8, 5.82, 11.0], n), 'p_tx': rng.uniform(15, 25, n),
+        'g_a': rng.uniform(20, 34, n), 'g_b': rng.uniform(20, 34, n),
+        'bandwidth': rng.choice([20.0, 40.0], n),
+    }
+
+
+def _assert_same(updated, rebuilt):
+    assert updated.nnz == rebuilt.nnz
+    np.testing.assert_allclose(updated.sinr(), rebuilt.sinr(), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(updated.snr(), rebuilt.snr())
+    got = sorted(zip(updated.interferer.tolist(), updated.victim.tolist(), updated.power.tolist()))
+    want = sorted(zip(rebuilt.interferer.tolist(), rebuilt.victim.tolist(), rebuilt.power.tolist()))
+    assert [p[:2] for p in got] == [p[:2] for p in want]
+    np.testing.assert_allclose([p[2] for p in got], [p[2] for p in want])
+
+
+def test_update_link_matches_rebuild():
+    links = _links(300)
+    matrix = InterferenceMatrix(links)
+    assert matrix.nnz > 0
+    for k, changes in [(0, {'freq': 5.82}), (17, {'p_tx': 12.0, 'g_a': 25.0}),
+                       (42, {'lat_b': links['lat_a'][42] + 0.05, 'bandwidth': 40.0}), ('L7', {'freq': 11.0})]:
+        result = matrix.update_link(k, **changes)
+        row = k if isinstance(k, int) else links['link_id'].index(k)
+        for name, value in changes.items():
+            links[name][row] = value
+        rebuilt = InterferenceMatrix(links)
+        _assert_same(matrix, rebuilt)
+        np.testing.assert_allclose(result['sinr'], rebuilt.sinr()[result['affected']], rtol=1e-9)
+
+
+def test_sinr_never_exceeds_snr():
+    matrix = InterferenceMatrix(_links(200, seed=4))
+    assert np.all(matrix.sinr() <= matrix.snr() + 1e-12)
+    indptr, interferers, ci = matrix.ci_matrix()
+    assert indptr[-1] == matrix.nnz
+    worst = matrix.worst(int(np.argmax(np.diff(indptr))), limit=3)
+    assert [v for _, v in worst] == sorted(v for _, v in worst)
+
+
+def test_max_pairs_caps_dense_builds():
+    links = _links(200, span=0.05)
+    try:
+        InterferenceMatrix(links, max_pairs=100)
+    except ValueError as e:
+        assert "densa" in str(e)
+    else:
+        raise AssertionError("se esperaba ValueError")
@@ -0,0 +1,92 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from uptalink import mesh
+
+
+def _scene(shape):
+    bounds = mesh.grid_bounds(10.0, -67.0, 10.1, -66.9)
+    return mesh.TerrainMesh(mesh.simulated_grid(bounds, shape), bounds, z_scale=3.0), bounds
+
+
+def _check_conforming(terrain_mesh):
+    """Triángulos que cubren la malla sin huecos, sin solapes y sin grietas."""
+    rows, cols = terrain_mesh.shape
+    tri = terrain_mesh.indices.reshape(-1, 3).astype(np.int64)
+    r, c = np.divmod(tri, cols)
+    area = (c[:, 1] - c[:, 0]) * (r[:, 2] - r[:, 0]) - (c[:, 2] - c[:, 0]) * (r[:, 1] - r[:, 0])
+    # Mismo sentido en todos y suma igual al área de la malla
+    assert (area > 0).all() or (area < 0).all()
+    assert abs(area).sum() == 2 * (rows - 1) * (cols - 1)
+    # Cada arista interior la comparten dos triángulos; una grieta (vértice
+    # en T) dejaría aristas interiores con un solo triángulo
+    edges = Counter()
+    for k in range(3):
+        a, b = tri[:, k], tri[:, (k + 1) % 3]
+        edges.update(zip(np.minimum(a, b).tolist(), np.maximum(a, b).tolist()))
+    for (a, b), count in edges.items():
+        (ra, ca), (rb, cb) = divmod(a, cols), divmod(b, cols)
+        border = (ra == rb and ra in (0, rows - 1)) or (ca == cb and ca in (0, cols - 1))
+        assert count == (1 if border else 2)
+
+
+@pytest.mark.parametrize('shape', [(65, 65), (47, 71)])
+def test_lod_mesh_is_conforming(shape):
+    terrain_mesh, bounds = _scene(shape)
+    stats = terrain_mesh.update_lod((10.0, -67.0), (10.1, -66.9), lod_factor=1.0, max_leaf=16)
+    assert stats['rebuilt'] and max(stats['leaves']) > 1
+    _check_conforming(terrain_mesh)
+    assert stats['triangles'] < 2 * (shape[0] - 1) * (shape[1] - 1)
+
+
+def test_full_detail_and_incremental_updates():
+    terrain_mesh, _ = _scene((33, 33))
+    stats = terrain_mesh.update_lod((10.0, -67.0), (10.1, -66.9), max_leaf=1)
+    assert stats['triangles'] == 2 * 32 * 32 and stats['leaves'] == {1: 32 * 32}
+    _check_conforming(terrain_mesh)
+
+    far = terrain_mesh.update_lod((10.0, -67.0), (10.1, -66.9), lod_factor=0.5)
+    same = terrain_mesh.update_lod((10.0, -67.0), (10.1, -66.9), lod_factor=0.5)
+    assert far['rebuilt'] and not same['rebuilt'] and same['triangles'] == far['triangles']
+    moved = terrain_mesh.update_lod((10.09, -66.91), (10.1, -66.9), lod_factor=0.5)
+    assert moved['rebuilt']
+    _check_conforming(terrain_mesh)
+
+
+def test_vertex_buffers():
+    flat = mesh.TerrainMesh(np.full((9, 9), 120.0), (-0.01, 0.01, -0.01, 0.01), z_scale=2.0)
+    assert flat.positions.dtype == np.float32 and flat.positions.shape == (81, 3)
+    np.testing.assert_allclose(flat.positions[:, 1], 240.0)
+    np.testing.assert_allclose(flat.normals, np.tile([0.0, 1.0, 0.0], (81, 1)))
+    np.testing.assert_allclose(flat.to_world(0.0, 0.0, 10.0), [0.0, 20.0, 0.0])
+    np.testing.assert_allclose(flat.positions[40], [0.0, 240.0, 0.0], atol=1e-6)
+
+    slope = mesh.TerrainMesh(np.tile(np.arange(9.0) * 10, (9, 1)), (0.0, 0.1, 0.0, 0.1))
+    np.testing.assert_allclose(np.linalg.norm(slope.normals, axis=1), 1.0, rtol=1e-6)
+    assert (slope.normals[:, 0] < 0).all()   # sube hacia el este
+    assert slope.elevation_at(0.05, 0.05) == pytest.approx(40.0)
+
+    colors = mesh.terrain_colors(np.linspace(0, 100, 11))
+    assert colors.shape == (11, 3) and (colors >= 0).all() and (colors <= 1).all()
+    with pytest.raises(ValueError, match="2x2"):
+        mesh.TerrainMesh(np.zeros((1, 4)), (0.0, 0.1, 0.0, 0.1))
+
+
+def test_render_triangles_are_visible_and_sorted_back_to_front():
+    elevations, bounds, a, b = mesh.synthetic_link_grid(10.0, obstacle_height=200.0, shape=(65, 65))
+    terrain_mesh = mesh.TerrainMesh(elevations, bounds, mesh.default_z_scale(10.0))
+    terrain_mesh.update_lod(a, b)
+    camera = mesh.default_camera(terrain_mesh, a, b, 30.0, 30.0)
+    polygons, colors = mesh.render_triangles(terrain_mesh, camera, 640, 480)
+    assert len(polygons) == len(colors) > 0 and colors.dtype == np.uint8
+    assert (polygons.max(axis=1) >= 0).all() and (polygons.min(axis=1)[:, 0] <= 640).all()
+
+    # Profundidad media creciente hacia el principio de la lista
+    _, depth = mesh.project(terrain_mesh.positions, camera['eye'], camera['target'], 640, 480)
+    tri = terrain_mesh.indices.reshape(-1, 3)
+    xy, _ = mesh.project(terrain_mesh.positions, camera['eye'], camera['target'], 640, 480)
+    by_polygon = {tuple(np.round(xy[t], 6).ravel()): depth[t].mean() for t in tri}
+    depths = [by_polygon[tuple(np.round(p, 6).ravel())] for p in polygons]
+    assert depths == sorted(depths, reverse=True)
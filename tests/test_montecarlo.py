@@ -0,0 +1,75 @@
+import math
+
+import numpy as np
+import pytest
+
+from uptalink import montecarlo, rain
+
+
+def _last(stream):
+    summary = None
+    for summary in stream:
+        pass
+    return summary
+
+
+def test_wilson_interval():
+    low, high = montecarlo.wilson_interval(10, 100)
+    assert (low, high) == pytest.approx((0.0552, 0.1744), abs=1e-4)
+    assert montecarlo.wilson_interval(0, 0) == (0.0, 1.0)
+    assert montecarlo.wilson_interval(0, 1000)[0] == pytest.approx(0.0, abs=1e-12)
+
+
+def test_rayleigh_outage_matches_the_closed_form():
+    # Sin lluvia (rain_rate 0) y Rayleigh: P(potencia < 10^(-M/10)) = 1 - exp(-10^(-M/10))
+    summary = _last(montecarlo.simulate(-60.0, -70.0, 6.0, 10.0, seed=1, rain_rate=0.0, rice_k_db=None,
+                                        chunk_size=1 << 18, workers=1, max_samples=1 << 21, min_samples=1 << 21))
+    expected = 100 * (1 - math.exp(-0.1))
+    low, high = summary['outage_ci']
+    assert summary['done'] == 'max_samples' and summary['samples'] == 1 << 21
+    assert low <= expected <= high
+    assert summary['availability'] == pytest.approx(100 - summary['outage'])
+    # Mediana de la potencia de Rayleigh: ln 2 -> -1.59 dB sobre el nivel determinista
+    assert summary['percentiles'][50.0] == pytest.approx(-60.0 + 10 * math.log10(math.log(2)), abs=0.05)
+    levels = [summary['percentiles'][q] for q in montecarlo.REPORT_PERCENTILES]
+    assert levels == sorted(levels)
+
+
+def test_rain_only_outage_matches_the_rain_model():
+    freq, dist, margin = 23.0, 15.0, 25.0
+    summary = _last(montecarlo.simulate(-50.0, -50.0 - margin, freq, dist, seed=2, rice_k_db=40.0,
+                                        chunk_size=1 << 19, workers=1, max_samples=1 << 22, min_samples=1 << 22))
+    a001 = float(rain.attenuation_001(freq, dist))
+    expected = float(rain.outage_probability(margin, a001))
+    low, high = summary['outage_ci']
+    assert low * 0.95 <= expected <= high * 1.05
+
+
+def test_same_seed_same_result_with_any_worker_count():
+    kwargs = dict(seed=7, chunk_size=50000, max_samples=200000, min_samples=200000, interference=(-10.0, 3.0))
+    serial = [s['outages'] for s in montecarlo.simulate(-65.0, -80.0, 18.0, 8.0, workers=1, **kwargs)]
+    pooled = [s['outages'] for s in montecarlo.simulate(-65.0, -80.0, 18.0, 8.0, workers=2, **kwargs)]
+    assert serial == pooled and len(serial) == 4
+    other = _last(montecarlo.simulate(-65.0, -80.0, 18.0, 8.0, workers=1, **dict(kwargs, seed=8)))
+    assert other['outages'] != serial[-1]
+
+
+def test_stops_once_the_interval_is_narrow():
+    stream = montecarlo.simulate(-60.0, -70.0, 6.0, 10.0, rain_rate=0.0, rice_k_db=None, chunk_size=1 << 16,
+                                 workers=1, min_samples=1 << 17, max_samples=1 << 24, rel_precision=0.05)
+    summaries = list(stream)
+    assert summaries[-1]['done'] == 'precision'
+    assert all(s['done'] is None for s in summaries[:-1])
+    low, high = summaries[-1]['outage_ci']
+    assert (high - low) / 2 <= 0.05 * summaries[-1]['outage']
+    assert summaries[-1]['samples'] < 1 << 24
+
+
+def test_simulate_link_and_invalid_inputs():
+    inputs = {'freq': 11.0, 'dist': 20.0, 'p_tx': 20.0, 'g_a': 30.0, 'g_b': 30.0, 'cable_loss': 2.0,
+              'sens': -80.0, 'cost_eq': 0.0, 'hours': 0.0, 'rain_margin': 0.0, 'bandwidth': 0.0,
+              'noise_figure': 0.0, 'temperature': 16.85}
+    first = next(montecarlo.simulate_link(inputs, chunk_size=10000, workers=1))
+    assert first['samples'] == 10000 and np.isfinite(first['outage'])
+    with pytest.raises(ValueError, match="mayores a 0"):
+        next(montecarlo.simulate(-60.0, -70.0, 0.0, 10.0, workers=1))
@@ -0,0 +1,104 @@
+import io
+
+import numpy as np
+import pytest
+
+from uptalink import network, terrain
+from uptalink.calculator import LinkBudgetCalculator
+
+
+def _sites(n, seed=0, span=2.0):
+    rng = np.random.default_rng(seed)
+    return {
+        'id': [f"S{k}" for k in range(n)],
+        'lat': rng.uniform(10, 10 + span, n),
+        'lon': rng.uniform(-67, -67 + span, n),
+        'p_tx': rng.uniform(10, 30, n),
+        'gain': rng.uniform(15, 35, n),
+        'sens': rng.uniform(-90, -70, n),
+        'height': rng.uniform(10, 60, n),
+        'cable_loss': rng.uniform(0, 3, n),
+    }
+
+
+def _all_pairs(n):
+    i, j = np.triu_indices(n, k=1)
+    return i.astype(np.int64), j.astype(np.int64)
+
+
+def test_candidate_pairs_match_brute_force():
+    sites = _sites(400, span=3.0)
+    for max_km in (5.0, 40.0, 500.0):
+        found = set()
+        for i, j in network.candidate_pairs(sites['lat'], sites['lon'], max_km, chunk_size=1000):
+            assert (i < j).all()
+            found.update(zip(i.tolist(), j.tolist()))
+        i, j = _all_pairs(400)
+        dist = terrain.haversine(sites['lat'][i], sites['lon'][i], sites['lat'][j], sites['lon'][j]) / 1000
+        assert found == set(zip(i[dist <= max_km].tolist(), j[dist <= max_km].tolist()))
+
+
+def test_pair_margin_matches_the_calculator():
+    sites = _sites(2)
+    r = network.evaluate_pairs(sites, np.array([0]), np.array([1]), 5.8)
+    dist = float(r['dist'][0])
+    scalar = LinkBudgetCalculator.calculate(
+        5.8, dist, sites['p_tx'][0], sites['gain'][0], sites['gain'][1],
+        sites['cable_loss'][0] + sites['cable_loss'][1], sites['sens'][1], 0, 0,
+    )
+    assert r['fspl'][0] == pytest.approx(scalar['fspl'], rel=1e-12)
+    assert r['margin_ab'][0] == pytest.approx(scalar['margin'], rel=1e-12)
+    assert r['margin'][0] == min(r['margin_ab'][0], r['margin_ba'][0])
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_plan_network_matches_exhaustive_evaluation(workers):
+    sites = _sites(300, seed=3)
+    graph = network.plan_network(sites, 11.0, workers=workers, chunk_size=500)
+    i, j = _all_pairs(300)
+    r = network.evaluate_pairs(sites, i, j, 11.0)
+    keep = (r['dist'] > 0) & (r['margin'] > LinkBudgetCalculator.MARGIN_THRESHOLD)
+    assert len(graph) > 0
+    np.testing.assert_array_equal(graph.i, i[keep])
+    np.testing.assert_array_equal(graph.j, j[keep])
+    np.testing.assert_allclose(graph.edges['margin'], r['margin'][keep])
+
+    # Adyacencia CSR: cada enlace aparece en los dos extremos
+    degree = np.bincount(np.concatenate((graph.i, graph.j)), minlength=300)
+    np.testing.assert_array_equal(graph.degree(), degree)
+    site = int(np.argmax(degree))
+    neighbours = graph.neighbors(site)
+    margins = [m for _, m in neighbours]
+    assert margins == sorted(margins, reverse=True) and len(neighbours) == degree[site]
+
+
+def test_range_limit_and_clearance_filter():
+    sites = _sites(200, seed=8)
+    full = network.plan_network(sites, 11.0, workers=1)
+    limited = network.plan_network(sites, 11.0, max_range_km=30.0, workers=1)
+    clear = network.plan_network(sites, 11.0, require_clear=True, workers=1)
+    assert 0 < len(limited) < len(full)
+    assert (limited.edges['dist'] <= 30.0).all()
+    assert (clear.edges['clearance'] >= terrain.CLEARANCE_THRESHOLD).all()
+    assert len(clear) < len(full)
+
+
+def test_load_sites_and_csv_output(tmp_path):
+    path = tmp_path / "sitios.csv"
+    path.write_text("id,lat,lon,p_tx,gain,sens,height\nA,10.0,-66.9,20,30,-80,30\nB,10.05,-66.9,20,30,-80,\n")
+    sites = network.load_sites(str(path))
+    assert sites['id'] == ['A', 'B']
+    assert sites['height'].tolist() == [30.0, 0.0] and sites['cable_loss'].tolist() == [0.0, 0.0]
+    graph = network.plan_network(sites, 5.8, workers=1)
+    out = io.StringIO()
+    graph.write_csv(out)
+    header, row = out.getvalue().splitlines()
+    assert header == 'site_a,site_b,' + ','.join(network.EDGE_FIELDS)
+    assert row.startswith('A,B,5.5597,')   # 0.05° de latitud
+
+    path.write_text("id,lat,lon,p_tx,gain,sens\nA,10.0,x,20,30,-80\n")
+    with pytest.raises(ValueError, match="Línea 2: 'lon' no es numérico"):
+        network.load_sites(str(path))
+    path.write_text("id,lat,lon\nA,10.0,-66.9\n")
+    with pytest.raises(ValueError, match="Faltan columnas"):
+        network.load_sites(str(path))
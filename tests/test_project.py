@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from uptalink.project import HEADER, MAGIC, ProjectFile, ProjectFormatError, TextColumn
+
+
+def _links(n, seed=0):
+    rng = np.random.default_rng(seed)
+    margin = rng.uniform(-10, 40, n)
+    margin[::7] = np.nan
+    return {
+        'link_id': [f"LNK-{k:05d}" for k in range(n)],
+        'status': [None if k % 5 == 0 else ('VIABLE' if m > 0 else 'CRÍTICO') for k, m in enumerate(margin)],
+        'freq': rng.uniform(1, 30, n),
+        'margin': margin,
+    }
+
+
+def _assert_links(project, links):
+    assert project.link_count == len(links['link_id'])
+    assert sorted(project.link_columns()) == sorted(links)
+    assert list(project.link_column('link_id')) == links['link_id']
+    assert list(project.link_column('status')) == [s or '' for s in links['status']]
+    np.testing.assert_array_equal(project.link_column('freq'), links['freq'])
+    np.testing.assert_array_equal(project.link_column('margin'), links['margin'])
+
+
+def test_save_reopen_compact_round_trip(tmp_path):
+    path = str(tmp_path / "plan.uptp")
+    links = _links(500)
+    raster = np.arange(120, dtype=np.float32).reshape(10, 12)
+    with ProjectFile(path) as project:
+        project.set_links(links)
+        project.put('rasters/cov', raster, units='dBm', bounds=[1, 2, 3, 4])
+        project.put_text('notes', ['á', '', 'c'])
+        assert project.save() > 0
+
+    with ProjectFile(path) as project:
+        _assert_links(project, links)
+        np.testing.assert_array_equal(project.array('rasters/cov'), raster)
+        assert project.attrs('rasters/cov') == {'units': 'dBm', 'bounds': [1, 2, 3, 4]}
+        assert list(project.text('notes')) == ['á', '', 'c']
+        link = project.link(7)
+        assert link['link_id'] == 'LNK-00007' and link['margin'] is None
+        padding = project.garbage   # solo el relleno de alineación
+        assert padding < 64 * len(project.names())
+
+        # Guardado incremental: solo la columna cambiada y el índice
+        links['freq'] = links['freq'] * 2
+        project.set_links(links)
+        written = project.save()
+        assert written < links['freq'].nbytes + 4096
+        assert project.save() == 0
+        assert project.garbage >= padding + links['freq'].nbytes
+        project.remove('notes')
+        project.compact()
+        assert project.garbage <= padding
+        _assert_links(project, links)
+
+    with ProjectFile(path) as project:
+        _assert_links(project, links)
+        assert 'notes' not in project
+        np.testing.assert_array_equal(project.array('rasters/cov'), raster)
+
+
+def test_views_survive_a_later_save(tmp_path):
+    path = str(tmp_path / "plan.uptp")
+    with ProjectFile(path) as project:
+        project.put('profiles/a', np.arange(5.0))
+        project.save()
+        view = project.array('profiles/a')
+        project.put('profiles/a', np.zeros(5))
+        project.save()
+        np.testing.assert_array_equal(view, np.arange(5.0))
+        np.testing.assert_array_equal(project.array('profiles/a'), np.zeros(5))
+
+
+def test_damaged_files_raise_format_error(tmp_path):
+    path = tmp_path / "plan.uptp"
+    # Primer save() interrumpido: solo la cabecera provisional
+    path.write_bytes(HEADER.pack(MAGIC, 0, 0) + b'\0' * 40)
+    with pytest.raises(ProjectFormatError, match="interrumpido"):
+        ProjectFile(str(path))
+
+    for index in (b'{"sections": ', b'[]', b'{"meta": {}}'):
+        path.write_bytes(HEADER.pack(MAGIC, HEADER.size, len(index)) + index)
+        with pytest.raises(ProjectFormatError, match="índice dañado"):
+            ProjectFile(str(path))
+
+
+def test_empty_sections_round_trip(tmp_path):
+    path = str(tmp_path / "plan.uptp")
+    with ProjectFile(path) as project:
+        project.put('rasters/vacio', np.zeros((0, 3)))
+        project.put('profiles/vacio', np.zeros(0, dtype=np.float32))
+        project.put('escalar', np.float64(2.5))
+        project.put_text('notas', [])
+        project.save()
+    with ProjectFile(path) as project:
+        assert project.array('rasters/vacio').shape == (0, 3)
+        assert project.array('profiles/vacio').dtype == np.float32
+        assert project.array('escalar') == 2.5
+        assert list(project.text('notas')) == []
+
+
+def test_failed_first_save_leaves_no_file(tmp_path, monkeypatch):
+    path = tmp_path / "plan.uptp"
+    project = ProjectFile(str(path))
+    project.put('profiles/a', np.arange(5.0))
+
+    def fail(f, end, data):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(ProjectFile, '_write_block', staticmethod(fail))
+    with pytest.raises(OSError):
+        project.save()
+    assert list(tmp_path.iterdir()) == []
+
+    monkeypatch.undo()
+    project.save()
+    np.testing.assert_array_equal(ProjectFile(str(path)).array('profiles/a'), np.arange(5.0))
+
+
+def test_text_column_encoding():
+    column = TextColumn.encode(['a', None, 'ñandú'])
+    assert list(column) == ['a', '', 'ñandú']
+    assert column[-1] == 'ñandú' and column[0:2] == ['a', '']
+    with pytest.raises(IndexError):
+        column[3]
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from uptalink import rain
+
+
+def test_coefficients_match_p838_table():
+    # Valores de ITU-R P.838-3 (coeficientes tabulados)
+    for freq, k_h, alpha_h, k_v, alpha_v in ((10, 0.01217, 1.2571, 0.01129, 1.2156),
+                                            (20, 0.09164, 1.0568, 0.09611, 0.9847)):
+        assert rain.coefficients(freq, 'H') == pytest.approx((k_h, alpha_h), rel=2e-3)
+        assert rain.coefficients(freq, 'V') == pytest.approx((k_v, alpha_v), rel=2e-3)
+    # La tabla interpolada sigue a la regresión de la recomendación
+    freq = np.geomspace(1, 1000, 500)
+    k, alpha = rain.coefficients(freq, 'H')
+    np.testing.assert_allclose(np.log10(k), rain._regression(np.log10(freq), rain._K_H), atol=1e-4)
+    np.testing.assert_allclose(alpha, rain._regression(np.log10(freq), rain._ALPHA_H), atol=1e-4)
+    k, alpha = rain.coefficients(20, 45)
+    assert 0.09164 < k < 0.09611
+
+
+def test_scaling_is_one_at_0_01_percent_and_inverts():
+    a001 = np.array([5.0, 20.0, 60.0])
+    assert rain.attenuation(0.01, a001) == pytest.approx(a001, rel=5e-3)
+    for latitude in (None, 10.0):
+        p = np.geomspace(rain.MIN_OUTAGE, rain.MAX_OUTAGE, 25)
+        margins = rain.attenuation(p, 20.0, latitude)
+        np.testing.assert_allclose(rain.outage_probability(margins, 20.0, latitude), p, rtol=1e-9)
+    # Sin margen no hay disponibilidad; con mucho, el mínimo modelado
+    assert rain.outage_probability(0.0, 20.0) == 100.0
+    assert rain.outage_probability(1e4, 20.0) == rain.MIN_OUTAGE
+
+
+def test_availability_matches_the_closed_form():
+    rng = np.random.default_rng(4)
+    n = 2000
+    freq = rng.uniform(1, 90, n)
+    dist = rng.uniform(0.2, 80, n)
+    margin = rng.uniform(-10, 60, n)
+    rain_margin = np.where(rng.random(n) < 0.3, rng.uniform(0, 40, n), 0.0)
+    rate = rng.uniform(5, 120, n)
+    budget = np.where(rain_margin > 0, np.minimum(rain_margin, margin), margin)
+    a001 = rain.attenuation_001(freq, dist, rate)
+    expected = 100 - rain.outage_probability(budget, a001)
+    np.testing.assert_allclose(rain.availability(freq, dist, margin, rain_margin, rate), expected, rtol=1e-9)
+
+
+def test_availability_broadcasts_and_flags_invalid_rows():
+    out = rain.availability(np.array([[18.0], [0.0]]), np.array([10.0, 20.0, -1.0]), 30.0)
+    assert out.shape == (2, 3)
+    assert np.isnan(out[1]).all() and np.isnan(out[0, 2])
+    assert np.isfinite(out[0, :2]).all()
+    assert isinstance(rain.availability(18.0, 10.0, 30.0), float)
+
+
+def test_availability_from_logs_writes_into_out():
+    freq = np.array([6.0, 18.0, 38.0, 0.0])
+    dist = np.array([40.0, 10.0, 3.0, 5.0])
+    margin = np.array([35.0, 20.0, 12.0, 20.0])
+    invalid = ~(freq > 0)
+    with np.errstate(divide='ignore'):
+        log_f, log_d = np.log10(freq), np.log10(dist)
+    out = np.empty(4)
+    result = rain.availability_from_logs(dist, log_f, log_d, margin, invalid=invalid, out=out)
+    assert result is out
+    np.testing.assert_allclose(out, rain.availability(freq, dist, margin), rtol=1e-12)
+
+
+def test_link_availability_matches_vector_version():
+    for args in ((18.0, 10.0, 30.0), (6.0, 40.0, 5.0, 3.0), (38.0, 2.0, 25.0, 0.0, 90.0), (80.0, 5.0, -1.0)):
+        assert rain.link_availability(*args) == pytest.approx(float(rain.availability(*args)), rel=1e-12)
@@ -0,0 +1,45 @@
+import random
+
+from uptalink.search import LinkSearchIndex, PrefixIndex
+
+
+def _brute_force(ids, prefix, limit):
+    return sorted((i for i in ids if i.lower().startswith(prefix.lower())), key=lambda i: (i.lower(), i))[:limit]
+
+
+def test_prefix_search_matches_brute_force():
+    rng = random.Random(5)
+    ids = {f"{rng.choice(['LNK', 'lnk-', 'Site', 'B'])}{rng.getrandbits(20):05X}" for _ in range(2000)}
+    # IDs que solo difieren en mayúsculas
+    ids = list(ids | {i.lower() for i in list(ids)[:300]} | {i.upper() for i in list(ids)[:300]})
+    index = PrefixIndex()
+    for link_id in ids + ids[:50]:
+        index.add(link_id)
+    assert len(index) == len(ids)
+    for prefix in ['', 'l', 'LNK', 'lnk-', 'Si', 'site1', 'b0', 'zz', 'LNK-' + ids[0][4:7]]:
+        for limit in (1, 10, 5000):
+            assert index.search(prefix, limit) == _brute_force(ids, prefix, limit), (prefix, limit)
+
+
+def test_prefix_index_remove():
+    index = PrefixIndex()
+    for link_id in ('A1', 'a1', 'A2', 'B1'):
+        index.add(link_id)
+    assert index.search('a1') == ['A1', 'a1']
+    index.remove('A2')
+    index.remove('a2')
+    index.remove('missing')
+    assert index.search('a') == ['A1', 'a1']
+    index.remove('a1')
+    assert index.search('A') == ['A1']
+    assert len(index) == 2
+
+
+def test_link_search_index_dispatches_coordinates_and_prefixes():
+    index = LinkSearchIndex()
+    index.add({'link_id': 'CCS-1', 'lat_a': 10.50, 'lon_a': -66.90, 'lat_b': 10.55, 'lon_b': -66.85})
+    index.add({'link_id': 'MCB-1', 'lat_a': 10.65, 'lon_a': -71.60, 'lat_b': 10.70, 'lon_b': -71.65})
+    assert index.search('ccs') == ['CCS-1']
+    assert index.search('10.5,-66.9') == ['CCS-1']
+    assert index.search('10.5, -66.9, 1km') == ['CCS-1']
+    assert index.search('  ') == []
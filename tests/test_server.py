@@ -0,0 +1,190 @@
+import asyncio
+import json
+import re
+import threading
+
+import numpy as np
+import pytest
+
+from uptalink.calculator import LinkBudgetCalculator
+from uptalink.server import (
+    INVALID_JSON, INVALID_LINKS, LARGE_BODY_SIZE, LinkService, RESULT_FIELDS, split_links,
+)
+
+LINK = {'freq': 5.8, 'dist': 12.0, 'p_tx': 20, 'g_a': 30, 'g_b': 30, 'cable_loss': 2, 'sens': -80}
+
+
+@pytest.fixture(scope='module')
+def service():
+    """Servicio en un hilo con su propio bucle; cada prueba usa otro bucle como cliente."""
+    loop = asyncio.new_event_loop()
+    service = LinkService(workers=2, chunk_size=1000)
+    server = loop.run_until_complete(service.start(port=0))
+    service.port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield service
+    asyncio.run_coroutine_threadsafe(service.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    headers = {name.lower(): value for name, _, value in (line.partition(': ') for line in lines[1:] if line)}
+    if headers.get('transfer-encoding') == 'chunked':
+        body = []
+        while True:
+            size = int(await reader.readuntil(b'\r\n'), 16)
+            body.append((await reader.readexactly(size + 2))[:-2])
+            if size == 0:
+                return status, headers, b''.join(body)
+    return status, headers, await reader.readexactly(int(headers.get('content-length', 0)))
+
+
+def _request(method, path, body=b'', close=False):
+    return (f'{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n'
+            + ('Connection: close\r\n' if close else '') + '\r\n').encode('latin-1') + body
+
+
+def _exchange(service, *requests, timeout=20):
+    """Envía las peticiones por una conexión; devuelve las respuestas y si el servidor cerró."""
+    async def run():
+        reader, writer = await asyncio.open_connection('127.0.0.1', service.port)
+        responses = []
+        for request in requests:
+            writer.write(request)
+            responses.append(await _read_response(reader))
+        closed = None
+        if requests[-1].find(b'Connection: close') >= 0:
+            closed = await reader.read() == b''
+        writer.close()
+        return responses, closed
+
+    return asyncio.run(asyncio.wait_for(run(), timeout))
+
+
+def _ndjson(body):
+    return [json.loads(line) for line in body.decode('utf-8').splitlines()]
+
+
+def _expected(links):
+    columns = [np.array([float(link.get(name, 0.0)) for link in links]) for name in LinkBudgetCalculator.BATCH_FIELDS]
+    return LinkBudgetCalculator.calculate_batch(*columns)
+
+
+def test_connection_close_ends_the_first_request(service):
+    # El primer /batch es el que pone en marcha los procesos del pool: no deben heredar el socket
+    responses, closed = _exchange(service, _request('POST', '/batch', json.dumps([LINK]).encode(), close=True))
+    assert responses[0][0] == 200 and responses[0][1]['connection'] == 'close'
+    assert closed
+
+
+def test_keep_alive_serves_requests_in_sequence(service):
+    body = json.dumps(LINK).encode()
+    responses, _ = _exchange(service, _request('GET', '/health'), _request('POST', '/calculate', body),
+                             _request('POST', '/calculate', body), _request('GET', '/nada'))
+    assert [status for status, _, _ in responses] == [200, 200, 200, 404]
+    assert all(headers['connection'] == 'keep-alive' for _, headers, _ in responses)
+    row = json.loads(responses[1][2])
+    expected = _expected([LINK])
+    assert row['status'] == 'VIABLE'
+    assert row['rssi'] == pytest.approx(expected['rssi'][0])
+    assert json.loads(responses[2][2]) == row
+
+
+def test_concurrent_calculate_requests_are_coalesced(service):
+    links = [dict(LINK, dist=1.0 + k) for k in range(64)]
+
+    async def one(link):
+        reader, writer = await asyncio.open_connection('127.0.0.1', service.port)
+        writer.write(_request('POST', '/calculate', json.dumps(link).encode()))
+        response = await _read_response(reader)
+        writer.close()
+        return json.loads(response[2])
+
+    async def run():
+        return await asyncio.gather(*(one(link) for link in links))
+
+    before = service.coalescer.batches
+    rows = asyncio.run(run())
+    np.testing.assert_allclose([row['rssi'] for row in rows], _expected(links)['rssi'])
+    assert service.coalescer.batches - before < len(links)
+
+
+@pytest.mark.parametrize('links', [20, 2500])
+def test_batch_streams_rows_in_order(service, links):
+    rows = [dict(LINK, dist=0.5 + k / 10, freq=0 if k % 97 == 0 else 5.8) for k in range(links)]
+    [(status, headers, body)], _ = _exchange(service, _request('POST', '/batch', json.dumps({'links': rows}).encode()))
+    assert status == 200 and headers['transfer-encoding'] == 'chunked'
+    out = _ndjson(body)
+    expected = _expected(rows)
+    assert len(out) == links
+    assert [row['status'] for row in out] == [
+        'INVÁLIDO' if not valid else ('VIABLE' if good else 'CRÍTICO')
+        for valid, good in zip(expected['valid'], expected['is_good'])
+    ]
+    np.testing.assert_allclose([row['margin'] if row['margin'] is not None else np.nan for row in out],
+                               expected['margin'])
+
+
+def test_large_batch_is_split_in_the_pool(service):
+    # Enlaces con texto no ASCII y espacios variados: los bloques son trozos del cuerpo en bytes
+    rows = [dict(LINK, dist=1.0 + k % 50, nombre=f"Enlace ñ {k}") for k in range(12000)]
+    body = json.dumps({'meta': {'origen': 'pruebas'}, 'links': rows}, indent=1).encode('utf-8')
+    assert len(body) > LARGE_BODY_SIZE
+    [(status, _, data)], _ = _exchange(service, _request('POST', '/batch', body))
+    assert status == 200
+    out = _ndjson(data)
+    assert len(out) == len(rows)
+    np.testing.assert_allclose([row['rssi'] for row in out], _expected(rows)['rssi'])
+
+
+@pytest.mark.parametrize('large', [False, True])
+def test_batch_rejects_invalid_bodies(service, large):
+    padding = ' ' * (LARGE_BODY_SIZE + 1) if large else ''
+    cases = [
+        (('{"links": [' + json.dumps(LINK) + ',]}' + padding).encode(), INVALID_JSON),
+        (('{"links": {}}' + padding).encode(), INVALID_LINKS),
+        (('{"links": [1, 2]}' + padding).encode(), INVALID_LINKS),
+        (b'\xff\xfe' + padding.encode(), INVALID_JSON),
+    ]
+    for body, message in cases:
+        responses, _ = _exchange(service, _request('POST', '/batch', body), _request('GET', '/health'))
+        (status, _, data), (health, _, _) = responses
+        assert status == 400 and json.loads(data) == {'error': message}
+        assert health == 200   # la conexión sigue utilizable
+
+
+def test_invalid_json_in_calculate(service):
+    [(status, _, data)], _ = _exchange(service, _request('POST', '/calculate', b'{"freq": '))
+    assert status == 400 and json.loads(data)['error'] == INVALID_JSON
+    [(status, _, data)], _ = _exchange(service, _request('POST', '/calculate', json.dumps({'freq': 5.8}).encode()))
+    assert status == 400 and 'Faltan campos' in json.loads(data)['error']
+
+
+def test_non_finite_results_are_null(service):
+    huge = dict(LINK, p_tx=1e308, g_a=1e308)
+    [(_, _, body)], _ = _exchange(service, _request('POST', '/batch', json.dumps([LINK, huge]).encode()))
+    ok, overflow = _ndjson(body)
+    assert all(isinstance(ok[name], float) for name in RESULT_FIELDS[:-1])
+    assert overflow['rssi'] is None and overflow['margin'] is None
+    assert overflow['status'] == 'VIABLE'
+    assert set(overflow) == set(RESULT_FIELDS)
+
+
+def test_split_links_matches_json_loads():
+    rows = [dict(LINK, dist=k, nombre="ñ" * (k % 3)) for k in range(23)]
+    for body in (json.dumps({'links': rows}), json.dumps(rows, indent=2), json.dumps({'x': [1], 'links': rows})):
+        data = body.encode('utf-8')
+        chunks = [json.loads(b'[%b]' % data[start:end]) for start, end in split_links(data, 5)]
+        assert [len(chunk) for chunk in chunks] == [5, 5, 5, 5, 3]
+        assert [row for chunk in chunks for row in chunk] == rows
+    assert split_links(b'{"links": []}', 5) == []
+    for body, message in ((b'{"links": [{}] ', INVALID_JSON), (b'{"otro": 1}', INVALID_LINKS),
+                          (b'[{}] x', INVALID_JSON), (b'{"links": [{}],}', INVALID_JSON)):
+        with pytest.raises(ValueError, match=re.escape(message)):
+            split_links(body, 5)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from uptalink import solver
+from uptalink.calculator import LinkBudgetCalculator
+
+LINK = {'freq': 11.0, 'dist': 25.0, 'p_tx': 22.0, 'g_a': 32.0, 'g_b': 30.0, 'cable_loss': 2.5, 'sens': -78.0}
+
+
+def _margin(freq, dist, p_tx, g_a, g_b, cable_loss, sens):
+    return LinkBudgetCalculator.calculate(freq, dist, p_tx, g_a, g_b, cable_loss, sens, 0, 0)['margin']
+
+
+def test_inversions_reach_the_required_margin():
+    limits = solver.solve_link(LINK, margin=15.0)
+    f, d, p, ga, gb, c, s = (LINK[name] for name in solver.GRID_FIELDS)
+    assert _margin(f, limits['max_dist'], p, ga, gb, c, s) == pytest.approx(15.0)
+    assert _margin(f, d, limits['min_p_tx'], ga, gb, c, s) == pytest.approx(15.0)
+    assert _margin(f, d, p, limits['min_g_a'], gb, c, s) == pytest.approx(15.0)
+    assert _margin(f, d, p, ga, limits['min_g_b'], c, s) == pytest.approx(15.0)
+    assert _margin(f, d, p, limits['min_gain'], limits['min_gain'], c, s) == pytest.approx(15.0)
+
+
+def test_inversions_broadcast_and_flag_invalid_inputs():
+    freq = np.array([2.4, 5.8, 0.0])
+    dist = solver.max_distance(freq, 20, 24, 24, 1, -85)
+    assert np.isnan(dist[2]) and (dist[:2] > 0).all() and dist[0] > dist[1]
+    power = solver.min_power(5.8, np.array([[1.0], [10.0], [-1.0]]), 24, 24, 1, -85)
+    assert power.shape == (3, 1) and np.isnan(power[2, 0])
+    assert power[1, 0] - power[0, 0] == pytest.approx(20.0)   # 10x distancia = +20 dB
+
+
+def test_feasibility_grid_matches_the_calculator():
+    freqs = np.linspace(2, 30, 7)
+    dists = np.array([1.0, 5.0, 20.0, 60.0])
+    equipment = {'p_tx': [18.0, 25.0, 30.0], 'g_a': [24.0, 30.0, 38.0], 'g_b': [24.0, 30.0, 38.0],
+                 'sens': [-70.0, -78.0, -85.0]}
+    grid = solver.feasibility_grid({'freq': freqs, 'dist': dists, 'equipo': equipment}, fixed={'cable_loss': 2})
+    assert grid['axes'] == ('freq', 'dist', 'equipo') and grid['shape'] == (7, 4, 3)
+    for i, j, k in np.ndindex(grid['shape']):
+        result = LinkBudgetCalculator.calculate(
+            freqs[i], dists[j], equipment['p_tx'][k], equipment['g_a'][k], equipment['g_b'][k], 2,
+            equipment['sens'][k], 0, 0)
+        assert grid['margin'][i, j, k] == pytest.approx(result['margin'], abs=1e-9)
+        assert grid['feasible'][i, j, k] == result['is_good']
+
+
+def test_feasibility_grid_validates_parameters():
+    base = {'freq': [5.8], 'dist': [10.0]}
+    fixed = {'p_tx': 20, 'g_a': 30, 'g_b': 30, 'sens': -80}
+    with pytest.raises(ValueError, match="Faltan parámetros: sens"):
+        solver.feasibility_grid(base, fixed={'p_tx': 20, 'g_a': 30, 'g_b': 30})
+    with pytest.raises(ValueError, match="desconocido: 'ruido'"):
+        solver.feasibility_grid(dict(base, ruido=[1.0]), fixed=fixed)
+    with pytest.raises(ValueError, match="una sola vez"):
+        solver.feasibility_grid(base, fixed=dict(fixed, freq=5.8))
+    with pytest.raises(ValueError, match="distinta longitud"):
+        solver.feasibility_grid(dict(base, radio={'p_tx': [20, 25], 'sens': [-80]}), fixed={'g_a': 30, 'g_b': 30})
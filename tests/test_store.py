@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from uptalink.store import LinkStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    rng = np.random.default_rng(7)
+    store = LinkStore(str(tmp_path / "links.sqlite"))
+    links = []
+    for k in range(600):
+        margin = None if k % 9 == 0 else float(rng.integers(-5, 5))   # muchos empates y nulos
+        links.append({
+            'link_id': f"{'AB'[k % 2]}-{k:04d}", 'margin': margin,
+            'status': 'VIABLE' if margin is not None and margin > 0 else 'CRÍTICO',
+            'freq': float(rng.uniform(1, 30)),
+        })
+    store.insert_many(links, chunk_size=128)
+    yield store
+    store.close()
+
+
+def _all_rows(store):
+    return [(link['id'], link) for link in store.iter_links(batch_size=97)]
+
+
+def test_insert_get_and_bulk_import(store):
+    assert store.count() == 600
+    link_id = store.insert({'link_id': 'NUEVO-1', 'freq': 5.8, 'margin': 12.5, 'status': 'VIABLE'})
+    assert link_id == 'NUEVO-1'
+    saved = store.get('NUEVO-1')
+    assert (saved['freq'], saved['margin'], saved['status']) == (5.8, 12.5, 'VIABLE')
+    assert saved['created_at'] > 0 and saved['p_tx'] is None
+    assert store.get('NO-EXISTE') is None
+    # link_id se genera si falta y es único
+    generated = {store.insert({'freq': 1.0}) for _ in range(3)}
+    assert len(generated) == 3 and store.count() == 604
+
+
+def test_iter_links_returns_every_link_in_creation_order(store):
+    rows = _all_rows(store)
+    assert [row_id for row_id, _ in rows] == sorted(row_id for row_id, _ in rows)
+    assert [link['link_id'] for _, link in rows] == [f"{'AB'[k % 2]}-{k:04d}" for k in range(600)]
+
+
+def _expected(store, sort, descending, status=None, prefix=None):
+    rows = [(row_id, link) for row_id, link in _all_rows(store)
+            if (status is None or link['status'] == status)
+            and (prefix is None or link['link_id'].lower().startswith(prefix.lower()))]
+    if sort == 'id':
+        ordered = sorted(rows, key=lambda r: r[0], reverse=descending)
+    else:
+        # SQLite: NULL primero en ASC y último en DESC; el id desempata
+        ordered = sorted(rows, key=lambda r: (r[1][sort] is not None, r[1][sort] or 0, r[0]), reverse=descending)
+    return [row_id for row_id, _ in ordered]
+
+
+def _paged(store, sort, descending, limit, **filters):
+    out, after = [], None
+    while True:
+        page = store.fetch_page(('link_id',), sort=sort, descending=descending, after=after, limit=limit, **filters)
+        out += [row[0] for row in page]
+        if len(page) < limit:
+            return out
+        after = (page[-1][1], page[-1][0])
+
+
+@pytest.mark.parametrize('sort', ['id', 'margin', 'freq'])
+@pytest.mark.parametrize('descending', [False, True])
+def test_keyset_paging_visits_every_row_once_in_order(store, sort, descending):
+    assert _paged(store, sort, descending, limit=37) == _expected(store, sort, descending)
+
+
+def test_keyset_paging_with_filters(store):
+    assert _paged(store, 'margin', False, 25, status='VIABLE') == _expected(store, 'margin', False, status='VIABLE')
+    assert _paged(store, 'margin', True, 25, id_prefix='a-') == _expected(store, 'margin', True, prefix='a-')
+
+
+def test_prefix_filter_treats_wildcards_literally(store):
+    store.insert({'link_id': 'X_%1'})
+    store.insert({'link_id': 'XY%2'})
+    store.insert({'link_id': 'x_\\3'})
+    assert [row[2] for row in store.fetch_page(('link_id',), id_prefix='x_')] == ['X_%1', 'x_\\3']
+    assert [row[2] for row in store.fetch_page(('link_id',), id_prefix='X_\\')] == ['x_\\3']
+
+
+def test_prefix_filter_searches_the_nocase_index(store):
+    sql = ("EXPLAIN QUERY PLAN SELECT id FROM links "
+           "WHERE link_id COLLATE NOCASE >= ? AND link_id COLLATE NOCASE < ?")
+    plan = ' '.join(row[3] for row in store.db.execute(sql, ('a-', 'a-\U0010ffff')))
+    assert 'SEARCH links USING COVERING INDEX idx_links_link_id_nocase' in plan
+    assert _paged(store, 'id', False, 50, id_prefix='b-00') == _expected(store, 'id', False, prefix='B-00')
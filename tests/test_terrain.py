@@ -0,0 +1,74 @@
+import math
+
+import numpy as np
+import pytest
+
+from uptalink import terrain
+
+
+def test_haversine_known_distances():
+    # Un grado de meridiano: pi/180 * R
+    assert terrain.haversine(10.0, -66.0, 11.0, -66.0) == pytest.approx(math.pi / 180 * terrain.EARTH_RADIUS)
+    assert terrain.haversine(0.0, 0.0, 0.0, 180.0) == pytest.approx(math.pi * terrain.EARTH_RADIUS)
+    assert terrain.haversine(10.5, -66.9, 10.5, -66.9) == 0.0
+    lat = np.array([10.0, 45.0, -33.0])
+    lon = np.array([-66.0, 2.0, 151.0])
+    np.testing.assert_allclose(terrain.haversine(lat, lon, lat[::-1], lon[::-1]),
+                               terrain.haversine(lat[::-1], lon[::-1], lat, lon))
+
+
+def test_earth_drop_and_fresnel_radius():
+    # Punto medio de 50 Km con k = 4/3: 25000² / (2 · 4/3 · R)
+    assert terrain.earth_drop(25.0, 50.0) == pytest.approx(25000 ** 2 / (2 * terrain.EARTH_RADIUS * 4 / 3))
+    assert terrain.earth_drop(np.array([0.0, 50.0]), 50.0).tolist() == [0.0, 0.0]
+    assert terrain.earth_drop(25.0, 50.0, k=1.0) > terrain.earth_drop(25.0, 50.0)
+
+    d1 = np.linspace(0, 20, 5)
+    radius = terrain.fresnel_radius(20.0, d1, 6.0)
+    assert radius[0] == 0.0 and radius[-1] == 0.0
+    assert radius[2] == pytest.approx(17.32 * math.sqrt(10 * 10 / (6.0 * 20)))
+    np.testing.assert_allclose(radius, radius[::-1])
+    assert not terrain.fresnel_radius(0.0, d1, 6.0).any()
+    assert not terrain.fresnel_radius(20.0, d1, 0.0).any()
+
+
+def test_grid_source_is_bilinear_and_clips_to_the_edges():
+    lats = np.linspace(10.0, 11.0, 11)
+    lons = np.linspace(-67.0, -66.0, 21)
+    plane = 100 + 50 * (lats[:, None] - 10.0) - 30 * (lons[None, :] + 67.0)
+    source = terrain.GridElevationSource(plane, 10.0, 11.0, -67.0, -66.0)
+    rng = np.random.default_rng(2)
+    q_lat, q_lon = rng.uniform(10.0, 11.0, 200), rng.uniform(-67.0, -66.0, 200)
+    # Un plano se interpola sin error
+    np.testing.assert_allclose(source.lookup(q_lat, q_lon), 100 + 50 * (q_lat - 10.0) - 30 * (q_lon + 67.0))
+    np.testing.assert_allclose(source.lookup([9.0, 12.0], [-68.0, -65.0]), [plane[0, 0], plane[-1, -1]])
+    np.testing.assert_allclose(terrain.sample_grid(source, (10.0, 11.0, -67.0, -66.0), plane.shape), plane)
+
+
+def test_extract_profile_samples_the_straight_path():
+    source = terrain.GridElevationSource([[0.0, 0.0], [100.0, 100.0]], 10.0, 11.0, -67.0, -66.0)
+    dist, elevations = terrain.extract_profile(source, 10.0, -66.5, 11.0, -66.5, n_samples=11)
+    assert dist == pytest.approx(terrain.haversine(10.0, -66.5, 11.0, -66.5) / 1000)
+    np.testing.assert_allclose(elevations, np.linspace(0.0, 100.0, 11))
+
+
+def test_analyze_profile_clearance():
+    dist, freq = 20.0, 6.0
+    flat = terrain.analyze_profile(terrain.obstacle_profile(51), dist, freq, 60.0, 60.0)
+    mid = 25
+    radius = terrain.fresnel_radius(dist, dist / 2, freq)
+    bulge = terrain.earth_drop(dist / 2, dist)
+    assert flat['clearance'][mid] == pytest.approx((60.0 - bulge) / radius * 100)
+    assert np.isnan(flat['clearance'][0]) and np.isnan(flat['clearance'][-1])
+    assert flat['is_clear'] and flat['max_obstruction'] == 0.0
+    assert flat['distances'][-1] == pytest.approx(dist * 1000)
+
+    # Un obstáculo en el punto medio que invade el 60 % de la zona
+    height = 60.0 - bulge - 0.3 * radius
+    blocked = terrain.analyze_profile(terrain.obstacle_profile(51, height), dist, freq, 60.0, 60.0)
+    assert not blocked['is_clear']
+    assert blocked['min_clearance'] == pytest.approx(30.0)
+    assert blocked['max_obstruction'] == pytest.approx(0.3 * radius)
+
+    with pytest.raises(ValueError, match="mayores a 0"):
+        terrain.analyze_profile(np.zeros(5), 0.0, freq, 10.0, 10.0)
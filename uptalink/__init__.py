@@ -0,0 +1,3 @@
+"""
+UPTALINK: núcleo de cálculo de radioenlaces sin dependencias de UI.
+"""
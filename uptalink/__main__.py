@@ -0,0 +1,137 @@
+"""
+Línea de comandos de UPTALINK (sin interfaz gráfica).
+
+    python -m uptalink batch entrada.csv salida.csv [--chunk-size N] [--workers N]
+    python -m uptalink network sitios.csv enlaces.csv --freq GHz [--margin dB] [--workers N]
+    python -m uptalink coverage salida.tif --dem DIR --lat LAT --lon LON --freq GHz --p-tx dBm --gain dBi
+    python -m uptalink catalog [--radios radios.csv] [--antennas antenas.csv] [--freq GHz --dist Km]
+    python -m uptalink serve [--host HOST] [--port PUERTO] [--workers N]
+    python -m uptalink project proyecto.uptp [--from-db links.sqlite] [--compact]
+    python -m uptalink export informe.(csv|kml|pdf) [--db links.sqlite]
+    python -m uptalink interference sinr.csv [--db links.sqlite] [--link ID] [--max-pairs N]
+
+Los submódulos se importan solo al ejecutar cada comando para que el
+arranque sea mínimo.
+"""
+
+import argparse
+import sys
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="uptalink", description="Cálculo de radioenlaces sin interfaz gráfica.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="Calcula un CSV de enlaces en streaming.")
+    batch.add_argument("input", help="CSV de entrada ('-' para stdin).")
+    batch.add_argument("output", help="CSV de salida ('-' para stdout).")
+    batch.add_argument("--chunk-size", type=int, default=20000, help="Filas por bloque (por defecto 20000).")
+    batch.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto, todos los núcleos).")
+
+    network = commands.add_parser("network", help="Calcula los enlaces viables entre todos los emplazamientos.")
+    network.add_argument("sites", help="CSV de emplazamientos (id, lat, lon, p_tx, gain, sens[, height, cable_loss]).")
+    network.add_argument("output", help="CSV de enlaces viables ('-' para stdout).")
+    network.add_argument("--freq", type=float, required=True, help="Frecuencia de la red (GHz).")
+    network.add_argument("--margin", type=float, default=10.0, help="Margen requerido en ambos sentidos (dB, por defecto 10).")
+    network.add_argument("--max-range", type=float, default=None, help="Alcance máximo del equipo (Km).")
+    network.add_argument("--require-clear", action="store_true", help="Exigir despeje de Fresnel a mitad de trayecto.")
+    network.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto, todos los núcleos).")
+
+    coverage = commands.add_parser("coverage", help="Mapa de cobertura (RSSI y visibilidad) de un transmisor.")
+    coverage.add_argument("output", help="GeoTIFF de salida con el RSSI (dBm).")
+    coverage.add_argument("--dem", required=True, help="Carpeta con teselas DEM (.hgt/.tif).")
+    coverage.add_argument("--lat", type=float, required=True, help="Latitud del transmisor.")
+    coverage.add_argument("--lon", type=float, required=True, help="Longitud del transmisor.")
+    coverage.add_argument("--freq", type=float, required=True, help="Frecuencia (GHz).")
+    coverage.add_argument("--p-tx", type=float, required=True, help="Potencia Tx (dBm).")
+    coverage.add_argument("--gain", type=float, required=True, help="Ganancia de la antena Tx (dBi).")
+    coverage.add_argument("--rx-gain", type=float, default=0.0, help="Ganancia de la antena Rx (dBi, por defecto 0).")
+    coverage.add_argument("--cable-loss", type=float, default=0.0, help="Pérdidas de cables (dB, por defecto 0).")
+    coverage.add_argument("--height", type=float, default=30.0, help="Altura de la torre Tx (m, por defecto 30).")
+    coverage.add_argument("--rx-height", type=float, default=10.0, help="Altura de la antena Rx (m, por defecto 10).")
+    coverage.add_argument("--radius", type=float, default=10.0, help="Semilado de la ventana (Km, por defecto 10).")
+    coverage.add_argument("--resolution", type=float, default=30.0, help="Tamaño de celda (m, por defecto 30).")
+    coverage.add_argument("--sens", type=float, default=-80.0, help="Sensibilidad Rx para el resumen (dBm, por defecto -80).")
+    coverage.add_argument("--visibility", default=None, help="GeoTIFF opcional con la capa de visibilidad.")
+    coverage.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto, todos los núcleos).")
+
+    catalog = commands.add_parser("catalog", help="Importa equipos al catálogo y elige el más barato viable.")
+    catalog.add_argument("--db", default=None, help="Base SQLite del catálogo (por defecto ~/.uptalink/catalog.sqlite).")
+    catalog.add_argument("--radios", default=None,
+                         help="CSV de radios a importar (model, vendor, band_min, band_max, p_tx, sens, cost).")
+    catalog.add_argument("--antennas", default=None,
+                         help="CSV de antenas a importar (model, vendor, band_min, band_max, gain, cost).")
+    catalog.add_argument("--freq", type=float, default=None, help="Frecuencia del enlace (GHz).")
+    catalog.add_argument("--dist", type=float, default=None, help="Distancia del enlace (Km).")
+    catalog.add_argument("--cable-loss", type=float, default=0.0, help="Pérdidas de cables (dB, por defecto 0).")
+    catalog.add_argument("--margin", type=float, default=10.0, help="Margen requerido (dB, por defecto 10).")
+
+    serve = commands.add_parser("serve", help="Servicio HTTP/JSON local con el calculador.")
+    serve.add_argument("--host", default="127.0.0.1", help="Dirección de escucha (por defecto 127.0.0.1).")
+    serve.add_argument("--port", type=int, default=8765, help="Puerto (por defecto 8765).")
+    serve.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto, todos los núcleos).")
+    serve.add_argument("--max-batch", type=int, default=4096,
+                       help="Peticiones /calculate agrupadas por cálculo (por defecto 4096).")
+    serve.add_argument("--max-delay", type=float, default=2.0,
+                       help="Espera máxima para agrupar peticiones (ms, por defecto 2).")
+    serve.add_argument("--chunk-size", type=int, default=5000, help="Enlaces por bloque en /batch (por defecto 5000).")
+
+    project = commands.add_parser("project", help="Muestra un fichero de proyecto o guarda en él los enlaces de la base.")
+    project.add_argument("path", help="Fichero de proyecto (.uptp).")
+    project.add_argument("--from-db", default=None, help="Base SQLite de enlaces cuyo contenido se guarda en el proyecto.")
+    project.add_argument("--compact", action="store_true", help="Reescribe el proyecto sin las versiones antiguas.")
+
+    export = commands.add_parser("export", help="Exporta los enlaces guardados a CSV, KML o PDF en streaming.")
+    export.add_argument("output", help="Fichero de salida; el formato sale de la extensión (.csv, .kml, .pdf).")
+    export.add_argument("--db", default=None, help="Base SQLite de enlaces (por defecto ~/.uptalink/links.sqlite).")
+    export.add_argument("--format", choices=("csv", "kml", "pdf"), default=None, help="Formato, si no se deduce de la extensión.")
+    export.add_argument("--batch-size", type=int, default=5000, help="Enlaces leídos de la base por consulta (por defecto 5000).")
+
+    interference = commands.add_parser("interference", help="SNR, SINR y C/I de los enlaces guardados (matriz de interferencia).")
+    interference.add_argument("output", help="CSV con SNR, SINR y C/I por enlace ('-' para stdout).")
+    interference.add_argument("--db", default=None, help="Base SQLite de enlaces (por defecto ~/.uptalink/links.sqlite).")
+    interference.add_argument("--link", default=None, help="ID de enlace cuyos interferentes principales se listan.")
+    interference.add_argument("--max-pairs", type=int, default=20_000_000,
+                              help="Máximo de pares candidatos; 0 sin límite (por defecto 20000000, ~10 s).")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "batch":
+        from uptalink import batch
+        return batch.main(args)
+    if args.command == "network":
+        from uptalink import network
+        return network.main(args)
+    if args.command == "coverage":
+        from uptalink import coverage
+        return coverage.main(args)
+    if args.command == "catalog":
+        from uptalink import catalog
+        if args.db is None:
+            args.db = catalog.DEFAULT_CATALOG_PATH
+        return catalog.main(args)
+    if args.command == "serve":
+        from uptalink import server
+        return server.main(args)
+    if args.command == "project":
+        from uptalink import project
+        return project.main(args)
+    if args.command == "export":
+        from uptalink import export
+        if args.db is None:
+            from uptalink.store import DEFAULT_DB_PATH
+            args.db = DEFAULT_DB_PATH
+        return export.main(args)
+    if args.command == "interference":
+        from uptalink import interference
+        if args.db is None:
+            from uptalink.store import DEFAULT_DB_PATH
+            args.db = DEFAULT_DB_PATH
+        return interference.main(args)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
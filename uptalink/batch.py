@@ -0,0 +1,173 @@
+"""
+Modo batch sin cabeza: CSV de enlaces -> CSV de resultados.
+
+El proceso principal solo lee líneas, las agrupa en bloques de tamaño
+fijo y escribe los resultados en orden; el parseo, el cálculo vectorizado
+y el formateo ocurren en un pool de procesos. Así la memoria es constante
+(como mucho max_pending bloques en vuelo) y el arranque no paga NumPy ni
+Qt. Limitación: no se admiten campos CSV con saltos de línea internos.
+"""
+
+import csv
+import io
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Duplicados de LinkBudgetCalculator.BATCH_FIELDS/OPTIONAL_FIELDS para no importar NumPy aquí
+BATCH_FIELDS = ('freq', 'dist', 'p_tx', 'g_a', 'g_b', 'cable_loss', 'sens', 'cost_eq', 'hours')
+OPTIONAL_FIELDS = ('rain_margin', 'rain_rate', 'bandwidth', 'noise_figure', 'temperature')  # solo si están en el CSV
+REQUIRED_FIELDS = ('freq', 'dist')
+
+RESULT_FIELDS = (
+    'fspl', 'total_loss', 'rssi', 'margin', 'availability', 'snr', 'throughput', 'fresnel', 'total_cost', 'status',
+)
+
+DEFAULT_CHUNK_SIZE = 20000
+
+
+def _parse_column(values):
+    import numpy as np
+
+    # Camino rápido: NumPy convierte la columna entera; si hay celdas vacías
+    # o no numéricas se recurre al parseo celda a celda (vacío/erróneo -> 0.0)
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        pass
+    out = []
+    for v in values:
+        try:
+            out.append(float(v) if v.strip() else 0.0)
+        except ValueError:
+            out.append(0.0)
+    return np.array(out, dtype=np.float64)
+
+
+def process_chunk(header, lines):
+    """
+    Calcula un bloque de líneas CSV (se ejecuta en los procesos del pool).
+
+    Args:
+        header: Lista de nombres de columna del CSV de entrada.
+        lines: Líneas crudas del bloque (sin la cabecera).
+
+    Returns:
+        str: Líneas de salida (entrada original + columnas de resultado).
+    """
+    import numpy as np
+    from uptalink.calculator import LinkBudgetCalculator
+
+    rows = list(csv.reader(lines))
+    n = len(rows)
+    positions = {name: i for i, name in enumerate(header)}
+    columns = []
+    for name in BATCH_FIELDS:
+        pos = positions.get(name)
+        if pos is None:
+            columns.append(np.zeros(n))
+        else:
+            columns.append(_parse_column([row[pos] if pos < len(row) else '' for row in rows]))
+
+    optional = {}
+    for name in OPTIONAL_FIELDS:
+        pos = positions.get(name)
+        if pos is not None:
+            optional[name] = _parse_column([row[pos] if pos < len(row) else '' for row in rows])
+
+    r = LinkBudgetCalculator.calculate_batch(*columns, **optional)
+    numeric = np.column_stack([r[name] for name in RESULT_FIELDS[:-1]])
+    status = np.where(r['valid'], np.where(r['is_good'], 'VIABLE', 'CRÍTICO'), 'INVÁLIDO')
+
+    # Una operación de formato por fila; las filas inválidas van con celdas vacías
+    row_fmt = ',' + ','.join(['%.4f'] * numeric.shape[1])
+    empty = ',' * numeric.shape[1]
+    out = io.StringIO()
+    for line, values, ok, st in zip(lines, numeric.tolist(), r['valid'].tolist(), status.tolist()):
+        out.write(line.rstrip('\r\n'))
+        out.write(row_fmt % tuple(values) if ok else empty)
+        out.write(',' + st + '\n')
+    return out.getvalue()
+
+
+def _read_chunks(fh, chunk_size):
+    chunk = []
+    for line in fh:
+        if not line.strip():
+            continue
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(src, dst, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, progress=None):
+    """
+    Procesa un CSV de enlaces en streaming.
+
+    Args:
+        src: Fichero de entrada (texto) con cabecera que incluya al menos freq y dist.
+        dst: Fichero de salida (texto).
+        chunk_size: Filas por bloque.
+        workers: Procesos del pool (None = todos los núcleos; 1 = sin pool).
+        progress: Callback opcional progress(filas_escritas).
+
+    Returns:
+        int: Filas procesadas.
+    """
+    header_line = src.readline()
+    if not header_line:
+        return 0
+    header = [name.strip() for name in next(csv.reader([header_line]))]
+    missing = [name for name in REQUIRED_FIELDS if name not in header]
+    if missing:
+        raise ValueError(f"Faltan columnas obligatorias en el CSV: {', '.join(missing)}")
+    dst.write(header_line.rstrip('\r\n') + ',' + ','.join(RESULT_FIELDS) + '\n')
+
+    workers = workers or os.cpu_count() or 1
+    total = 0
+    if workers == 1:
+        for chunk in _read_chunks(src, chunk_size):
+            dst.write(process_chunk(header, chunk))
+            total += len(chunk)
+            if progress:
+                progress(total)
+        return total
+
+    # Ventana acotada de bloques en vuelo: memoria constante y salida en orden
+    max_pending = workers * 2
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in _read_chunks(src, chunk_size):
+            pending.append((len(chunk), pool.submit(process_chunk, header, chunk)))
+            if len(pending) >= max_pending:
+                n, future = pending.popleft()
+                dst.write(future.result())
+                total += n
+                if progress:
+                    progress(total)
+        while pending:
+            n, future = pending.popleft()
+            dst.write(future.result())
+            total += n
+            if progress:
+                progress(total)
+    return total
+
+
+def main(args):
+    """Punto de entrada de 'python -m uptalink batch'."""
+    src = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    dst = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        total = run_batch(src, dst, args.chunk_size, args.workers)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    print(f"{total} enlaces procesados.", file=sys.stderr)
+    return 0
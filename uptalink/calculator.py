@@ -0,0 +1,357 @@
+"""
+Cálculo de presupuesto de enlace (sin dependencias de UI).
+
+Lo usan la app de escritorio (ya.py) y el modo batch sin cabeza
+(python -m uptalink batch), que nunca importa Qt.
+"""
+
+import math
+
+import numpy as np
+
+from uptalink import instrument, rain
+
+# Tipos que noise_floor calcula con math (np.float64 es subclase de float)
+_SCALARS = (int, float)
+
+
+class LinkBudgetCalculator:
+    """
+    Clase encargada exclusivamente de los cálculos matemáticos.
+    No contiene nada de UI.
+    """
+
+    # Umbral de viabilidad (dB) y tarifa de ingeniería ($/hora)
+    MARGIN_THRESHOLD = 10
+    HOURLY_RATE = 50
+
+    # Columnas esperadas por calculate_table (mismo orden que calculate)
+    BATCH_FIELDS = ('freq', 'dist', 'p_tx', 'g_a', 'g_b', 'cable_loss', 'sens', 'cost_eq', 'hours')
+    # Columnas opcionales de calculate_table (argumentos con nombre de calculate)
+    OPTIONAL_FIELDS = ('rain_margin', 'rain_rate', 'bandwidth', 'noise_figure', 'temperature')
+    # Resultados float64 de calculate_batch (además de 'is_good' y 'valid')
+    BATCH_RESULTS = ('fspl', 'total_loss', 'rssi', 'margin', 'availability', 'snr',
+                     'throughput', 'fresnel', 'total_cost')
+    # Filas por bloque de calculate_batch: los temporales de un bloque caben
+    # en la caché y solo las entradas y salidas recorren la memoria
+    BLOCK_SIZE = 32768
+
+    # Constante de Boltzmann (J/K) y 0 °C en Kelvin para el ruido térmico
+    BOLTZMANN = 1.380649e-23
+    ZERO_CELSIUS = 273.15
+    # Piso de ruido implícito en el SNR del JS (snr = rssi + 100)
+    JS_NOISE_FLOOR = -100.0
+    # Temperatura de referencia del ruido térmico (°C): 290 K
+    DEFAULT_TEMPERATURE = 16.85
+
+    @staticmethod
+    def noise_floor(bandwidth, noise_figure=0.0, temperature=DEFAULT_TEMPERATURE):
+        """
+        Piso de ruido térmico del receptor: 10*log10(k*T*B) + 30 + NF.
+
+        Args:
+            bandwidth: Ancho de Banda (MHz); <= 0 usa el piso fijo del JS.
+            noise_figure: Factor de Ruido (dB).
+            temperature: Temperatura (°C); por defecto 290 K.
+
+        Returns:
+            Potencia de ruido en dBm (float o ndarray).
+        """
+        if isinstance(bandwidth, _SCALARS) and isinstance(noise_figure, _SCALARS) and isinstance(temperature, _SCALARS):
+            # Un solo enlace (ruta de calculate): sin arrays ni np.ndim, que cuesta más que el cálculo
+            if not bandwidth > 0:
+                return LinkBudgetCalculator.JS_NOISE_FLOOR
+            kelvin = max(temperature + LinkBudgetCalculator.ZERO_CELSIUS, 1.0)
+            return 10 * math.log10(LinkBudgetCalculator.BOLTZMANN * kelvin * bandwidth * 1e6) + 30 + noise_figure
+        bandwidth = np.asarray(bandwidth, dtype=np.float64)
+        kelvin = np.maximum(np.asarray(temperature, dtype=np.float64) + LinkBudgetCalculator.ZERO_CELSIUS, 1.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            thermal = 10 * np.log10(LinkBudgetCalculator.BOLTZMANN * kelvin * bandwidth * 1e6) + 30
+        floor = np.where(bandwidth > 0, thermal + noise_figure, LinkBudgetCalculator.JS_NOISE_FLOOR)
+        return floor[()] if floor.ndim == 0 else floor
+
+    @staticmethod
+    @instrument.probe("calculator.calculate", sample_every=16)
+    def calculate(freq, dist, p_tx, g_a, g_b, cable_loss, sens, cost_eq, hours,
+                  rain_margin=0.0, rain_rate=rain.DEFAULT_RAIN_RATE,
+                  bandwidth=0.0, noise_figure=0.0, temperature=DEFAULT_TEMPERATURE):
+        """
+        Ejecuta las fórmulas basadas en el JS original.
+        
+        Args:
+            freq: Frecuencia (GHz)
+            dist: Distancia (Km)
+            p_tx: Potencia Tx (dBm)
+            g_a: Ganancia Antena A (dBi)
+            g_b: Ganancia Antena B (dBi)
+            cable_loss: Pérdidas Cables (dB)
+            sens: Sensibilidad Rx (dBm)
+            cost_eq: Costo Equipo ($)
+            hours: Horas Instalación
+            rain_margin: Margen de Lluvia (dB); 0 = todo el margen de desvanecimiento
+            rain_rate: Intensidad de lluvia R0.01 (mm/h)
+            bandwidth, noise_figure, temperature: Ver noise_floor; sin
+                Ancho de Banda el SNR usa el piso fijo del JS.
+            
+        Returns:
+            dict: Diccionario con todos los resultados calculados y estado.
+        """
+        
+        # Validación básica
+        if freq == 0 or dist == 0:
+            raise ValueError("La Frecuencia y la Distancia deben ser mayores a 0.")
+
+        # 1. FSPL (Free Space Path Loss)
+        # Formula: 20*log10(d) + 20*log10(f) + 32.44
+        fspl = 20 * math.log10(dist) + 20 * math.log10(freq) + 32.44
+        
+        # 2. Pérdida Total del Sistema
+        total_loss = fspl + cable_loss
+        
+        # 3. Nivel Rx Recibido (RSSI)
+        rssi = p_tx + g_a + g_b - total_loss
+        
+        # 4. Margen de Desvanecimiento (Fade Margin)
+        margin = rssi - sens
+        
+        # 5. Determinación de viabilidad
+        is_good = margin > LinkBudgetCalculator.MARGIN_THRESHOLD
+        
+        # Disponibilidad frente a lluvia (ITU-R P.838/P.530), en %
+        availability = rain.link_availability(freq, dist, margin, rain_margin, rain_rate)
+        
+        # Cálculos secundarios (simulados según el JS original)
+        snr = rssi - LinkBudgetCalculator.noise_floor(bandwidth, noise_figure, temperature)
+        throughput = (freq * 10) if is_good else 0
+        
+        # Radio de Fresnel (Aproximación JS: 5.5 * sqrt(dist/freq))
+        fresnel_radius = 5.5 * math.sqrt(dist / freq)
+        
+        # Costos
+        total_cost = cost_eq + (hours * LinkBudgetCalculator.HOURLY_RATE) # $50/hora ingeniero
+        
+        # Estado
+        status = "VIABLE" if is_good else "CRÍTICO"
+        
+        return {
+            'fspl': fspl,
+            'total_loss': total_loss,
+            'rssi': rssi,
+            'margin': margin,
+            'availability': availability,
+            'snr': snr,
+            'throughput': throughput,
+            'fresnel': fresnel_radius,
+            'total_cost': total_cost,
+            'status': status,
+            'is_good': is_good
+        }
+
+    @staticmethod
+    @instrument.probe("calculator.calculate_batch")
+    def calculate_batch(freq, dist, p_tx, g_a, g_b, cable_loss, sens, cost_eq, hours,
+                        rain_margin=0.0, rain_rate=rain.DEFAULT_RAIN_RATE,
+                        bandwidth=0.0, noise_figure=0.0, temperature=DEFAULT_TEMPERATURE):
+        """
+        Versión vectorizada de calculate para muchos enlaces a la vez.
+
+        Acepta arrays NumPy (o escalares) con broadcasting y devuelve los
+        resultados por columnas. Las filas con Frecuencia o Distancia <= 0
+        no lanzan excepción: se marcan en 'valid' y sus resultados son NaN.
+        Las filas se procesan en bloques de BLOCK_SIZE que escriben
+        directamente en los arrays de resultado.
+
+        Args:
+            freq, dist, p_tx, g_a, g_b, cable_loss, sens, cost_eq, hours,
+            rain_margin, rain_rate, bandwidth, noise_figure, temperature:
+                Mismas magnitudes y unidades que calculate.
+
+        Returns:
+            dict: Arrays float64 ('fspl', 'total_loss', 'rssi', 'margin',
+            'availability', 'snr', 'throughput', 'fresnel', 'total_cost') y
+            máscaras booleanas 'is_good' y 'valid'.
+        """
+        optional = {
+            name: np.asarray(value, dtype=np.float64) for name, value in zip(
+                LinkBudgetCalculator.OPTIONAL_FIELDS, (rain_margin, rain_rate, bandwidth, noise_figure, temperature)
+            )
+        }
+        columns = np.broadcast_arrays(
+            *(np.asarray(v, dtype=np.float64) for v in (freq, dist, p_tx, g_a, g_b, cable_loss, sens, cost_eq, hours)),
+            *optional.values(),
+        )
+        # Se recorre en 1-D por bloques y se devuelve con la forma común; las
+        # columnas opcionales escalares (lo habitual) no se expanden
+        shape = columns[0].shape
+        per_row = {
+            name: column.reshape(-1)
+            for (name, value), column in zip(optional.items(), columns[9:]) if value.ndim > 0
+        }
+        columns = [column.reshape(-1) for column in columns[:9]]
+        size = columns[0].size
+
+        results = {name: np.empty(size) for name in LinkBudgetCalculator.BATCH_RESULTS}
+        results['is_good'] = np.empty(size, dtype=bool)
+        results['valid'] = np.empty(size, dtype=bool)
+        step = LinkBudgetCalculator.BLOCK_SIZE
+        for start in range(0, size, step):
+            block = slice(start, start + step)
+            _batch_block(
+                [column[block] for column in columns],
+                optional | {name: column[block] for name, column in per_row.items()},
+                {name: column[block] for name, column in results.items()},
+            )
+        return {name: column.reshape(shape) for name, column in results.items()}
+
+    @staticmethod
+    def calculate_table(table):
+        """
+        Ejecuta calculate_batch sobre una tabla con columnas nombradas.
+
+        Args:
+            table: Array estructurado NumPy, DataFrame de pandas o dict
+                con las columnas de BATCH_FIELDS (y opcionalmente las de
+                OPTIONAL_FIELDS).
+
+        Returns:
+            dict: Mismo formato que calculate_batch.
+        """
+        columns = [np.asarray(table[name], dtype=np.float64) for name in LinkBudgetCalculator.BATCH_FIELDS]
+        names = getattr(getattr(table, 'dtype', None), 'names', None) or table
+        optional = {
+            name: np.asarray(table[name], dtype=np.float64)
+            for name in LinkBudgetCalculator.OPTIONAL_FIELDS if name in names
+        }
+        return LinkBudgetCalculator.calculate_batch(*columns, **optional)
+
+
+def _batch_block(columns, optional, out):
+    """
+    Un bloque de calculate_batch: escribe en out (vistas de los arrays de
+    resultado) con ufuncs in situ y el mismo orden de operaciones que
+    calculate, para obtener los mismos números. optional tiene las claves
+    de OPTIONAL_FIELDS (escalares o columnas del bloque).
+    """
+    freq, dist, p_tx, g_a, g_b, cable_loss, sens, cost_eq, hours = columns
+
+    # Validación por fila: las inválidas se propagan como NaN (si las hay)
+    valid = np.greater(freq, 0, out=out['valid'])
+    valid &= dist > 0
+    invalid = None if valid.all() else ~valid
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # log10(f) y log10(d) se comparten con la disponibilidad por lluvia
+        log_f = np.log10(freq)
+        log_d = np.log10(dist)
+        fspl = np.multiply(log_d, 20, out=out['fspl'])
+        fspl += np.multiply(log_f, 20, out=out['snr'])   # snr aún libre: hace de temporal
+        fspl += 32.44
+        if invalid is not None:
+            np.copyto(fspl, np.nan, where=invalid)
+        total_loss = np.add(fspl, cable_loss, out=out['total_loss'])
+        rssi = np.add(p_tx, g_a, out=out['rssi'])
+        rssi += g_b
+        rssi -= total_loss
+        margin = np.subtract(rssi, sens, out=out['margin'])
+        is_good = np.greater(margin, LinkBudgetCalculator.MARGIN_THRESHOLD, out=out['is_good'])
+
+        rain.availability_from_logs(
+            dist, log_f, log_d, margin, optional['rain_margin'], optional['rain_rate'],
+            invalid=invalid, out=out['availability']
+        )
+        noise = LinkBudgetCalculator.noise_floor(optional['bandwidth'], optional['noise_figure'], optional['temperature'])
+        np.subtract(rssi, noise, out=out['snr'])
+        throughput = np.multiply(freq, 10, out=out['throughput'])
+        throughput *= is_good
+        fresnel_radius = np.divide(dist, freq, out=out['fresnel'])
+        np.sqrt(fresnel_radius, out=fresnel_radius)
+        fresnel_radius *= 5.5
+        total_cost = np.multiply(hours, LinkBudgetCalculator.HOURLY_RATE, out=out['total_cost'])
+        total_cost += cost_eq
+
+    if invalid is not None:
+        for column in (throughput, fresnel_radius, total_cost):
+            np.copyto(column, np.nan, where=invalid)
+
+
+def evaluate_link(inputs, profile_samples=201):
+    """
+    Cálculo completo de un enlace del panel de entradas.
+
+    Combina el presupuesto de enlace con el despeje de Fresnel sobre un
+    perfil sintético (terreno plano con el obstáculo a mitad de trayecto).
+    No toca la UI, así que puede ejecutarse en un hilo de trabajo.
+
+    Args:
+        inputs: dict con las claves de store.INPUT_FIELDS.
+        profile_samples: Muestras del perfil (impar para tener punto medio).
+
+    Returns:
+        dict: Resultados de LinkBudgetCalculator.calculate más 'clearance'.
+    """
+    from uptalink import terrain
+
+    freq = inputs['freq']
+    dist = inputs['dist']
+    results = LinkBudgetCalculator.calculate(
+        freq, dist, inputs['p_tx'], inputs['g_a'], inputs['g_b'], inputs['cable_loss'],
+        inputs['sens'], inputs['cost_eq'], inputs['hours'], rain_margin=inputs['rain_margin'],
+        bandwidth=inputs['bandwidth'], noise_figure=inputs['noise_figure'], temperature=inputs['temperature']
+    )
+    profile = terrain.analyze_profile(
+        terrain.obstacle_profile(profile_samples, inputs['obstacle']), dist, freq, inputs['height_a'], inputs['height_b']
+    )
+    results['clearance'] = profile['min_clearance']
+    return results
+
+
+def build_link_graph(profile_samples=201):
+    """
+    Modelo de enlace como grafo de dependencias (recálculo incremental).
+
+    Mismas fórmulas que LinkBudgetCalculator.calculate y evaluate_link,
+    separadas por magnitud: fspl depende de freq y dist, margin de rssi y
+    sens, total_cost solo de cost_eq y hours, etc.
+    snr usa el ruido térmico (bandwidth, noise_figure, temperature) cuando
+    hay Ancho de Banda, igual que calculate.
+
+    Returns:
+        CalcGraph: Entradas con las claves de store.INPUT_FIELDS y nodos con
+        las claves de salida de evaluate_link.
+    """
+    from uptalink import terrain
+    from uptalink.graph import CalcGraph
+    from uptalink.store import INPUT_DEFAULTS
+
+    def fspl(freq, dist):
+        if freq == 0 or dist == 0:
+            raise ValueError("La Frecuencia y la Distancia deben ser mayores a 0.")
+        return 20 * math.log10(dist) + 20 * math.log10(freq) + 32.44
+
+    def clearance(freq, dist, h_a, h_b, obstacle):
+        profile = terrain.analyze_profile(terrain.obstacle_profile(profile_samples, obstacle), dist, freq, h_a, h_b)
+        return profile['min_clearance']
+
+    g = CalcGraph()
+    for name in ('freq', 'dist', 'p_tx', 'g_a', 'g_b', 'cable_loss', 'sens', 'noise_figure', 'bandwidth',
+                 'temperature', 'rain_margin', 'height_a', 'height_b', 'obstacle', 'cost_eq', 'hours'):
+        g.add_input(name, INPUT_DEFAULTS.get(name, 0.0))
+
+    # fspl valida freq/dist y va primero: si falla no se evalúa nada más
+    g.add_node('fspl', ('freq', 'dist'), fspl)
+    g.add_node('total_loss', ('fspl', 'cable_loss'), lambda fspl, cable_loss: fspl + cable_loss)
+    g.add_node('rssi', ('p_tx', 'g_a', 'g_b', 'total_loss'), lambda p_tx, g_a, g_b, total_loss: p_tx + g_a + g_b - total_loss)
+    g.add_node('margin', ('rssi', 'sens'), lambda rssi, sens: rssi - sens)
+    g.add_node('is_good', ('margin',), lambda margin: margin > LinkBudgetCalculator.MARGIN_THRESHOLD)
+    g.add_node('availability', ('freq', 'dist', 'margin', 'rain_margin'), rain.link_availability)
+    # Con Ancho de Banda el SNR usa el ruido térmico; sin él, el piso fijo del JS
+    g.add_node('snr', ('rssi', 'bandwidth', 'noise_figure', 'temperature'),
+               lambda rssi, bandwidth, noise_figure, temperature:
+               rssi - float(LinkBudgetCalculator.noise_floor(bandwidth, noise_figure, temperature)))
+    g.add_node('throughput', ('freq', 'is_good'), lambda freq, is_good: (freq * 10) if is_good else 0)
+    g.add_node('fresnel', ('freq', 'dist'), lambda freq, dist: 5.5 * math.sqrt(dist / freq))
+    g.add_node('clearance', ('freq', 'dist', 'height_a', 'height_b', 'obstacle'), clearance)
+    g.add_node('total_cost', ('cost_eq', 'hours'),
+               lambda cost_eq, hours: cost_eq + (hours * LinkBudgetCalculator.HOURLY_RATE))
+    g.add_node('status', ('is_good',), lambda is_good: "VIABLE" if is_good else "CRÍTICO")
+    return g
@@ -0,0 +1,361 @@
+"""
+Catálogo de equipos (radios y antenas) y selección del equipo más barato.
+
+Dos tablas SQLite con índices por banda, ganancia y costo:
+
+    radios   (model, vendor, band_min, band_max, p_tx, sens, cost)
+    antennas (model, vendor, band_min, band_max, gain, cost)
+
+con las bandas en GHz. Un enlace lleva RADIOS_PER_LINK radios del mismo
+modelo y una antena en cada extremo; con el modelo de
+LinkBudgetCalculator es viable si
+
+    (p_tx - sens) + g_a + g_b - fspl - cable_loss > MARGIN_THRESHOLD
+
+así que cada radio fija la ganancia conjunta que necesita el par de
+antenas. La selección no recorre radios x antenas x antenas:
+
+    1. Se descartan las radios y antenas dominadas (otra de la banda es
+       igual de barata y mejor): ordenadas por ganancia (o por p_tx - sens)
+       solo queda la frontera en la que el costo sube con la ganancia.
+    2. Sobre la frontera de antenas, la antena B más barata que completa
+       una ganancia es la primera con ganancia suficiente (searchsorted);
+       cada radio se evalúa contra todas las antenas A a la vez.
+    3. Las radios se recorren por bloques de costo creciente y se para en
+       cuanto el costo de las radios solas supera la mejor combinación.
+"""
+
+import csv
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from uptalink import instrument, solver
+from uptalink.calculator import LinkBudgetCalculator
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".uptalink", "catalog.sqlite")
+
+RADIO_FIELDS = ('model', 'vendor', 'band_min', 'band_max', 'p_tx', 'sens', 'cost')
+ANTENNA_FIELDS = ('model', 'vendor', 'band_min', 'band_max', 'gain', 'cost')
+
+# Radios por enlace (una en cada extremo, mismo modelo)
+RADIOS_PER_LINK = 2
+
+# Elementos (radios x antenas de la frontera) evaluados por bloque
+_BLOCK_ELEMENTS = 1 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS radios (
+    id INTEGER PRIMARY KEY, model TEXT NOT NULL, vendor TEXT,
+    band_min REAL NOT NULL, band_max REAL NOT NULL,
+    p_tx REAL NOT NULL, sens REAL NOT NULL, cost REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS antennas (
+    id INTEGER PRIMARY KEY, model TEXT NOT NULL, vendor TEXT,
+    band_min REAL NOT NULL, band_max REAL NOT NULL,
+    gain REAL NOT NULL, cost REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_radios_band ON radios (band_min, band_max);
+CREATE INDEX IF NOT EXISTS idx_radios_cost ON radios (cost);
+CREATE INDEX IF NOT EXISTS idx_antennas_band ON antennas (band_min, band_max);
+CREATE INDEX IF NOT EXISTS idx_antennas_gain ON antennas (gain);
+"""
+
+
+def frontier(score, cost):
+    """
+    Elementos no dominados: ninguno con score >= y costo <= (y alguno mejor).
+
+    Args:
+        score: Figura de mérito (ganancia, o p_tx - sens), mayor es mejor.
+        cost: Costo de cada elemento.
+
+    Returns:
+        ndarray: Índices de la frontera con score y costo estrictamente
+        crecientes.
+    """
+    score = np.asarray(score, dtype=np.float64)
+    cost = np.asarray(cost, dtype=np.float64)
+    # De mayor a menor score (a igual score, el más barato primero)
+    order = np.lexsort((cost, -score))
+    ordered = cost[order]
+    cheapest_above = np.concatenate(([np.inf], np.minimum.accumulate(ordered)[:-1]))
+    return order[ordered < cheapest_above][::-1]
+
+
+def cheapest_pair_cost(required, gains, costs):
+    """
+    Costo mínimo de dos antenas con ganancia conjunta > required.
+
+    Args:
+        required: Ganancias conjuntas pedidas (dBi), array 1-D.
+        gains, costs: Frontera de antenas (ver frontier), ambos crecientes.
+
+    Returns:
+        tuple: (cost, a, b) arrays con el costo del par (inf si no hay) y
+        las posiciones en la frontera de las antenas A y B.
+    """
+    required = np.asarray(required, dtype=np.float64)
+    # B más barata con g_b > required - g_a: la primera de la frontera que lo cumple
+    b = np.searchsorted(gains, required[:, None] - gains[None, :], side='right')
+    padded = np.append(costs, np.inf)
+    total = costs[None, :] + padded[b]
+    a = np.argmin(total, axis=1)
+    rows = np.arange(len(required))
+    return total[rows, a], a, np.minimum(b[rows, a], len(gains) - 1)
+
+
+def select_equipment(freq, dist, radios, antennas, cable_loss=0.0,
+                     margin=LinkBudgetCalculator.MARGIN_THRESHOLD):
+    """
+    Radio y par de antenas más baratos que hacen viable el enlace.
+
+    Args:
+        freq: Frecuencia (GHz).
+        dist: Distancia (Km).
+        radios: dict con arrays 'p_tx', 'sens' y 'cost' (ya filtrados por banda).
+        antennas: dict con arrays 'gain' y 'cost' (ya filtrados por banda).
+        cable_loss: Pérdidas Cables (dB).
+        margin: Margen que debe superarse estrictamente (dB).
+
+    Returns:
+        dict: Índices 'radio', 'antenna_a', 'antenna_b' en los arrays de
+        entrada, 'cost' total y 'margin' resultante; None si ninguna
+        combinación es viable.
+    """
+    if freq <= 0 or dist <= 0:
+        raise ValueError("La Frecuencia y la Distancia deben ser mayores a 0.")
+    fspl = 20 * np.log10(dist) + 20 * np.log10(freq) + solver.FSPL_CONSTANT
+    budget = np.asarray(radios['p_tx'], dtype=np.float64) - np.asarray(radios['sens'], dtype=np.float64)
+    if budget.size == 0 or len(antennas['gain']) == 0:
+        return None
+
+    ant = frontier(antennas['gain'], antennas['cost'])
+    gains = np.asarray(antennas['gain'], dtype=np.float64)[ant]
+    ant_costs = np.asarray(antennas['cost'], dtype=np.float64)[ant]
+    # Frontera de radios en orden de costo creciente (y presupuesto creciente)
+    rad = frontier(budget, radios['cost'])
+    rad_costs = RADIOS_PER_LINK * np.asarray(radios['cost'], dtype=np.float64)[rad]
+    required = margin + fspl + cable_loss - budget[rad]
+
+    best = None
+    best_cost = np.inf
+    block = max(1, _BLOCK_ELEMENTS // len(ant))
+    for start in range(0, len(rad), block):
+        # Las radios que siguen son más caras: ninguna puede mejorar el resultado
+        if rad_costs[start] >= best_cost:
+            break
+        stop = start + block
+        pair_cost, a, b = cheapest_pair_cost(required[start:stop], gains, ant_costs)
+        total = rad_costs[start:stop] + pair_cost
+        k = int(np.argmin(total))
+        if total[k] < best_cost:
+            best_cost = float(total[k])
+            best = (start + k, a[k], b[k])
+
+    if best is None:
+        return None
+    r, a, b = best
+    return {
+        'radio': int(rad[r]),
+        'antenna_a': int(ant[a]),
+        'antenna_b': int(ant[b]),
+        'cost': best_cost,
+        'margin': float(budget[rad[r]] + gains[a] + gains[b] - fspl - cable_loss),
+    }
+
+
+def load_csv(path, fields):
+    """
+    Lee un CSV de radios o antenas.
+
+    Args:
+        path: Ruta del CSV con cabecera; columnas fields (vendor es opcional).
+        fields: RADIO_FIELDS o ANTENNA_FIELDS.
+
+    Returns:
+        list: Un dict por fila con los campos numéricos como float.
+    """
+    with open(path, newline='', encoding='utf-8') as fh:
+        rows = list(csv.DictReader(fh))
+    if rows:
+        missing = [name for name in fields if name != 'vendor' and name not in rows[0]]
+        if missing:
+            raise ValueError(f"Faltan columnas obligatorias en el CSV: {', '.join(missing)}")
+    out = []
+    for n, row in enumerate(rows, start=2):
+        item = {'model': row['model'], 'vendor': row.get('vendor') or None}
+        for name in fields[2:]:
+            try:
+                item[name] = float(row[name])
+            except (TypeError, ValueError):
+                raise ValueError(f"Línea {n}: valor no numérico en '{name}'.")
+        out.append(item)
+    return out
+
+
+class EquipmentCatalog:
+    """
+    Acceso a las tablas de radios y antenas.
+
+    Como LinkStore, protege la conexión con un lock para poder usarse
+    desde hilos de trabajo.
+    """
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+
+    def _insert(self, table, fields, rows):
+        sql = f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' for _ in fields)})"
+        values = [tuple(row.get(name) for name in fields) for row in rows]
+        with self._lock, self.db:
+            self.db.executemany(sql, values)
+        return len(values)
+
+    def add_radios(self, rows):
+        """Inserta radios (dicts con RADIO_FIELDS) en una transacción; devuelve cuántas."""
+        return self._insert('radios', RADIO_FIELDS, rows)
+
+    def add_antennas(self, rows):
+        """Inserta antenas (dicts con ANTENNA_FIELDS) en una transacción; devuelve cuántas."""
+        return self._insert('antennas', ANTENNA_FIELDS, rows)
+
+    def count(self):
+        """Número de (radios, antenas) del catálogo."""
+        with self._lock:
+            return tuple(self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                         for table in ('radios', 'antennas'))
+
+    def radios(self, freq=None, min_p_tx=None, max_sens=None, limit=None):
+        """
+        Radios que cubren freq (GHz), ordenadas por costo.
+
+        Returns:
+            list: Una fila (dict, con 'id') por radio.
+        """
+        where, params = [], []
+        if freq is not None:
+            where.append("band_min <= ? AND band_max >= ?")
+            params += [freq, freq]
+        if min_p_tx is not None:
+            where.append("p_tx >= ?")
+            params.append(min_p_tx)
+        if max_sens is not None:
+            where.append("sens <= ?")
+            params.append(max_sens)
+        return self._query('radios', where, params, "cost", limit)
+
+    def antennas(self, freq=None, min_gain=None, max_gain=None, limit=None):
+        """
+        Antenas que cubren freq (GHz) dentro del rango de ganancia, por ganancia.
+
+        Returns:
+            list: Una fila (dict, con 'id') por antena.
+        """
+        where, params = [], []
+        if freq is not None:
+            where.append("band_min <= ? AND band_max >= ?")
+            params += [freq, freq]
+        if min_gain is not None:
+            where.append("gain >= ?")
+            params.append(min_gain)
+        if max_gain is not None:
+            where.append("gain <= ?")
+            params.append(max_gain)
+        return self._query('antennas', where, params, "gain", limit)
+
+    def _query(self, table, where, params, order, limit):
+        sql = f"SELECT * FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + [int(limit)]
+        with self._lock:
+            return [dict(row) for row in self.db.execute(sql, params)]
+
+    def _columns(self, table, fields, freq):
+        """Columnas numéricas de la banda como arrays (sin crear un dict por fila)."""
+        sql = f"SELECT id, {', '.join(fields)} FROM {table} WHERE band_min <= ? AND band_max >= ?"
+        with self._lock:
+            rows = self.db.execute(sql, (freq, freq)).fetchall()
+        data = np.array([tuple(row) for row in rows], dtype=np.float64).reshape(len(rows), len(fields) + 1)
+        columns = {name: data[:, k + 1] for k, name in enumerate(fields)}
+        columns['id'] = data[:, 0].astype(np.int64)
+        return columns
+
+    @instrument.probe("catalog.select")
+    def select(self, freq, dist, cable_loss=0.0, margin=LinkBudgetCalculator.MARGIN_THRESHOLD):
+        """
+        Combinación más barata del catálogo para un enlace.
+
+        Args:
+            freq: Frecuencia (GHz).
+            dist: Distancia (Km).
+            cable_loss: Pérdidas Cables (dB).
+            margin: Margen que debe superarse (dB).
+
+        Returns:
+            dict: 'radio', 'antenna_a' y 'antenna_b' (filas del catálogo),
+            'cost' total del equipo y 'margin' (dB); None si no hay
+            combinación viable.
+        """
+        radios = self._columns('radios', ('p_tx', 'sens', 'cost'), freq)
+        antennas = self._columns('antennas', ('gain', 'cost'), freq)
+        best = select_equipment(freq, dist, radios, antennas, cable_loss, margin)
+        if best is None:
+            return None
+        with self._lock:
+            radio = dict(self.db.execute("SELECT * FROM radios WHERE id = ?",
+                                         (int(radios['id'][best['radio']]),)).fetchone())
+            ant_a, ant_b = (
+                dict(self.db.execute("SELECT * FROM antennas WHERE id = ?",
+                                     (int(antennas['id'][best[key]]),)).fetchone())
+                for key in ('antenna_a', 'antenna_b')
+            )
+        return {'radio': radio, 'antenna_a': ant_a, 'antenna_b': ant_b,
+                'cost': best['cost'], 'margin': best['margin']}
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+
+def main(args):
+    """Punto de entrada de 'python -m uptalink catalog'."""
+    import sys
+
+    catalog = EquipmentCatalog(args.db)
+    try:
+        if args.radios:
+            print(f"{catalog.add_radios(load_csv(args.radios, RADIO_FIELDS))} radios importadas.", file=sys.stderr)
+        if args.antennas:
+            print(f"{catalog.add_antennas(load_csv(args.antennas, ANTENNA_FIELDS))} antenas importadas.",
+                  file=sys.stderr)
+        if args.freq is None or args.dist is None:
+            radios, antennas = catalog.count()
+            print(f"Catálogo: {radios} radios, {antennas} antenas.", file=sys.stderr)
+            return 0
+        best = catalog.select(args.freq, args.dist, args.cable_loss, args.margin)
+        if best is None:
+            print("Ninguna combinación del catálogo es viable.", file=sys.stderr)
+            return 1
+        radio, ant_a, ant_b = best['radio'], best['antenna_a'], best['antenna_b']
+        print(f"Radio: {radio['model']} x{RADIOS_PER_LINK} ({radio['p_tx']:.1f} dBm, {radio['sens']:.1f} dBm)")
+        print(f"Antena A: {ant_a['model']} ({ant_a['gain']:.1f} dBi)")
+        print(f"Antena B: {ant_b['model']} ({ant_b['gain']:.1f} dBi)")
+        print(f"Costo: ${best['cost']:,.2f}  Margen: {best['margin']:.2f} dB")
+        return 0
+    finally:
+        catalog.close()
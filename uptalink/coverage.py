@@ -0,0 +1,333 @@
+"""
+Cobertura de un transmisor sobre una ventana DEM (mapa de RSSI y visibilidad).
+
+Trazar un perfil (extract_profile + analyze_profile) a cada celda cuesta
+O(n) por celda, O(n³) en total. Aquí se usa un barrido radial (tipo R2):
+
+    1. Se lanzan rayos desde el emplazamiento al centro de cada celda del
+       perímetro de la ventana, muestreados a paso de una celda.
+    2. A lo largo de cada rayo se acumula el máximo del ángulo de
+       elevación del terreno (con abultamiento terrestre, factor K). Una
+       muestra tiene línea de vista si su antena queda por encima de ese
+       máximo; el trabajo del rayo se comparte entre todas sus celdas.
+    3. El punto donde se alcanza el máximo es la arista dominante. Su
+       despeje respecto al radio de Fresnel da la visibilidad (despeje >=
+       CLEARANCE_THRESHOLD) y la pérdida por difracción en filo de cuchillo
+       (ITU-R P.526, J(v)), que se resta al presupuesto en espacio libre.
+    4. Cada celda toma el valor de la muestra más cercana del rayo con el
+       acimut más próximo.
+
+Los rayos se agrupan en sectores de acimut contiguos, que son las
+teselas que se reparten a un pool de procesos (el DEM viaja una vez por
+proceso, como en network). Cada celda pertenece a un solo rayo, así que
+los sectores escriben en celdas disjuntas del raster de salida.
+
+El despeje se evalúa en la arista dominante y no en todo el trayecto:
+es una aproximación (la de los métodos de arista única) que coincide
+con analyze_profile cuando un único obstáculo limita el enlace.
+"""
+
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from uptalink import dem, instrument, solver, terrain
+
+# Altura de la antena receptora sobre el terreno (m) por defecto
+DEFAULT_RX_HEIGHT = 10.0
+
+# Rayos por sector (tesela del pool)
+DEFAULT_SECTOR_RAYS = 256
+
+# Códigos de la capa de visibilidad
+OBSTRUCTED = 0
+LOS = 1
+CLEAR = 2
+
+# Ventana DEM en cada proceso del pool (ver _init_worker)
+_worker_grid = None
+
+
+def coverage_window(lat, lon, radius_km, resolution_m):
+    """
+    Ventana cuadrada centrada en el emplazamiento.
+
+    Args:
+        lat, lon: Emplazamiento (grados).
+        radius_km: Semilado de la ventana (Km).
+        resolution_m: Tamaño de celda aproximado (m).
+
+    Returns:
+        tuple: (bounds, shape) con bounds = (min_lat, max_lat, min_lon,
+        max_lon) y shape = (filas, columnas), impares para que el
+        emplazamiento caiga en el centro de una celda.
+    """
+    half_cells = max(1, int(round(radius_km * 1000 / resolution_m)))
+    dlat = math.degrees(resolution_m / terrain.EARTH_RADIUS)
+    dlon = dlat / math.cos(math.radians(lat))
+    bounds = (lat - half_cells * dlat, lat + half_cells * dlat,
+              lon - half_cells * dlon, lon + half_cells * dlon)
+    return bounds, (2 * half_cells + 1, 2 * half_cells + 1)
+
+
+def diffraction_loss(v):
+    """Pérdida (dB) de un filo de cuchillo, ITU-R P.526: J(v), 0 si v <= -0.78."""
+    v = np.asarray(v)
+    w = v - 0.1
+    with np.errstate(invalid='ignore', over='ignore'):
+        loss = 6.9 + 20 * np.log10(np.sqrt(w * w + 1) + w)
+    return np.where(v > -0.78, loss, 0.0)
+
+
+def _ray_geometry(shape, site, cell_size):
+    """
+    Rayos al perímetro y asignación de cada celda a un rayo.
+
+    Returns:
+        tuple: (ángulos, muestras por rayo, rayo por celda, muestra por
+        celda), con los rayos ordenados por ángulo.
+    """
+    rows, cols = shape
+    site_row, site_col = site
+    dy, dx = cell_size
+    step = min(dx, dy)
+
+    # Celdas del perímetro (sin repetir esquinas)
+    perimeter_rows = np.concatenate([
+        np.zeros(cols, np.intp), np.full(cols, rows - 1, np.intp),
+        np.arange(1, rows - 1), np.arange(1, rows - 1),
+    ])
+    perimeter_cols = np.concatenate([
+        np.arange(cols), np.arange(cols),
+        np.zeros(rows - 2, np.intp), np.full(rows - 2, cols - 1, np.intp),
+    ])
+    y = (perimeter_rows - site_row) * dy
+    x = (perimeter_cols - site_col) * dx
+    angles = np.arctan2(y, x)
+    order = np.argsort(angles)
+    angles = angles[order]
+    samples = np.rint(np.hypot(x, y)[order] / step).astype(np.intp) + 1
+
+    # Rayo de acimut más próximo (circular) y muestra más cercana por celda
+    cy = ((np.arange(rows, dtype=np.float32) - site_row) * np.float32(dy))[:, None]
+    cx = ((np.arange(cols, dtype=np.float32) - site_col) * np.float32(dx))[None, :]
+    cell_angles = np.arctan2(cy, cx).ravel()
+    upper = np.searchsorted(angles, cell_angles) % len(angles)
+    lower = (upper - 1) % len(angles)
+    gap_upper = np.abs((angles[upper] - cell_angles + np.pi) % (2 * np.pi) - np.pi)
+    gap_lower = np.abs((cell_angles - angles[lower] + np.pi) % (2 * np.pi) - np.pi)
+    ray = np.where(gap_upper < gap_lower, upper, lower)
+    sample = np.rint(np.sqrt(cy * cy + cx * cx).ravel() / step).astype(np.intp)
+    np.minimum(sample, samples[ray] - 1, out=sample)
+    return angles, samples, ray, sample
+
+
+def _init_worker(grid):
+    global _worker_grid
+    _worker_grid = grid
+
+
+def _sweep_sector(angles, samples, params, grid=None):
+    """
+    Recorre un sector de rayos (se ejecuta en los procesos del pool).
+
+    Args:
+        angles, samples: Ángulo y número de muestras de cada rayo.
+        params: dict con 'freq', 'eirp', alturas y 'k_factor' (ver compute_coverage).
+        grid: dict con 'elevations', 'site' y 'cell_size'; None usa el del
+            proceso.
+
+    Returns:
+        tuple: (rssi float32, visibilidad uint8), forma (rayos, muestras).
+    """
+    grid = grid if grid is not None else _worker_grid
+    elevations = grid['elevations']
+    rows, cols = elevations.shape
+    site_row, site_col = grid['site']
+    dy, dx = grid['cell_size']
+    step = min(dx, dy)
+    n_samples = int(samples.max())
+
+    # Muestras de todos los rayos del sector a la vez: (rayos, muestras)
+    dist = (np.arange(n_samples, dtype=np.float32) * np.float32(step))[None, :]
+    row = np.clip(site_row + dist * (np.sin(angles).astype(np.float32) / np.float32(dy))[:, None], 0, rows - 1)
+    col = np.clip(site_col + dist * (np.cos(angles).astype(np.float32) / np.float32(dx))[:, None], 0, cols - 1)
+    r0 = np.minimum(row.astype(np.intp), rows - 2)
+    c0 = np.minimum(col.astype(np.intp), cols - 2)
+    ty = row - r0
+    tx = col - c0
+    e = elevations
+    height = (1 - ty) * ((1 - tx) * e[r0, c0] + tx * e[r0, c0 + 1]) + ty * ((1 - tx) * e[r0 + 1, c0] + tx * e[r0 + 1, c0 + 1])
+
+    # Abultamiento respecto al plano tangente en el transmisor
+    height -= dist * dist / np.float32(2 * terrain.EARTH_RADIUS * params['k_factor'])
+    tx_top = np.float32(e[site_row, site_col] + params['tx_height'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_dist = np.float32(1) / dist
+        slope = (height - tx_top) * inv_dist
+        slope[:, 0] = -np.inf
+        target = (height + np.float32(params['rx_height']) - tx_top) * inv_dist
+
+    # Máximo acumulado del ángulo (sin incluir la propia muestra) y dónde se alcanza
+    horizon = np.maximum.accumulate(slope, axis=1)
+    index = np.arange(n_samples, dtype=np.int32)[None, :]
+    edge = np.maximum.accumulate(np.where(slope == horizon, index, 0), axis=1)
+    horizon[:, 1:] = horizon[:, :-1]
+    horizon[:, 0] = -np.inf
+    edge[:, 1:] = edge[:, :-1]
+
+    # Altura de la arista sobre la línea de vista y despeje en radios de Fresnel
+    d1 = edge.astype(np.float32) * np.float32(step)
+    d2 = dist - d1
+    wavelength = np.float32(0.299792458 / params['freq'])
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        excess = d1 * (horizon - target)
+        radius = np.sqrt(wavelength * d1 * d2 * inv_dist)
+        clearance = np.where(edge > 0, -excess / radius, np.inf)
+        v = np.where(edge > 0, -np.float32(math.sqrt(2)) * clearance, -np.inf)
+        fspl = 20 * np.log10(dist / np.float32(1000)) + np.float32(20 * math.log10(params['freq']) + solver.FSPL_CONSTANT)
+    rssi = np.float32(params['eirp']) - fspl - diffraction_loss(v).astype(np.float32)
+    rssi[:, 0] = np.nan
+
+    visibility = np.full(rssi.shape, OBSTRUCTED, dtype=np.uint8)
+    visibility[(edge == 0) | (excess <= 0)] = LOS
+    visibility[clearance >= terrain.CLEARANCE_THRESHOLD / 100] = CLEAR
+    visibility[:, 0] = CLEAR
+    return rssi, visibility
+
+
+@instrument.probe("coverage.compute")
+def compute_coverage(elevations, bounds, lat, lon, freq, p_tx, g_tx, g_rx=0.0, cable_loss=0.0,
+                     tx_height=30.0, rx_height=DEFAULT_RX_HEIGHT, k_factor=terrain.DEFAULT_K_FACTOR,
+                     sector_rays=DEFAULT_SECTOR_RAYS, workers=None):
+    """
+    RSSI previsto y visibilidad en cada celda de una ventana DEM.
+
+    Args:
+        elevations: Array (filas, columnas), filas por latitud creciente.
+        bounds: (min_lat, max_lat, min_lon, max_lon) de los centros de celda.
+        lat, lon: Emplazamiento del transmisor (dentro de la ventana).
+        freq: Frecuencia (GHz).
+        p_tx, g_tx, g_rx, cable_loss: Presupuesto como en calculate (dBm, dBi, dB).
+        tx_height, rx_height: Alturas de antena sobre el terreno (m).
+        k_factor: Factor K para el abultamiento terrestre.
+        sector_rays: Rayos por sector (tesela del pool).
+        workers: Procesos del pool (None = todos los núcleos; 1 = sin pool).
+
+    Returns:
+        dict: 'rssi' (float32 dBm, NaN en el emplazamiento), 'visibility'
+        (uint8: OBSTRUCTED, LOS o CLEAR), 'bounds' y 'site' (fila, columna).
+    """
+    if freq <= 0:
+        raise ValueError("La Frecuencia debe ser mayor a 0.")
+    elevations = np.ascontiguousarray(elevations, dtype=np.float32)
+    rows, cols = elevations.shape
+    if rows < 3 or cols < 3:
+        raise ValueError("La ventana debe tener al menos 3x3 celdas.")
+    min_lat, max_lat, min_lon, max_lon = bounds
+    if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+        raise ValueError("El emplazamiento está fuera de la ventana.")
+
+    site = (int(round((lat - min_lat) / (max_lat - min_lat) * (rows - 1))),
+            int(round((lon - min_lon) / (max_lon - min_lon) * (cols - 1))))
+    dlat = math.radians((max_lat - min_lat) / (rows - 1)) * terrain.EARTH_RADIUS
+    dlon = math.radians((max_lon - min_lon) / (cols - 1)) * terrain.EARTH_RADIUS * math.cos(math.radians(lat))
+    grid = {'elevations': elevations, 'site': site, 'cell_size': (dlat, dlon)}
+    params = {
+        'freq': freq, 'eirp': p_tx + g_tx + g_rx - cable_loss, 'tx_height': tx_height,
+        'rx_height': rx_height, 'k_factor': k_factor,
+    }
+
+    angles, samples, ray, sample = _ray_geometry((rows, cols), site, (dlat, dlon))
+    # Celdas agrupadas por rayo: cada sector escribe un tramo contiguo
+    cell_order = np.argsort(ray, kind='stable')
+    ray_starts = np.searchsorted(ray[cell_order], np.arange(len(angles) + 1))
+
+    rssi = np.full(rows * cols, np.nan, dtype=np.float32)
+    visibility = np.zeros(rows * cols, dtype=np.uint8)
+
+    def collect(k0, k1, result):
+        cells = cell_order[ray_starts[k0]:ray_starts[k1]]
+        local = (ray[cells] - k0, sample[cells])
+        rssi[cells] = result[0][local]
+        visibility[cells] = result[1][local]
+
+    sectors = [(k0, min(k0 + sector_rays, len(angles))) for k0 in range(0, len(angles), sector_rays)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for k0, k1 in sectors:
+            collect(k0, k1, _sweep_sector(angles[k0:k1], samples[k0:k1], params, grid))
+    else:
+        max_pending = workers * 2
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(grid,)) as pool:
+            for k0, k1 in sectors:
+                pending.append((k0, k1, pool.submit(_sweep_sector, angles[k0:k1], samples[k0:k1], params)))
+                if len(pending) >= max_pending:
+                    k0_done, k1_done, future = pending.popleft()
+                    collect(k0_done, k1_done, future.result())
+            while pending:
+                k0_done, k1_done, future = pending.popleft()
+                collect(k0_done, k1_done, future.result())
+
+    return {
+        'rssi': rssi.reshape(rows, cols),
+        'visibility': visibility.reshape(rows, cols),
+        'bounds': tuple(bounds),
+        'site': site,
+    }
+
+
+def coverage_from_source(source, lat, lon, radius_km, resolution_m, **kwargs):
+    """
+    compute_coverage sobre una ventana muestreada de una fuente de elevación.
+
+    Args:
+        source: Objeto con lookup(lats, lons) (dem.DemTileStore, ...).
+        lat, lon: Emplazamiento.
+        radius_km, resolution_m: Ver coverage_window.
+        **kwargs: Resto de argumentos de compute_coverage.
+
+    Returns:
+        dict: Igual que compute_coverage.
+    """
+    bounds, shape = coverage_window(lat, lon, radius_km, resolution_m)
+    elevations = terrain.sample_grid(source, bounds, shape)
+    return compute_coverage(elevations, bounds, lat, lon, **kwargs)
+
+
+def save_coverage(result, path, visibility_path=None):
+    """
+    Guarda la cobertura como GeoTIFF (ver dem.write_geotiff).
+
+    Args:
+        result: dict de compute_coverage.
+        path: GeoTIFF float32 del RSSI (dBm; NaN sin dato).
+        visibility_path: GeoTIFF uint8 opcional con la capa de visibilidad.
+    """
+    dem.write_geotiff(path, result['rssi'], result['bounds'], nodata='nan')
+    if visibility_path:
+        dem.write_geotiff(visibility_path, result['visibility'], result['bounds'])
+
+
+def main(args):
+    """Punto de entrada de 'python -m uptalink coverage'."""
+    import sys
+    import time
+
+    start = time.perf_counter()
+    result = coverage_from_source(
+        dem.DemTileStore(args.dem), args.lat, args.lon, args.radius, args.resolution,
+        freq=args.freq, p_tx=args.p_tx, g_tx=args.gain, g_rx=args.rx_gain, cable_loss=args.cable_loss,
+        tx_height=args.height, rx_height=args.rx_height, workers=args.workers,
+    )
+    save_coverage(result, args.output, args.visibility)
+    rows, cols = result['rssi'].shape
+    covered = result['rssi'] >= args.sens
+    elapsed = time.perf_counter() - start
+    print(f"{rows}x{cols} celdas, {100 * covered.mean():.1f} % con RSSI >= {args.sens} dBm, "
+          f"{100 * (result['visibility'] == CLEAR).mean():.1f} % con despeje ({elapsed:.1f} s).", file=sys.stderr)
+    return 0
@@ -0,0 +1,307 @@
+"""
+Almacén local de teselas DEM con acceso por numpy.memmap.
+
+Sustituye a fetchElevationsFromAPI (UPTALINK_WEB17.html) cuando hay
+teselas en disco: no usa red y solo se leen del fichero las páginas que
+tocan los puntos consultados. Las teselas abiertas se mantienen en una
+caché LRU acotada para que la memoria no crezca al recorrer cientos de
+teselas.
+
+Formatos soportados (teselas de 1°x1° nombradas por su esquina SW,
+p. ej. N10W067.hgt):
+    - SRTM .hgt: int16 big-endian, cuadradas (1201 o 3601 muestras).
+    - GeoTIFF .tif sin compresión, en tiras contiguas (int16/float32).
+
+write_geotiff guarda rásteres propios (p. ej. coberturas) en ese mismo
+formato GeoTIFF.
+"""
+
+import math
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from uptalink import instrument
+
+SRTM_VOID = -32768
+
+
+def tile_name(lat, lon):
+    """Nombre SRTM de la tesela que contiene (lat, lon), p. ej. 'N10W067'."""
+    lat0 = math.floor(lat)
+    lon0 = math.floor(lon)
+    return f"{'N' if lat0 >= 0 else 'S'}{abs(lat0):02d}{'E' if lon0 >= 0 else 'W'}{abs(lon0):03d}"
+
+
+class _Tile:
+    """Tesela abierta: raster mapeado en memoria y su georreferencia."""
+
+    __slots__ = ('data', 'lat_top', 'lon_left', 'dlat', 'dlon', 'nodata')
+
+    def __init__(self, data, lat_top, lon_left, dlat, dlon, nodata):
+        self.data = data
+        self.lat_top = lat_top
+        self.lon_left = lon_left
+        self.dlat = dlat
+        self.dlon = dlon
+        self.nodata = nodata
+
+    def sample(self, lats, lons):
+        """Interpolación bilineal (misma fórmula que getElevFromGrid)."""
+        rows, cols = self.data.shape
+        y = np.clip((self.lat_top - lats) / self.dlat, 0, rows - 1)
+        x = np.clip((lons - self.lon_left) / self.dlon, 0, cols - 1)
+        x0 = np.floor(x).astype(np.intp)
+        y0 = np.floor(y).astype(np.intp)
+        x1 = np.minimum(x0 + 1, cols - 1)
+        y1 = np.minimum(y0 + 1, rows - 1)
+        tx = x - x0
+        ty = y - y0
+
+        # Indexado por puntos: el memmap solo carga las páginas necesarias
+        e00 = self.data[y0, x0].astype(np.float64)
+        e10 = self.data[y0, x1].astype(np.float64)
+        e01 = self.data[y1, x0].astype(np.float64)
+        e11 = self.data[y1, x1].astype(np.float64)
+        if self.nodata is not None:
+            for e in (e00, e10, e01, e11):
+                e[e == self.nodata] = 0.0
+        return (1 - ty) * ((1 - tx) * e00 + tx * e10) + ty * ((1 - tx) * e01 + tx * e11)
+
+
+def _open_hgt(path, lat0, lon0):
+    n = int(round(math.sqrt(os.path.getsize(path) // 2)))
+    if n * n * 2 != os.path.getsize(path):
+        raise ValueError(f"Tamaño de tesela .hgt inválido: {path}")
+    data = np.memmap(path, dtype='>i2', mode='r', shape=(n, n))
+    step = 1.0 / (n - 1)
+    return _Tile(data, lat0 + 1, lon0, step, step, SRTM_VOID)
+
+
+# Tipos TIFF: código -> (formato struct, tamaño)
+_TIFF_TYPES = {1: ('B', 1), 2: ('c', 1), 3: ('H', 2), 4: ('I', 4), 11: ('f', 4), 12: ('d', 8), 16: ('Q', 8)}
+
+
+def _read_tiff_tags(fh):
+    order = fh.read(2)
+    if order not in (b'II', b'MM'):
+        raise ValueError("No es un fichero TIFF")
+    end = '<' if order == b'II' else '>'
+    magic, ifd_offset = struct.unpack(end + 'HI', fh.read(6))
+    if magic != 42:
+        raise ValueError("Solo se admite TIFF clásico (no BigTIFF)")
+    fh.seek(ifd_offset)
+    (count,) = struct.unpack(end + 'H', fh.read(2))
+    tags = {}
+    for _ in range(count):
+        tag, typ, n, raw = struct.unpack(end + 'HHI4s', fh.read(12))
+        if typ not in _TIFF_TYPES:
+            continue
+        fmt, size = _TIFF_TYPES[typ]
+        if n * size <= 4:
+            payload = raw[:n * size]
+        else:
+            pos = fh.tell()
+            fh.seek(struct.unpack(end + 'I', raw)[0])
+            payload = fh.read(n * size)
+            fh.seek(pos)
+        tags[tag] = struct.unpack(end + fmt * n, payload)
+    return end, tags
+
+
+def _open_geotiff(path):
+    with open(path, 'rb') as fh:
+        end, tags = _read_tiff_tags(fh)
+
+    width, height = tags[256][0], tags[257][0]
+    bits = tags.get(258, (16,))[0]
+    sample_format = tags.get(339, (1,))[0]
+    if tags.get(259, (1,))[0] != 1 or 273 not in tags:
+        raise ValueError(f"GeoTIFF comprimido o en teselas internas no soportado: {path}")
+
+    offsets = tags[273]
+    byte_counts = tags[279]
+    for i in range(1, len(offsets)):
+        if offsets[i] != offsets[i - 1] + byte_counts[i - 1]:
+            raise ValueError(f"GeoTIFF con tiras no contiguas no soportado: {path}")
+
+    kind = {1: 'u', 2: 'i', 3: 'f'}[sample_format]
+    dtype = np.dtype(f"{end}{kind}{bits // 8}")
+    data = np.memmap(path, dtype=dtype, mode='r', offset=offsets[0], shape=(height, width))
+
+    # ModelTiepoint (33922) y ModelPixelScale (33550): centro de píxel (0, 0)
+    _, _, _, lon_left, lat_top, _ = tags[33922][:6]
+    dlon, dlat = tags[33550][:2]
+    nodata = SRTM_VOID if kind == 'i' else None
+    return _Tile(data, lat_top, lon_left, dlat, dlon, nodata)
+
+
+def write_geotiff(path, data, bounds, nodata=None):
+    """
+    Guarda un raster en WGS84 como GeoTIFF sin compresión (una tira).
+
+    Es el formato que lee _open_geotiff (puntos en el centro de píxel), y
+    también lo abren GDAL/QGIS.
+
+    Args:
+        path: Fichero de salida.
+        data: Array 2-D (filas por latitud creciente, como
+            terrain.GridElevationSource); uint8, int16 o float32.
+        bounds: (min_lat, max_lat, min_lon, max_lon) de los centros de
+            píxel extremos.
+        nodata: Valor sin dato que se anota en la etiqueta GDAL_NODATA.
+    """
+    data = np.asarray(data)
+    if data.dtype.kind == 'f':
+        data = data.astype('<f4', copy=False)
+    rows, cols = data.shape
+    if rows < 2 or cols < 2:
+        raise ValueError("El raster debe tener al menos 2x2 píxeles.")
+    kind = {'u': 1, 'i': 2, 'f': 3}[data.dtype.kind]
+    min_lat, max_lat, min_lon, max_lon = bounds
+    dlat = (max_lat - min_lat) / (rows - 1)
+    dlon = (max_lon - min_lon) / (cols - 1)
+    # Primera fila del TIFF = norte
+    pixels = np.ascontiguousarray(data[::-1]).astype(data.dtype.newbyteorder('<'), copy=False).tobytes()
+
+    # GeoKeyDirectory: modelo geográfico, PixelIsPoint, WGS84 (EPSG:4326)
+    geokeys = (1, 1, 0, 3, 1024, 0, 1, 2, 1025, 0, 1, 2, 2048, 0, 1, 4326)
+    tags = [
+        (256, 4, (cols,)),
+        (257, 4, (rows,)),
+        (258, 3, (data.dtype.itemsize * 8,)),
+        (259, 3, (1,)),
+        (262, 3, (1,)),
+        (273, 4, (0,)),  # se rellena al conocer el desplazamiento de los píxeles
+        (277, 3, (1,)),
+        (278, 4, (rows,)),
+        (279, 4, (len(pixels),)),
+        (339, 3, (kind,)),
+        (33550, 12, (dlon, dlat, 0.0)),
+        (33922, 12, (0.0, 0.0, 0.0, min_lon, max_lat, 0.0)),
+        (34735, 3, geokeys),
+    ]
+    if nodata is not None:
+        tags.append((42113, 2, tuple(bytes([c]) for c in f"{nodata}\0".encode('ascii'))))
+
+    # Cabecera (8) + IFD; los valores que no caben en 4 bytes van detrás
+    ifd_size = 2 + 12 * len(tags) + 4
+    extra_offset = 8 + ifd_size
+    entries = []
+    extra = b''
+    for tag, typ, values in tags:
+        fmt, size = _TIFF_TYPES[typ]
+        payload = struct.pack('<' + fmt * len(values), *values)
+        if len(payload) <= 4:
+            entries.append((tag, typ, len(values), payload.ljust(4, b'\0')))
+        else:
+            entries.append((tag, typ, len(values), struct.pack('<I', extra_offset + len(extra))))
+            extra += payload + b'\0' * (len(payload) % 2)
+    pixel_offset = extra_offset + len(extra)
+    entries[5] = (273, 4, 1, struct.pack('<I', pixel_offset))
+
+    with open(path, 'wb') as fh:
+        fh.write(b'II' + struct.pack('<HI', 42, 8))
+        fh.write(struct.pack('<H', len(entries)))
+        for tag, typ, count, raw in entries:
+            fh.write(struct.pack('<HHI4s', tag, typ, count, raw))
+        fh.write(struct.pack('<I', 0))
+        fh.write(extra)
+        fh.write(pixels)
+
+
+class DemTileStore:
+    """
+    Fuente de elevación sobre un directorio de teselas DEM locales.
+
+    Implementa lookup(lats, lons) igual que terrain.GridElevationSource,
+    así que puede pasarse directamente a terrain.extract_profile.
+    """
+
+    EXTENSIONS = ('.hgt', '.tif', '.tiff')
+
+    def __init__(self, directory, max_open_tiles=16, fill_value=0.0):
+        """
+        Args:
+            directory: Carpeta con las teselas.
+            max_open_tiles: Capacidad de la caché LRU de teselas abiertas.
+            fill_value: Elevación devuelta donde no hay tesela (el JS usa 0).
+        """
+        self.directory = directory
+        self.max_open_tiles = max_open_tiles
+        self.fill_value = fill_value
+        self._tiles = OrderedDict()
+
+    def _find_tile_path(self, name):
+        for ext in self.EXTENSIONS:
+            path = os.path.join(self.directory, name + ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _get_tile(self, lat0, lon0):
+        key = (lat0, lon0)
+        tile = self._tiles.get(key)
+        if tile is not None or key in self._tiles:
+            self._tiles.move_to_end(key)
+            return tile
+
+        path = self._find_tile_path(tile_name(lat0, lon0))
+        if path is None:
+            tile = None
+        elif path.endswith('.hgt'):
+            tile = _open_hgt(path, lat0, lon0)
+        else:
+            tile = _open_geotiff(path)
+
+        # Las teselas inexistentes también se cachean para no repetir stat()
+        self._tiles[key] = tile
+        while len(self._tiles) > self.max_open_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    @instrument.probe("dem.lookup")
+    def lookup(self, lats, lons):
+        """
+        Elevaciones por interpolación bilineal para arrays de coordenadas.
+
+        Args:
+            lats, lons: Arrays de coordenadas (grados).
+
+        Returns:
+            ndarray: Elevaciones en metros (fill_value sin tesela).
+        """
+        lats, lons = np.broadcast_arrays(np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64))
+        out = np.full(lats.shape, self.fill_value, dtype=np.float64)
+
+        # Agrupar puntos por tesela y resolver cada grupo de una vez. La tesela
+        # se codifica en un int64 (np.unique con axis=0 ordena filas como
+        # bytes y es ~30 veces más lento) y un solo argsort estable deja los
+        # índices de cada grupo contiguos, como en network.candidate_pairs
+        flat_lats = lats.ravel()
+        flat_lons = lons.ravel()
+        flat_out = out.reshape(-1)
+        if not flat_out.size:
+            return out
+        lat_i = np.floor(flat_lats).astype(np.int64)
+        lon_i = np.floor(flat_lons).astype(np.int64)
+        lon_min = int(lon_i.min())
+        width = int(lon_i.max()) - lon_min + 1
+        code = lat_i * width + (lon_i - lon_min)
+        order = np.argsort(code, kind='stable')
+        code = code[order]
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(code)) + 1, [len(code)])).tolist()
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            lat0, lon0 = divmod(int(code[start]), width)
+            tile = self._get_tile(lat0, lon0 + lon_min)
+            if tile is None:
+                continue
+            idx = order[start:end]
+            flat_out[idx] = tile.sample(flat_lats[idx], flat_lons[idx])
+        return out
+
+    def clear(self):
+        """Cierra todas las teselas abiertas."""
+        self._tiles.clear()
@@ -0,0 +1,252 @@
+"""
+Cliente asíncrono de elevación remota con caché SQLite persistente.
+
+Versión Python de fetchElevationsFromAPI (UPTALINK_WEB17.html) para los
+sitios sin teselas DEM locales:
+    - Redondea los puntos a 5 decimales (como toFixed(5) del JS) y elimina
+      duplicados.
+    - Agrupa en lotes compartidos los puntos pedidos por varios enlaces a
+      la vez; un punto ya en vuelo no se vuelve a pedir.
+    - Limita las peticiones simultáneas y reintenta con espera exponencial.
+    - Guarda cada resultado en SQLite, de modo que un replanteo repetido
+      no vuelve a tocar la red.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import urllib.request
+
+import numpy as np
+
+from uptalink import instrument
+
+OPENTOPODATA_URL = "https://api.opentopodata.org/v1/srtm90m"
+PRECISION = 5
+_SCALE = 10 ** PRECISION
+
+
+def _http_get_json(url, timeout):
+    with urllib.request.urlopen(url, timeout=timeout) as res:
+        return json.loads(res.read().decode('utf-8'))
+
+
+class ElevationClient:
+    """
+    Cliente de una API tipo OpenTopoData (GET ?locations=lat,lon|...).
+
+    Uso:
+        client = ElevationClient(cache_path="elevaciones.sqlite")
+        elevs = await client.fetch(lats, lons)
+    """
+
+    def __init__(self, base_url=OPENTOPODATA_URL, cache_path=":memory:", batch_size=100,
+                 max_in_flight=4, max_retries=3, backoff=0.5, batch_delay=0.005, timeout=30):
+        """
+        Args:
+            base_url: Endpoint de la API de elevación.
+            cache_path: Fichero SQLite de la caché persistente.
+            batch_size: Puntos por petición (el JS usa 100).
+            max_in_flight: Peticiones HTTP simultáneas como máximo.
+            max_retries: Reintentos por lote antes de fallar.
+            backoff: Espera inicial entre reintentos (s), se duplica en cada uno.
+            batch_delay: Ventana (s) para reunir puntos de varios enlaces en un lote.
+            timeout: Timeout por petición HTTP (s).
+        """
+        self.base_url = base_url
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.batch_delay = batch_delay
+        self.timeout = timeout
+
+        # La escritura de la caché va a un hilo (asyncio.to_thread): la conexión
+        # se comparte entre hilos y el cerrojo serializa su uso
+        self.db = sqlite3.connect(cache_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS elevations ("
+            "lat_e5 INTEGER NOT NULL, lon_e5 INTEGER NOT NULL, elevation REAL NOT NULL, "
+            "PRIMARY KEY (lat_e5, lon_e5)) WITHOUT ROWID"
+        )
+        self.db.commit()
+
+        # Estadísticas de uso (peticiones remotas, puntos servidos desde caché)
+        self.stats = {'requests': 0, 'points_fetched': 0, 'cache_hits': 0, 'retries': 0}
+
+        self._loop = None
+        self._pending = {}
+        self._queue = []
+        self._flush_handle = None
+        self._semaphore = None
+        self._tasks = set()
+
+    # -------------------------------------------------------------------------
+    # Caché SQLite
+    # -------------------------------------------------------------------------
+
+    def _cache_get(self, keys):
+        # Consulta preparada por clave primaria: sqlite3 reutiliza la sentencia
+        found = {}
+        query = "SELECT elevation FROM elevations WHERE lat_e5 = ? AND lon_e5 = ?"
+        with self._db_lock:
+            for key in keys:
+                row = self.db.execute(query, key).fetchone()
+                if row is not None:
+                    found[key] = row[0]
+        return found
+
+    def _cache_put(self, items):
+        rows = [(lat, lon, elev) for (lat, lon), elev in items]
+        with self._db_lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO elevations (lat_e5, lon_e5, elevation) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    # -------------------------------------------------------------------------
+    # Agrupación de peticiones
+    # -------------------------------------------------------------------------
+
+    def _bind_loop(self):
+        # El estado asyncio se liga al bucle activo (permite varios asyncio.run)
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._pending = {}
+            self._queue = []
+            self._flush_handle = None
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._tasks = set()
+        return loop
+
+    def _schedule_flush(self, loop):
+        if len(self._queue) >= self.batch_size:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        queue, self._queue = self._queue, []
+        for i in range(0, len(queue), self.batch_size):
+            # El bucle solo guarda referencias débiles a las tareas: sin esta
+            # referencia un lote en vuelo podría recolectarse antes de acabar
+            task = self._loop.create_task(self._run_batch(queue[i:i + self.batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, keys):
+        try:
+            elevations = await self._request_with_retry(keys)
+        except Exception as e:
+            for key in keys:
+                future = self._pending.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        # executemany + commit fuera del bucle, como la petición HTTP
+        await asyncio.to_thread(self._cache_put, list(zip(keys, elevations)))
+        for key, elevation in zip(keys, elevations):
+            future = self._pending.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(elevation)
+
+    async def _request_with_retry(self, keys):
+        locations = "|".join(f"{lat / _SCALE:.{PRECISION}f},{lon / _SCALE:.{PRECISION}f}" for lat, lon in keys)
+        url = f"{self.base_url}?locations={locations}"
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    self.stats['requests'] += 1
+                    instrument.count("elevation.requests")
+                    with instrument.span("elevation.http"):
+                        data = await asyncio.to_thread(_http_get_json, url, self.timeout)
+                if data.get('status') != 'OK':
+                    raise RuntimeError(data.get('error') or 'API Error')
+                results = data['results']
+                if len(results) != len(keys):
+                    raise RuntimeError("Respuesta de la API incompleta")
+                self.stats['points_fetched'] += len(keys)
+                return [0.0 if r.get('elevation') is None else float(r['elevation']) for r in results]
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                self.stats['retries'] += 1
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    # -------------------------------------------------------------------------
+    # API pública
+    # -------------------------------------------------------------------------
+
+    async def fetch(self, lats, lons):
+        """
+        Elevaciones para arrays de coordenadas.
+
+        Args:
+            lats, lons: Arrays de coordenadas (grados).
+
+        Returns:
+            ndarray: Elevaciones en metros (null de la API -> 0, como el JS).
+        """
+        loop = self._bind_loop()
+        lat_e5 = np.rint(np.asarray(lats, dtype=np.float64) * _SCALE).astype(np.int64).ravel()
+        lon_e5 = np.rint(np.asarray(lons, dtype=np.float64) * _SCALE).astype(np.int64).ravel()
+        unique, inverse = np.unique(np.stack([lat_e5, lon_e5], axis=1), axis=0, return_inverse=True)
+        keys = [(int(a), int(b)) for a, b in unique]
+
+        values = {}
+        missing = [key for key in keys if key not in self._pending]
+        cached = self._cache_get(missing)
+        self.stats['cache_hits'] += len(cached)
+        instrument.count("elevation.cache_hits", len(cached))
+        values.update(cached)
+
+        waiting = {}
+        for key in keys:
+            if key in values:
+                continue
+            future = self._pending.get(key)
+            if future is None:
+                future = loop.create_future()
+                self._pending[key] = future
+                self._queue.append(key)
+            waiting[key] = future
+        if self._queue:
+            self._schedule_flush(loop)
+
+        if waiting:
+            results = await asyncio.gather(*waiting.values())
+            values.update(zip(waiting.keys(), results))
+
+        out = np.array([values[key] for key in keys], dtype=np.float64)
+        return out[inverse.ravel()].reshape(np.shape(lats))
+
+    def lookup(self, lats, lons):
+        """
+        Versión síncrona de fetch (interfaz de fuente de elevación de terrain).
+
+        Ejecuta su propio bucle, así que solo puede llamarse desde código
+        síncrono (p. ej. un hilo de trabajo); dentro de un bucle asyncio en
+        marcha use await fetch(...).
+
+        Raises:
+            RuntimeError: Si se llama con un bucle asyncio en marcha.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch(lats, lons))
+        raise RuntimeError("ElevationClient.lookup no puede usarse dentro de un bucle asyncio; use await fetch().")
+
+    def close(self):
+        with self._db_lock:
+            self.db.close()
@@ -0,0 +1,290 @@
+"""
+Exportación masiva de enlaces a CSV, KML y PDF en streaming.
+
+Los enlaces llegan por bloques de tuplas con las columnas de
+store.COLUMNS (LinkStore.iter_pages) y cada escritor los vuelca al
+fichero a medida que llegan: ni el conjunto de enlaces ni el documento se
+tienen en memoria. export_links es un generador que informa del avance
+tras cada bloque; cerrarlo a mitad (cancelación) borra el fichero parcial.
+
+El PDF se escribe sin dependencias: texto monoespaciado (Courier) con
+los objetos de cada página emitidos al completarse; de cada página solo
+se retiene su offset para la tabla xref final.
+"""
+
+import csv
+import os
+import sys
+from xml.sax.saxutils import escape
+
+from uptalink.store import COLUMNS, COORD_FIELDS
+
+FORMATS = ('csv', 'kml', 'pdf')
+BUFFER_SIZE = 1024 * 1024   # escrituras grandes: el límite es el disco, no las llamadas al sistema
+
+# Posición de cada columna en las tuplas de LinkStore.iter_pages
+POSITIONS = {name: k for k, name in enumerate(COLUMNS)}
+
+# Colores de estado (los de la interfaz) en formato KML aabbggrr
+KML_STYLES = {'VIABLE': ('viable', 'ff9cd000'), 'CRÍTICO': ('critico', 'ff4d4dff')}
+KML_DEFAULT_STYLE = ('otro', 'ffaaaaaa')
+
+
+class CsvWriter:
+    """Una fila por enlace con todas las columnas de la base (None -> celda vacía)."""
+
+    binary = False
+
+    def __init__(self, fh):
+        self.writer = csv.writer(fh)
+        self.writer.writerow(COLUMNS)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        pass
+
+
+class KmlWriter:
+    """
+    Una línea por enlace entre sus extremos, coloreada por estado.
+
+    Los enlaces sin coordenadas se omiten y se cuentan en skipped.
+    """
+
+    binary = False
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.skipped = 0
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<kml xmlns="http://www.opengis.net/kml/2.2">\n<Document>\n<name>UPTALINK</name>\n')
+        for style, color in list(KML_STYLES.values()) + [KML_DEFAULT_STYLE]:
+            fh.write(f'<Style id="{style}"><LineStyle><color>{color}</color><width>2</width></LineStyle></Style>\n')
+
+    def write_rows(self, rows):
+        coords = [POSITIONS[name] for name in COORD_FIELDS]
+        link_id, status = POSITIONS['link_id'], POSITIONS['status']
+        out = []
+        for row in rows:
+            lat_a, lon_a, lat_b, lon_b = (row[k] for k in coords)
+            if lat_a is None or lon_a is None or lat_b is None or lon_b is None:
+                self.skipped += 1
+                continue
+            style = KML_STYLES.get(row[status], KML_DEFAULT_STYLE)[0]
+            out.append(
+                f'<Placemark><name>{escape(str(row[link_id]))}</name><styleUrl>#{style}</styleUrl>'
+                f'<description>{_describe(row)}</description>'
+                f'<LineString><tessellate>1</tessellate><coordinates>{lon_a},{lat_a},0 {lon_b},{lat_b},0</coordinates>'
+                '</LineString></Placemark>\n'
+            )
+        self.fh.write(''.join(out))
+
+    def close(self):
+        self.fh.write('</Document>\n</kml>\n')
+
+
+DESCRIPTION_FIELDS = tuple(
+    (POSITIONS[name], label, unit) for name, label, unit in (
+        ('freq', "Frecuencia", "GHz"), ('dist', "Distancia", "Km"),
+        ('margin', "Margen", "dB"), ('availability', "Disponibilidad", "%"),
+    )
+)
+
+
+def _describe(row):
+    parts = [f"{label}: {row[k]:.2f} {unit}" for k, label, unit in DESCRIPTION_FIELDS if row[k] is not None]
+    status = row[POSITIONS['status']]
+    if status:
+        parts.append(escape(str(status)))
+    return '; '.join(parts)
+
+
+class PdfSummaryWriter:
+    """
+    Resumen paginado en PDF: una tabla de enlaces por página A4 y, al
+    final, una página con los totales (acumulados sobre la marcha).
+    """
+
+    binary = True
+    ROWS_PER_PAGE = 72
+    PAGE_SIZE = (595, 842)   # A4 en puntos
+    TITLE = "UPTALINK - Resumen de enlaces"
+
+    # (columna, cabecera, ancho, formato)
+    COLUMNS = (
+        ('link_id', "ID", 14, "{}"),
+        ('freq', "GHz", 7, "{:.2f}"),
+        ('dist', "Km", 8, "{:.2f}"),
+        ('rssi', "Rx dBm", 8, "{:.2f}"),
+        ('margin', "Margen", 8, "{:.2f}"),
+        ('availability', "Disp. %", 9, "{:.4f}"),
+        ('total_cost', "Costo $", 11, "{:.2f}"),
+        ('status', "Estado", 8, "{}"),
+    )
+
+    # Objetos reservados: 1 catálogo, 2 árbol de páginas, 3-4 fuentes
+    CATALOG, PAGES, FONT, FONT_BOLD = 1, 2, 3, 4
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.position = 0
+        self.offsets = {}
+        self.next_object = 5
+        self.page_objects = []
+        self.rows = []
+        self.count = 0
+        self.by_status = {}
+        self.margin_sum = 0.0
+        self.margin_count = 0
+        self.cost_sum = 0.0
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        font = '<< /Type /Font /Subtype /Type1 /BaseFont /{} /Encoding /WinAnsiEncoding >>'
+        self._object(self.FONT, font.format('Courier'))
+        self._object(self.FONT_BOLD, font.format('Courier-Bold'))
+        self.header = ' '.join(title.ljust(width) for _, title, width, _ in self.COLUMNS)
+        self.cells = tuple((POSITIONS[name], width, fmt) for name, _, width, fmt in self.COLUMNS)
+
+    def _write(self, data):
+        self.fh.write(data)
+        self.position += len(data)
+
+    def _object(self, number, body):
+        if isinstance(body, str):
+            body = body.encode('latin-1')
+        self.offsets[number] = self.position
+        self._write(b'%d 0 obj\n%b\nendobj\n' % (number, body))
+
+    def _new_object(self):
+        number = self.next_object
+        self.next_object += 1
+        return number
+
+    @staticmethod
+    def _text(value):
+        text = str(value).encode('cp1252', 'replace')
+        return text.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+    def _page(self, lines, bold_lines=1):
+        width, height = self.PAGE_SIZE
+        content = [b'BT /F2 12 Tf 40 %d Td 12 TL' % (height - 50)]
+        content.append(b'(%b) Tj T*' % self._text(f"{self.TITLE}  -  página {len(self.page_objects) + 1}"))
+        content.append(b'/F2 8 Tf 9.5 TL T*')
+        for k, line in enumerate(lines):
+            if k == bold_lines:
+                content.append(b'/F1 8 Tf')
+            content.append(b"(%b) '" % self._text(line))
+        content.append(b'ET')
+        stream = b'\n'.join(content)
+        contents = self._new_object()
+        self._object(contents, b'<< /Length %d >>\nstream\n%b\nendstream' % (len(stream), stream))
+        page = self._new_object()
+        self._object(page, (
+            f'<< /Type /Page /Parent {self.PAGES} 0 R /MediaBox [0 0 {width} {height}] /Contents {contents} 0 R '
+            f'/Resources << /Font << /F1 {self.FONT} 0 R /F2 {self.FONT_BOLD} 0 R >> >> >>'
+        ))
+        self.page_objects.append(page)
+
+    def write_rows(self, rows):
+        status_pos, margin_pos, cost_pos = POSITIONS['status'], POSITIONS['margin'], POSITIONS['total_cost']
+        for row in rows:
+            self.rows.append(' '.join(
+                ('-' if row[k] is None else fmt.format(row[k]))[:width].ljust(width) for k, width, fmt in self.cells
+            ))
+            if len(self.rows) >= self.ROWS_PER_PAGE:
+                self._page([self.header] + self.rows)
+                self.rows = []
+            status = row[status_pos] or '-'
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+            if row[margin_pos] is not None:
+                self.margin_sum += row[margin_pos]
+                self.margin_count += 1
+            if row[cost_pos] is not None:
+                self.cost_sum += row[cost_pos]
+        self.count += len(rows)
+
+    def close(self):
+        if self.rows:
+            self._page([self.header] + self.rows)
+            self.rows = []
+        summary = ["Totales", "", f"Enlaces: {self.count}"]
+        summary += [f"  {status}: {n}" for status, n in sorted(self.by_status.items())]
+        if self.margin_count:
+            summary.append(f"Margen medio: {self.margin_sum / self.margin_count:.2f} dB")
+        summary.append(f"Costo total: ${self.cost_sum:,.2f}")
+        self._page(summary)
+
+        kids = ' '.join(f'{number} 0 R' for number in self.page_objects)
+        self._object(self.PAGES, f'<< /Type /Pages /Kids [{kids}] /Count {len(self.page_objects)} >>')
+        self._object(self.CATALOG, f'<< /Type /Catalog /Pages {self.PAGES} 0 R >>')
+        xref = self.position
+        size = self.next_object
+        entries = [b'xref\n0 %d\n0000000000 65535 f \n' % size]
+        entries += [b'%010d 00000 n \n' % self.offsets[number] for number in range(1, size)]
+        self._write(b''.join(entries))
+        self._write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (size, self.CATALOG, xref))
+
+
+WRITERS = {'csv': CsvWriter, 'kml': KmlWriter, 'pdf': PdfSummaryWriter}
+
+
+def format_from_path(path):
+    """Formato de exportación según la extensión ('csv', 'kml' o 'pdf')."""
+    fmt = os.path.splitext(path)[1].lower().lstrip('.')
+    if fmt not in WRITERS:
+        raise ValueError(f"Formato de exportación no soportado: '{fmt}' (use {', '.join(FORMATS)}).")
+    return fmt
+
+
+def export_links(pages, path, fmt=None):
+    """
+    Exporta enlaces a un fichero en streaming.
+
+    Args:
+        pages: Iterable de bloques (listas de tuplas con los valores de
+            store.COLUMNS), p. ej. LinkStore.iter_pages().
+        path: Fichero de salida.
+        fmt: 'csv', 'kml' o 'pdf'; por defecto según la extensión.
+
+    Yields:
+        int: Enlaces escritos tras cada bloque; el último valor es el
+        total (sin bloques no produce ninguno). El fichero queda completo
+        al agotar el generador; si se cierra antes, el parcial se borra.
+    """
+    writer_class = WRITERS[fmt or format_from_path(path)]
+    count = 0
+    complete = False
+    # Abrir fuera del try: si falla, el fichero no es nuestro y no se borra
+    if writer_class.binary:
+        fh = open(path, 'wb', buffering=BUFFER_SIZE)
+    else:
+        fh = open(path, 'w', buffering=BUFFER_SIZE, encoding='utf-8', newline='')
+    try:
+        with fh:
+            writer = writer_class(fh)
+            for rows in pages:
+                writer.write_rows(rows)
+                count += len(rows)
+                yield count
+            writer.close()
+        complete = True
+    finally:
+        if not complete and os.path.exists(path):
+            os.remove(path)
+
+
+def main(args):
+    """Punto de entrada de 'python -m uptalink export'."""
+    from uptalink.store import LinkStore
+
+    store = LinkStore(args.db)
+    try:
+        total = store.count()
+        count = 0
+        for count in export_links(store.iter_pages(batch_size=args.batch_size), args.output, args.format):
+            print(f"\r{count}/{total} enlaces", end='', file=sys.stderr)
+    finally:
+        store.close()
+    print(f"\r{count} enlaces exportados a {args.output}.", file=sys.stderr)
+    return 0
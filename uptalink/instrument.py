@@ -0,0 +1,342 @@
+"""
+Instrumentación en tiempo de ejecución: spans de tiempo y contadores.
+
+Dos formas de medir:
+    - @probe("nombre"): registra una función o método. Mientras la
+      instrumentación está desactivada el código queda intacto (coste
+      cero); enable() sustituye cada función registrada en su clase o
+      módulo por una envoltura que mide, y disable() la restaura.
+      Para funciones de microsegundos, sample_every=N mide 1 de cada N
+      llamadas (todas se cuentan).
+    - with span("nombre"): para bloques de código; desactivado devuelve
+      un contexto nulo compartido.
+
+snapshot() devuelve recuentos y percentiles p50/p95/p99 sobre una
+ventana de las últimas RESERVOIR_SIZE muestras por span; write_snapshot()
+lo vuelca a JSON o a texto Prometheus. Con UPTALINK_INSTRUMENT=1 se
+activa al importar, y con UPTALINK_INSTRUMENT_FILE=ruta se escribe un
+snapshot al salir del proceso.
+"""
+
+import atexit
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from time import perf_counter
+
+RESERVOIR_SIZE = 4096
+
+_enabled = False
+_lock = threading.Lock()
+_probes = []
+
+# Tablas por hilo: cada hilo escribe solo en las suyas (sin lock en la ruta
+# caliente) y snapshot() las combina. Las de hilos terminados (QThreadPool y
+# asyncio.to_thread crean y retiran hilos) se funden en _retired y se quitan
+# de _tables al registrar un hilo nuevo o tomar un snapshot.
+_local = threading.local()
+_tables = []
+_retired = ({}, {})
+
+
+class _SpanStats:
+    __slots__ = ('count', 'total', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=RESERVOIR_SIZE)
+
+
+def _thread_tables():
+    try:
+        return _local.spans, _local.counters
+    except AttributeError:
+        _local.spans = {}
+        _local.counters = {}
+        with _lock:
+            _prune()
+            _tables.append((threading.current_thread(), _local.spans, _local.counters))
+        return _local.spans, _local.counters
+
+
+def _prune():
+    # Llamar con _lock: funde las tablas de los hilos terminados en _retired
+    retired_spans, retired_counters = _retired
+    live = []
+    for entry in _tables:
+        thread, spans, counters = entry
+        if thread.is_alive():
+            live.append(entry)
+            continue
+        for name, stats in spans.items():
+            merged = retired_spans.get(name)
+            if merged is None:
+                merged = retired_spans[name] = _SpanStats()
+            merged.count += stats.count
+            merged.total += stats.total
+            merged.samples.extend(stats.samples)
+        for name, value in counters.items():
+            retired_counters[name] = retired_counters.get(name, 0) + value
+    _tables[:] = live
+
+
+def _stats(name):
+    """Estadísticas del span name para el hilo actual."""
+    try:
+        return _local.spans[name]
+    except (AttributeError, KeyError):
+        spans = _thread_tables()[0]
+        return spans.setdefault(name, _SpanStats())
+
+
+def record(name, seconds, calls=1):
+    """Registra una duración (s) para el span name."""
+    stats = _stats(name)
+    stats.count += calls
+    stats.total += seconds * calls
+    stats.samples.append(seconds)
+
+
+def count(name, n=1):
+    """Incrementa un contador (sin efecto si la instrumentación está desactivada)."""
+    if _enabled:
+        counters = _thread_tables()[1]
+        counters[name] = counters.get(name, 0) + n
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, perf_counter() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """Context manager que mide el bloque si la instrumentación está activa."""
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+# -----------------------------------------------------------------------------
+# Sondas sobre funciones (parcheo al activar)
+# -----------------------------------------------------------------------------
+
+class _Probe:
+    __slots__ = ('func', 'name', 'sample_every', 'wrapper')
+
+    def __init__(self, func, name, sample_every):
+        self.func = func
+        self.name = name
+        self.sample_every = sample_every
+        self.wrapper = self._make_wrapper()
+
+    def _make_wrapper(self):
+        func = self.func
+        name = self.name
+        every = self.sample_every
+
+        if every <= 1:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    # record() en línea: es la ruta caliente de cada sonda
+                    elapsed = perf_counter() - start
+                    stats = _stats(name)
+                    stats.count += 1
+                    stats.total += elapsed
+                    stats.samples.append(elapsed)
+        else:
+            # next() sobre itertools.count es atómico con el GIL: con varios
+            # hilos no se pierden ni se duplican muestras
+            calls = itertools.count(1)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if next(calls) % every:
+                    return func(*args, **kwargs)
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    # La muestra representa a las 'every' llamadas del intervalo
+                    record(name, perf_counter() - start, every)
+        return wrapper
+
+    def _owner(self):
+        owner = sys.modules.get(self.func.__module__)
+        parts = self.func.__qualname__.split('.')
+        for part in parts[:-1]:
+            if owner is None or part == '<locals>':
+                return None, None
+            owner = getattr(owner, part, None)
+        return owner, parts[-1]
+
+    def install(self, active):
+        owner, attr = self._owner()
+        if owner is None:
+            return
+        current = owner.__dict__.get(attr) if isinstance(owner, type) else getattr(owner, attr, None)
+        target = self.wrapper if active else self.func
+        if isinstance(current, staticmethod):
+            setattr(owner, attr, staticmethod(target))
+        elif isinstance(current, classmethod):
+            setattr(owner, attr, classmethod(target))
+        elif current is not None:
+            setattr(owner, attr, target)
+
+
+def probe(name, sample_every=1):
+    """
+    Decorador que registra una función como punto de medida.
+
+    Debe aplicarse directamente sobre la función (por debajo de
+    @staticmethod/@classmethod). No añade coste mientras la
+    instrumentación esté desactivada.
+    """
+    def decorator(func):
+        p = _Probe(func, name, sample_every)
+        _probes.append(p)
+        return p.wrapper if _enabled else func
+    return decorator
+
+
+def enable():
+    """Activa la instrumentación e instala las sondas registradas."""
+    global _enabled
+    with _lock:
+        _enabled = True
+        for p in _probes:
+            p.install(True)
+
+
+def disable():
+    """Desactiva la instrumentación y restaura las funciones originales."""
+    global _enabled
+    with _lock:
+        _enabled = False
+        for p in _probes:
+            p.install(False)
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Borra todas las medidas acumuladas."""
+    with _lock:
+        for _, spans, counters in _tables:
+            spans.clear()
+            counters.clear()
+        for table in _retired:
+            table.clear()
+
+
+# -----------------------------------------------------------------------------
+# Exportación
+# -----------------------------------------------------------------------------
+
+def _percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def snapshot():
+    """
+    Los percentiles y el máximo se calculan sobre la ventana de muestras;
+    count y total_s cubren todas las llamadas.
+
+    Returns:
+        dict: {'enabled', 'timestamp', 'spans': {nombre: {count, total_s,
+        p50_s, p95_s, p99_s, max_s}}, 'counters': {nombre: valor}}.
+    """
+    merged = {}
+    counters = {}
+    # Con el lock: _retired solo cambia dentro de _prune, también bajo el lock
+    with _lock:
+        _prune()
+        for thread_spans, thread_counters in [entry[1:] for entry in _tables] + [_retired]:
+            for name, stats in list(thread_spans.items()):
+                n, total, samples = merged.get(name, (0, 0.0, []))
+                merged[name] = (n + stats.count, total + stats.total, samples + list(stats.samples))
+            for name, value in list(thread_counters.items()):
+                counters[name] = counters.get(name, 0) + value
+    raw = {name: (n, total, sorted(samples)) for name, (n, total, samples) in merged.items()}
+    spans = {}
+    for name, (n, total, ordered) in sorted(raw.items()):
+        spans[name] = {
+            'count': n,
+            'total_s': total,
+            'p50_s': _percentile(ordered, 0.50),
+            'p95_s': _percentile(ordered, 0.95),
+            'p99_s': _percentile(ordered, 0.99),
+            'max_s': ordered[-1] if ordered else 0.0,
+        }
+    return {'enabled': _enabled, 'timestamp': time.time(), 'spans': spans, 'counters': dict(sorted(counters.items()))}
+
+
+def _metric_name(name):
+    return ''.join(c if c.isalnum() else '_' for c in name)
+
+
+def to_prometheus(snap=None):
+    """Convierte un snapshot al formato de texto de Prometheus."""
+    snap = snap or snapshot()
+    lines = ["# TYPE uptalink_span_seconds summary"]
+    for name, s in snap['spans'].items():
+        for q, key in (("0.5", 'p50_s'), ("0.95", 'p95_s'), ("0.99", 'p99_s')):
+            lines.append(f'uptalink_span_seconds{{span="{name}",quantile="{q}"}} {s[key]:.9f}')
+        lines.append(f'uptalink_span_seconds_sum{{span="{name}"}} {s["total_s"]:.9f}')
+        lines.append(f'uptalink_span_seconds_count{{span="{name}"}} {s["count"]}')
+    for name, value in snap['counters'].items():
+        metric = f"uptalink_{_metric_name(name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(path):
+    """Escribe el snapshot en path: texto Prometheus si acaba en .prom/.txt, JSON si no."""
+    snap = snapshot()
+    text = to_prometheus(snap) if path.endswith(('.prom', '.txt')) else json.dumps(snap, indent=2)
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+if os.environ.get("UPTALINK_INSTRUMENT") == "1":
+    _enabled = True
+
+if os.environ.get("UPTALINK_INSTRUMENT_FILE"):
+    atexit.register(write_snapshot, os.environ["UPTALINK_INSTRUMENT_FILE"])
@@ -0,0 +1,471 @@
+"""
+Matriz de interferencia del plan de frecuencias (co-canal y canal adyacente).
+
+Para un conjunto de enlaces A -> B (el transmisor en A, el receptor en B)
+calcula la potencia que cada transmisor i entrega en cada receptor j:
+
+    I_ij = p_tx_i + G_a_i(θ_tx) + G_b_j(θ_rx) - fspl(d(A_i, B_j), f_i)
+           - NFD(f_i, bw_i, f_j, bw_j) - (cable_loss_i + cable_loss_j) / 2
+
+donde θ_tx es el ángulo entre el apuntamiento de la antena de A_i (hacia
+B_i) y la dirección hacia B_j, θ_rx el análogo en B_j, y NFD el rechazo
+del receptor a la señal del canal del interferente (ver
+channel_rejection). El FSPL es el de LinkBudgetCalculator, así que la
+portadora C_j coincide con el rssi del enlace.
+
+Evitar los N² pares:
+
+    1. Ningún interferente más allá del horizonte radioeléctrico (con las
+       torres más altas de la red), ni del alcance en espacio libre del
+       mejor transmisor hasta el umbral de ruido, puede llegar al
+       receptor; los pares candidatos salen de la rejilla 3D de
+       network.candidate_pairs.
+    2. Solo se guardan las entradas relevantes: I por encima del piso de
+       ruido menos DEFAULT_NOISE_MARGIN y C/I por debajo de
+       DEFAULT_CI_LIMIT. El resto no cambia el SINR de forma apreciable.
+    3. La matriz se guarda dispersa (interferente, víctima, potencia) y la
+       suma de interferencia por víctima en mW; update_link recalcula solo
+       la fila y la columna del enlace modificado (O(N) vectorizado) y
+       corrige las sumas afectadas sin recalcular el resto.
+
+Coste de construcción: proporcional a los pares A_i -> B_j dentro del
+alcance (unos 0.5 µs por par), es decir, a la densidad de la red y no
+solo a N. Con torres de 30 m el alcance es de unos 45 Km; 10 000 enlaces
+de 2-15 Km repartidos en 5°x5° son ~2M pares (~7 entradas por enlace,
+~2 s), pero en 1°x1° todos los pares están en alcance: ~35M pares, ~145
+entradas por enlace y ~30 s. max_pairs acota ese caso con un error en
+lugar de un cálculo de minutos.
+"""
+
+import math
+
+import numpy as np
+
+from uptalink import solver, terrain
+from uptalink.calculator import LinkBudgetCalculator
+from uptalink.network import DEFAULT_CHUNK_SIZE, candidate_pairs
+
+# Columnas por enlace (obligatorias y opcionales con su valor por defecto)
+LINK_FIELDS = ('lat_a', 'lon_a', 'lat_b', 'lon_b', 'freq', 'p_tx', 'g_a', 'g_b')
+LINK_DEFAULTS = {
+    'bandwidth': 20.0, 'cable_loss': 0.0, 'noise_figure': 0.0, 'temperature': 16.85,
+    'height_a': 30.0, 'height_b': 30.0,
+}
+# Campos cuyo valor <= 0 se trata como "sin dato" (el panel guarda 0.0)
+_POSITIVE_FIELDS = ('bandwidth', 'height_a', 'height_b')
+
+# Diagrama de antena: lóbulo principal parabólico con suelo en G - FRONT_TO_BACK
+FRONT_TO_BACK = 30.0  # dB
+# Máscara de rechazo de canal adyacente: (separación / ancho medio, rechazo dB)
+ACR_MASK = ((1.0, 30.0), (2.0, 45.0), (3.0, 55.0))
+
+DEFAULT_NOISE_MARGIN = 20.0  # dB por debajo del piso de ruido que se descartan
+DEFAULT_CI_LIMIT = 60.0  # dB de C/I por encima del cual se descarta
+MIN_DISTANCE_KM = 0.01  # emplazamientos compartidos: evita log10(0)
+HORIZON_KM = 4.12  # horizonte radioeléctrico: 4.12 * (sqrt(h1) + sqrt(h2)) Km con k = 4/3
+DEFAULT_MAX_PAIRS = 20_000_000  # pares candidatos de la línea de comandos (~10 s de construcción)
+
+_ACR_OFFSETS = np.array([p[0] for p in ACR_MASK])
+_ACR_VALUES = np.array([p[1] for p in ACR_MASK])
+
+
+def radio_horizon(h_a, h_b):
+    """Alcance del horizonte radioeléctrico (Km) entre torres de h_a y h_b m."""
+    return HORIZON_KM * (np.sqrt(np.maximum(h_a, 0.0)) + np.sqrt(np.maximum(h_b, 0.0)))
+
+
+def bearing(lat1, lon1, lat2, lon2):
+    """
+    Rumbo inicial de gran círculo de 1 hacia 2.
+
+    Returns:
+        Ángulo en radianes (-pi, pi], 0 = norte.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    return np.arctan2(np.sin(dlon) * np.cos(lat2),
+                      np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon))
+
+
+def off_axis(direction, boresight):
+    """Ángulo (grados, 0..180) entre una dirección y el apuntamiento, en radianes."""
+    return np.degrees(np.abs(np.mod(direction - boresight + math.pi, 2 * math.pi) - math.pi))
+
+
+def antenna_gain(g_max, theta):
+    """
+    Ganancia fuera de eje con el diagrama simplificado del enlace.
+
+    El ancho de haz a -3 dB se estima de la ganancia máxima
+    (G = 27000 / θ3dB², con θ3dB en grados); las antenas de ganancia
+    <= 0 dBi se tratan como omnidireccionales.
+
+    Args:
+        g_max: Ganancia máxima (dBi).
+        theta: Ángulo fuera de eje (grados).
+
+    Returns:
+        Ganancia (dBi) en esa dirección.
+    """
+    g_max = np.asarray(g_max, dtype=np.float64)
+    beamwidth = np.sqrt(27000 / 10 ** (np.maximum(g_max, 0.0) / 10))
+    loss = np.minimum(12 * (np.asarray(theta) / beamwidth) ** 2, FRONT_TO_BACK)
+    return g_max - np.where(g_max > 0, loss, 0.0)
+
+
+def channel_rejection(f_i, bw_i, f_j, bw_j):
+    """
+    Rechazo (NFD, dB) del receptor j a la emisión del transmisor i.
+
+    Es el menor de dos términos: la fracción de la potencia del
+    interferente que cae dentro del canal de la víctima (co-canal o
+    solape parcial) y la máscara ACR_MASK interpolada sobre la separación
+    normalizada |Δf| / ((bw_i + bw_j) / 2), que cubre las emisiones fuera
+    de banda. Más allá del último punto de la máscara se mantiene su valor.
+
+    Args:
+        f_i, f_j: Frecuencias centrales (GHz).
+        bw_i, bw_j: Anchos de banda (MHz).
+
+    Returns:
+        Rechazo en dB (0 para el mismo canal).
+    """
+    f_i, f_j = np.asarray(f_i, dtype=np.float64) * 1000, np.asarray(f_j, dtype=np.float64) * 1000
+    bw_i, bw_j = np.asarray(bw_i, dtype=np.float64), np.asarray(bw_j, dtype=np.float64)
+    overlap = np.minimum(f_i + bw_i / 2, f_j + bw_j / 2) - np.maximum(f_i - bw_i / 2, f_j - bw_j / 2)
+    fraction = np.clip(overlap / bw_i, 0.0, 1.0)
+    with np.errstate(divide='ignore'):
+        in_band = -10 * np.log10(fraction)
+    spacing = np.abs(f_i - f_j) / ((bw_i + bw_j) / 2)
+    mask = np.interp(np.maximum(spacing, _ACR_OFFSETS[0]), _ACR_OFFSETS, _ACR_VALUES)
+    return np.minimum(in_band, mask)
+
+
+def _fspl(dist, freq):
+    return 20 * np.log10(dist) + 20 * np.log10(freq) + solver.FSPL_CONSTANT
+
+
+def _to_mw(dbm):
+    return 10 ** (np.asarray(dbm) / 10)
+
+
+def _to_dbm(mw):
+    with np.errstate(divide='ignore'):
+        return 10 * np.log10(mw)
+
+
+def prepare_links(links):
+    """
+    Normaliza las columnas de un conjunto de enlaces.
+
+    Args:
+        links: dict (o tabla con columnas nombradas) con LINK_FIELDS y
+            opcionalmente las de LINK_DEFAULTS y 'link_id'.
+
+    Returns:
+        dict: Arrays float64 por columna (copias) y 'link_id' (lista).
+    """
+    names = getattr(getattr(links, 'dtype', None), 'names', None) or links
+    missing = [name for name in LINK_FIELDS if name not in names]
+    if missing:
+        raise ValueError(f"Faltan columnas obligatorias: {', '.join(missing)}")
+    n = len(np.asarray(links[LINK_FIELDS[0]]))
+    out = {name: np.array(links[name], dtype=np.float64) for name in LINK_FIELDS}
+    for name, default in LINK_DEFAULTS.items():
+        values = np.array(links[name], dtype=np.float64) if name in names else np.full(n, default)
+        values[np.isnan(values) | ((values <= 0) & (name in _POSITIVE_FIELDS))] = default
+        out[name] = values
+    out['link_id'] = list(links['link_id']) if 'link_id' in names else [str(k) for k in range(n)]
+    return out
+
+
+class InterferenceMatrix:
+    """
+    Matriz dispersa de interferencia entre enlaces, actualizable por enlace.
+
+    Las entradas (interferer[k], victim[k], power[k] en dBm) solo existen
+    para los pares relevantes; total_mw guarda la suma por víctima.
+    """
+
+    def __init__(self, links, noise_margin=DEFAULT_NOISE_MARGIN, ci_limit=DEFAULT_CI_LIMIT,
+                 chunk_size=DEFAULT_CHUNK_SIZE, max_pairs=None):
+        """
+        Args:
+            links: Columnas de enlaces (ver prepare_links).
+            noise_margin: Se descartan interferencias más de noise_margin
+                dB por debajo del piso de ruido de la víctima.
+            ci_limit: Se descartan interferencias con C/I mayor (dB).
+            chunk_size: Pares candidatos evaluados por bloque.
+            max_pairs: Máximo de pares candidatos A_i -> B_j (None = sin
+                límite); si la red es más densa se lanza ValueError.
+        """
+        self.links = prepare_links(links)
+        self.noise_margin = noise_margin
+        self.ci_limit = ci_limit
+        self.chunk_size = chunk_size
+        self.max_pairs = max_pairs
+        self.ids = self.links['link_id']
+        self._derive()
+        self._build()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        """Construye la matriz con los enlaces del LinkStore que tienen coordenadas."""
+        fields = ('link_id',) + LINK_FIELDS + tuple(LINK_DEFAULTS)
+        columns = {name: [] for name in fields}
+        for link in store.iter_links(batch_size=5000):
+            if any(link[name] is None for name in LINK_FIELDS):
+                continue
+            for name in fields:
+                value = link[name]
+                columns[name].append(value if value is not None or name == 'link_id' else np.nan)
+        return cls(columns, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Magnitudes por enlace
+    # ------------------------------------------------------------------
+    def _derive(self, rows=None):
+        """Portadora, ruido y apuntamientos de los enlaces rows (None = todos)."""
+        L = self.links
+        if rows is None:
+            rows = slice(None)
+            n = len(self.ids)
+            self.carrier = np.empty(n)
+            self.noise = np.empty(n)
+            self.boresight_a = np.empty(n)
+            self.boresight_b = np.empty(n)
+        dist = terrain.haversine(L['lat_a'][rows], L['lon_a'][rows], L['lat_b'][rows], L['lon_b'][rows]) / 1000
+        freq = L['freq'][rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fspl = np.where((dist > 0) & (freq > 0), _fspl(dist, freq), np.nan)
+        self.carrier[rows] = L['p_tx'][rows] + L['g_a'][rows] + L['g_b'][rows] - fspl - L['cable_loss'][rows]
+        self.noise[rows] = LinkBudgetCalculator.noise_floor(
+            L['bandwidth'][rows], L['noise_figure'][rows], L['temperature'][rows]
+        )
+        self.boresight_a[rows] = bearing(L['lat_a'][rows], L['lon_a'][rows], L['lat_b'][rows], L['lon_b'][rows])
+        self.boresight_b[rows] = bearing(L['lat_b'][rows], L['lon_b'][rows], L['lat_a'][rows], L['lon_a'][rows])
+
+    def _reach_km(self):
+        """
+        Distancia máxima A_i -> B_j a la que se evalúa un par: el horizonte
+        con las torres más altas, o menos si ni el mejor transmisor con
+        ambas antenas apuntadas supera el umbral de ruido a esa distancia.
+        """
+        L = self.links
+        if not len(self.ids):
+            return 0.0
+        horizon = float(radio_horizon(np.max(L['height_a']), np.max(L['height_b'])))
+        free_space = solver.max_distance(
+            np.min(L['freq']), np.max(L['p_tx']), np.max(L['g_a']), np.max(L['g_b']), np.min(L['cable_loss']),
+            np.nanmin(self.noise) - self.noise_margin, margin=0.0
+        )
+        return min(horizon, float(free_space)) if np.isfinite(free_space) else horizon
+
+    def evaluate(self, i, j):
+        """
+        Interferencia del transmisor de i en el receptor de j.
+
+        Args:
+            i, j: Arrays de índices de enlace (interferente, víctima).
+
+        Returns:
+            tuple: (power, keep) con la potencia en dBm y la máscara de
+            pares relevantes (dentro del horizonte y sobre los umbrales).
+        """
+        L = self.links
+        lat_t, lon_t = L['lat_a'][i], L['lon_a'][i]
+        lat_r, lon_r = L['lat_b'][j], L['lon_b'][j]
+        dist = terrain.haversine(lat_t, lon_t, lat_r, lon_r) / 1000
+        co_sited = dist < MIN_DISTANCE_KM
+        # Sin dirección definida entre emplazamientos compartidos: 90° fuera de eje
+        theta_t = np.where(co_sited, 90.0, off_axis(bearing(lat_t, lon_t, lat_r, lon_r), self.boresight_a[i]))
+        theta_r = np.where(co_sited, 90.0, off_axis(bearing(lat_r, lon_r, lat_t, lon_t), self.boresight_b[j]))
+        power = (
+            L['p_tx'][i] - (L['cable_loss'][i] + L['cable_loss'][j]) / 2
+            + antenna_gain(L['g_a'][i], theta_t) + antenna_gain(L['g_b'][j], theta_r)
+            - _fspl(np.maximum(dist, MIN_DISTANCE_KM), L['freq'][i])
+            - channel_rejection(L['freq'][i], L['bandwidth'][i], L['freq'][j], L['bandwidth'][j])
+        )
+        with np.errstate(invalid='ignore'):
+            keep = (
+                (i != j)
+                & (dist <= radio_horizon(L['height_a'][i], L['height_b'][j]))
+                & (power >= self.noise[j] - self.noise_margin)
+                & ~(self.carrier[j] - power > self.ci_limit)
+            )
+        return power, keep
+
+    def _build(self):
+        n = len(self.ids)
+        L = self.links
+        lat = np.concatenate((L['lat_a'], L['lat_b']))
+        lon = np.concatenate((L['lon_a'], L['lon_b']))
+        parts_i, parts_j, parts_p = [], [], []
+        pairs = 0
+        reach = self._reach_km()
+        # Pares de puntos (A o B de cualquier enlace); solo sirven los A_i -> B_j
+        for p, q in candidate_pairs(lat, lon, reach, self.chunk_size):
+            a_first = (p < n) & (q >= n)
+            b_first = (q < n) & (p >= n)
+            i = np.concatenate((p[a_first], q[b_first]))
+            j = np.concatenate((q[a_first], p[b_first])) - n
+            pairs += len(i)
+            if self.max_pairs is not None and pairs > self.max_pairs:
+                raise ValueError(
+                    f"Red demasiado densa: más de {self.max_pairs} pares de enlaces a menos de {reach:.0f} Km."
+                )
+            power, keep = self.evaluate(i, j)
+            parts_i.append(i[keep])
+            parts_j.append(j[keep])
+            parts_p.append(power[keep])
+        # El interferente con su propio receptor (i == j) nunca es candidato
+        self.interferer = np.concatenate(parts_i) if parts_i else np.empty(0, np.int64)
+        self.victim = np.concatenate(parts_j) if parts_j else np.empty(0, np.int64)
+        self.power = np.concatenate(parts_p) if parts_p else np.empty(0)
+        self.total_mw = np.bincount(self.victim, weights=_to_mw(self.power), minlength=n)
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+    @property
+    def nnz(self):
+        return len(self.power)
+
+    def interference(self):
+        """Interferencia agregada por víctima (dBm; -inf sin interferentes)."""
+        return _to_dbm(self.total_mw)
+
+    def snr(self):
+        """C/N por enlace (dB)."""
+        return self.carrier - self.noise
+
+    def sinr(self):
+        """C/(N+I) por enlace (dB)."""
+        return self.carrier - _to_dbm(_to_mw(self.noise) + self.total_mw)
+
+    def ci(self):
+        """C/I agregado por enlace (dB; inf sin interferentes)."""
+        return self.carrier - self.interference()
+
+    def ci_matrix(self):
+        """
+        Matriz C/I dispersa en formato CSR, por víctima.
+
+        Returns:
+            tuple: (indptr, interferers, ci) con las entradas de la víctima
+            j en indptr[j]:indptr[j + 1], de peor a mejor C/I.
+        """
+        ci = self.carrier[self.victim] - self.power
+        order = np.lexsort((ci, self.victim))
+        indptr = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.victim, minlength=len(self.ids)), out=indptr[1:])
+        return indptr, self.interferer[order], ci[order]
+
+    def worst(self, link, limit=10):
+        """
+        Interferentes principales de un enlace.
+
+        Returns:
+            list: (link_id del interferente, C/I dB) de peor a mejor.
+        """
+        k = self.ids.index(link) if not isinstance(link, (int, np.integer)) else int(link)
+        rows = np.flatnonzero(self.victim == k)
+        rows = rows[np.argsort(self.power[rows])[::-1][:limit]]
+        return [(self.ids[i], float(self.carrier[k] - p)) for i, p in zip(self.interferer[rows], self.power[rows])]
+
+    # ------------------------------------------------------------------
+    # Actualización incremental
+    # ------------------------------------------------------------------
+    def update_link(self, link, **values):
+        """
+        Cambia las columnas de un enlace y recalcula solo su fila y columna.
+
+        Args:
+            link: Índice o link_id del enlace.
+            **values: Nuevos valores de columnas de LINK_FIELDS/LINK_DEFAULTS.
+
+        Returns:
+            dict: 'affected' (índices de víctimas cuyo SINR cambia) y
+            arrays 'snr', 'sinr' y 'ci' (dB) de esos enlaces.
+        """
+        k = self.ids.index(link) if not isinstance(link, (int, np.integer)) else int(link)
+        L = self.links
+        for name, value in values.items():
+            if name not in L or name == 'link_id':
+                raise KeyError(f"Columna desconocida: {name}")
+            value = float(value)
+            if name in _POSITIVE_FIELDS and not value > 0:
+                value = LINK_DEFAULTS[name]
+            L[name][k] = value
+        self._derive(slice(k, k + 1))
+
+        # Fuera las entradas antiguas de k (como interferente y como víctima)
+        outgoing = self.interferer == k
+        affected = self.victim[outgoing]
+        np.subtract.at(self.total_mw, affected, _to_mw(self.power[outgoing]))
+        keep = ~(outgoing | (self.victim == k))
+        self.interferer, self.victim, self.power = self.interferer[keep], self.victim[keep], self.power[keep]
+
+        # Fila y columna nuevas contra todos los enlaces
+        n = len(self.ids)
+        others = np.arange(n)
+        row, row_keep = self.evaluate(np.full(n, k), others)
+        col, col_keep = self.evaluate(others, np.full(n, k))
+        new_victims = others[row_keep]
+        self.interferer = np.concatenate((self.interferer, np.full(len(new_victims), k), others[col_keep]))
+        self.victim = np.concatenate((self.victim, new_victims, np.full(int(col_keep.sum()), k)))
+        self.power = np.concatenate((self.power, row[row_keep], col[col_keep]))
+
+        np.add.at(self.total_mw, new_victims, _to_mw(row[row_keep]))
+        np.maximum(self.total_mw, 0.0, out=self.total_mw)  # restos de redondeo
+        self.total_mw[k] = float(np.sum(_to_mw(col[col_keep])))
+
+        affected = np.union1d(np.union1d(affected, new_victims), [k])
+        return {
+            'affected': affected,
+            'snr': self.carrier[affected] - self.noise[affected],
+            'sinr': self.carrier[affected] - _to_dbm(_to_mw(self.noise[affected]) + self.total_mw[affected]),
+            'ci': self.carrier[affected] - _to_dbm(self.total_mw[affected]),
+        }
+
+
+def main(args):
+    """Punto de entrada de 'python -m uptalink interference'."""
+    import csv
+    import sys
+    import time
+
+    from uptalink.store import LinkStore
+
+    start = time.perf_counter()
+    store = LinkStore(args.db)
+    try:
+        matrix = InterferenceMatrix.from_store(store, max_pairs=args.max_pairs or None)
+    except ValueError as e:
+        print(f"{e} Use --max-pairs 0 para calcularla igualmente.", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    snr, sinr, ci = matrix.snr(), matrix.sinr(), matrix.ci()
+    counts = np.bincount(matrix.victim, minlength=len(matrix))
+    fh = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        writer = csv.writer(fh)
+        writer.writerow(('link_id', 'snr', 'sinr', 'ci', 'interferers'))
+        for row in zip(matrix.ids, snr.tolist(), sinr.tolist(), ci.tolist(), counts.tolist()):
+            writer.writerow((row[0], *(f"{v:.2f}" for v in row[1:4]), row[4]))
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+    elapsed = time.perf_counter() - start
+    print(f"{len(matrix)} enlaces, {matrix.nnz} interferencias relevantes ({elapsed:.1f} s).", file=sys.stderr)
+    if args.link and args.link not in matrix.ids:
+        print(f"El enlace '{args.link}' no existe o no tiene coordenadas.", file=sys.stderr)
+        return 1
+    if args.link:
+        for link_id, value in matrix.worst(args.link):
+            print(f"  {link_id}: C/I {value:.2f} dB", file=sys.stderr)
+    return 0
@@ -0,0 +1,518 @@
+"""
+Malla de terreno 3D con nivel de detalle (generateGridTerrainMesh del JS).
+
+A partir de una malla regular de elevaciones (DEM) se construyen buffers
+NumPy compactos, listos para subir a la GPU o para el render por CPU:
+
+    - positions (N, 3) float32: x = este, y = elevación * z_scale,
+      z = norte, en metros respecto al centro de la malla (como mapTo3D).
+    - colors (N, 3) float32: la rampa de colores por altura del JS.
+    - normals (N, 3) float32: normales por vértice desde el gradiente.
+    - indices uint32: triángulos con el mismo sentido que el JS.
+
+Los vértices se calculan una vez por malla. Los índices se generan con un
+quadtree: cada celda pide un tamaño de hoja según su distancia al trayecto
+del enlace (celdas lejanas, hojas grandes), se equilibra para que hojas
+vecinas difieran como mucho en un nivel, y cada hoja se triangula en
+abanico desde su centro añadiendo el punto medio de los lados que tocan
+hojas más finas, de modo que la malla no tiene grietas. El buffer de
+índices se reserva al tamaño máximo y se reescribe en su sitio cuando se
+mueven los extremos; si el mapa de hojas no cambia no se toca.
+
+El render (render_triangles) proyecta y ordena los triángulos de atrás
+hacia delante en NumPy; la app los pinta con QPainter, lo que funciona
+sin GPU (QT_QPA_PLATFORM=offscreen).
+"""
+
+import math
+
+import numpy as np
+
+from uptalink.terrain import GridElevationSource
+
+METERS_PER_DEGREE = 111320.0
+
+# La hoja de cada celda mide como mucho distancia_al_trayecto / DEFAULT_LOD_FACTOR
+DEFAULT_LOD_FACTOR = 4.0
+DEFAULT_MAX_LEAF = 64
+
+# Rampa de colores por altura normalizada t (4 tramos): color = base + t * pendiente
+_RAMP_BASE = np.array([
+    [0.08, 0.22, 0.06],
+    [0.23, 0.55, 0.08],
+    [0.43, 0.40, 0.10],
+    [0.68, 0.30, 0.15],
+], dtype=np.float32)
+_RAMP_SLOPE = np.array([
+    [0.15, 0.35, 0.0],
+    [0.20, -0.15, 0.0],
+    [0.25, -0.10, 0.0],
+    [0.20, 0.10, 0.0],
+], dtype=np.float32)
+
+# Nivel de las celdas fuera de la malla y de los vecinos inexistentes
+_OUTSIDE = -1
+_NO_NEIGHBOUR = 127
+
+
+def grid_bounds(lat_a, lon_a, lat_b, lon_b):
+    """
+    Extensión de la malla alrededor de un enlace (generateGridPoints del JS).
+
+    Returns:
+        tuple: (min_lat, max_lat, min_lon, max_lon).
+    """
+    lat_min, lat_max = min(lat_a, lat_b), max(lat_a, lat_b)
+    lon_min, lon_max = min(lon_a, lon_b), max(lon_a, lon_b)
+    pad_lat = (lat_max - lat_min) * 0.6 + 0.01
+    pad_lon = (lon_max - lon_min) * 0.6 + 0.01
+    return lat_min - pad_lat, lat_max + pad_lat, lon_min - pad_lon, lon_max + pad_lon
+
+
+def simulated_grid(bounds, shape):
+    """Terreno local simulado del JS para cuando no hay fuente de elevación."""
+    min_lat, max_lat, min_lon, max_lon = bounds
+    lats = np.linspace(min_lat, max_lat, shape[0])
+    lons = np.linspace(min_lon, max_lon, shape[1])
+    return 50 + np.sin(lats * 100)[:, None] * 30 + np.cos(lons * 100)[None, :] * 30
+
+
+def synthetic_link_grid(dist_km, obstacle_height=0.0, shape=(257, 257)):
+    """
+    Escena sintética para la app de escritorio (sin coordenadas ni DEM).
+
+    Como terrain.obstacle_profile: terreno plano con un cerro de altura
+    obstacle_height en el punto medio del enlace, que va de oeste a este
+    sobre el ecuador.
+
+    Returns:
+        tuple: (elevaciones, bounds, a, b) con a y b como (lat, lon).
+    """
+    a = (0.0, 0.0)
+    b = (0.0, dist_km * 1000 / METERS_PER_DEGREE)
+    # Extensión cuadrada: el margen de grid_bounds dejaría una franja
+    _, _, min_lon, max_lon = grid_bounds(a[0], a[1], b[0], b[1])
+    half = (max_lon - min_lon) / 2
+    min_lat, max_lat = -half, half
+    bounds = (min_lat, max_lat, min_lon, max_lon)
+    north = np.linspace(min_lat, max_lat, shape[0])[:, None] * METERS_PER_DEGREE
+    east = (np.linspace(min_lon, max_lon, shape[1])[None, :] - b[1] / 2) * METERS_PER_DEGREE
+    width = max(dist_km * 1000 / 12, 1.0)
+    elevations = obstacle_height * np.exp(-(north * north + east * east) / (2 * width * width))
+    return elevations, bounds, a, b
+
+
+def default_z_scale(dist_km):
+    """Exageración vertical del JS: entre 3 y 5 según la distancia."""
+    return max(3.0, min(5.0, dist_km * 1000 / 4000))
+
+
+def terrain_colors(elevations, out=None):
+    """
+    Colores por altura (rampa del JS), vectorizado.
+
+    Args:
+        elevations: Array de elevaciones.
+        out: Array float32 (..., 3) donde escribir, o None.
+
+    Returns:
+        ndarray: Colores RGB en 0-1 con forma elevations.shape + (3,).
+    """
+    e = np.asarray(elevations, dtype=np.float32)
+    low = e.min()
+    t = (e - low) / max(1.0, float(e.max() - low))
+    segment = np.minimum((t * 4).astype(np.intp), 3)
+    if out is None:
+        out = np.empty(e.shape + (3,), dtype=np.float32)
+    for channel in range(3):
+        np.multiply(_RAMP_SLOPE[segment, channel], t, out=out[..., channel])
+        out[..., channel] += _RAMP_BASE[segment, channel]
+    return out
+
+
+def _block_min(levels):
+    """Mínimo por bloques de 2x2 (un nivel del quadtree hacia arriba)."""
+    n = levels.shape[0] // 2
+    return levels.reshape(n, 2, n, 2).min(axis=(1, 3))
+
+
+def _upsample(levels):
+    """Cada nodo a sus 4 hijos (un nivel del quadtree hacia abajo)."""
+    return levels.repeat(2, axis=0).repeat(2, axis=1)
+
+
+def _leaf_levels(desired, depth):
+    """
+    Nivel de la hoja del quadtree que contiene cada celda.
+
+    Un nodo de nivel L (lado 2**L celdas) es hoja si todas sus celdas piden
+    al menos ese nivel; si no, se divide.
+
+    Args:
+        desired: Nivel pedido por celda (int8, cuadrado de lado potencia
+            de 2, _OUTSIDE fuera de la malla).
+        depth: Nivel máximo.
+
+    Returns:
+        ndarray: Nivel de hoja por celda (_OUTSIDE fuera de la malla).
+    """
+    pyramid = [desired]
+    for _ in range(depth):
+        pyramid.append(_block_min(pyramid[-1]))
+
+    leaves = np.where(pyramid[depth] >= depth, depth, _OUTSIDE).astype(np.int8)
+    for level in range(depth - 1, -1, -1):
+        parent = _upsample(leaves)
+        leaves = np.where(parent != _OUTSIDE, parent, np.where(pyramid[level] >= level, level, _OUTSIDE))
+        leaves = leaves.astype(np.int8, copy=False)
+    return leaves
+
+
+def _neighbour_min(levels):
+    """Nivel mínimo de los 4 vecinos de cada celda (fuera de la malla no cuenta)."""
+    padded = np.pad(np.where(levels == _OUTSIDE, _NO_NEIGHBOUR, levels).astype(np.int8), 1,
+                    constant_values=_NO_NEIGHBOUR)
+    return np.minimum(np.minimum(padded[:-2, 1:-1], padded[2:, 1:-1]),
+                      np.minimum(padded[1:-1, :-2], padded[1:-1, 2:]))
+
+
+def _fan_template(size, pattern, width):
+    """
+    Índices relativos de una hoja de lado size (> 1) en abanico.
+
+    Args:
+        size: Lado de la hoja en celdas.
+        pattern: Bits 1/2/4/8: el lado oeste/norte/este/sur toca hojas más
+            finas y lleva punto medio.
+        width: Vértices por fila de la malla.
+
+    Returns:
+        ndarray: Desplazamientos de vértice (int64), 3 por triángulo.
+    """
+    half = size // 2
+    # Contorno (fila, columna) en el sentido de los triángulos del JS
+    corners = [(0, 0), (size, 0), (size, size), (0, size)]
+    midpoints = [(half, 0), (size, half), (half, size), (0, half)]
+    ring = []
+    for side in range(4):
+        ring.append(corners[side])
+        if pattern & (1 << side):
+            ring.append(midpoints[side])
+    center = half * width + half
+    offsets = [row * width + col for row, col in ring]
+    triangles = []
+    for k, offset in enumerate(offsets):
+        triangles.extend((center, offset, offsets[(k + 1) % len(offsets)]))
+    return np.array(triangles, dtype=np.int64)
+
+
+class TerrainMesh:
+    """
+    Buffers de malla para una malla regular de elevaciones.
+
+    Los vértices son los de la malla completa; update_lod decide qué
+    triángulos se dibujan según la posición del enlace.
+    """
+
+    def __init__(self, elevations, bounds, z_scale=1.0):
+        """
+        Args:
+            elevations: Array (filas, columnas), filas por latitud creciente.
+            bounds: (min_lat, max_lat, min_lon, max_lon) de la malla.
+            z_scale: Exageración vertical.
+        """
+        elevations = np.asarray(elevations, dtype=np.float32)
+        rows, cols = elevations.shape
+        if rows < 2 or cols < 2:
+            raise ValueError("La malla debe tener al menos 2x2 puntos.")
+        if rows * cols > np.iinfo(np.uint32).max:
+            raise ValueError("La malla tiene demasiados vértices.")
+
+        self.shape = (rows, cols)
+        self.bounds = tuple(float(v) for v in bounds)
+        min_lat, max_lat, min_lon, max_lon = self.bounds
+        self.lat0 = (min_lat + max_lat) / 2
+        self.lon0 = (min_lon + max_lon) / 2
+        self.z_scale = float(z_scale)
+        self._lon_scale = METERS_PER_DEGREE * math.cos(math.radians(self.lat0))
+        # Tamaño de celda (m) entre filas (norte) y entre columnas (este)
+        self.cell_size = (
+            (max_lat - min_lat) / (rows - 1) * METERS_PER_DEGREE,
+            (max_lon - min_lon) / (cols - 1) * self._lon_scale,
+        )
+        self.source = GridElevationSource(elevations, min_lat, max_lat, min_lon, max_lon)
+
+        self.positions = np.empty((rows * cols, 3), dtype=np.float32)
+        grid = self.positions.reshape(rows, cols, 3)
+        grid[..., 0] = ((np.linspace(min_lon, max_lon, cols) - self.lon0) * self._lon_scale)[None, :]
+        np.multiply(elevations, self.z_scale, out=grid[..., 1])
+        grid[..., 2] = ((np.linspace(min_lat, max_lat, rows) - self.lat0) * METERS_PER_DEGREE)[:, None]
+
+        self.colors = np.empty((rows * cols, 3), dtype=np.float32)
+        terrain_colors(elevations, out=self.colors.reshape(rows, cols, 3))
+
+        # Normal de la superficie y = h(x, z): (-dh/dx, 1, -dh/dz)
+        self.normals = np.empty((rows * cols, 3), dtype=np.float32)
+        normals = self.normals.reshape(rows, cols, 3)
+        d_north, d_east = np.gradient(grid[..., 1], *self.cell_size)
+        inverse = np.sqrt(d_east * d_east + d_north * d_north + 1)
+        np.reciprocal(inverse, out=inverse)
+        np.multiply(d_east, -inverse, out=normals[..., 0])
+        normals[..., 1] = inverse
+        np.multiply(d_north, -inverse, out=normals[..., 2])
+
+        # Peor caso: todas las hojas de una celda (2 triángulos por celda)
+        self._indices = np.empty((rows - 1) * (cols - 1) * 6, dtype=np.uint32)
+        self.index_count = 0
+        self._leaves = None
+        self._templates = {}
+
+    @property
+    def indices(self):
+        """Índices de triángulos en uso (vista del buffer reservado)."""
+        return self._indices[:self.index_count]
+
+    def to_world(self, lat, lon, elevation):
+        """
+        Posición 3D de un punto (mapTo3D del JS).
+
+        Returns:
+            ndarray: (x, y, z) en metros.
+        """
+        return np.array([
+            (lon - self.lon0) * self._lon_scale,
+            elevation * self.z_scale,
+            (lat - self.lat0) * METERS_PER_DEGREE,
+        ])
+
+    def elevation_at(self, lat, lon):
+        """Elevación (m) interpolada en la malla."""
+        return float(self.source.lookup(np.array([lat]), np.array([lon]))[0])
+
+    def _to_cells(self, lat, lon):
+        """Coordenadas (fila, columna) fraccionarias en la malla."""
+        min_lat, max_lat, min_lon, max_lon = self.bounds
+        rows, cols = self.shape
+        return ((lat - min_lat) / (max_lat - min_lat) * (rows - 1),
+                (lon - min_lon) / (max_lon - min_lon) * (cols - 1))
+
+    def _desired_levels(self, a, b, lod_factor, depth, size):
+        """Nivel pedido por cada celda según su distancia al trayecto A-B."""
+        rows, cols = self.shape[0] - 1, self.shape[1] - 1
+        d_row, d_col = self.cell_size
+        row_a, col_a = self._to_cells(*a)
+        row_b, col_b = self._to_cells(*b)
+
+        # Centros de celda en metros respecto a A; distancia al segmento
+        y = ((np.arange(rows, dtype=np.float32) + 0.5 - row_a) * d_row)[:, None]
+        x = ((np.arange(cols, dtype=np.float32) + 0.5 - col_a) * d_col)[None, :]
+        seg_y = (row_b - row_a) * d_row
+        seg_x = (col_b - col_a) * d_col
+        length2 = seg_x * seg_x + seg_y * seg_y
+        if length2 > 0:
+            t = (x * np.float32(seg_x / length2)) + (y * np.float32(seg_y / length2))
+            np.clip(t, 0, 1, out=t)
+            x = x - t * np.float32(seg_x)
+            y = y - t * np.float32(seg_y)
+        distance = np.sqrt(x * x + y * y)
+
+        # Nivel = log2 de (distancia en celdas / lod_factor), entre 0 y depth
+        distance /= np.float32(min(d_row, d_col) * lod_factor)
+        np.maximum(distance, 1, out=distance)
+        levels = np.minimum(np.log2(distance), depth).astype(np.int8)
+
+        desired = np.full((size, size), _OUTSIDE, dtype=np.int8)
+        desired[:rows, :cols] = levels
+        return desired
+
+    def update_lod(self, a, b, lod_factor=DEFAULT_LOD_FACTOR, max_leaf=DEFAULT_MAX_LEAF):
+        """
+        Regenera los índices para un enlace entre a y b.
+
+        Args:
+            a, b: Extremos (lat, lon) del enlace.
+            lod_factor: Mayor = más detalle lejos del trayecto.
+            max_leaf: Lado máximo de hoja en celdas (1 = malla completa).
+
+        Returns:
+            dict: 'triangles', 'leaves' ({lado: número de hojas}) y
+            'rebuilt' (False si el mapa de hojas no cambió).
+        """
+        rows, cols = self.shape[0] - 1, self.shape[1] - 1
+        size = 1 << max(0, max(rows, cols) - 1).bit_length()
+        depth = min(size.bit_length() - 1, max(0, int(max_leaf).bit_length() - 1))
+
+        desired = self._desired_levels(a, b, lod_factor, depth, size)
+        # Equilibrado: hojas vecinas difieren como mucho en un nivel
+        while True:
+            leaves = _leaf_levels(desired, depth)
+            limit = _neighbour_min(leaves).astype(np.int16) + 1
+            inside = leaves != _OUTSIDE
+            if not np.any(leaves[inside] > limit[inside]):
+                break
+            np.minimum(desired, np.where(inside, limit, _OUTSIDE).astype(np.int8), out=desired)
+
+        leaves = leaves[:rows, :cols]
+        if self._leaves is not None and np.array_equal(leaves, self._leaves):
+            return self._lod_stats(rebuilt=False)
+        self._leaves = leaves
+        self._write_indices(leaves, depth)
+        return self._lod_stats(rebuilt=True)
+
+    def _lod_stats(self, rebuilt):
+        counts = {}
+        for level in range(int(self._leaves.max()) + 1):
+            step = 1 << level
+            origins = self._leaves[::step, ::step]
+            n = int(np.count_nonzero(origins == level))
+            if n:
+                counts[step] = n
+        return {'triangles': self.index_count // 3, 'leaves': counts, 'rebuilt': rebuilt}
+
+    def _write_indices(self, leaves, depth):
+        """Triangula las hojas en el buffer de índices reservado."""
+        width = self.shape[1]
+        padded = np.pad(np.where(leaves == _OUTSIDE, _NO_NEIGHBOUR, leaves), 1,
+                        constant_values=_NO_NEIGHBOUR)
+        position = 0
+        for level in range(depth + 1):
+            step = 1 << level
+            r0, c0 = np.nonzero(leaves[::step, ::step] == level)
+            if len(r0) == 0:
+                continue
+            r0 *= step
+            c0 *= step
+            base = r0.astype(np.int64) * width + c0
+
+            if level == 0:
+                groups = [(0, slice(None))]
+            else:
+                # Un vecino del lado es más fino si su primera celda lo es
+                # (con el equilibrado basta una muestra por lado)
+                pattern = (
+                    (padded[r0 + 1, c0] < level).astype(np.intp)
+                    | (padded[r0 + step + 1, c0 + 1] < level) << 1
+                    | (padded[r0 + 1, c0 + step + 1] < level) << 2
+                    | (padded[r0, c0 + 1] < level) << 3
+                )
+                groups = [(p, pattern == p) for p in np.unique(pattern)]
+
+            for p, mask in groups:
+                template = self._template(step, int(p), width)
+                group = base[mask]
+                count = len(group) * len(template)
+                out = self._indices[position:position + count].reshape(len(group), len(template))
+                np.add(group[:, None], template[None, :], out=out, casting='unsafe')
+                position += count
+        self.index_count = position
+
+    def _template(self, size, pattern, width):
+        key = (size, pattern)
+        template = self._templates.get(key)
+        if template is None:
+            if size == 1:
+                # Celda completa: (a, c, b, b, c, d) como en el JS
+                template = np.array([0, width, 1, 1, width, width + 1], dtype=np.int64)
+            else:
+                template = _fan_template(size, pattern, width)
+            self._templates[key] = template
+        return template
+
+
+def default_camera(mesh, a, b, h_a=0.0, h_b=0.0):
+    """
+    Cámara del JS: detrás de A, elevada, mirando al centro del enlace.
+
+    Args:
+        mesh: TerrainMesh.
+        a, b: Extremos (lat, lon).
+        h_a, h_b: Alturas de antena (m).
+
+    Returns:
+        dict: 'eye' y 'target' (posiciones 3D).
+    """
+    el_a = mesh.elevation_at(*a)
+    el_b = mesh.elevation_at(*b)
+    p_a = mesh.to_world(a[0], a[1], el_a)
+    p_b = mesh.to_world(b[0], b[1], el_b)
+    dist = float(np.hypot(p_b[0] - p_a[0], p_b[2] - p_a[2]))
+    cam = max(dist * 1.2, 3000.0)
+    return {
+        'eye': np.array([p_a[0] - cam * 0.8, cam * 0.6, p_b[2] + cam * 0.8]),
+        'target': np.array([(p_a[0] + p_b[0]) / 2, (el_a + el_b) / 2 * mesh.z_scale * 0.6, (p_a[2] + p_b[2]) / 2]),
+    }
+
+
+def project(points, eye, target, width, height, fov=45.0):
+    """
+    Proyección en perspectiva a píxeles.
+
+    Args:
+        points: Array (N, 3) de posiciones.
+        eye, target: Posición de la cámara y punto al que mira.
+        width, height: Tamaño de la imagen (px).
+        fov: Campo de visión vertical (grados).
+
+    Returns:
+        tuple: (xy (N, 2) en píxeles, profundidad (N,) en metros).
+    """
+    eye = np.asarray(eye, dtype=np.float64)
+    forward = np.asarray(target, dtype=np.float64) - eye
+    forward /= np.linalg.norm(forward)
+    right = np.cross(forward, (0.0, 1.0, 0.0))
+    right /= np.linalg.norm(right)
+    up = np.cross(right, forward)
+
+    view = np.asarray(points, dtype=np.float64) - eye
+    depth = view @ forward
+    focal = height / 2 / math.tan(math.radians(fov) / 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = focal / depth
+    xy = np.empty((len(view), 2))
+    xy[:, 0] = width / 2 + (view @ right) * scale
+    xy[:, 1] = height / 2 - (view @ up) * scale
+    return xy, depth
+
+
+def render_triangles(mesh, camera, width, height, light=(-0.4, 0.8, 0.45), near=1.0):
+    """
+    Triángulos visibles proyectados, sombreados y ordenados para pintar.
+
+    Se dibujan en orden (del más lejano al más cercano: algoritmo del
+    pintor) con color plano: color medio de sus vértices por la luz
+    difusa de la normal media más un término ambiente.
+
+    Args:
+        mesh: TerrainMesh con update_lod ya aplicado.
+        camera: dict con 'eye' y 'target' (ver default_camera).
+        width, height: Tamaño de la imagen (px).
+        light: Dirección hacia la luz.
+        near: Distancia mínima a la cámara (m).
+
+    Returns:
+        tuple: (polígonos (T, 3, 2) float en px, colores (T, 3) uint8).
+    """
+    triangles = mesh.indices.reshape(-1, 3)
+    used, inverse = np.unique(triangles, return_inverse=True)
+    xy, depth = project(mesh.positions[used], camera['eye'], camera['target'], width, height)
+    tri = inverse.reshape(-1, 3)
+
+    polygons = xy[tri]
+    tri_depth = depth[tri]
+    lo = polygons.min(axis=1)
+    hi = polygons.max(axis=1)
+    visible = ((tri_depth > near).all(axis=1)
+               & (hi[:, 0] >= 0) & (lo[:, 0] <= width)
+               & (hi[:, 1] >= 0) & (lo[:, 1] <= height))
+    tri = tri[visible]
+    polygons = polygons[visible]
+    order = np.argsort(-tri_depth[visible].mean(axis=1), kind='stable')
+    tri = tri[order]
+    polygons = polygons[order]
+
+    light = np.asarray(light, dtype=np.float32)
+    light /= np.linalg.norm(light)
+    normal = mesh.normals[used][tri].mean(axis=1)
+    diffuse = np.clip(normal @ light / np.linalg.norm(normal, axis=1), 0, 1)
+    color = mesh.colors[used][tri].mean(axis=1) * (0.45 + 0.75 * diffuse)[:, None]
+    return polygons, np.clip(color * 255, 0, 255).astype(np.uint8)
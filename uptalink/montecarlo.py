@@ -0,0 +1,283 @@
+"""
+Simulación Monte Carlo del nivel recibido de un enlace.
+
+Alrededor del rssi/margen deterministas de LinkBudgetCalculator se
+sortean, por muestra:
+
+    - Desvanecimiento multitrayecto: potencia de una envolvente de Rice
+      con factor K (K = 0 es Rayleigh).
+    - Lluvia: un instante al azar del año (p uniforme en 0-100 %) y la
+      atenuación excedida ese porcentaje del tiempo según rain.attenuation,
+      de modo que P(A > M) coincide con rain.outage_probability(M). Por
+      encima de p = rain.MAX_OUTAGE (1 %) la fórmula de P.530 se
+      extrapola, igual que en outage_probability: la atenuación sigue
+      decreciendo con p y solo pesa en márgenes de pocos dB.
+      Con Margen de Lluvia (rain_margin > 0) también hay corte si la
+      lluvia supera ese presupuesto, como en rain.availability.
+    - Interferencia (opcional): I/N log-normal; degrada el margen en
+      10*log10(1 + I/N).
+
+Las muestras se procesan en bloques de tamaño fijo (memoria acotada) en
+un pool de procesos. Cada bloque devuelve el número de cortes y un
+histograma de pérdidas de ancho fijo, que se suman en el proceso
+principal. De ahí salen los percentiles del nivel recibido y la
+probabilidad de corte con su intervalo de confianza (Wilson). simulate()
+es un generador que produce un resumen tras cada bloque y se detiene
+cuando el intervalo es suficientemente estrecho.
+
+Reproducibilidad: el bloque n usa SeedSequence(seed, spawn_key=(n,)) y
+los bloques se consumen en orden, así que la misma semilla y el mismo
+tamaño de bloque dan el mismo resultado con cualquier número de procesos.
+"""
+
+import math
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from uptalink import rain
+from uptalink.calculator import LinkBudgetCalculator
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_MAX_SAMPLES = 10 ** 9
+DEFAULT_MIN_SAMPLES = 1 << 22
+
+# Factor K de Rice (dB) por defecto: enlace con línea de vista
+DEFAULT_RICE_K_DB = 6.0
+
+# Histograma de pérdidas (dB); los valores fuera de rango caen en los extremos
+LOSS_MIN = -20.0
+LOSS_MAX = 200.0
+LOSS_BIN = 0.05
+_N_BINS = int(round((LOSS_MAX - LOSS_MIN) / LOSS_BIN))
+
+# Percentiles (%) del nivel recibido que se informan: cola baja
+REPORT_PERCENTILES = (0.01, 0.1, 1.0, 10.0, 50.0)
+
+
+def simulate_chunk(seed, index, n, margin, a001, rice_k_db=DEFAULT_RICE_K_DB, interference=None,
+                   latitude=None, rain_budget=None):
+    """
+    Simula un bloque de n muestras (se ejecuta en los procesos del pool).
+
+    Args:
+        seed: Semilla de la simulación.
+        index: Número de bloque (selecciona el flujo aleatorio).
+        n: Muestras del bloque.
+        margin: Margen de desvanecimiento determinista (dB).
+        a001: Atenuación por lluvia excedida el 0.01 % del tiempo (dB).
+        rice_k_db: Factor K de Rice (dB); None = Rayleigh.
+        interference: (media, desviación) de I/N en dB, o None.
+        latitude: Ver rain.attenuation.
+        rain_budget: Presupuesto de lluvia (dB) si hay Margen de Lluvia:
+            la lluvia que lo supera es corte por sí sola. None = sin él.
+
+    Returns:
+        tuple: (cortes, histograma de pérdidas int64).
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+    # Potencia normalizada (media 1) de una envolvente de Rice
+    k = 0.0 if rice_k_db is None else 10 ** (rice_k_db / 10)
+    los = math.sqrt(k / (k + 1))
+    sigma = math.sqrt(1 / (2 * (k + 1)))
+    x = rng.standard_normal(n)
+    x *= sigma
+    x += los
+    y = rng.standard_normal(n)
+    y *= sigma
+    x *= x
+    y *= y
+    x += y
+    loss = np.log10(x, out=x)
+    loss *= -10
+
+    rain_outage = None
+    if a001 > 0:
+        # p en todo el año: por encima de MAX_OUTAGE es extrapolación de P.530
+        p = rng.random(n)
+        p *= 100
+        np.maximum(p, rain.MIN_OUTAGE, out=p)
+        att = rain.attenuation(p, a001, latitude)
+        if rain_budget is not None:
+            rain_outage = att > rain_budget
+        loss += att
+
+    if interference is not None:
+        mean, std = interference
+        inr = rng.normal(mean / 10, std / 10, n)
+        np.power(10.0, inr, out=inr)
+        inr += 1
+        loss += 10 * np.log10(inr, out=inr)
+
+    cut = loss > margin
+    if rain_outage is not None:
+        cut |= rain_outage
+    outages = int(np.count_nonzero(cut))
+    loss -= LOSS_MIN
+    loss /= LOSS_BIN
+    np.clip(loss, 0, _N_BINS - 1, out=loss)
+    hist = np.bincount(loss.astype(np.intp), minlength=_N_BINS)
+    return outages, hist
+
+
+def wilson_interval(successes, n, confidence=0.95):
+    """Intervalo de Wilson (fracciones) para una proporción binomial."""
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    phat = successes / n
+    denom = 1 + z * z / n
+    center = (phat + z * z / (2 * n)) / denom
+    half = z * math.sqrt(phat * (1 - phat) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def _summary(rssi, samples, outages, hist, confidence):
+    low, high = wilson_interval(outages, samples, confidence)
+    cumulative = np.cumsum(hist)
+    percentiles = {}
+    for q in REPORT_PERCENTILES:
+        # El percentil q del nivel recibido es el (100 - q) de las pérdidas
+        rank = min(samples - 1, int(samples * (1 - q / 100)))
+        bin_index = int(np.searchsorted(cumulative, rank, side='right'))
+        percentiles[q] = rssi - (LOSS_MIN + (bin_index + 0.5) * LOSS_BIN)
+    outage = 100 * outages / samples
+    return {
+        'samples': samples,
+        'outages': outages,
+        'outage': outage,
+        'outage_ci': (100 * low, 100 * high),
+        'availability': 100 - outage,
+        'percentiles': percentiles,
+    }
+
+
+def simulate(rssi, sens, freq, dist, seed=0, rain_margin=0.0, rain_rate=rain.DEFAULT_RAIN_RATE,
+             polarization=rain.DEFAULT_POLARIZATION, latitude=None, rice_k_db=DEFAULT_RICE_K_DB,
+             interference=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=None,
+             max_samples=DEFAULT_MAX_SAMPLES, min_samples=DEFAULT_MIN_SAMPLES,
+             rel_precision=0.05, abs_precision=1e-4, confidence=0.95):
+    """
+    Simulación en streaming del nivel recibido.
+
+    Args:
+        rssi: Nivel recibido determinista (dBm).
+        sens: Sensibilidad del receptor (dBm); hay corte si el nivel cae por debajo.
+        freq, dist: Frecuencia (GHz) y distancia (Km), para la lluvia.
+        seed: Semilla (misma semilla y chunk_size = mismos resultados).
+        rain_margin: Margen de Lluvia (dB), como en rain.availability; 0 =
+            todo el margen de desvanecimiento cubre la lluvia.
+        rain_rate, polarization, latitude: Ver uptalink.rain.
+        rice_k_db: Factor K de Rice (dB); None = Rayleigh.
+        interference: (media, desviación) de I/N en dB, o None.
+        chunk_size: Muestras por bloque.
+        workers: Procesos del pool (None = todos los núcleos; 1 = sin pool).
+        max_samples: Tope de muestras.
+        min_samples: Muestras mínimas antes de poder parar.
+        rel_precision: Se para cuando la semiamplitud del intervalo es
+            <= rel_precision * probabilidad de corte...
+        abs_precision: ... o <= abs_precision (en %), para enlaces casi
+            sin cortes.
+        confidence: Nivel de confianza del intervalo.
+
+    Yields:
+        dict: Tras cada bloque: 'samples', 'outages', 'outage' (%),
+        'outage_ci' (%, %), 'availability' (%), 'percentiles'
+        ({q: nivel dBm}) y 'done' (None o 'precision' / 'max_samples').
+    """
+    if freq <= 0 or dist <= 0:
+        raise ValueError("La Frecuencia y la Distancia deben ser mayores a 0.")
+    margin = rssi - sens
+    a001 = float(rain.attenuation_001(freq, dist, rain_rate, polarization))
+    rain_budget = min(rain_margin, margin) if rain_margin > 0 else None
+    args = (margin, a001, rice_k_db, interference, latitude, rain_budget)
+
+    samples = 0
+    outages = 0
+    hist = np.zeros(_N_BINS, dtype=np.int64)
+
+    def consume(result, n):
+        nonlocal samples, outages
+        samples += n
+        outages += result[0]
+        np.add(hist, result[1], out=hist)
+        summary = _summary(rssi, samples, outages, hist, confidence)
+        low, high = summary['outage_ci']
+        half = (high - low) / 2
+        done = None
+        if samples >= max_samples:
+            done = 'max_samples'
+        elif samples >= min_samples and half <= max(rel_precision * summary['outage'], abs_precision):
+            done = 'precision'
+        summary['done'] = done
+        return summary
+
+    def chunk_sizes():
+        index = 0
+        planned = 0
+        while planned < max_samples:
+            n = min(chunk_size, max_samples - planned)
+            yield index, n
+            index += 1
+            planned += n
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for index, n in chunk_sizes():
+            summary = consume(simulate_chunk(seed, index, n, *args), n)
+            yield summary
+            if summary['done']:
+                return
+        return
+
+    # 'spawn': la simulación puede lanzarse desde un hilo de la app Qt y
+    # hacer fork de un proceso multihilo no es seguro
+    context = multiprocessing.get_context('spawn')
+    max_pending = workers * 2
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        try:
+            for index, n in chunk_sizes():
+                pending.append((n, pool.submit(simulate_chunk, seed, index, n, *args)))
+                if len(pending) < max_pending:
+                    continue
+                n_done, future = pending.popleft()
+                summary = consume(future.result(), n_done)
+                yield summary
+                if summary['done']:
+                    return
+            while pending:
+                n_done, future = pending.popleft()
+                summary = consume(future.result(), n_done)
+                yield summary
+                if summary['done']:
+                    return
+        finally:
+            # Parada temprana o cancelación (generator.close()): descartar lo pendiente
+            for _, future in pending:
+                future.cancel()
+
+
+def simulate_link(inputs, **kwargs):
+    """
+    simulate() para los valores del panel de entradas.
+
+    Args:
+        inputs: dict con las claves de store.INPUT_FIELDS.
+        **kwargs: Opciones de simulate.
+
+    Yields:
+        dict: Igual que simulate.
+    """
+    r = LinkBudgetCalculator.calculate(
+        inputs['freq'], inputs['dist'], inputs['p_tx'], inputs['g_a'], inputs['g_b'],
+        inputs['cable_loss'], inputs['sens'], inputs['cost_eq'], inputs['hours'], rain_margin=inputs['rain_margin'],
+        bandwidth=inputs['bandwidth'], noise_figure=inputs['noise_figure'], temperature=inputs['temperature']
+    )
+    kwargs.setdefault('rain_margin', inputs['rain_margin'])
+    return simulate(r['rssi'], inputs['sens'], inputs['freq'], inputs['dist'], **kwargs)
@@ -0,0 +1,383 @@
+"""
+Planificación de red: presupuesto de enlace para todos los pares viables.
+
+Dado un listado de emplazamientos (coordenadas, altura de torre y
+equipo), calcula los enlaces posibles entre todos los pares sin recorrer
+los N² pares:
+
+    1. Con el solver se obtiene el alcance máximo de la red (mejor
+       transmisor contra el mejor receptor); ningún par más lejano puede
+       cumplir el margen.
+    2. Los emplazamientos se colocan en una rejilla uniforme 3D (sobre el
+       vector unitario de cada coordenada, válida a cualquier latitud) con
+       celdas del tamaño de ese alcance; solo se comparan celdas vecinas.
+    3. Los pares candidatos se evalúan por bloques, vectorizados con
+       NumPy, en un pool de procesos con una ventana acotada de bloques en
+       vuelo (como el modo batch).
+    4. Los pares viables forman un grafo disperso (CSR).
+
+El margen de cada par es el del peor sentido: para A -> B
+    p_tx_A + gain_A + gain_B - fspl - cable_loss_A - cable_loss_B - sens_B
+con el mismo FSPL que LinkBudgetCalculator y la distancia haversine del
+JS original. El despeje se evalúa a mitad de trayecto sobre tierra plana
+con abultamiento terrestre (sin modelo de terreno).
+"""
+
+import csv
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from uptalink import solver, terrain
+from uptalink.calculator import LinkBudgetCalculator
+
+# Columnas del listado de emplazamientos (obligatorias y opcionales con su valor por defecto)
+SITE_FIELDS = ('id', 'lat', 'lon', 'p_tx', 'gain', 'sens')
+SITE_DEFAULTS = {'height': 0.0, 'cable_loss': 0.0}
+
+# Columnas por enlace en NetworkGraph.edges y en el CSV de salida
+EDGE_FIELDS = ('dist', 'fspl', 'margin_ab', 'margin_ba', 'margin', 'clearance')
+
+DEFAULT_CHUNK_SIZE = 200000
+
+# Datos de emplazamientos en cada proceso del pool (ver _init_worker)
+_worker_sites = None
+
+
+def load_sites(path):
+    """
+    Lee un CSV de emplazamientos.
+
+    Args:
+        path: Ruta del CSV con cabecera; columnas id, lat, lon, p_tx (dBm),
+            gain (dBi), sens (dBm) y opcionalmente height (m) y
+            cable_loss (dB, pérdidas en ese extremo).
+
+    Returns:
+        dict: 'id' (lista) y arrays float64 por columna numérica.
+    """
+    with open(path, newline='', encoding='utf-8') as fh:
+        rows = list(csv.DictReader(fh))
+    if rows:
+        missing = [name for name in SITE_FIELDS if name not in rows[0]]
+        if missing:
+            raise ValueError(f"Faltan columnas obligatorias en el CSV: {', '.join(missing)}")
+
+    sites = {'id': [row['id'] for row in rows]}
+    for name in SITE_FIELDS[1:] + tuple(SITE_DEFAULTS):
+        default = SITE_DEFAULTS.get(name)
+        values = []
+        for n, row in enumerate(rows, start=2):
+            cell = (row.get(name) or '').strip()
+            if not cell:
+                if default is None:
+                    raise ValueError(f"Línea {n}: falta '{name}'.")
+                values.append(default)
+                continue
+            try:
+                values.append(float(cell))
+            except ValueError:
+                raise ValueError(f"Línea {n}: '{name}' no es numérico ({cell!r}).") from None
+        sites[name] = np.array(values, dtype=np.float64)
+    return sites
+
+
+def max_reach(sites, freq, margin=LinkBudgetCalculator.MARGIN_THRESHOLD):
+    """
+    Distancia (Km) por encima de la cual ningún par puede cumplir el margen.
+
+    Combina el mejor transmisor con el mejor receptor (que no tienen por
+    qué ser el mismo emplazamiento), por lo que es una cota superior.
+    """
+    if len(sites['lat']) == 0:
+        return 0.0
+    tx = np.max(sites['p_tx'] + sites['gain'] - sites['cable_loss'])
+    rx = np.max(sites['gain'] - sites['cable_loss'] - sites['sens'])
+    return float(solver.max_distance(freq, tx, 0, 0, 0, -rx, margin))
+
+
+def _unit_vectors(lat, lon):
+    lat = np.radians(lat)
+    lon = np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+# Vecinos "hacia delante" de una celda 3D (incluida ella misma): cada par
+# de celdas vecinas se visita una sola vez
+_HALF_NEIGHBOURS = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    if (dx, dy, dz) >= (0, 0, 0)
+]
+
+
+def candidate_pairs(lat, lon, max_km, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Pares de emplazamientos a menos de max_km, por bloques.
+
+    Yields:
+        tuple: (i, j) arrays int64 con i < j; la distancia exacta se filtra
+        aquí con la cuerda 3D, equivalente a la de gran círculo.
+    """
+    n = len(lat)
+    if n < 2 or not max_km > 0:
+        return
+    angle = max_km * 1000 / terrain.EARTH_RADIUS
+    if angle >= math.pi:
+        # Alcance mayor que medio globo: todos los pares son candidatos
+        chord = 2.0
+    else:
+        chord = 2 * math.sin(angle / 2)
+
+    points = _unit_vectors(lat, lon)
+    cells = np.floor(points / max(chord, 1e-9)).astype(np.int64)
+    keys, inverse = np.unique(cells, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(inverse, kind='stable')
+    counts = np.bincount(inverse, minlength=len(keys))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    lookup = {tuple(key): c for c, key in enumerate(keys.tolist())}
+    limit = chord * chord
+
+    buf_i, buf_j, size = [], [], 0
+    for c, key in enumerate(keys.tolist()):
+        members = order[starts[c]:starts[c] + counts[c]]
+        for dx, dy, dz in _HALF_NEIGHBOURS:
+            other = lookup.get((key[0] + dx, key[1] + dy, key[2] + dz))
+            if other is None:
+                continue
+            if other == c:
+                if len(members) < 2:
+                    continue
+                ii, jj = np.triu_indices(len(members), k=1)
+                i, j = members[ii], members[jj]
+            else:
+                others = order[starts[other]:starts[other] + counts[other]]
+                i = np.repeat(members, len(others))
+                j = np.tile(others, len(members))
+            delta = points[i] - points[j]
+            keep = np.einsum('ij,ij->i', delta, delta) <= limit
+            if not keep.all():
+                i, j = i[keep], j[keep]
+            if len(i) == 0:
+                continue
+            swap = i > j
+            i, j = np.where(swap, j, i), np.where(swap, i, j)
+            buf_i.append(i)
+            buf_j.append(j)
+            size += len(i)
+            if size >= chunk_size:
+                yield np.concatenate(buf_i), np.concatenate(buf_j)
+                buf_i, buf_j, size = [], [], 0
+    if size:
+        yield np.concatenate(buf_i), np.concatenate(buf_j)
+
+
+def evaluate_pairs(sites, i, j, freq, k_factor=terrain.DEFAULT_K_FACTOR):
+    """
+    Presupuesto de enlace vectorizado para los pares (i, j).
+
+    Returns:
+        dict: Arrays con las columnas de EDGE_FIELDS (dist en Km; margin
+        es el mínimo de los dos sentidos; clearance en % de la 1ª zona de
+        Fresnel a mitad de trayecto).
+    """
+    lat, lon = sites['lat'], sites['lon']
+    dist = terrain.haversine(lat[i], lon[i], lat[j], lon[j]) / 1000
+    with np.errstate(divide='ignore'):
+        fspl = 20 * np.log10(dist) + 20 * math.log10(freq) + solver.FSPL_CONSTANT
+
+    p_tx, gain, cable, sens = sites['p_tx'], sites['gain'], sites['cable_loss'], sites['sens']
+    common = gain[i] + gain[j] - cable[i] - cable[j] - fspl
+    margin_ab = p_tx[i] + common - sens[j]
+    margin_ba = p_tx[j] + common - sens[i]
+
+    # Despeje a mitad de trayecto: línea de vista sobre tierra plana menos el
+    # abultamiento (eDrop), relativo al radio de Fresnel (calcFR con d1 = d2)
+    height = sites['height']
+    bulge = terrain.earth_drop(dist / 2, dist, k_factor)
+    fresnel = 17.32 * np.sqrt(dist / (4 * freq))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        clearance = np.where(fresnel > 0, ((height[i] + height[j]) / 2 - bulge) / fresnel * 100, np.inf)
+
+    return {
+        'dist': dist,
+        'fspl': fspl,
+        'margin_ab': margin_ab,
+        'margin_ba': margin_ba,
+        'margin': np.minimum(margin_ab, margin_ba),
+        'clearance': clearance,
+    }
+
+
+def _init_worker(sites):
+    global _worker_sites
+    _worker_sites = sites
+
+
+def _evaluate_chunk(i, j, freq, margin, require_clear, k_factor, sites=None):
+    """Evalúa un bloque y devuelve solo los pares viables (i, j, columnas)."""
+    r = evaluate_pairs(_worker_sites if sites is None else sites, i, j, freq, k_factor)
+    # Emplazamientos coincidentes no forman enlace (como Distancia 0 en calculate)
+    keep = (r['dist'] > 0) & (r['margin'] > margin)
+    if require_clear:
+        keep &= r['clearance'] >= terrain.CLEARANCE_THRESHOLD
+    return i[keep], j[keep], {name: r[name][keep] for name in EDGE_FIELDS}
+
+
+class NetworkGraph:
+    """
+    Grafo disperso no dirigido de enlaces viables.
+
+    Cada enlace se guarda una vez (i < j) en edges; la adyacencia en
+    formato CSR (indptr/indices/edge_index) permite recorrer los vecinos
+    de un emplazamiento sin buscar.
+    """
+
+    def __init__(self, site_ids, i, j, edges):
+        self.site_ids = list(site_ids)
+        self.i = i
+        self.j = j
+        self.edges = edges
+
+        n = len(self.site_ids)
+        ends = np.concatenate((i, j))
+        others = np.concatenate((j, i))
+        edge_ids = np.concatenate((np.arange(len(i)), np.arange(len(i))))
+        order = np.argsort(ends, kind='stable')
+        self.indices = others[order]
+        self.edge_index = edge_ids[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=n), out=self.indptr[1:])
+
+    def __len__(self):
+        return len(self.i)
+
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def neighbors(self, site):
+        """
+        Args:
+            site: Índice del emplazamiento.
+
+        Returns:
+            list: Tuplas (índice_vecino, margen) ordenadas por margen descendente.
+        """
+        start, end = self.indptr[site], self.indptr[site + 1]
+        margins = self.edges['margin'][self.edge_index[start:end]]
+        order = np.argsort(-margins, kind='stable')
+        return list(zip(self.indices[start:end][order].tolist(), margins[order].tolist()))
+
+    def write_csv(self, fh):
+        """Escribe un enlace por línea: site_a, site_b y EDGE_FIELDS."""
+        writer = csv.writer(fh)
+        writer.writerow(('site_a', 'site_b') + EDGE_FIELDS)
+        columns = np.column_stack([self.edges[name] for name in EDGE_FIELDS]).round(4).tolist()
+        ids = self.site_ids
+        for a, b, values in zip(self.i.tolist(), self.j.tolist(), columns):
+            writer.writerow([ids[a], ids[b]] + values)
+
+
+def plan_network(sites, freq, margin=LinkBudgetCalculator.MARGIN_THRESHOLD, max_range_km=None,
+                 require_clear=False, k_factor=terrain.DEFAULT_K_FACTOR, workers=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Calcula todos los enlaces viables de la red.
+
+    Args:
+        sites: dict de load_sites (o con las mismas columnas).
+        freq: Frecuencia de la red (GHz).
+        margin: Margen requerido (dB), en ambos sentidos.
+        max_range_km: Alcance máximo adicional (p. ej. el del equipo).
+        require_clear: Exigir despeje >= CLEARANCE_THRESHOLD.
+        k_factor: Factor K para el abultamiento terrestre.
+        workers: Procesos del pool (None = todos los núcleos; 1 = sin pool).
+        chunk_size: Pares candidatos por bloque.
+        progress: Callback opcional progress(pares_candidatos_evaluados).
+
+    Returns:
+        NetworkGraph
+    """
+    if freq <= 0:
+        raise ValueError("La Frecuencia debe ser mayor a 0.")
+    sites = dict(sites)
+    n = len(sites['lat'])
+    for name, default in SITE_DEFAULTS.items():
+        if name not in sites:
+            sites[name] = np.full(n, default)
+    for name in SITE_FIELDS[1:] + tuple(SITE_DEFAULTS):
+        sites[name] = np.asarray(sites[name], dtype=np.float64)
+    if 'id' not in sites:
+        sites['id'] = [str(k) for k in range(n)]
+
+    reach = max_reach(sites, freq, margin)
+    if max_range_km is not None:
+        reach = min(reach, max_range_km)
+
+    arrays = {name: sites[name] for name in SITE_FIELDS[1:] + tuple(SITE_DEFAULTS)}
+    chunks = candidate_pairs(sites['lat'], sites['lon'], reach, chunk_size)
+    found = []
+    evaluated = 0
+
+    def collect(result, n_pairs):
+        nonlocal evaluated
+        found.append(result)
+        evaluated += n_pairs
+        if progress:
+            progress(evaluated)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for i, j in chunks:
+            collect(_evaluate_chunk(i, j, freq, margin, require_clear, k_factor, arrays), len(i))
+    else:
+        # Los datos de emplazamientos viajan una vez por proceso, no en cada bloque
+        max_pending = workers * 2
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(arrays,)) as pool:
+            for i, j in chunks:
+                pending.append((len(i), pool.submit(_evaluate_chunk, i, j, freq, margin, require_clear, k_factor)))
+                if len(pending) >= max_pending:
+                    n_pairs, future = pending.popleft()
+                    collect(future.result(), n_pairs)
+            while pending:
+                n_pairs, future = pending.popleft()
+                collect(future.result(), n_pairs)
+
+    if found:
+        i = np.concatenate([f[0] for f in found])
+        j = np.concatenate([f[1] for f in found])
+        edges = {name: np.concatenate([f[2][name] for f in found]) for name in EDGE_FIELDS}
+        order = np.lexsort((j, i))
+        i, j = i[order], j[order]
+        edges = {name: values[order] for name, values in edges.items()}
+    else:
+        i = j = np.zeros(0, dtype=np.int64)
+        edges = {name: np.zeros(0) for name in EDGE_FIELDS}
+    return NetworkGraph(sites['id'], i, j, edges)
+
+
+def main(args):
+    """Punto de entrada de 'python -m uptalink network'."""
+    import sys
+    import time
+
+    start = time.perf_counter()
+    sites = load_sites(args.sites)
+    graph = plan_network(
+        sites, args.freq, margin=args.margin, max_range_km=args.max_range,
+        require_clear=args.require_clear, workers=args.workers,
+    )
+    if args.output == '-':
+        graph.write_csv(sys.stdout)
+    else:
+        with open(args.output, 'w', newline='', encoding='utf-8') as fh:
+            graph.write_csv(fh)
+    elapsed = time.perf_counter() - start
+    print(f"{len(sites['id'])} emplazamientos, {len(graph)} enlaces viables ({elapsed:.1f} s).", file=sys.stderr)
+    return 0
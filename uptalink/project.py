@@ -0,0 +1,499 @@
+"""
+Fichero de proyecto binario por columnas con carga perezosa (mmap).
+
+Un proyecto guarda los enlaces como columnas tipadas y los perfiles y
+rásteres de cobertura como arrays contiguos. Estructura del fichero:
+
+    cabecera (24 bytes): MAGIC, offset y longitud del índice
+    secciones de datos, alineadas a 64 bytes
+    índice JSON: nombre -> offset, dtype, forma y atributos
+
+Abrir un proyecto solo lee la cabecera y el índice y mapea el fichero en
+memoria; cada columna o array es una vista NumPy sobre el mapa que no se
+lee de disco hasta que se accede. Guardar es incremental: las secciones
+modificadas y un índice nuevo se añaden al final y la cabecera se
+reescribe al terminar, así que un corte a mitad deja el proyecto anterior
+intacto. El espacio de las versiones antiguas se recupera con compact().
+
+Las columnas de texto (link_id, status, alert) se guardan como en Arrow:
+offsets int64 más un bloque UTF-8; None se guarda como cadena vacía.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from uptalink.store import COLUMNS, TEXT_OUTPUTS
+
+MAGIC = b'UPTPRJ01'
+HEADER = struct.Struct('<8sQQ')
+ALIGNMENT = 64
+FORMAT_VERSION = 1
+
+LINKS_PREFIX = 'links/'
+PROFILES_PREFIX = 'profiles/'
+RASTERS_PREFIX = 'rasters/'
+
+TEXT_COLUMNS = ('link_id',) + TEXT_OUTPUTS
+NUMERIC_COLUMNS = tuple(name for name in COLUMNS if name not in TEXT_COLUMNS)
+
+
+class ProjectFormatError(ValueError):
+    """El fichero no es un proyecto de UPTALINK o está dañado."""
+
+
+class TextColumn:
+    """
+    Columna de texto perezosa: decodifica solo las cadenas que se piden.
+
+    Args:
+        offsets: Array int64 de len+1 posiciones en data.
+        data: Array uint8 con las cadenas UTF-8 concatenadas.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    @classmethod
+    def encode(cls, values):
+        encoded = [b'' if v is None else str(v).encode('utf-8') for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), np.int64, len(encoded)), out=offsets[1:])
+        return cls(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[k] for k in range(len(self)))
+
+    def __eq__(self, other):
+        return (isinstance(other, TextColumn) and np.array_equal(self.offsets, other.offsets)
+                and np.array_equal(self.data, other.data))
+
+
+def _aligned(position):
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+class ProjectFile:
+    """
+    Proyecto de planificación guardado en un único fichero.
+
+    Si el fichero no existe, el proyecto empieza vacío y se crea en el
+    primer save(). Las lecturas devuelven vistas de solo lectura sobre el
+    mapa en memoria; las escrituras (put, put_text, set_links, remove)
+    quedan pendientes hasta save().
+
+    Args:
+        path: Ruta del fichero (extensión habitual .uptp).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.sections = {}
+        self.meta = {}
+        self._map = None
+        self._views = {}
+        self._staged = {}
+        self._removed = set()
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            head = f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                raise ProjectFormatError(f"{self.path}: fichero de proyecto truncado.")
+            magic, index_offset, index_length = HEADER.unpack(head)
+            if magic != MAGIC:
+                raise ProjectFormatError(f"{self.path}: no es un proyecto de UPTALINK.")
+            # Cabecera provisional (0, 0): el primer save() no llegó a terminar
+            if index_offset < HEADER.size:
+                raise ProjectFormatError(f"{self.path}: proyecto sin índice (guardado interrumpido).")
+            f.seek(index_offset)
+            raw = f.read(index_length)
+            if len(raw) != index_length:
+                raise ProjectFormatError(f"{self.path}: índice incompleto.")
+            try:
+                index = json.loads(raw)
+            except ValueError as e:
+                raise ProjectFormatError(f"{self.path}: índice dañado ({e}).") from None
+            if not isinstance(index, dict) or not isinstance(index.get('sections'), dict):
+                raise ProjectFormatError(f"{self.path}: índice dañado (sin secciones).")
+            self._index_length = index_length
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if index.get('version', 0) > FORMAT_VERSION:
+            raise ProjectFormatError(f"{self.path}: versión de formato {index['version']} no soportada.")
+        self.sections = index['sections']
+        self.meta = index.get('meta', {})
+        self._views = {}
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def names(self, prefix=''):
+        """Nombres de las secciones (incluidas las pendientes) que empiezan por prefix."""
+        names = (set(self.sections) | set(self._staged)) - self._removed
+        return sorted(name for name in names if name.startswith(prefix))
+
+    def __contains__(self, name):
+        return name not in self._removed and (name in self._staged or name in self.sections)
+
+    def attrs(self, name):
+        """Atributos guardados con la sección (dict)."""
+        entry = self._entry(name)
+        return dict(entry.get('attrs', {}))
+
+    def array(self, name):
+        """
+        Array de una sección numérica.
+
+        Returns:
+            ndarray: Vista de solo lectura sobre el fichero (o el array
+            pendiente de guardar).
+        """
+        entry = self._entry(name)
+        if entry.get('kind') == 'text':
+            raise TypeError(f"La sección '{name}' es de texto; use text().")
+        return self._value(name, entry)
+
+    def text(self, name):
+        """Columna de texto como TextColumn perezosa."""
+        entry = self._entry(name)
+        if entry.get('kind') != 'text':
+            raise TypeError(f"La sección '{name}' no es de texto; use array().")
+        return self._value(name, entry)
+
+    def _entry(self, name):
+        if name in self._removed:
+            raise KeyError(name)
+        if name in self._staged:
+            return self._staged[name][0]
+        return self.sections[name]
+
+    def _value(self, name, entry):
+        if name in self._staged:
+            return self._staged[name][1]
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = self._map_section(entry)
+        return view
+
+    def _map_section(self, entry):
+        if entry.get('kind') == 'text':
+            count = entry['count']
+            offsets = np.frombuffer(self._map, np.int64, count + 1, entry['offset'])
+            data = np.frombuffer(self._map, np.uint8, int(offsets[-1]), entry['data_offset'])
+            return TextColumn(offsets, data)
+        dtype = np.dtype(entry['dtype'])
+        count = int(np.prod(entry['shape'], dtype=np.int64))
+        return np.frombuffer(self._map, dtype, count, entry['offset']).reshape(entry['shape'])
+
+    # ------------------------------------------------------------------
+    # Enlaces
+    # ------------------------------------------------------------------
+
+    @property
+    def link_count(self):
+        return self.meta.get('links', 0)
+
+    def link_columns(self):
+        """Columnas de enlace presentes, sin el prefijo."""
+        return [name[len(LINKS_PREFIX):] for name in self.names(LINKS_PREFIX)]
+
+    def link_column(self, name):
+        """Una columna de enlaces: ndarray float64 o TextColumn."""
+        return self.text(LINKS_PREFIX + name) if name in TEXT_COLUMNS else self.array(LINKS_PREFIX + name)
+
+    def link(self, row):
+        """
+        Un enlace como dict, decodificando solo esa fila.
+
+        Returns:
+            dict: Columnas presentes; los NaN numéricos se devuelven como None.
+        """
+        link = {}
+        for name in self.link_columns():
+            value = self.link_column(name)[row]
+            if name not in TEXT_COLUMNS:
+                value = float(value)
+                value = None if value != value else value
+            link[name] = value
+        return link
+
+    def set_links(self, columns):
+        """
+        Sustituye la tabla de enlaces.
+
+        Args:
+            columns: dict columna -> secuencia (todas del mismo largo), con
+                nombres de store.COLUMNS. Las numéricas se guardan como
+                float64 (None -> NaN) y las de TEXT_COLUMNS como texto.
+        """
+        unknown = [name for name in columns if name not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Columna desconocida: {', '.join(unknown)}")
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Las columnas de enlaces deben tener el mismo largo.")
+        for name in self.link_columns():
+            if name not in columns:
+                self.remove(LINKS_PREFIX + name)
+        for name, values in columns.items():
+            if name in TEXT_COLUMNS:
+                self.put_text(LINKS_PREFIX + name, values)
+            else:
+                self.put(LINKS_PREFIX + name, np.asarray(values, dtype=np.float64))
+        self.meta['links'] = lengths.pop() if lengths else 0
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def put(self, name, array, **attrs):
+        """
+        Deja pendiente una sección numérica (perfil, ráster, columna...).
+
+        Args:
+            name: Nombre de la sección, p. ej. 'profiles/LNK-3F9A1C2B'.
+            array: Array de cualquier forma y dtype numérico.
+            **attrs: Atributos JSON (unidades, límites del ráster...).
+        """
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise TypeError(f"La sección '{name}' debe ser numérica.")
+        entry = {'dtype': array.dtype.str, 'shape': list(array.shape), 'attrs': attrs}
+        self._staged[name] = (entry, array)
+        self._removed.discard(name)
+
+    def put_text(self, name, values, **attrs):
+        """Deja pendiente una columna de texto."""
+        column = values if isinstance(values, TextColumn) else TextColumn.encode(values)
+        entry = {'kind': 'text', 'count': len(column), 'attrs': attrs}
+        self._staged[name] = (entry, column)
+        self._removed.discard(name)
+
+    def remove(self, name):
+        self._staged.pop(name, None)
+        if name in self.sections:
+            self._removed.add(name)
+
+    @property
+    def dirty(self):
+        return bool(self._staged or self._removed)
+
+    def _unchanged(self, name, entry, value):
+        # Una sección igual a la guardada no se reescribe
+        old = self.sections.get(name)
+        if old is None or old.get('kind') != entry.get('kind') or old.get('attrs', {}) != entry['attrs']:
+            return False
+        if entry.get('kind') == 'text':
+            return old['count'] == entry['count'] and self._map_section(old) == value
+        if old['dtype'] != entry['dtype'] or old['shape'] != entry['shape']:
+            return False
+        return np.array_equal(self._map_section(old), value, equal_nan=value.dtype.kind in 'fc')
+
+    def save(self):
+        """
+        Guarda los cambios pendientes de forma incremental.
+
+        Solo se escriben las secciones que cambiaron y un índice nuevo, al
+        final del fichero; la cabecera se actualiza al último.
+
+        Returns:
+            int: Bytes escritos (0 si no había cambios).
+        """
+        if not self.dirty and os.path.exists(self.path):
+            return 0
+        sections = {name: entry for name, entry in self.sections.items() if name not in self._removed}
+        written = 0
+        # El primer guardado va a un temporal que sustituye al destino al
+        # terminar: un fallo a mitad no deja un fichero sin índice válido
+        new = not os.path.exists(self.path)
+        target = self.path + '.tmp' if new else self.path
+        try:
+            with open(target, 'w+b' if new else 'r+b') as f:
+                if new:
+                    f.write(HEADER.pack(MAGIC, 0, 0))
+                end = f.seek(0, os.SEEK_END)
+                for name, (entry, value) in self._staged.items():
+                    if self._unchanged(name, entry, value):
+                        sections[name] = dict(self.sections[name], attrs=entry['attrs'])
+                        continue
+                    entry = dict(entry)
+                    if entry.get('kind') == 'text':
+                        entry['offset'] = end = self._write_block(f, end, value.offsets)
+                        end += value.offsets.nbytes
+                        entry['data_offset'] = end = self._write_block(f, end, value.data)
+                        end += value.data.nbytes
+                        written += value.offsets.nbytes + value.data.nbytes
+                    else:
+                        entry['offset'] = end = self._write_block(f, end, value)
+                        end += value.nbytes
+                        written += value.nbytes
+                    sections[name] = entry
+
+                index = json.dumps({'version': FORMAT_VERSION, 'meta': self.meta, 'sections': sections},
+                                   separators=(',', ':')).encode('utf-8')
+                index_offset = self._write_block(f, end, index)
+                f.truncate(index_offset + len(index))
+                f.flush()
+                os.fsync(f.fileno())
+                # La cabecera se escribe al final: hasta aquí sigue valiendo el índice anterior
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, index_offset, len(index)))
+                f.flush()
+                os.fsync(f.fileno())
+                written += len(index)
+            if new:
+                os.replace(target, self.path)
+        except BaseException:
+            if new and os.path.exists(target):
+                os.remove(target)
+            raise
+
+        self._staged = {}
+        self._removed = set()
+        # Las vistas ya entregadas siguen siendo válidas: el mapa antiguo vive mientras se usen
+        self._load()
+        return written
+
+    @staticmethod
+    def _write_block(f, end, data):
+        start = _aligned(end)
+        f.seek(start)
+        if not isinstance(data, np.ndarray):
+            f.write(data)
+        elif data.nbytes:
+            # cast('B') no admite formas con ceros: los arrays vacíos no ocupan nada
+            f.write(memoryview(data).cast('B'))
+        return start
+
+    @property
+    def garbage(self):
+        """Bytes del fichero ocupados por versiones antiguas de secciones."""
+        if self._map is None:
+            return 0
+        live = HEADER.size + self._index_length
+        for entry in self.sections.values():
+            if entry.get('kind') == 'text':
+                live += (entry['count'] + 1) * 8 + int(self._map_section(entry).offsets[-1])
+            else:
+                live += np.dtype(entry['dtype']).itemsize * int(np.prod(entry['shape'], dtype=np.int64))
+        return max(len(self._map) - live, 0)
+
+    def compact(self):
+        """
+        Reescribe el proyecto solo con las secciones vigentes.
+
+        Guarda antes los cambios pendientes. Escribe un fichero temporal y
+        lo sustituye de forma atómica.
+        """
+        self.save()
+        tmp_path = self.path + '.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        fresh = ProjectFile(tmp_path)
+        fresh.meta = dict(self.meta)
+        for name, entry in self.sections.items():
+            value = self._value(name, entry)
+            if entry.get('kind') == 'text':
+                fresh.put_text(name, value, **entry.get('attrs', {}))
+            else:
+                fresh.put(name, value, **entry.get('attrs', {}))
+        fresh.save()
+        fresh.close()
+        self.close()
+        os.replace(tmp_path, self.path)
+        self._load()
+
+    def close(self):
+        # Sin cerrar el mmap a mano: las vistas entregadas lo mantienen vivo
+        self._map = None
+        self._views = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def links_from_store(store, batch_size=10000):
+    """
+    Lee la tabla de enlaces de un LinkStore en forma de columnas.
+
+    Returns:
+        dict: Columna -> ndarray float64 (numéricas) o lista (texto), con
+        las columnas de store.COLUMNS en orden de creación.
+    """
+    pages = []
+    after = None
+    while True:
+        rows = store.fetch_page(COLUMNS, after=after, limit=batch_size)
+        if not rows:
+            break
+        pages.append(rows)
+        after = (rows[-1][1], rows[-1][0])
+    columns = {name: [] for name in COLUMNS}
+    for rows in pages:
+        for name, values in zip(COLUMNS, list(zip(*rows))[2:]):
+            columns[name].extend(values)
+    return {
+        name: values if name in TEXT_COLUMNS else np.array(values, dtype=np.float64)
+        for name, values in columns.items()
+    }
+
+
+def save_store(store, path):
+    """
+    Guarda los enlaces de un LinkStore en un proyecto (incremental).
+
+    Returns:
+        int: Bytes escritos.
+    """
+    with ProjectFile(path) as project:
+        project.set_links(links_from_store(store))
+        return project.save()
+
+
+def main(args):
+    """Punto de entrada de 'python -m uptalink project'."""
+    import sys
+
+    if args.from_db:
+        from uptalink.store import LinkStore
+        store = LinkStore(args.from_db)
+        try:
+            written = save_store(store, args.path)
+        finally:
+            store.close()
+        print(f"{written / 1e6:.1f} MB escritos en {args.path}.", file=sys.stderr)
+    with ProjectFile(args.path) as project:
+        if args.compact:
+            before = project.garbage
+            project.compact()
+            print(f"{before / 1e6:.1f} MB recuperados.", file=sys.stderr)
+        print(f"{args.path}: {project.link_count} enlaces")
+        for name in project.names():
+            entry = project.sections[name]
+            if entry.get('kind') == 'text':
+                print(f"  {name}  texto[{entry['count']}]")
+            else:
+                print(f"  {name}  {np.dtype(entry['dtype']).name}{entry['shape']}")
+    return 0
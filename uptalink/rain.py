@@ -0,0 +1,417 @@
+"""
+Atenuación por lluvia y disponibilidad (ITU-R P.838-3 y P.530-17).
+
+    - P.838-3: atenuación específica gamma = k * R^alpha (dB/Km). Los
+      coeficientes k y alpha se obtienen de la regresión de la
+      recomendación; aquí se tabulan una sola vez al importar sobre una
+      rejilla uniforme en log f de 1 a 1000 GHz y se interpolan
+      linealmente (log k y alpha son suaves en log f). Al ser uniforme,
+      el índice de cada frecuencia se calcula directamente, sin búsqueda,
+      y se comparte entre k y alpha.
+    - P.530-17 §2.4.1: longitud efectiva del trayecto (factor de reducción
+      r, limitado a 2.5), atenuación excedida el 0.01 % del tiempo y su
+      escalado a otros porcentajes p (0.001-1 %).
+    - Disponibilidad: se invierte ese escalado para obtener el porcentaje
+      de tiempo en que la lluvia supera el margen disponible.
+
+Todas las funciones aceptan escalares o arrays NumPy con broadcasting.
+"""
+
+import math
+
+import numpy as np
+
+# Intensidad de lluvia excedida el 0.01 % del tiempo (mm/h) si no se indica
+# otra; 42 mm/h corresponde a la zona K de ITU-R P.837.
+DEFAULT_RAIN_RATE = 42.0
+
+# Polarización por defecto: horizontal, la más desfavorable
+DEFAULT_POLARIZATION = 'H'
+
+# Rango de validez de la fórmula de escalado de P.530 (% del tiempo)
+MIN_OUTAGE = 0.001
+MAX_OUTAGE = 1.0
+
+# P.838-3, tablas 1 a 4: términos (a_j, b_j, c_j) y (m, c) de
+#   log10(k) = sum a_j exp(-((log10 f - b_j) / c_j)^2) + m_k log10 f + c_k
+#   alpha    = sum a_j exp(-((log10 f - b_j) / c_j)^2) + m_a log10 f + c_a
+_K_H = (
+    ((-5.33980, -0.10008, 1.13098), (-0.35351, 1.26970, 0.45400),
+     (-0.23789, 0.86036, 0.15354), (-0.94158, 0.64552, 0.16817)),
+    -0.18961, 0.71147,
+)
+_K_V = (
+    ((-3.80595, 0.56934, 0.81061), (-3.44965, -0.22911, 0.51059),
+     (-0.39902, 0.73042, 0.11899), (0.50167, 1.07319, 0.27195)),
+    -0.16398, 0.63297,
+)
+_ALPHA_H = (
+    ((-0.14318, 1.82442, -0.55187), (0.29591, 0.77564, 0.19822),
+     (0.32177, 0.63773, 0.13164), (-5.37610, -0.96230, 1.47828),
+     (16.1721, -3.29980, 3.43990)),
+    0.67849, -1.95537,
+)
+_ALPHA_V = (
+    ((-0.07771, 2.33840, -0.76284), (0.56727, 0.95545, 0.54039),
+     (-0.20238, 1.14520, 0.26809), (-48.2991, 0.791669, 0.116226),
+     (48.5833, 0.791459, 0.116479)),
+    -0.053739, 0.83433,
+)
+
+
+def _regression(log_f, table):
+    terms, m, c = table
+    out = m * log_f + c
+    for a, b, w in terms:
+        out = out + a * np.exp(-((log_f - b) / w) ** 2)
+    return out
+
+
+# Tabla precalculada sobre log10(f) uniforme: log10(k) y alpha por polarización
+_TABLE_LOG_F0 = 0.0
+_TABLE_SIZE = 1201
+_TABLE_STEP = 3.0 / (_TABLE_SIZE - 1)
+_TABLE_LOG_F = _TABLE_LOG_F0 + _TABLE_STEP * np.arange(_TABLE_SIZE)
+_TABLE = {
+    'log_k_h': _regression(_TABLE_LOG_F, _K_H),
+    'log_k_v': _regression(_TABLE_LOG_F, _K_V),
+    'alpha_h': _regression(_TABLE_LOG_F, _ALPHA_H),
+    'alpha_v': _regression(_TABLE_LOG_F, _ALPHA_V),
+}
+# Copia en listas para la ruta escalar (indexar una lista es más barato que un array)
+_TABLE_LISTS = {name: column.tolist() for name, column in _TABLE.items()}
+# Pendiente de cada tramo de la tabla (ruta vectorizada de availability); el
+# último punto lleva pendiente 0 para no tener que acotar el índice
+_SLOPES = {name: np.append(np.diff(column), 0.0) for name, column in _TABLE.items()}
+
+
+def _lookup(freq, *names):
+    """Interpolación lineal de las columnas names de la tabla (fuera de rango se satura)."""
+    pos = (np.log10(np.asarray(freq, dtype=np.float64)) - _TABLE_LOG_F0) / _TABLE_STEP
+    pos = np.clip(pos, 0, _TABLE_SIZE - 1)
+    i = np.minimum(pos.astype(np.intp), _TABLE_SIZE - 2)
+    frac = pos - i
+    out = []
+    for name in names:
+        column = _TABLE[name]
+        lo = column[i]
+        out.append(lo + (column[i + 1] - lo) * frac)
+    return out
+
+
+def coefficients(freq, polarization=DEFAULT_POLARIZATION):
+    """
+    Coeficientes k y alpha de P.838-3 para un trayecto terrestre.
+
+    Args:
+        freq: Frecuencia (GHz), de 1 a 1000.
+        polarization: 'H', 'V' o ángulo de inclinación tau en grados
+            (0 = horizontal, 90 = vertical, 45 = circular).
+
+    Returns:
+        tuple: (k, alpha).
+    """
+    if polarization == 'H':
+        log_k_h, alpha_h = _lookup(freq, 'log_k_h', 'alpha_h')
+        return 10 ** log_k_h, alpha_h
+    if polarization == 'V':
+        log_k_v, alpha_v = _lookup(freq, 'log_k_v', 'alpha_v')
+        return 10 ** log_k_v, alpha_v
+    log_k_h, alpha_h, log_k_v, alpha_v = _lookup(freq, 'log_k_h', 'alpha_h', 'log_k_v', 'alpha_v')
+    k_h = 10 ** log_k_h
+    k_v = 10 ** log_k_v
+
+    # Ecuaciones (4) y (5) con elevación 0
+    cos_2tau = np.cos(np.radians(2 * np.asarray(polarization, dtype=np.float64)))
+    k = (k_h + k_v + (k_h - k_v) * cos_2tau) / 2
+    alpha = (k_h * alpha_h + k_v * alpha_v + (k_h * alpha_h - k_v * alpha_v) * cos_2tau) / (2 * k)
+    return k, alpha
+
+
+def specific_attenuation(freq, rain_rate=DEFAULT_RAIN_RATE, polarization=DEFAULT_POLARIZATION):
+    """
+    Returns:
+        Atenuación específica gamma_R (dB/Km).
+    """
+    k, alpha = coefficients(freq, polarization)
+    return k * np.asarray(rain_rate, dtype=np.float64) ** alpha
+
+
+def attenuation_001(freq, dist, rain_rate=DEFAULT_RAIN_RATE, polarization=DEFAULT_POLARIZATION):
+    """
+    Atenuación por lluvia excedida el 0.01 % del tiempo (P.530-17, pasos 1-4).
+
+    Args:
+        freq: Frecuencia (GHz)
+        dist: Longitud del trayecto (Km)
+        rain_rate: R0.01 (mm/h)
+        polarization: Ver coefficients.
+
+    Returns:
+        A0.01 (dB).
+    """
+    freq = np.asarray(freq, dtype=np.float64)
+    dist = np.asarray(dist, dtype=np.float64)
+    rain_rate = np.asarray(rain_rate, dtype=np.float64)
+    k, alpha = coefficients(freq, polarization)
+    gamma = k * rain_rate ** alpha
+
+    # Factor de reducción de distancia, ecuación (34), limitado a 2.5
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = (0.477 * dist ** 0.633 * rain_rate ** (0.073 * alpha) * freq ** 0.123
+                 - 10.579 * (1 - np.exp(-0.024 * dist)))
+        r = np.where(denom > 0, 1 / denom, 2.5)
+    r = np.minimum(r, 2.5)
+    return gamma * dist * r
+
+
+def _scaling(latitude):
+    """Parámetros (C0, a, b) de A_p / A0.01 = C0 * p^-(a + b*log10 p), ecuaciones (35)-(36)."""
+    if latitude is not None and abs(latitude) < 30:
+        return 0.07, 0.855, 0.139
+    return 0.12, 0.546, 0.043
+
+
+def attenuation(p, a001, latitude=None):
+    """
+    Atenuación excedida el p % del tiempo a partir de A0.01.
+
+    Args:
+        p: Porcentaje de tiempo (0.001-1 %).
+        a001: A0.01 (dB).
+        latitude: Latitud (grados); None usa la fórmula de |lat| >= 30.
+
+    Returns:
+        A_p (dB).
+    """
+    c0, a, b = _scaling(latitude)
+    log_p = np.log10(np.asarray(p, dtype=np.float64))
+    return a001 * c0 * 10 ** (-(a + b * log_p) * log_p)
+
+
+def outage_probability(fade_margin, a001, latitude=None):
+    """
+    Porcentaje del tiempo en que la lluvia supera el margen disponible.
+
+    Invierte attenuation() resolviendo b*x^2 + a*x + log10(M / (C0*A0.01)) = 0
+    con x = log10(p). El resultado se limita a [MIN_OUTAGE, 100]; por
+    encima de MAX_OUTAGE es una extrapolación fuera del rango de P.530.
+    Sin margen (<= 0) la indisponibilidad es del 100 %.
+
+    Returns:
+        p (%).
+    """
+    c0, a, b = _scaling(latitude)
+    fade_margin = np.asarray(fade_margin, dtype=np.float64)
+    a001 = np.asarray(a001, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        level = np.log10(fade_margin / (c0 * a001))
+        disc = a * a - 4 * b * level
+        # Discriminante negativo: el margen supera cualquier atenuación modelada
+        log_p = np.where(disc >= 0, (-a + np.sqrt(np.maximum(disc, 0))) / (2 * b), -np.inf)
+        p = np.clip(10 ** log_p, MIN_OUTAGE, 100.0)
+    p = np.where(a001 > 0, p, MIN_OUTAGE)
+    return np.where(fade_margin > 0, p, 100.0)
+
+
+def _max_ratio(latitude):
+    """A_p / A0.01 en p = MIN_OUTAGE: con más margen que eso la indisponibilidad es MIN_OUTAGE."""
+    c0, a, b = _scaling(latitude)
+    log_p = math.log10(MIN_OUTAGE)
+    return c0 * 10 ** (-(a + b * log_p) * log_p)
+
+
+def _log_coefficients(log_f, polarization):
+    """log10(k) y alpha por fila; H y V interpolan la tabla con arrays reutilizados."""
+    if polarization not in ('H', 'V'):
+        k, alpha = coefficients(10 ** log_f, polarization)
+        return np.log10(k), np.asarray(alpha, dtype=np.float64)
+    pos = np.subtract(log_f, _TABLE_LOG_F0)
+    pos *= 1 / _TABLE_STEP
+    np.clip(pos, 0, _TABLE_SIZE - 1, out=pos)
+    lower = np.floor(pos)
+    i = lower.astype(np.intp)
+    pos -= lower
+    suffix = polarization.lower()
+    # lo + pendiente * frac; i ya está acotado y mode='clip' evita la copia
+    # intermedia de take(out=)
+    log_k = _SLOPES['log_k_' + suffix].take(i, mode='clip')
+    log_k *= pos
+    alpha = _SLOPES['alpha_' + suffix].take(i, mode='clip')
+    alpha *= pos
+    log_k += _TABLE['log_k_' + suffix].take(i, out=lower, mode='clip')
+    alpha += _TABLE['alpha_' + suffix].take(i, out=lower, mode='clip')
+    return log_k, alpha
+
+
+def availability(freq, dist, fade_margin, rain_margin=0.0, rain_rate=DEFAULT_RAIN_RATE,
+                 polarization=DEFAULT_POLARIZATION, latitude=None):
+    """
+    Disponibilidad anual frente a lluvia.
+
+    Mismo modelo que attenuation_001 + outage_probability, reescrito para
+    tablas grandes: las potencias se agrupan en exp/log sobre arrays
+    temporales reutilizados, y la inversión de attenuation() solo se
+    resuelve en las filas con presupuesto entre 0 y la atenuación de
+    p = MIN_OUTAGE (el resto vale 100 - MIN_OUTAGE o 0 sin cálculo).
+
+    Args:
+        freq: Frecuencia (GHz)
+        dist: Distancia (Km)
+        fade_margin: Margen de desvanecimiento del enlace (dB).
+        rain_margin: Margen reservado para lluvia (dB). Si es > 0 se usa
+            como presupuesto de lluvia, sin superar el margen del enlace;
+            con 0 todo el margen de desvanecimiento cubre la lluvia.
+        rain_rate, polarization, latitude: Ver attenuation_001 y attenuation.
+
+    Returns:
+        Disponibilidad (%), NaN si Frecuencia o Distancia <= 0.
+    """
+    rain_rate = np.asarray(rain_rate, dtype=np.float64)
+    freq, dist, fade_margin, rain_margin = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (freq, dist, fade_margin, rain_margin)), rain_rate
+    )[:4]
+    # Se trabaja en 1-D (vista salvo broadcasting N-D) y se devuelve con la forma común
+    shape = freq.shape
+    freq, dist, fade_margin, rain_margin = (v.reshape(-1) for v in (freq, dist, fade_margin, rain_margin))
+    if rain_rate.ndim:
+        rain_rate = np.broadcast_to(rain_rate, shape).reshape(-1)
+    invalid = ~((freq > 0) & (dist > 0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_f = np.log10(freq)
+        log_d = np.log10(dist)
+    out = availability_from_logs(dist, log_f, log_d, fade_margin, rain_margin, rain_rate, polarization, latitude, invalid)
+    out = out.reshape(shape)
+    return out[()] if out.ndim == 0 else out
+
+
+def availability_from_logs(dist, log_f, log_d, fade_margin, rain_margin=0.0, rain_rate=DEFAULT_RAIN_RATE,
+                           polarization=DEFAULT_POLARIZATION, latitude=None, invalid=None, out=None):
+    """
+    Núcleo de availability sobre arrays 1-D de la misma longitud.
+
+    Recibe log10(f) y log10(d) ya calculados (calculate_batch los comparte
+    con el FSPL) y los usa como temporales: ambos se sobrescriben.
+
+    Args:
+        dist: Distancia (Km), array 1-D.
+        log_f, log_d: log10 de Frecuencia y Distancia (se sobrescriben).
+        fade_margin: Margen de desvanecimiento (dB), array 1-D.
+        rain_margin, rain_rate: Escalares o arrays 1-D; ver availability.
+        polarization, latitude: Ver availability.
+        invalid: Máscara de filas con Frecuencia o Distancia <= 0, o None
+            si no hay ninguna.
+        out: Array donde escribir el resultado (None = uno nuevo).
+
+    Returns:
+        ndarray: Disponibilidad (%), out si se indicó.
+    """
+    log_rain = np.log(rain_rate)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        if invalid is not None:
+            np.copyto(log_f, 0.0, where=invalid)
+        log_k, alpha = _log_coefficients(log_f, polarization)
+
+        # alpha * ln R sirve para R^alpha y para R^(0.073 alpha)
+        alpha *= log_rain
+        # ln(gamma) = ln(k) + alpha * ln(R)
+        log_k *= math.log(10)
+        log_k += alpha
+        gamma = np.exp(log_k, out=log_k)
+
+        # Ecuación (34): 0.477 d^0.633 R^(0.073 alpha) f^0.123 en un solo exp
+        alpha *= 0.073
+        log_f *= 0.123 * math.log(10)
+        alpha += log_f
+        log_d *= 0.633 * math.log(10)
+        alpha += log_d
+        alpha += math.log(0.477)
+        denom = np.exp(alpha, out=alpha)
+        # ... - 10.579 (1 - exp(-0.024 d))
+        decay = np.multiply(dist, -0.024, out=log_d)
+        np.exp(decay, out=decay)
+        decay -= 1
+        decay *= 10.579
+        denom += decay
+        # r = 1/denom limitado a 2.5; denom <= 0 también da 2.5
+        r = np.reciprocal(denom, out=denom)
+        np.copyto(r, 2.5, where=r < 0)
+        np.minimum(r, 2.5, out=r)
+
+        # Atenuación máxima modelada (la de p = MIN_OUTAGE): A0.01 * max_ratio,
+        # con A0.01 = gamma * d * r
+        max_ratio = _max_ratio(latitude)
+        a_max = np.multiply(gamma, dist, out=gamma)
+        a_max *= r
+        a_max *= max_ratio
+        budget = fade_margin
+        if np.any(rain_margin > 0):
+            budget = np.where(rain_margin > 0, np.minimum(rain_margin, fade_margin), fade_margin)
+
+        # r ya no se usa: guarda el resultado si no hay out. Sin presupuesto la
+        # indisponibilidad es del 100 %; con más presupuesto que a_max, MIN_OUTAGE
+        positive = budget > 0
+        out = np.multiply(positive, 100.0 - MIN_OUTAGE, out=r if out is None else out)
+        solve = np.flatnonzero(positive & (budget < a_max))
+        if solve.size:
+            # log10(M / (C0*A0.01)) = log10(M / a_max) + log10(max_ratio / C0)
+            c0, a, b = _scaling(latitude)
+            level = np.divide(budget[solve], a_max[solve])
+            np.log10(level, out=level)
+            level += math.log10(max_ratio / c0)
+            level *= -4 * b
+            level += a * a
+            log_p = np.sqrt(level, out=level)
+            log_p -= a
+            log_p *= math.log(10) / (2 * b)
+            p = np.exp(log_p, out=log_p)
+            np.clip(p, MIN_OUTAGE, 100.0, out=p)
+            out[solve] = np.subtract(100.0, p, out=p)
+    if invalid is not None:
+        np.copyto(out, np.nan, where=invalid)
+    return out
+
+
+def link_availability(freq, dist, fade_margin, rain_margin=0.0, rain_rate=DEFAULT_RAIN_RATE,
+                      polarization=DEFAULT_POLARIZATION, latitude=None):
+    """
+    availability() para un solo enlace, sin arrays (ruta de calculate).
+
+    Los coeficientes salen de la misma tabla precalculada.
+
+    Returns:
+        float: Disponibilidad (%).
+    """
+    if freq <= 0 or dist <= 0:
+        return math.nan
+    if polarization in ('H', 'V'):
+        # Misma interpolación que _lookup, sin pasar por NumPy
+        suffix = polarization.lower()
+        last = _TABLE_SIZE - 1
+        pos = min(max((math.log10(freq) - _TABLE_LOG_F0) / _TABLE_STEP, 0.0), last)
+        i = min(int(pos), last - 1)
+        frac = pos - i
+        log_k = _TABLE_LISTS['log_k_' + suffix]
+        alphas = _TABLE_LISTS['alpha_' + suffix]
+        k = 10 ** (log_k[i] + (log_k[i + 1] - log_k[i]) * frac)
+        alpha = alphas[i] + (alphas[i + 1] - alphas[i]) * frac
+    else:
+        k, alpha = (float(v) for v in coefficients(freq, polarization))
+
+    denom = (0.477 * dist ** 0.633 * rain_rate ** (0.073 * alpha) * freq ** 0.123
+             - 10.579 * (1 - math.exp(-0.024 * dist)))
+    r = min(1 / denom, 2.5) if denom > 0 else 2.5
+    a001 = k * rain_rate ** alpha * dist * r
+
+    budget = min(rain_margin, fade_margin) if rain_margin > 0 else fade_margin
+    if budget <= 0:
+        return 0.0
+    if a001 <= 0:
+        return 100.0 - MIN_OUTAGE
+    c0, a, b = _scaling(latitude)
+    disc = a * a - 4 * b * math.log10(budget / (c0 * a001))
+    if disc < 0:
+        p = MIN_OUTAGE
+    else:
+        p = min(max(10 ** ((-a + math.sqrt(disc)) / (2 * b)), MIN_OUTAGE), 100.0)
+    return 100.0 - p
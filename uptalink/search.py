@@ -0,0 +1,214 @@
+"""
+Índices en memoria para la caja de búsqueda del header.
+
+    - PrefixIndex: IDs de enlace ordenados; una búsqueda por prefijo es
+      una bisección más un recorrido por el rango coincidente.
+    - SpatialGridIndex: rejilla uniforme (hash de celdas lat/lon) sobre los
+      extremos de los enlaces para consultas "cerca de lat,lon a X km" y
+      por caja envolvente.
+
+Ambos admiten inserciones incrementales, de modo que cada enlace
+guardado se indexa al momento sin reconstruir nada.
+"""
+
+import bisect
+import math
+import re
+
+import numpy as np
+
+from uptalink.terrain import haversine
+
+# "lat,lon" o "lat,lon,km" / "lat, lon 5km"
+_COORD_QUERY = re.compile(
+    r"^\s*(-?\d+(?:\.\d+)?)\s*[,;\s]\s*(-?\d+(?:\.\d+)?)(?:\s*[,;\s]\s*(\d+(?:\.\d+)?)\s*(?:km)?)?\s*$",
+    re.IGNORECASE,
+)
+
+DEFAULT_RADIUS_KM = 5.0
+
+
+class PrefixIndex:
+    """
+    Índice de prefijos sobre IDs (insensible a mayúsculas).
+
+    IDs que solo difieren en mayúsculas ('lnk-1' y 'LNK-1') comparten
+    clave y se guardan juntos, ordenados, bajo ella.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._ids = {}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, link_id):
+        key = link_id.lower()
+        ids = self._ids.get(key)
+        if ids is None:
+            self._ids[key] = [link_id]
+            bisect.insort(self._keys, key)
+        elif link_id in ids:
+            return
+        else:
+            bisect.insort(ids, link_id)
+        self._count += 1
+
+    def remove(self, link_id):
+        key = link_id.lower()
+        ids = self._ids.get(key)
+        if ids is None or link_id not in ids:
+            return
+        ids.remove(link_id)
+        self._count -= 1
+        if not ids:
+            del self._ids[key]
+            del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def search(self, prefix, limit=50):
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._keys, prefix)
+        out = []
+        for key in self._keys[start:start + limit]:
+            if not key.startswith(prefix):
+                break
+            out.extend(self._ids[key])
+            if len(out) >= limit:
+                break
+        return out[:limit]
+
+
+class SpatialGridIndex:
+    """
+    Rejilla uniforme de celdas de cell_deg grados.
+
+    Cada enlace se registra en las celdas de sus dos extremos; las
+    consultas solo examinan las celdas que solapan la zona buscada.
+    """
+
+    def __init__(self, cell_deg=0.1):
+        self.cell_deg = cell_deg
+        self._cells = {}
+        self._points = {}
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    def add(self, link_id, points):
+        """
+        Args:
+            link_id: ID del enlace.
+            points: Iterable de (lat, lon) (normalmente los extremos A y B).
+        """
+        self.remove(link_id)
+        points = [(lat, lon) for lat, lon in points if lat is not None and lon is not None]
+        if not points:
+            return
+        self._points[link_id] = points
+        for lat, lon in points:
+            self._cells.setdefault(self._cell(lat, lon), []).append((link_id, lat, lon))
+
+    def remove(self, link_id):
+        for lat, lon in self._points.pop(link_id, ()):
+            cell = self._cells.get(self._cell(lat, lon))
+            if cell is not None:
+                cell[:] = [entry for entry in cell if entry[0] != link_id]
+
+    def _candidates(self, min_lat, min_lon, max_lat, max_lon):
+        i0, j0 = self._cell(min_lat, min_lon)
+        i1, j1 = self._cell(max_lat, max_lon)
+        out = []
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                out.extend(self._cells.get((i, j), ()))
+        return out
+
+    def bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """IDs con algún extremo dentro de la caja envolvente."""
+        found = []
+        seen = set()
+        for link_id, lat, lon in self._candidates(min_lat, min_lon, max_lat, max_lon):
+            if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon and link_id not in seen:
+                seen.add(link_id)
+                found.append(link_id)
+        return found
+
+    def near(self, lat, lon, radius_km, limit=50):
+        """
+        IDs con algún extremo a menos de radius_km, ordenados por distancia.
+
+        Returns:
+            list: Tuplas (link_id, distancia_km).
+        """
+        dlat = radius_km / 111.32
+        dlon = radius_km / (111.32 * max(math.cos(math.radians(lat)), 1e-6))
+        candidates = self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        if not candidates:
+            return []
+        lats = np.fromiter((c[1] for c in candidates), dtype=np.float64, count=len(candidates))
+        lons = np.fromiter((c[2] for c in candidates), dtype=np.float64, count=len(candidates))
+        dist_km = haversine(lat, lon, lats, lons) / 1000
+
+        best = {}
+        for k in np.argsort(dist_km):
+            if dist_km[k] > radius_km:
+                break
+            link_id = candidates[k][0]
+            if link_id not in best:
+                best[link_id] = float(dist_km[k])
+                if len(best) >= limit:
+                    break
+        return list(best.items())
+
+
+class LinkSearchIndex:
+    """Índice combinado que interpreta el texto de la caja de búsqueda."""
+
+    def __init__(self, cell_deg=0.1):
+        self.ids = PrefixIndex()
+        self.spatial = SpatialGridIndex(cell_deg)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, link):
+        """Indexa un enlace (dict con link_id y, opcionalmente, lat_a/lon_a/lat_b/lon_b)."""
+        link_id = link['link_id']
+        self.ids.add(link_id)
+        self.spatial.add(link_id, [(link.get('lat_a'), link.get('lon_a')), (link.get('lat_b'), link.get('lon_b'))])
+
+    def remove(self, link_id):
+        self.ids.remove(link_id)
+        self.spatial.remove(link_id)
+
+    @classmethod
+    def from_store(cls, store, cell_deg=0.1):
+        """Construye el índice recorriendo todos los enlaces del LinkStore."""
+        index = cls(cell_deg)
+        for link in store.iter_links(batch_size=5000):
+            index.add(link)
+        return index
+
+    def search(self, text, limit=50):
+        """
+        Resuelve una consulta de la caja de búsqueda.
+
+        Args:
+            text: Prefijo de ID, o "lat,lon[,km]" para buscar por cercanía
+                (radio por defecto DEFAULT_RADIUS_KM).
+
+        Returns:
+            list: IDs de enlace coincidentes.
+        """
+        text = text.strip()
+        if not text:
+            return []
+        match = _COORD_QUERY.match(text)
+        if match:
+            lat, lon = float(match.group(1)), float(match.group(2))
+            if -90 <= lat <= 90 and -180 <= lon <= 180:
+                radius = float(match.group(3)) if match.group(3) else DEFAULT_RADIUS_KM
+                return [link_id for link_id, _ in self.spatial.near(lat, lon, radius, limit)]
+        return self.ids.search(text, limit)
@@ -0,0 +1,605 @@
+"""
+Servicio HTTP/JSON local sobre asyncio para el cálculo de enlaces.
+
+Expone LinkBudgetCalculator y el análisis de perfil para que las páginas
+web (UPTALINK_WEB*.html) usen las mismas fórmulas que la app de escritorio:
+
+    GET  /health     -> {"status": "ok"}
+    POST /calculate  -> un enlace (objeto con las claves de BATCH_FIELDS)
+    POST /batch      -> {"links": [...]}; respuesta NDJSON en streaming
+    POST /profile    -> despeje de Fresnel de un perfil de elevaciones
+
+El bucle de eventos solo parsea HTTP y encola trabajo: el cálculo y la
+serialización de resultados ocurren en un pool de procesos. Las
+peticiones /calculate concurrentes se agrupan en un único cálculo
+vectorizado (Coalescer). Los cuerpos /batch grandes tampoco se parsean en
+el bucle: un proceso del pool localiza los bloques de enlaces y a cada
+proceso se le envía solo su trozo de bytes. Las conexiones son keep-alive
+(HTTP/1.1).
+Limitación: no se admiten cuerpos de petición con Transfer-Encoding.
+"""
+
+import asyncio
+import json
+import json.scanner
+import math
+import multiprocessing
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from uptalink.batch import BATCH_FIELDS, OPTIONAL_FIELDS, REQUIRED_FIELDS, RESULT_FIELDS
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 4096       # peticiones /calculate por cálculo agrupado
+DEFAULT_MAX_DELAY = 0.002      # s de espera máxima para llenar un grupo
+DEFAULT_CHUNK_SIZE = 5000      # enlaces por bloque en /batch
+KEEPALIVE_TIMEOUT = 15         # s de inactividad antes de cerrar la conexión
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 64 * 1024 * 1024
+LARGE_BODY_SIZE = 1024 * 1024  # /batch mayores se parsean en el pool (json.loads de 46 MB bloquea ~1.3 s)
+
+DEFAULT_RAIN_MARGIN = 0.0
+DEFAULT_RAIN_RATE = 42.0       # mismo valor que rain.DEFAULT_RAIN_RATE, sin importar NumPy
+DEFAULT_BANDWIDTH = 0.0        # sin Ancho de Banda: piso de ruido fijo del JS
+DEFAULT_NOISE_FIGURE = 0.0
+DEFAULT_TEMPERATURE = 16.85    # mismo valor que LinkBudgetCalculator.DEFAULT_TEMPERATURE
+
+# Plantilla de una fila de resultado; las filas inválidas van con nulos como en batch.py
+_ROW_TEMPLATE = '{' + ','.join(f'"{name}":%r' for name in RESULT_FIELDS[:-1]) + ',"status":"%s"}'
+_INVALID_ROW = json.dumps(
+    dict.fromkeys(RESULT_FIELDS[:-1]) | {'status': 'INVÁLIDO'}, ensure_ascii=False, separators=(',', ':')
+)
+
+INVALID_JSON = "El cuerpo no es JSON válido."
+INVALID_LINKS = "Se espera {\"links\": [objetos de enlace]}."
+
+CORS_HEADERS = (
+    'Access-Control-Allow-Origin: *\r\n'
+    'Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n'
+    'Access-Control-Allow-Headers: Content-Type\r\n'
+)
+
+
+class RequestError(Exception):
+    """Petición no válida; se responde con el estado HTTP indicado."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ============================================================================
+# TRABAJO EN EL POOL DE PROCESOS
+# ============================================================================
+
+def _warm_worker():
+    # Los procesos del pool pagan la importación de NumPy al arrancar, no en la 1ª petición
+    import uptalink.calculator  # noqa: F401
+    import uptalink.terrain  # noqa: F401
+
+
+def _column(rows, name, default):
+    import numpy as np
+
+    # Camino rápido con fromiter; si hay valores no numéricos se convierten
+    # uno a uno (erróneo -> 0.0, igual que en batch.py)
+    try:
+        return np.fromiter((row.get(name, default) for row in rows), np.float64, len(rows))
+    except (TypeError, ValueError):
+        pass
+    out = []
+    for row in rows:
+        try:
+            out.append(float(row.get(name, default)))
+        except (TypeError, ValueError):
+            out.append(0.0)
+    return np.array(out, dtype=np.float64)
+
+
+def evaluate_rows(rows):
+    """
+    Calcula un grupo de enlaces (se ejecuta en los procesos del pool).
+
+    Args:
+        rows: Lista de dicts con las claves de BATCH_FIELDS (las ausentes
+            valen 0) y opcionalmente las de OPTIONAL_FIELDS.
+
+    Returns:
+        list: Una fila JSON (str) por enlace, en el mismo orden.
+    """
+    import numpy as np
+    from uptalink.calculator import LinkBudgetCalculator
+
+    columns = [_column(rows, name, 0.0) for name in BATCH_FIELDS]
+    r = LinkBudgetCalculator.calculate_batch(
+        *columns,
+        rain_margin=_column(rows, 'rain_margin', DEFAULT_RAIN_MARGIN),
+        rain_rate=_column(rows, 'rain_rate', DEFAULT_RAIN_RATE),
+        bandwidth=_column(rows, 'bandwidth', DEFAULT_BANDWIDTH),
+        noise_figure=_column(rows, 'noise_figure', DEFAULT_NOISE_FIGURE),
+        temperature=_column(rows, 'temperature', DEFAULT_TEMPERATURE),
+    )
+    numeric = np.column_stack([r[name] for name in RESULT_FIELDS[:-1]])
+    status = np.where(r['is_good'], 'VIABLE', 'CRÍTICO')
+    # %r da 'nan'/'inf', que no es JSON: esas filas (raras) van con null
+    finite = np.isfinite(numeric).all(axis=1)
+    return [
+        (_ROW_TEMPLATE % (*values, st) if clean else _null_row(values, st)) if ok else _INVALID_ROW
+        for values, ok, clean, st in zip(numeric.tolist(), r['valid'].tolist(), finite.tolist(), status.tolist())
+    ]
+
+
+def _null_row(values, status):
+    row = {name: v if math.isfinite(v) else None for name, v in zip(RESULT_FIELDS, values)}
+    row['status'] = status
+    return json.dumps(row, ensure_ascii=False, separators=(',', ':'))
+
+
+def evaluate_chunk(rows):
+    """Como evaluate_rows, pero devuelve el bloque ya codificado en NDJSON."""
+    lines = evaluate_rows(rows)
+    lines.append('')
+    return '\n'.join(lines).encode('utf-8')
+
+
+def evaluate_raw_chunk(data):
+    """Como evaluate_chunk, con los enlaces como trozo del cuerpo (ver split_links)."""
+    return evaluate_chunk(json.loads(b'[%b]' % data))
+
+
+_SPACES = ' \t\n\r'
+_WHITESPACE = re.compile(f'[{_SPACES}]*')
+_DECODER = json.JSONDecoder()
+_SCAN = json.scanner.make_scanner(_DECODER)
+
+
+def _skip(text, pos):
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _expect(text, pos, char):
+    if not text.startswith(char, pos):
+        raise ValueError(INVALID_JSON)
+    return _skip(text, pos + 1)
+
+
+def _scan_links(text, pos, chunk_size):
+    # text[pos] es el '[' del array de enlaces. Bucle mínimo por enlace con
+    # el escáner C de json (raw_decode y un _skip por elemento lo duplican)
+    offsets = []
+    pos = _skip(text, pos + 1)
+    if text.startswith(']', pos):
+        return offsets, pos + 1
+    first, count = pos, 0
+    while True:
+        row, end = _SCAN(text, pos)
+        if type(row) is not dict:
+            raise ValueError(INVALID_LINKS)
+        count += 1
+        if count == chunk_size:
+            offsets.append((first, end))
+            count = 0
+        pos = end
+        if text[pos] in _SPACES:
+            pos = _skip(text, pos)
+        if text[pos] != ',':
+            break
+        pos += 1
+        if text[pos] in _SPACES:
+            pos = _skip(text, pos)
+        if count == 0:
+            first = pos
+    if count:
+        offsets.append((first, end))
+    return offsets, _expect(text, pos, ']')
+
+
+def split_links(body, chunk_size):
+    """
+    Bloques de enlaces de un cuerpo /batch (se ejecuta en los procesos del pool).
+
+    Valida el cuerpo como json.loads pero sin devolver los enlaces: solo
+    dónde empieza y acaba cada bloque, para que el bucle envíe a cada
+    proceso su trozo de bytes sin parsearlo.
+
+    Args:
+        body: Cuerpo de la petición ({"links": [...]} o [...], UTF-8).
+        chunk_size: Enlaces por bloque.
+
+    Returns:
+        list: (inicio, fin) en bytes de cada bloque; body[inicio:fin] son
+        objetos separados por comas (ver evaluate_raw_chunk).
+
+    Raises:
+        ValueError: Con INVALID_JSON o INVALID_LINKS como mensaje.
+    """
+    try:
+        body.decode('utf-8')
+    except UnicodeDecodeError:
+        # Sin encadenar: la excepción original lleva el cuerpo entero de vuelta al bucle
+        raise ValueError(INVALID_JSON) from None
+    # latin-1: un carácter por byte, así que las posiciones valen para body.
+    # Los bytes de las secuencias UTF-8 nunca son ASCII: la estructura no cambia.
+    text = body.decode('latin-1')
+    try:
+        offsets = None
+        pos = _skip(text, 0)
+        if text.startswith('[', pos):
+            offsets, pos = _scan_links(text, pos, chunk_size)
+        elif text.startswith('{', pos):
+            pos = _skip(text, pos + 1)
+            while not text.startswith('}', pos):
+                key, pos = _DECODER.raw_decode(text, pos)
+                if not isinstance(key, str):
+                    raise ValueError(INVALID_JSON)
+                pos = _expect(text, _skip(text, pos), ':')
+                if key == 'links':
+                    if not text.startswith('[', pos):
+                        raise ValueError(INVALID_LINKS)
+                    offsets, pos = _scan_links(text, pos, chunk_size)
+                else:
+                    _, pos = _DECODER.raw_decode(text, pos)
+                pos = _skip(text, pos)
+                if not text.startswith('}', pos):
+                    pos = _expect(text, pos, ',')
+                    if text.startswith('}', pos):
+                        raise ValueError(INVALID_JSON)
+            pos += 1
+        else:
+            _, pos = _DECODER.raw_decode(text, pos)
+    except (json.JSONDecodeError, StopIteration, IndexError):
+        raise ValueError(INVALID_JSON) from None
+    if _skip(text, pos) != len(text):
+        raise ValueError(INVALID_JSON)
+    if offsets is None:
+        raise ValueError(INVALID_LINKS)
+    return offsets
+
+
+def analyze_profile(payload):
+    """
+    Despeje de Fresnel de un perfil (se ejecuta en los procesos del pool).
+
+    Args:
+        payload: dict con 'elevations' (m, equiespaciadas de A a B),
+            'dist' (Km), 'freq' (GHz), 'h_a', 'h_b' (m) y opcionalmente
+            'k_factor'.
+
+    Returns:
+        bytes: JSON con los arrays por muestra (NaN -> null) y el resumen
+        de terrain.analyze_profile.
+    """
+    import numpy as np
+    from uptalink import terrain
+
+    result = terrain.analyze_profile(
+        payload['elevations'], payload['dist'], payload['freq'], payload['h_a'], payload['h_b'],
+        payload.get('k_factor', terrain.DEFAULT_K_FACTOR),
+    )
+    out = {}
+    for name, value in result.items():
+        if isinstance(value, np.ndarray):
+            out[name] = [None if v != v else v for v in value.tolist()]
+        else:
+            out[name] = bool(value) if isinstance(value, np.bool_) else value
+    return json.dumps(out, separators=(',', ':')).encode('utf-8')
+
+
+# ============================================================================
+# AGRUPACIÓN DE PETICIONES
+# ============================================================================
+
+class Coalescer:
+    """
+    Agrupa los enlaces de peticiones concurrentes en un solo cálculo.
+
+    Cada submit devuelve un futuro; el grupo se envía al pool cuando
+    alcanza max_batch enlaces o han pasado max_delay segundos desde el
+    primero. Con carga baja la latencia añadida es como mucho max_delay.
+    """
+
+    def __init__(self, executor, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.rows = []
+        self.futures = []
+        self.timer = None
+        self.batches = 0
+
+    def submit(self, row):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.rows.append(row)
+        self.futures.append(future)
+        if len(self.rows) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_delay, self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.rows:
+            return
+        rows, futures = self.rows, self.futures
+        self.rows, self.futures = [], []
+        self.batches += 1
+        task = asyncio.get_running_loop().run_in_executor(self.executor, evaluate_rows, rows)
+        task.add_done_callback(lambda done: self._resolve(done, futures))
+
+    @staticmethod
+    def _resolve(done, futures):
+        error = done.exception()
+        results = None if error else done.result()
+        for k, future in enumerate(futures):
+            # Los futuros de clientes desconectados ya están cancelados
+            if future.done():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(results[k])
+
+
+# ============================================================================
+# SERVIDOR HTTP
+# ============================================================================
+
+def _check_link(row):
+    if not isinstance(row, dict):
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Cada enlace debe ser un objeto JSON.")
+    missing = [name for name in REQUIRED_FIELDS if name not in row]
+    if missing:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"Faltan campos obligatorios: {', '.join(missing)}")
+    for name in BATCH_FIELDS + OPTIONAL_FIELDS:
+        value = row.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"El campo '{name}' debe ser numérico.")
+    return row
+
+
+def _head(status, content_type=None, length=None, keep_alive=True, chunked=False):
+    lines = [f'HTTP/1.1 {status.value} {status.phrase}\r\n']
+    if content_type:
+        lines.append(f'Content-Type: {content_type}\r\n')
+    if chunked:
+        lines.append('Transfer-Encoding: chunked\r\n')
+    elif status is not HTTPStatus.NO_CONTENT:
+        lines.append(f'Content-Length: {length or 0}\r\n')
+    lines.append('Connection: keep-alive\r\n' if keep_alive else 'Connection: close\r\n')
+    lines.append(CORS_HEADERS)
+    lines.append('\r\n')
+    return ''.join(lines).encode('latin-1')
+
+
+def _parse_json(body):
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_JSON) from None
+
+
+def _json_response(status, body, keep_alive=True):
+    if not isinstance(body, bytes):
+        body = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return _head(status, 'application/json; charset=utf-8', len(body), keep_alive) + body
+
+
+class LinkService:
+    """
+    Servicio HTTP del calculador.
+
+    Args:
+        workers: Procesos del pool (None = todos los núcleos).
+        max_batch, max_delay: Parámetros del Coalescer de /calculate.
+        chunk_size: Enlaces por bloque en /batch.
+    """
+
+    def __init__(self, workers=None, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # Los procesos del pool se crean en la primera petición, con el socket de
+        # escucha y las conexiones ya abiertos: con 'fork' los heredarían y un
+        # 'Connection: close' no llegaría nunca al cliente. forkserver (spawn
+        # donde no existe) arranca los procesos sin los descriptores del servidor
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(method),
+                                            initializer=_warm_worker)
+        self.coalescer = Coalescer(self.executor, max_batch, max_delay)
+        self.server = None
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('POST', '/calculate'): self.calculate,
+            ('POST', '/batch'): self.batch,
+            ('POST', '/profile'): self.profile,
+        }
+        # Rutas que reciben el cuerpo sin parsear (deciden dónde parsearlo)
+        self.raw_routes = {('POST', '/batch')}
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Abre el socket de escucha; devuelve el asyncio.Server (port=0 elige uno libre)."""
+        self.server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_SIZE)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.coalescer.flush()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        """Atiende una conexión: peticiones en secuencia mientras sea keep-alive."""
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(_json_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                                {'error': "Cabeceras demasiado grandes."}, False))
+                    break
+                keep_alive = await self.dispatch(head, reader, writer)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, head, reader, writer):
+        """Parsea una petición, la enruta y escribe la respuesta. Devuelve si se mantiene la conexión."""
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            writer.write(_json_response(HTTPStatus.BAD_REQUEST, {'error': "Línea de petición no válida."}, False))
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        try:
+            if 'transfer-encoding' in headers:
+                raise RequestError(HTTPStatus.NOT_IMPLEMENTED, "Transfer-Encoding no soportado en peticiones.")
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY_SIZE:
+                raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Cuerpo de la petición demasiado grande.")
+            body = await reader.readexactly(length) if length else b''
+        except (ValueError, asyncio.IncompleteReadError):
+            writer.write(_json_response(HTTPStatus.BAD_REQUEST, {'error': "Cuerpo de la petición incompleto."}, False))
+            return False
+        except RequestError as e:
+            writer.write(_json_response(e.status, {'error': str(e)}, False))
+            return False
+
+        path = target.split('?', 1)[0]
+        if method == 'OPTIONS':
+            writer.write(_head(HTTPStatus.NO_CONTENT, keep_alive=keep_alive))
+            return keep_alive
+        route = self.routes.get((method, path))
+        try:
+            if route is None:
+                if any(p == path for _, p in self.routes):
+                    raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, f"Método {method} no permitido en {path}.")
+                raise RequestError(HTTPStatus.NOT_FOUND, f"Ruta no encontrada: {path}")
+            payload = None
+            if (method, path) in self.raw_routes:
+                payload = body
+            elif method == 'POST':
+                payload = _parse_json(body)
+            await route(payload, writer, keep_alive)
+        except ConnectionError:
+            raise
+        except RequestError as e:
+            writer.write(_json_response(e.status, {'error': str(e)}, keep_alive))
+        except Exception as e:
+            writer.write(_json_response(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}, keep_alive))
+        return keep_alive
+
+    async def health(self, payload, writer, keep_alive):
+        writer.write(_json_response(HTTPStatus.OK, {'status': 'ok', 'workers': self.workers}, keep_alive))
+
+    async def calculate(self, payload, writer, keep_alive):
+        """Un enlace; se agrupa con las peticiones concurrentes en un solo cálculo."""
+        row = await self.coalescer.submit(_check_link(payload))
+        writer.write(_json_response(HTTPStatus.OK, row.encode('utf-8'), keep_alive))
+
+    async def batch(self, body, writer, keep_alive):
+        """
+        Muchos enlaces; la respuesta es NDJSON (una fila por enlace, en orden)
+        con Transfer-Encoding chunked, calculada por bloques en el pool.
+
+        Los cuerpos de más de LARGE_BODY_SIZE se validan y trocean en el
+        pool (split_links) y cada bloque viaja como bytes sin parsear.
+
+        Los valores no numéricos dentro del lote no abortan la respuesta:
+        valen 0 y la fila sale como INVÁLIDO (igual que en batch.py).
+        """
+        loop = asyncio.get_running_loop()
+        if len(body) > LARGE_BODY_SIZE:
+            try:
+                offsets = await loop.run_in_executor(self.executor, split_links, body, self.chunk_size)
+            except ValueError as e:
+                raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from None
+            task, chunks = evaluate_raw_chunk, (body[start:end] for start, end in offsets)
+        else:
+            payload = _parse_json(body)
+            links = payload.get('links') if isinstance(payload, dict) else payload
+            if not isinstance(links, list) or not all(isinstance(row, dict) for row in links):
+                raise RequestError(HTTPStatus.BAD_REQUEST, INVALID_LINKS)
+            task = evaluate_chunk
+            chunks = (links[start:start + self.chunk_size] for start in range(0, len(links), self.chunk_size))
+
+        writer.write(_head(HTTPStatus.OK, 'application/x-ndjson; charset=utf-8', keep_alive=keep_alive, chunked=True))
+
+        # Ventana acotada de bloques en vuelo: memoria constante y salida en orden
+        max_pending = self.workers * 2
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(loop.run_in_executor(self.executor, task, chunk))
+                if len(pending) >= max_pending:
+                    await self._write_chunk(writer, await pending.popleft())
+            while pending:
+                await self._write_chunk(writer, await pending.popleft())
+        except Exception as e:
+            # La cabecera ya salió: solo queda cortar la conexión para que el cliente vea la respuesta incompleta
+            for future in pending:
+                future.cancel()
+            raise ConnectionAbortedError(str(e)) from e
+        writer.write(b'0\r\n\r\n')
+
+    @staticmethod
+    async def _write_chunk(writer, data):
+        writer.write(b'%x\r\n%b\r\n' % (len(data), data))
+        await writer.drain()
+
+    async def profile(self, payload, writer, keep_alive):
+        if not isinstance(payload, dict):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Se espera un objeto JSON.")
+        missing = [name for name in ('elevations', 'dist', 'freq', 'h_a', 'h_b') if name not in payload]
+        if missing:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Faltan campos obligatorios: {', '.join(missing)}")
+        try:
+            body = await asyncio.get_running_loop().run_in_executor(self.executor, analyze_profile, payload)
+        except (TypeError, ValueError) as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from None
+        writer.write(_json_response(HTTPStatus.OK, body, keep_alive))
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    """Ejecuta el servicio hasta que se cancele."""
+    service = LinkService(**options)
+    server = await service.start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"UPTALINK escuchando en http://{address[0]}:{address[1]} ({service.workers} procesos)", file=sys.stderr)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main(args):
+    """Punto de entrada de 'python -m uptalink serve'."""
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_batch=args.max_batch,
+                          max_delay=args.max_delay / 1000, chunk_size=args.chunk_size))
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,182 @@
+"""
+Solver del espacio de diseño (problemas inversos del presupuesto de enlace).
+
+Usa el mismo modelo que LinkBudgetCalculator:
+
+    margen = p_tx + g_a + g_b - (20*log10(d) + 20*log10(f) + 32.44 + cable_loss) - sens
+
+que es lineal en dB, así que las inversiones simples (distancia máxima,
+ganancia o potencia mínimas para un margen dado) son analíticas. Para
+explorar la región viable sobre una rejilla de parámetros, cada término
+depende de un solo parámetro: se calcula sobre su eje 1-D y se suma con
+broadcasting, sin materializar la rejilla de entradas.
+
+Todas las funciones aceptan escalares o arrays NumPy. Como en
+calculate_batch, Frecuencia o Distancia <= 0 no lanzan excepción: el
+resultado correspondiente es NaN.
+
+Los valores devueltos son el límite exacto (margen == margin); calculate
+marca el enlace como viable solo si el margen es estrictamente mayor.
+"""
+
+import numpy as np
+
+from uptalink.calculator import LinkBudgetCalculator
+
+# Constante del FSPL con d en Km y f en GHz
+FSPL_CONSTANT = 32.44
+
+# Parámetros que admite feasibility_grid
+GRID_FIELDS = ('freq', 'dist', 'p_tx', 'g_a', 'g_b', 'cable_loss', 'sens')
+
+
+def _log_term(values):
+    """20*log10(values), NaN donde values <= 0."""
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(values > 0, 20 * np.log10(np.where(values > 0, values, 1.0)), np.nan)
+
+
+def max_distance(freq, p_tx, g_a, g_b, cable_loss, sens, margin=LinkBudgetCalculator.MARGIN_THRESHOLD):
+    """
+    Distancia máxima a la que el enlace conserva el margen pedido.
+
+    Args:
+        freq: Frecuencia (GHz)
+        p_tx, g_a, g_b, cable_loss, sens: Como en calculate.
+        margin: Margen de desvanecimiento requerido (dB).
+
+    Returns:
+        Distancia (Km).
+    """
+    budget = np.asarray(p_tx, dtype=np.float64) + g_a + g_b - cable_loss - sens - margin - FSPL_CONSTANT
+    return 10 ** ((budget - _log_term(freq)) / 20)
+
+
+def min_power(freq, dist, g_a, g_b, cable_loss, sens, margin=LinkBudgetCalculator.MARGIN_THRESHOLD):
+    """
+    Potencia de transmisión mínima para el margen pedido.
+
+    Returns:
+        Potencia Tx (dBm).
+    """
+    fspl = _log_term(dist) + _log_term(freq) + FSPL_CONSTANT
+    return margin + sens + fspl + cable_loss - g_a - g_b
+
+
+def min_gain(freq, dist, p_tx, cable_loss, sens, margin=LinkBudgetCalculator.MARGIN_THRESHOLD, g_other=None):
+    """
+    Ganancia de antena mínima para el margen pedido.
+
+    Args:
+        g_other: Ganancia de la otra antena (dBi). Si es None se supone
+            que ambas antenas son iguales y se devuelve la de cada una.
+
+    Returns:
+        Ganancia (dBi).
+    """
+    fspl = _log_term(dist) + _log_term(freq) + FSPL_CONSTANT
+    total_gain = margin + sens + fspl + cable_loss - p_tx
+    if g_other is None:
+        return total_gain / 2
+    return total_gain - g_other
+
+
+def solve_link(inputs, margin=LinkBudgetCalculator.MARGIN_THRESHOLD):
+    """
+    Inversiones analíticas para los valores del panel de entradas.
+
+    Args:
+        inputs: dict con las claves de store.INPUT_FIELDS.
+        margin: Margen requerido (dB).
+
+    Returns:
+        dict: 'max_dist' (Km), 'min_p_tx' (dBm), 'min_g_a' y 'min_g_b'
+        (dBi, manteniendo la otra antena) y 'min_gain' (dBi, ambas iguales).
+        Los valores no calculables son NaN.
+    """
+    freq, dist = inputs['freq'], inputs['dist']
+    p_tx, g_a, g_b = inputs['p_tx'], inputs['g_a'], inputs['g_b']
+    cable_loss, sens = inputs['cable_loss'], inputs['sens']
+    return {
+        'max_dist': float(max_distance(freq, p_tx, g_a, g_b, cable_loss, sens, margin)),
+        'min_p_tx': float(min_power(freq, dist, g_a, g_b, cable_loss, sens, margin)),
+        'min_g_a': float(min_gain(freq, dist, p_tx, cable_loss, sens, margin, g_other=g_b)),
+        'min_g_b': float(min_gain(freq, dist, p_tx, cable_loss, sens, margin, g_other=g_a)),
+        'min_gain': float(min_gain(freq, dist, p_tx, cable_loss, sens, margin)),
+    }
+
+
+def feasibility_grid(axes, fixed=None, margin=LinkBudgetCalculator.MARGIN_THRESHOLD):
+    """
+    Margen y viabilidad sobre el producto cartesiano de varios ejes.
+
+    Cada eje es un parámetro de GRID_FIELDS con un array 1-D de valores,
+    o un eje conjunto (p. ej. un catálogo de equipos) dado como dict de
+    parámetros con arrays de la misma longitud:
+
+        feasibility_grid(
+            {'freq': np.linspace(2, 30, 1000),
+             'equipo': {'p_tx': [20, 25], 'g_a': [30, 34], 'g_b': [30, 34], 'sens': [-80, -75]}},
+            fixed={'dist': 15, 'cable_loss': 2})
+
+    Args:
+        axes: dict ordenado nombre de eje -> valores.
+        fixed: dict con los parámetros que no son eje (cable_loss vale 0
+            si se omite).
+        margin: Margen requerido (dB).
+
+    Returns:
+        dict: 'axes' (nombres en orden), 'shape', 'margin' (array float64
+        con una dimensión por eje) y 'feasible' (margen > margin, como
+        is_good en calculate).
+    """
+    fixed = dict(fixed or {})
+    fixed.setdefault('cable_loss', 0.0)
+
+    # Columnas por eje: {parámetro: array 1-D}
+    columns = {}
+    for axis, values in axes.items():
+        params = values if isinstance(values, dict) else {axis: values}
+        params = {name: np.asarray(v, dtype=np.float64).ravel() for name, v in params.items()}
+        lengths = {len(v) for v in params.values()}
+        if len(lengths) != 1:
+            raise ValueError(f"El eje '{axis}' tiene columnas de distinta longitud.")
+        columns[axis] = params
+
+    assigned = [name for params in columns.values() for name in params]
+    for name in assigned + list(fixed):
+        if name not in GRID_FIELDS:
+            raise ValueError(f"Parámetro desconocido: '{name}'.")
+    if len(set(assigned)) != len(assigned) or set(assigned) & set(fixed):
+        raise ValueError("Cada parámetro debe aparecer una sola vez.")
+    missing = set(GRID_FIELDS) - set(assigned) - set(fixed)
+    if missing:
+        raise ValueError("Faltan parámetros: " + ", ".join(sorted(missing)))
+
+    # Cada término del margen con su signo; los logaritmos sobre el eje 1-D
+    def term(name, values):
+        if name in ('freq', 'dist'):
+            return -_log_term(values)
+        if name in ('cable_loss', 'sens'):
+            return -values
+        return values
+
+    constant = -FSPL_CONSTANT
+    for name, value in fixed.items():
+        constant = constant + term(name, np.float64(value))
+
+    shape = tuple(len(next(iter(params.values()))) for params in columns.values())
+    result = np.full(shape, constant, dtype=np.float64)
+    for dim, params in enumerate(columns.values()):
+        axis_term = sum(term(name, values) for name, values in params.items())
+        view = [1] * len(shape)
+        view[dim] = shape[dim]
+        result += axis_term.reshape(view)
+
+    return {
+        'axes': tuple(columns),
+        'shape': shape,
+        'margin': result,
+        'feasible': result > margin,
+    }
@@ -0,0 +1,265 @@
+"""
+Repositorio SQLite de enlaces guardados.
+
+Una fila por enlace con las 16 entradas y 16 salidas del panel derecho
+más las coordenadas de los extremos. La base trabaja en modo WAL, las
+inserciones usan una única sentencia preparada con executemany por lotes
+y hay índices sobre el ID de enlace (exacto y sin distinguir mayúsculas)
+y la fecha de creación.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from uptalink import instrument
+
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".uptalink", "links.sqlite")
+
+# Mismo orden que las etiquetas de entrada de MainWindow.create_module
+INPUT_FIELDS = (
+    'freq', 'dist', 'p_tx', 'g_a', 'g_b', 'cable_loss', 'sens', 'noise_figure',
+    'bandwidth', 'temperature', 'rain_margin', 'height_a', 'height_b', 'obstacle', 'cost_eq', 'hours',
+)
+
+# Valor de las entradas en blanco distinto de 0 (el de
+# LinkBudgetCalculator.DEFAULT_TEMPERATURE, repetido para no importar NumPy)
+INPUT_DEFAULTS = {'temperature': 16.85}
+
+# Mismo orden que las etiquetas de salida de MainWindow.create_module
+OUTPUT_FIELDS = (
+    'fspl', 'total_loss', 'rssi', 'margin', 'availability', 'snr', 'throughput', 'fresnel',
+    'clearance', 'power', 'heat', 'total_cost', 'roi', 'status', 'alert', 'budget',
+)
+
+TEXT_OUTPUTS = ('status', 'alert')
+
+COORD_FIELDS = ('lat_a', 'lon_a', 'lat_b', 'lon_b')
+
+COLUMNS = ('link_id', 'created_at') + COORD_FIELDS + INPUT_FIELDS + OUTPUT_FIELDS
+
+# Mayor punto de código: cota superior de los IDs con un prefijo dado
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def _schema():
+    cols = ["id INTEGER PRIMARY KEY", "link_id TEXT NOT NULL", "created_at REAL NOT NULL"]
+    cols += [f"{name} REAL" for name in COORD_FIELDS + INPUT_FIELDS]
+    cols += [f"{name} {'TEXT' if name in TEXT_OUTPUTS else 'REAL'}" for name in OUTPUT_FIELDS]
+    return (
+        f"CREATE TABLE IF NOT EXISTS links ({', '.join(cols)});\n"
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_links_link_id ON links (link_id);\n"
+        "CREATE INDEX IF NOT EXISTS idx_links_created_at ON links (created_at);\n"
+        "CREATE INDEX IF NOT EXISTS idx_links_link_id_nocase ON links (link_id COLLATE NOCASE);\n"
+    )
+
+
+def new_link_id():
+    """ID legible para enlaces creados desde la UI, p. ej. 'LNK-3F9A1C2B'."""
+    return f"LNK-{uuid.uuid4().hex[:8].upper()}"
+
+
+class LinkStore:
+    """
+    Acceso a la tabla de enlaces.
+
+    Es seguro usarlo desde hilos de trabajo (la conexión se protege con
+    un lock), lo que permite guardar sin bloquear el hilo de la UI.
+    """
+
+    INSERT_SQL = (
+        f"INSERT INTO links ({', '.join(COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in COLUMNS)})"
+    )
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_schema())
+
+    @staticmethod
+    def _row_values(link, now):
+        values = dict(link)
+        values.setdefault('link_id', new_link_id())
+        values.setdefault('created_at', now)
+        return tuple(values.get(name) for name in COLUMNS)
+
+    @instrument.probe("db.insert")
+    def insert(self, link):
+        """
+        Guarda un enlace.
+
+        Args:
+            link: dict con cualquier subconjunto de COLUMNS; link_id y
+                created_at se generan si faltan.
+
+        Returns:
+            str: link_id del enlace guardado.
+        """
+        row = self._row_values(link, time.time())
+        with self._lock, self.db:
+            self.db.execute(self.INSERT_SQL, row)
+        return row[0]
+
+    def insert_many(self, links, chunk_size=10000):
+        """
+        Importación masiva: executemany por lotes, una transacción por lote.
+
+        Args:
+            links: Iterable de dicts (puede ser un generador).
+            chunk_size: Filas por transacción.
+
+        Returns:
+            int: Número de enlaces insertados.
+        """
+        total = 0
+        now = time.time()
+        chunk = []
+        for link in links:
+            chunk.append(self._row_values(link, now))
+            if len(chunk) >= chunk_size:
+                total += self._write_chunk(chunk)
+                chunk = []
+        if chunk:
+            total += self._write_chunk(chunk)
+        return total
+
+    @instrument.probe("db.write_chunk")
+    def _write_chunk(self, rows):
+        with self._lock, self.db:
+            self.db.executemany(self.INSERT_SQL, rows)
+        return len(rows)
+
+    @instrument.probe("db.get")
+    def get(self, link_id):
+        """Devuelve el enlace como dict, o None si no existe."""
+        with self._lock:
+            row = self.db.execute("SELECT * FROM links WHERE link_id = ?", (link_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def count(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+    def iter_links(self, batch_size=1000):
+        """
+        Recorre todos los enlaces por orden de creación sin cargarlos a la vez.
+
+        Yields:
+            dict: Un enlace por iteración.
+        """
+        last_id = 0
+        while True:
+            with self._lock, instrument.span("db.iter_page"):
+                rows = self.db.execute(
+                    "SELECT * FROM links WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last_id = rows[-1]['id']
+
+    def iter_pages(self, columns=COLUMNS, batch_size=5000):
+        """
+        Recorre todos los enlaces por orden de creación en bloques de tuplas.
+
+        Más barato que iter_links para exportaciones: sin un dict por fila.
+
+        Yields:
+            list: Tuplas con los valores de columns, hasta batch_size por bloque.
+        """
+        unknown = [name for name in columns if name not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Columna desconocida: {', '.join(unknown)}")
+        sql = f"SELECT {', '.join(columns)}, id FROM links WHERE id > ? ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            with self._lock, instrument.span("db.iter_page"):
+                cursor = self.db.cursor()
+                cursor.row_factory = None
+                rows = cursor.execute(sql, (last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][-1]
+            yield [row[:-1] for row in rows]
+
+    def ensure_index(self, *columns):
+        """
+        Crea (una vez) el índice que permite filtrar por los primeros campos
+        y ordenar por el último sin ordenar la tabla.
+
+        La primera vez recorre toda la tabla; las siguientes no hace nada.
+        """
+        columns = tuple(name for name in columns if name != 'id')
+        if not columns or columns in (('link_id',), ('created_at',)):
+            return
+        unknown = [name for name in columns if name not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Columna desconocida: {', '.join(unknown)}")
+        with self._lock, self.db:
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS idx_links_{'_'.join(columns)} ON links ({', '.join(columns)})")
+
+    @instrument.probe("db.fetch_page")
+    def fetch_page(self, columns, sort='id', descending=False, after=None, limit=256, status=None, id_prefix=None):
+        """
+        Página de enlaces para listados, con paginación por clave (sin OFFSET).
+
+        Args:
+            columns: Columnas de COLUMNS a devolver.
+            sort: Columna de orden ('id' = orden de creación); el id desempata.
+            descending: Orden descendente.
+            after: (valor de sort, id) de la última fila de la página
+                anterior; None para la primera página.
+            limit: Filas por página.
+            status: Filtra por el estado ('VIABLE', 'CRÍTICO').
+            id_prefix: Filtra por prefijo del ID (sin distinguir mayúsculas).
+
+        Returns:
+            list: Tuplas (id, valor de sort, *columns) en orden.
+        """
+        for name in (sort, *columns):
+            if name != 'id' and name not in COLUMNS:
+                raise ValueError(f"Columna desconocida: {name}")
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if id_prefix:
+            # Rango sobre el índice NOCASE: [prefijo, prefijo + U+10FFFF) abarca
+            # todo ID que empieza por el prefijo (LIKE no usaría el índice)
+            where.append("link_id COLLATE NOCASE >= ? AND link_id COLLATE NOCASE < ?")
+            params += [id_prefix, id_prefix + _MAX_CHAR]
+        if after is not None:
+            value, last_id = after
+            op = '<' if descending else '>'
+            if sort == 'id':
+                where.append(f"id {op} ?")
+                params.append(last_id)
+            elif value is None:
+                # NULL va primero en orden ascendente y último en descendente
+                where.append(f"(({sort} IS NULL AND id {op} ?)" + ("" if descending else f" OR {sort} IS NOT NULL") + ")")
+                params.append(last_id)
+            else:
+                where.append(f"({sort} {op} ? OR ({sort} = ? AND id {op} ?)" + (f" OR {sort} IS NULL" if descending else "") + ")")
+                params += [value, value, last_id]
+        direction = 'DESC' if descending else 'ASC'
+        sql = f"SELECT id, {sort}, {', '.join(columns)} FROM links"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {sort} {direction}" + ("" if sort == 'id' else f", id {direction}") + " LIMIT ?"
+        params.append(int(limit))
+        with self._lock:
+            return [tuple(row) for row in self.db.execute(sql, params)]
+
+    def close(self):
+        with self._lock:
+            self.db.close()
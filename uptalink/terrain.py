@@ -0,0 +1,226 @@
+"""
+Motor de perfil de trayecto y despeje de Fresnel.
+
+Porta a Python (vectorizado con NumPy) las funciones del JS original
+de UPTALINK_WEB17.html: haversine, eDrop, calcFR y el bucle de análisis
+de runAnalysis/extProf. Todas las operaciones se aplican sobre el perfil
+completo de una vez, sin bucles Python por muestra.
+"""
+
+import numpy as np
+
+from uptalink import instrument
+
+EARTH_RADIUS = 6371000  # m
+DEFAULT_K_FACTOR = 4 / 3
+CLEARANCE_THRESHOLD = 60  # % de la 1ª zona de Fresnel exigido para línea de vista
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Distancia de gran círculo entre dos puntos (o arrays de puntos).
+
+    Args:
+        lat1, lon1, lat2, lon2: Coordenadas en grados decimales.
+
+    Returns:
+        Distancia en metros (float o ndarray).
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def earth_drop(d1, dt, k=DEFAULT_K_FACTOR):
+    """
+    Abultamiento terrestre (eDrop del JS) para radio efectivo k*R.
+
+    Args:
+        d1: Distancia desde el extremo A (Km).
+        dt: Distancia total del enlace (Km).
+        k: Factor K de refracción.
+
+    Returns:
+        Altura del abultamiento en metros.
+    """
+    m1 = np.asarray(d1, dtype=np.float64) * 1000
+    mt = dt * 1000
+    return (m1 * (mt - m1)) / (2 * EARTH_RADIUS * k)
+
+
+def fresnel_radius(dt, d1, freq):
+    """
+    Radio de la 1ª zona de Fresnel (calcFR del JS).
+
+    Args:
+        dt: Distancia total del enlace (Km).
+        d1: Distancia desde el extremo A (Km).
+        freq: Frecuencia (GHz).
+
+    Returns:
+        Radio en metros; 0 en los extremos del enlace.
+    """
+    d1 = np.asarray(d1, dtype=np.float64)
+    if dt <= 0 or freq <= 0:
+        return np.zeros_like(d1)
+    d2 = dt - d1
+    product = np.clip(d1 * d2, 0, None)
+    return 17.32 * np.sqrt(product / (freq * dt))
+
+
+def sample_path(lat_a, lon_a, lat_b, lon_b, n_samples):
+    """
+    Puntos equiespaciados entre A y B (interpolación lineal como en el JS).
+
+    Returns:
+        tuple: (lats, lons) como ndarrays de n_samples elementos.
+    """
+    t = np.linspace(0.0, 1.0, n_samples)
+    return lat_a + t * (lat_b - lat_a), lon_a + t * (lon_b - lon_a)
+
+
+def obstacle_profile(n_samples, obstacle_height=0.0, ground=0.0):
+    """
+    Perfil sintético de terreno plano con un obstáculo en el punto medio.
+
+    Es el peor caso para la zona de Fresnel y se usa en la app de
+    escritorio cuando no hay coordenadas ni fuente de elevación.
+
+    Returns:
+        ndarray: Elevaciones (m) de n_samples muestras.
+    """
+    elevations = np.full(n_samples, float(ground))
+    elevations[n_samples // 2] += obstacle_height
+    return elevations
+
+
+class GridElevationSource:
+    """
+    Fuente de elevación sobre una malla regular (getElevFromGrid del JS).
+
+    La malla cubre [min_lat, max_lat] x [min_lon, max_lon] con filas por
+    latitud creciente. Las consultas fuera de la malla se recortan al borde.
+    """
+
+    def __init__(self, elevs, min_lat, max_lat, min_lon, max_lon):
+        self.elevs = np.asarray(elevs, dtype=np.float64)
+        self.min_lat, self.max_lat = min_lat, max_lat
+        self.min_lon, self.max_lon = min_lon, max_lon
+
+    def lookup(self, lats, lons):
+        """
+        Interpolación bilineal vectorizada.
+
+        Args:
+            lats, lons: Arrays de coordenadas (grados).
+
+        Returns:
+            ndarray: Elevaciones en metros.
+        """
+        rows, cols = self.elevs.shape
+        lats = np.clip(np.asarray(lats, dtype=np.float64), self.min_lat, self.max_lat)
+        lons = np.clip(np.asarray(lons, dtype=np.float64), self.min_lon, self.max_lon)
+        x = (lons - self.min_lon) / (self.max_lon - self.min_lon) * (cols - 1)
+        y = (lats - self.min_lat) / (self.max_lat - self.min_lat) * (rows - 1)
+        x0 = np.floor(x).astype(np.intp)
+        y0 = np.floor(y).astype(np.intp)
+        x1 = np.minimum(x0 + 1, cols - 1)
+        y1 = np.minimum(y0 + 1, rows - 1)
+        tx = x - x0
+        ty = y - y0
+        e = self.elevs
+        return (1 - ty) * ((1 - tx) * e[y0, x0] + tx * e[y0, x1]) + ty * ((1 - tx) * e[y1, x0] + tx * e[y1, x1])
+
+
+def sample_grid(source, bounds, shape):
+    """
+    Muestrea una fuente de elevación sobre una malla regular.
+
+    Args:
+        source: Objeto con método lookup(lats, lons) -> ndarray
+            (GridElevationSource, dem.DemTileStore).
+        bounds: (min_lat, max_lat, min_lon, max_lon).
+        shape: (filas, columnas); las filas van por latitud creciente.
+
+    Returns:
+        ndarray: Elevaciones (filas, columnas).
+    """
+    min_lat, max_lat, min_lon, max_lon = bounds
+    lats = np.linspace(min_lat, max_lat, shape[0])
+    lons = np.linspace(min_lon, max_lon, shape[1])
+    return source.lookup(lats[:, None], lons[None, :])
+
+
+def extract_profile(source, lat_a, lon_a, lat_b, lon_b, n_samples=50):
+    """
+    Extrae el perfil de elevaciones entre A y B desde una fuente.
+
+    Args:
+        source: Objeto con método lookup(lats, lons) -> ndarray.
+        lat_a, lon_a, lat_b, lon_b: Extremos del enlace (grados).
+        n_samples: Número de muestras del perfil.
+
+    Returns:
+        tuple: (dist_km, elevations) con la distancia total y el perfil.
+    """
+    lats, lons = sample_path(lat_a, lon_a, lat_b, lon_b, n_samples)
+    dist_km = float(haversine(lat_a, lon_a, lat_b, lon_b)) / 1000
+    return dist_km, np.asarray(source.lookup(lats, lons), dtype=np.float64)
+
+
+@instrument.probe("terrain.analyze_profile")
+def analyze_profile(elevations, dist, freq, h_a, h_b, k_factor=DEFAULT_K_FACTOR):
+    """
+    Calcula el despeje de la 1ª zona de Fresnel sobre todo el perfil.
+
+    Args:
+        elevations: Elevaciones del terreno (m), equiespaciadas de A a B.
+        dist: Distancia total del enlace (Km).
+        freq: Frecuencia (GHz).
+        h_a: Altura Torre A sobre el terreno (m).
+        h_b: Altura Torre B sobre el terreno (m).
+        k_factor: Factor K para el abultamiento terrestre.
+
+    Returns:
+        dict: Arrays por muestra ('distances' en m, 'terrain' con
+        abultamiento, 'los', 'fresnel', 'clearance' en %) y resumen
+        ('min_clearance', 'max_obstruction', 'is_clear').
+    """
+    if freq <= 0 or dist <= 0:
+        raise ValueError("La Frecuencia y la Distancia deben ser mayores a 0.")
+
+    elevations = np.asarray(elevations, dtype=np.float64)
+    n = elevations.size
+    t = np.linspace(0.0, 1.0, n)
+    d_km = t * dist
+
+    # Terreno efectivo: el abultamiento eleva el terreno respecto a la cuerda
+    terrain = elevations + earth_drop(d_km, dist, k_factor)
+    top_a = elevations[0] + h_a
+    top_b = elevations[-1] + h_b
+    los = top_a + t * (top_b - top_a)
+    fresnel = fresnel_radius(dist, d_km, freq)
+
+    # Despeje en % del radio; en los extremos (radio 0) no aplica
+    clearance = np.full(n, np.nan)
+    inner = fresnel > 0
+    clearance[inner] = (los[inner] - terrain[inner]) / fresnel[inner] * 100
+
+    if inner.any():
+        min_clearance = float(np.min(clearance[inner]))
+        lower = los - fresnel * (CLEARANCE_THRESHOLD / 100)
+        max_obstruction = float(max(np.max(terrain[inner] - lower[inner]), 0.0))
+    else:
+        min_clearance = 100.0
+        max_obstruction = 0.0
+
+    return {
+        'distances': d_km * 1000,
+        'terrain': terrain,
+        'los': los,
+        'fresnel': fresnel,
+        'clearance': clearance,
+        'min_clearance': min_clearance,
+        'max_obstruction': max_obstruction,
+        'is_clear': min_clearance >= CLEARANCE_THRESHOLD
+    }
@@ -1,106 +1,1073 @@
+import importlib
+import os
 import sys
-import math
-# import numpy as np  <-- Eliminado (solo se usaba para 3D)
+import threading
+import time
+
+# Referencia para --profile-startup: antes de importar Qt
+_STARTUP_T0 = time.perf_counter()
+
+from collections import OrderedDict
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QGridLayout, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QFrame, QScrollArea, QSplitter,
-    QToolBar, QSizePolicy, QMessageBox
+    QToolBar, QSizePolicy, QMessageBox, QCheckBox, QTableWidget, QTableWidgetItem,
+    QHeaderView, QFileDialog, QTableView, QStyledItemDelegate, QComboBox, QAbstractItemView, QProgressDialog
 )
-from PySide6.QtCore import Qt, QTimer, Slot
-from PySide6.QtGui import QAction, QIcon, QPalette, QColor, QFont
-# import pyvista as pv <-- Eliminado
-# from pyvistaqt import QtInteractor <-- Eliminado
+from PySide6.QtCore import (
+    Qt, QTimer, Slot, QObject, QRunnable, QThreadPool, Signal, QPointF, QRectF, QAbstractTableModel, QModelIndex,
+    QEvent, QFile, QIODevice
+)
+from PySide6.QtGui import QAction, QIcon, QPalette, QColor, QFont, QImage, QPainter, QPen, QPolygonF
+from uptalink import instrument
+from uptalink.store import LinkStore, INPUT_DEFAULTS, INPUT_FIELDS, new_link_id
+# El visor 3D ya no usa PyVista: la malla sale de uptalink/mesh.py y se pinta por CPU (TerrainView)
+# Los módulos con NumPy (calculator, mesh, montecarlo, solver, search, catalog) se
+# importan en el primer uso; WarmUpTask los precarga tras el primer pintado.
 
 # =============================================================================
 # 1. BACKEND: Lógica de Negocio y Matemáticas
 # =============================================================================
+# LinkBudgetCalculator vive en uptalink/calculator.py para poder usarse sin Qt.
 
-class LinkBudgetCalculator:
-    """
-    Clase encargada exclusivamente de los cálculos matemáticos.
-    No contiene nada de UI.
-    """
-    
-    @staticmethod
-    def calculate(freq, dist, p_tx, g_a, g_b, cable_loss, sens, cost_eq, hours):
-        """
-        Ejecuta las fórmulas basadas en el JS original.
-        
-        Args:
-            freq: Frecuencia (GHz)
-            dist: Distancia (Km)
-            p_tx: Potencia Tx (dBm)
-            g_a: Ganancia Antena A (dBi)
-            g_b: Ganancia Antena B (dBi)
-            cable_loss: Pérdidas Cables (dB)
-            sens: Sensibilidad Rx (dBm)
-            cost_eq: Costo Equipo ($)
-            hours: Horas Instalación
-            
-        Returns:
-            dict: Diccionario con todos los resultados calculados y estado.
-        """
-        
-        # Validación básica
-        if freq == 0 or dist == 0:
-            raise ValueError("La Frecuencia y la Distancia deben ser mayores a 0.")
+def __getattr__(name):
+    # ya.LinkBudgetCalculator sigue disponible para quien lo importaba de aquí,
+    # pero NumPy solo se carga al pedirlo, no al arrancar la app
+    if name == "LinkBudgetCalculator":
+        from uptalink.calculator import LinkBudgetCalculator
+        return LinkBudgetCalculator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-        # 1. FSPL (Free Space Path Loss)
-        # Formula: 20*log10(d) + 20*log10(f) + 32.44
-        fspl = 20 * math.log10(dist) + 20 * math.log10(freq) + 32.44
-        
-        # 2. Pérdida Total del Sistema
-        total_loss = fspl + cable_loss
-        
-        # 3. Nivel Rx Recibido (RSSI)
-        rssi = p_tx + g_a + g_b - total_loss
-        
-        # 4. Margen de Desvanecimiento (Fade Margin)
-        margin = rssi - sens
-        
-        # 5. Determinación de viabilidad
-        is_good = margin > 10
-        
-        # Cálculos secundarios (simulados según el JS original)
-        availability = "99.999" if is_good else "98.5"
-        snr = rssi + 100  # Aproximación simple del JS
-        throughput = (freq * 10) if is_good else 0
-        
-        # Radio de Fresnel (Aproximación JS: 5.5 * sqrt(dist/freq))
-        fresnel_radius = 5.5 * math.sqrt(dist / freq)
-        
-        # Costos
-        total_cost = cost_eq + (hours * 50) # $50/hora ingeniero
-        
-        # Estado
-        status = "VIABLE" if is_good else "CRÍTICO"
-        
-        return {
-            'fspl': fspl,
-            'total_loss': total_loss,
-            'rssi': rssi,
-            'margin': margin,
-            'availability': availability,
-            'snr': snr,
-            'throughput': throughput,
-            'fresnel': fresnel_radius,
-            'total_cost': total_cost,
-            'status': status,
-            'is_good': is_good
-        }
 
 # =============================================================================
 # 2. FRONTEND: Interfaz Gráfica (PySide6)
 # =============================================================================
 
+class WorkerSignals(QObject):
+    """Señales para devolver resultados de tareas en segundo plano al hilo de la UI."""
+    finished = Signal(object)
+    error = Signal(str)
+
+
+class SaveLinkTask(QRunnable):
+    """Guarda un enlace en la base SQLite fuera del hilo de la UI."""
+
+    def __init__(self, store, link):
+        super().__init__()
+        self.store = store
+        self.link = link
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            link_id = self.store.insert(self.link)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(link_id)
+
+
+class SaveProjectTask(QRunnable):
+    """Guarda los enlaces de la base en un fichero de proyecto fuera del hilo de la UI."""
+
+    def __init__(self, store, path):
+        super().__init__()
+        self.store = store
+        self.path = path
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            from uptalink import project
+            written = project.save_store(self.store, self.path)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(written)
+
+
+class ExportSignals(QObject):
+    """Señales de ExportTask: enlaces escritos tras cada bloque."""
+    progress = Signal(int)
+    finished = Signal(object)
+    error = Signal(str)
+
+
+class ExportTask(QRunnable):
+    """
+    Exporta los enlaces de la base (CSV, KML o PDF) fuera del hilo de la UI.
+
+    Emite progress con los enlaces escritos y finished con el total (None
+    si se canceló; el fichero parcial se borra).
+    """
+
+    def __init__(self, store, path):
+        super().__init__()
+        self.store = store
+        self.path = path
+        self.cancelled = False
+        self.signals = ExportSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        count = 0
+        try:
+            from uptalink import export
+            stream = export.export_links(self.store.iter_pages(), self.path)
+            try:
+                for count in stream:
+                    if self.cancelled:
+                        count = None
+                        break
+                    self.signals.progress.emit(count)
+            finally:
+                stream.close()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(count)
+
+
+class BuildSearchIndexTask(QRunnable):
+    """Construye el índice de búsqueda a partir de la base sin bloquear la UI."""
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            from uptalink.search import LinkSearchIndex
+            index = LinkSearchIndex.from_store(self.store)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(index)
+
+
+class SelectEquipmentTask(QRunnable):
+    """Busca en el catálogo el equipo más barato viable sin bloquear la UI."""
+
+    def __init__(self, catalog, freq, dist, cable_loss):
+        super().__init__()
+        self.catalog = catalog
+        self.freq = freq
+        self.dist = dist
+        self.cable_loss = cable_loss
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            best = self.catalog.select(self.freq, self.dist, self.cable_loss)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(best)
+
+
+class WarmUpTask(QRunnable):
+    """
+    Importa los módulos con NumPy y abre la base de enlaces fuera del
+    arranque para que ni el primer cálculo ni el primer guardado esperen.
+    """
+
+    MODULES = ('uptalink.calculator', 'uptalink.mesh', 'uptalink.solver')
+
+    def __init__(self, open_store):
+        super().__init__()
+        self.open_store = open_store
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            for name in self.MODULES:
+                importlib.import_module(name)
+            self.open_store()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(None)
+
+
+class CalculationSignals(QObject):
+    """Señales de CalculationTask; la generación permite descartar resultados obsoletos."""
+    finished = Signal(int, object)
+    error = Signal(int, object)
+
+
+class CalculationTask(QRunnable):
+    """
+    Aplica las entradas al grafo de cálculo fuera del hilo de la UI.
+
+    El grafo solo se toca desde el pool de cálculo (un único hilo), así
+    que las actualizaciones quedan serializadas.
+    """
+
+    def __init__(self, generation, graph, inputs):
+        super().__init__()
+        self.generation = generation
+        self.graph = graph
+        self.inputs = inputs
+        self.cancelled = False
+        self.signals = CalculationSignals()
+        # La ventana conserva la referencia para poder hacer tryTake/cancel con seguridad
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        # Aun cancelada se emite la señal para liberar la tarea; la UI la ignora por obsoleta
+        if self.cancelled:
+            self.signals.finished.emit(self.generation, None)
+            return
+        try:
+            self.graph.update(self.inputs)
+            results = self.graph.values
+        except Exception as e:
+            self.signals.error.emit(self.generation, e)
+        else:
+            self.signals.finished.emit(self.generation, None if self.cancelled else results)
+
+
+class SimulationSignals(QObject):
+    """Señales de SimulationTask: un resumen por bloque simulado."""
+    progress = Signal(object)
+    finished = Signal(object)
+    error = Signal(str)
+
+
+class SimulationTask(QRunnable):
+    """
+    Ejecuta la simulación Monte Carlo fuera del hilo de la UI.
+
+    Emite progress con cada resumen de montecarlo.simulate y finished con
+    el último (None si se canceló).
+    """
+
+    def __init__(self, inputs, seed=0):
+        super().__init__()
+        self.inputs = inputs
+        self.seed = seed
+        self.cancelled = False
+        self.signals = SimulationSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        summary = None
+        try:
+            from uptalink import montecarlo
+            stream = montecarlo.simulate_link(self.inputs, seed=self.seed)
+            try:
+                for summary in stream:
+                    if self.cancelled:
+                        summary = None
+                        break
+                    self.signals.progress.emit(summary)
+            finally:
+                stream.close()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(summary)
+
+
+class SimulationPanel(QWidget):
+    """Ventana con los resultados de la simulación, actualizados en cada bloque."""
+
+    def __init__(self, main_window):
+        from uptalink import montecarlo
+        super().__init__(main_window, Qt.Window)
+        self.main_window = main_window
+        self.task = None
+        self.percentiles = montecarlo.REPORT_PERCENTILES
+        self.setWindowTitle("UPTALINK - Simulación Monte Carlo")
+        self.resize(420, 320)
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel("-")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(len(self.percentiles), 2)
+        self.table.setHorizontalHeaderLabels(["% del tiempo por debajo", "Nivel Rx (dBm)"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        for row, q in enumerate(self.percentiles):
+            self.table.setItem(row, 0, QTableWidgetItem(f"{q:g}"))
+            self.table.setItem(row, 1, QTableWidgetItem("-"))
+        layout.addWidget(self.table)
+
+        self.btn_stop = QPushButton("Detener")
+        self.btn_stop.clicked.connect(self.stop)
+        layout.addWidget(self.btn_stop)
+
+    def start(self, inputs):
+        self.stop()
+        self.summary_label.setText("Simulando...")
+        task = SimulationTask(inputs)
+        # Cada señal lleva su tarea: las de una simulación ya detenida se ignoran
+        task.signals.progress.connect(lambda summary: self.on_progress(task, summary))
+        task.signals.finished.connect(lambda summary: self.on_finished(task, summary))
+        task.signals.error.connect(lambda message: self.on_error(task, message))
+        self.task = task
+        self.btn_stop.setEnabled(True)
+        self.main_window.start_task(task)
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+            self.btn_stop.setEnabled(False)
+
+    def on_progress(self, task, summary):
+        if task is not self.task:
+            return
+        low, high = summary['outage_ci']
+        self.summary_label.setText(
+            f"Muestras: {summary['samples']:,}\n"
+            f"Disponibilidad: {summary['availability']:.4f} %\n"
+            f"Indisponibilidad: {summary['outage']:.5f} % (IC 95 %: {low:.5f} - {high:.5f})"
+        )
+        for row, q in enumerate(self.percentiles):
+            self.table.item(row, 1).setText(f"{summary['percentiles'][q]:.2f}")
+
+    def on_finished(self, task, summary):
+        if task is not self.task:
+            return
+        self.task = None
+        self.btn_stop.setEnabled(False)
+        if summary is not None:
+            reason = "precisión alcanzada" if summary['done'] == 'precision' else "tope de muestras"
+            self.summary_label.setText(self.summary_label.text() + f"\nFinalizada ({reason}).")
+
+    def on_error(self, task, message):
+        if task is not self.task:
+            return
+        self.task = None
+        self.btn_stop.setEnabled(False)
+        self.summary_label.setText(f"Error: {message}")
+
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)
+
+
+# Colores de la escena 3D (los del visor del JS)
+SCENE_BACKGROUND = "#080c14"
+SCENE_LOS = "#ef4444"
+SCENE_TOWER_A = "#f59e0b"
+SCENE_TOWER_B = "#06b6d4"
+SCENE_GROUND_LINE = "#334155"
+
+
+def render_terrain_image(scene_mesh, camera, width, height, lines=()):
+    """
+    Pinta una malla de terreno en una QImage sin GPU.
+
+    Los triángulos llegan ordenados de atrás hacia delante desde
+    mesh.render_triangles; funciona también con QT_QPA_PLATFORM=offscreen.
+
+    Args:
+        scene_mesh: mesh.TerrainMesh con update_lod aplicado.
+        camera: dict con 'eye' y 'target' (mesh.default_camera).
+        width, height: Tamaño de la imagen (px).
+        lines: Secuencia de (p0, p1, color) en coordenadas 3D.
+
+    Returns:
+        QImage: Imagen renderizada.
+    """
+    from uptalink import mesh
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor(SCENE_BACKGROUND))
+    polygons, colors = mesh.render_triangles(scene_mesh, camera, width, height)
+    painter = QPainter(image)
+    painter.setPen(Qt.NoPen)
+    last = None
+    for polygon, color in zip(polygons.tolist(), colors.tolist()):
+        # Los triángulos vecinos suelen compartir color: solo se cambia el pincel si difiere
+        if color != last:
+            painter.setBrush(QColor(*color))
+            last = color
+        painter.drawPolygon(QPolygonF([QPointF(x, y) for x, y in polygon]))
+
+    painter.setRenderHint(QPainter.Antialiasing)
+    for p0, p1, color in lines:
+        (x0, y0), (x1, y1) = mesh.project([p0, p1], camera['eye'], camera['target'], width, height)[0]
+        painter.setPen(QPen(QColor(color), 2))
+        painter.drawLine(QPointF(x0, y0), QPointF(x1, y1))
+    painter.end()
+    return image
+
+
+class TerrainSignals(QObject):
+    """Señales de TerrainRenderTask; la generación permite descartar imágenes obsoletas."""
+    finished = Signal(int, object)
+    error = Signal(int, str)
+
+
+class TerrainRenderTask(QRunnable):
+    """
+    Construye la malla de la escena del enlace y la renderiza fuera del hilo de la UI.
+
+    La malla se conserva en scene (un dict del visor) y solo se rehace si
+    cambian la distancia o el obstáculo; si no, se reutilizan sus buffers.
+    El visor usa un pool de un único hilo, así que scene no se comparte.
+    """
+
+    def __init__(self, generation, scene, inputs, width, height):
+        super().__init__()
+        self.generation = generation
+        self.scene = scene
+        self.inputs = inputs
+        self.width = width
+        self.height = height
+        self.signals = TerrainSignals()
+
+    def run(self):
+        try:
+            image = self.render()
+        except Exception as e:
+            self.signals.error.emit(self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.generation, image)
+
+    @instrument.probe("ui.render_terrain")
+    def render(self):
+        from uptalink import mesh
+        dist, obstacle = self.inputs['dist'], self.inputs['obstacle']
+        key = (dist, obstacle)
+        if self.scene.get('key') != key:
+            elevations, bounds, a, b = mesh.synthetic_link_grid(dist, obstacle, TerrainView.GRID_SHAPE)
+            self.scene.update(key=key, ends=(a, b),
+                              mesh=mesh.TerrainMesh(elevations, bounds, mesh.default_z_scale(dist)))
+        scene_mesh = self.scene['mesh']
+        a, b = self.scene['ends']
+        scene_mesh.update_lod(a, b)
+
+        # Torres sobre el terreno y línea de vista entre sus extremos (como el JS)
+        ground_a = scene_mesh.to_world(a[0], a[1], scene_mesh.elevation_at(*a))
+        ground_b = scene_mesh.to_world(b[0], b[1], scene_mesh.elevation_at(*b))
+        top_a = ground_a + (0, self.inputs['height_a'] * scene_mesh.z_scale, 0)
+        top_b = ground_b + (0, self.inputs['height_b'] * scene_mesh.z_scale, 0)
+        lines = (
+            (ground_a, ground_b, SCENE_GROUND_LINE),
+            (ground_a, top_a, SCENE_TOWER_A),
+            (ground_b, top_b, SCENE_TOWER_B),
+            (top_a, top_b, SCENE_LOS),
+        )
+        camera = mesh.default_camera(scene_mesh, a, b)
+        return render_terrain_image(scene_mesh, camera, self.width, self.height, lines)
+
+
+class TerrainView(QWidget):
+    """
+    Visor 3D del enlace (sustituye a la escena de PyVista).
+
+    Muestra la última imagen renderizada por TerrainRenderTask; al cambiar
+    de tamaño se escala la imagen y se vuelve a renderizar con debounce.
+    """
+
+    # Puntos de la malla de la escena sintética
+    GRID_SHAPE = (257, 257)
+
+    # Retardo (ms) del re-render tras redimensionar
+    RESIZE_DEBOUNCE_MS = 200
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.image = None
+        self.inputs = None
+        self.generation = 0
+        self.scene = {}
+        self.setMinimumSize(200, 150)
+
+        self.render_pool = QThreadPool(self)
+        self.render_pool.setMaxThreadCount(1)
+
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(self.RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(self.submit_render)
+
+    def show_link(self, inputs):
+        """Renderiza la escena para las entradas dadas (dict de INPUT_FIELDS)."""
+        if inputs['dist'] <= 0:
+            self.clear()
+            return
+        self.inputs = {name: inputs[name] for name in ('dist', 'obstacle', 'height_a', 'height_b')}
+        self.submit_render()
+
+    def clear(self):
+        self.generation += 1
+        self.inputs = None
+        self.image = None
+        self.update()
+
+    def submit_render(self):
+        if self.inputs is None:
+            return
+        self.generation += 1
+        task = TerrainRenderTask(self.generation, self.scene, self.inputs, max(1, self.width()), max(1, self.height()))
+        task.signals.finished.connect(self.on_rendered)
+        task.signals.error.connect(self.on_render_error)
+        self.main_window.start_task(task, self.render_pool)
+
+    def on_rendered(self, generation, image):
+        if generation != self.generation:
+            return
+        self.image = image
+        self.update()
+
+    def on_render_error(self, generation, message):
+        if generation == self.generation:
+            self.main_window.show_toast(f"Error del visor 3D: {message}")
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.inputs is not None:
+            self.resize_timer.start()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(SCENE_BACKGROUND))
+        if self.image is None:
+            painter.setPen(QColor("#333333"))
+            font = painter.font()
+            font.setPixelSize(24)
+            font.setBold(True)
+            painter.setFont(font)
+            painter.drawText(self.rect(), Qt.AlignCenter, "Visualización 3D: calcule un enlace")
+        else:
+            # Mientras llega el re-render tras redimensionar, se escala la imagen anterior
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(QRectF(self.rect()), self.image)
+        painter.end()
+
+
+class DebugPanel(QWidget):
+    """
+    Panel de depuración con las latencias p50/p95/p99 de la instrumentación.
+
+    Se abre con Ctrl+Shift+D y solo se refresca mientras está visible.
+    """
+
+    COLUMNS = ["Span", "Llamadas", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Máx (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.Window)
+        self.setWindowTitle("UPTALINK - Instrumentación")
+        self.resize(640, 420)
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.chk_enabled = QCheckBox("Instrumentación activa")
+        self.chk_enabled.setChecked(instrument.is_enabled())
+        self.chk_enabled.toggled.connect(self.on_enabled_toggled)
+        btn_reset = QPushButton("Reiniciar")
+        btn_reset.clicked.connect(instrument.reset)
+        btn_export = QPushButton("Exportar snapshot...")
+        btn_export.clicked.connect(self.export_snapshot)
+        top.addWidget(self.chk_enabled)
+        top.addStretch()
+        top.addWidget(btn_reset)
+        top.addWidget(btn_export)
+        layout.addLayout(top)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        self.counters_label = QLabel()
+        self.counters_label.setWordWrap(True)
+        layout.addWidget(self.counters_label)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def on_enabled_toggled(self, checked):
+        if checked:
+            instrument.enable()
+        else:
+            instrument.disable()
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snap = instrument.snapshot()
+        spans = snap['spans']
+        self.table.setRowCount(len(spans))
+        for row, (name, s) in enumerate(spans.items()):
+            values = [name, str(s['count'])] + [f"{s[k] * 1000:.3f}" for k in ('p50_s', 'p95_s', 'p99_s', 'max_s')]
+            for col, text in enumerate(values):
+                item = self.table.item(row, col)
+                if item is None:
+                    self.table.setItem(row, col, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+        counters = snap['counters']
+        self.counters_label.setText(
+            "Contadores: " + (", ".join(f"{k}={v}" for k, v in counters.items()) if counters else "-")
+        )
+
+    def export_snapshot(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar snapshot", "uptalink-metrics.json", "JSON (*.json);;Prometheus (*.prom)"
+        )
+        if path:
+            instrument.write_snapshot(path)
+
+
+# Colores de estado (los mismos que #outputField[linkState=...] en QSS)
+LINK_GOOD_COLOR = "#00d09c"
+LINK_BAD_COLOR = "#ff4d4d"
+
+# Resolver Qt.<Enum> en Python cuesta microsegundos y data() recibe el rol como int:
+# se compara contra estas constantes
+DISPLAY_ROLE = int(Qt.DisplayRole.value)
+USER_ROLE = int(Qt.UserRole.value)
+ALIGNMENT_ROLE = int(Qt.TextAlignmentRole.value)
+ALIGN_LEFT = Qt.AlignLeft | Qt.AlignVCenter
+ALIGN_RIGHT = Qt.AlignRight | Qt.AlignVCenter
+
+
+class SavedLinksModel(QAbstractTableModel):
+    """
+    Enlaces guardados para un QTableView, leídos de la base por páginas.
+
+    Las filas crecen con fetchMore (una página por llamada, paginación por
+    clave desde la última fila de la página anterior). Solo se retienen
+    MAX_PAGES páginas; las demás se releen al volver a ellas a partir del
+    límite de la página anterior, que se conserva siempre (una tupla por
+    página). Orden y filtro se resuelven en SQL.
+    """
+
+    PAGE_SIZE = 256
+    MAX_PAGES = 16
+
+    # (columna de la base, cabecera, formato)
+    COLUMNS = (
+        ('link_id', "ID", "{}"),
+        ('freq', "Frecuencia (GHz)", "{:.2f}"),
+        ('dist', "Distancia (Km)", "{:.2f}"),
+        ('rssi', "Nivel Rx (dBm)", "{:.2f}"),
+        ('margin', "Margen (dB)", "{:.2f}"),
+        ('availability', "Disponibilidad (%)", "{:.4f}"),
+        ('total_cost', "Costo Total ($)", "${:.2f}"),
+        ('status', "Estado", "{}"),
+    )
+    STATUS_COLUMN = 7
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.fields = tuple(name for name, _, _ in self.COLUMNS)
+        self.formats = tuple(fmt for _, _, fmt in self.COLUMNS)
+        self.alignments = tuple(
+            ALIGN_LEFT if column in (0, self.STATUS_COLUMN) else ALIGN_RIGHT for column in range(len(self.COLUMNS))
+        )
+        # Por defecto, los más recientes primero
+        self.sort_field = 'id'
+        self.descending = True
+        self.status = None
+        self.id_prefix = None
+        self._clear()
+
+    def _clear(self):
+        self.pages = OrderedDict()
+        self.bounds = []
+        self.loaded = 0
+        self.exhausted = False
+
+    def refresh(self):
+        """Descarta las filas cargadas; la vista vuelve a pedirlas con fetchMore."""
+        self.beginResetModel()
+        self._clear()
+        self.endResetModel()
+
+    def set_filter(self, status=None, id_prefix=None):
+        self.status = status or None
+        self.id_prefix = id_prefix or None
+        self._ensure_index()
+        self.refresh()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        number = len(self.bounds)
+        rows = self._read(number)
+        if len(rows) < self.PAGE_SIZE:
+            self.exhausted = True
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + len(rows) - 1)
+        self._keep(number, rows)
+        self.bounds.append((rows[-1][1], rows[-1][0]))
+        self.loaded += len(rows)
+        self.endInsertRows()
+
+    def _read(self, number):
+        after = self.bounds[number - 1] if number else None
+        return self.store.fetch_page(self.fields, self.sort_field, self.descending, after,
+                                     self.PAGE_SIZE, self.status, self.id_prefix)
+
+    def _reread(self, number):
+        # Página descartada: se relee por clave entre su límite inferior (el de
+        # la anterior) y el suyo, nunca por posición; las filas insertadas
+        # después en ese tramo no desplazan las de las páginas siguientes
+        rows = self._read(number)
+        last_id = self.bounds[number][1]
+        for end, values in enumerate(rows):
+            if values[0] == last_id:
+                return rows[:end + 1]
+        return rows
+
+    def _keep(self, number, rows):
+        self.pages[number] = rows
+        self.pages.move_to_end(number)
+        while len(self.pages) > self.MAX_PAGES:
+            self.pages.popitem(last=False)
+
+    def row_values(self, row):
+        """Valores (columnas de COLUMNS) de una fila; None si ya no existe."""
+        number, offset = divmod(row, self.PAGE_SIZE)
+        rows = self.pages.get(number)
+        if rows is None:
+            rows = self._reread(number)
+            self._keep(number, rows)
+        else:
+            self.pages.move_to_end(number)
+        return rows[offset][2:] if offset < len(rows) else None
+
+    def data(self, index, role=DISPLAY_ROLE):
+        # Se llama por celda visible y por rol en cada repintado: nada de trabajo extra aquí
+        if role == ALIGNMENT_ROLE:
+            return self.alignments[index.column()]
+        if role != DISPLAY_ROLE and role != USER_ROLE:
+            return None
+        values = self.row_values(index.row())
+        if values is None:
+            return None
+        value = values[index.column()]
+        if role == USER_ROLE or value is None:
+            return value
+        return self.formats[index.column()].format(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # Sin columna (indicador -1): orden de creación
+        self.sort_field = self.fields[column] if column >= 0 else 'id'
+        self.descending = order == Qt.DescendingOrder
+        self._ensure_index()
+        self.refresh()
+
+    def _ensure_index(self):
+        # Con índice, cada página es un recorrido acotado en vez de ordenar la tabla
+        if self.status is not None:
+            self.store.ensure_index('status', self.sort_field)
+        elif self.sort_field != 'id':
+            self.store.ensure_index(self.sort_field)
+
+
+class StatusDelegate(QStyledItemDelegate):
+    """Pinta el estado en verde/rojo y negrita sin hojas de estilo por celda."""
+
+    COLORS = {"VIABLE": QColor(LINK_GOOD_COLOR), "CRÍTICO": QColor(LINK_BAD_COLOR)}
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        color = self.COLORS.get(index.data(Qt.UserRole))
+        if color is not None:
+            option.palette.setColor(QPalette.Text, color)
+            option.palette.setColor(QPalette.HighlightedText, color)
+            option.font.setBold(True)
+
+
+class SavedLinksPanel(QWidget):
+    """Ventana con los enlaces guardados; doble clic carga sus entradas en el panel."""
+
+    FILTER_DEBOUNCE_MS = 250
+
+    def __init__(self, main_window):
+        super().__init__(main_window, Qt.Window)
+        self.main_window = main_window
+        self.setWindowTitle("UPTALINK - Enlaces Guardados")
+        self.resize(1040, 560)
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filtrar por prefijo de ID...")
+        self.status_combo = QComboBox()
+        self.status_combo.addItem("Todos", None)
+        self.status_combo.addItem("VIABLE", "VIABLE")
+        self.status_combo.addItem("CRÍTICO", "CRÍTICO")
+        btn_refresh = QPushButton("Actualizar")
+        top.addWidget(self.filter_input, 1)
+        top.addWidget(self.status_combo)
+        top.addWidget(btn_refresh)
+        layout.addLayout(top)
+
+        self.model = SavedLinksModel(main_window.get_link_store(), self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(SavedLinksModel.STATUS_COLUMN, StatusDelegate(self.table))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.DescendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setDefaultSectionSize(120)
+        self.table.setColumnWidth(0, 140)
+        # Altura fija: la vista no mide filas y el desplazamiento no toca el modelo de más
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setVisible(False)
+        self.table.doubleClicked.connect(self.on_double_clicked)
+        layout.addWidget(self.table)
+
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_input.textChanged.connect(self.filter_timer.start)
+        self.status_combo.currentIndexChanged.connect(self.apply_filter)
+        btn_refresh.clicked.connect(self.model.refresh)
+
+    def apply_filter(self):
+        self.filter_timer.stop()
+        self.model.set_filter(self.status_combo.currentData(), self.filter_input.text().strip())
+
+    def on_double_clicked(self, index):
+        link_id = self.model.index(index.row(), 0).data(Qt.UserRole)
+        if link_id is not None:
+            self.main_window.load_link(link_id)
+
+
+class ProjectLinksModel(QAbstractTableModel):
+    """
+    Enlaces de un fichero de proyecto para un QTableView.
+
+    Las columnas son vistas sobre el fichero mapeado en memoria: cada celda
+    se decodifica al pintarse, así que abrir un proyecto grande no lee
+    nada por adelantado. Mismas columnas que SavedLinksModel.
+    """
+
+    COLUMNS = SavedLinksModel.COLUMNS
+    STATUS_COLUMN = SavedLinksModel.STATUS_COLUMN
+
+    def __init__(self, project, parent=None):
+        super().__init__(parent)
+        self.project = project
+        present = set(project.link_columns())
+        self.columns = tuple(
+            project.link_column(name) if name in present else None for name, _, _ in self.COLUMNS
+        )
+        self.formats = tuple(fmt for _, _, fmt in self.COLUMNS)
+        self.alignments = tuple(
+            ALIGN_LEFT if column in (0, self.STATUS_COLUMN) else ALIGN_RIGHT for column in range(len(self.COLUMNS))
+        )
+        self.rows = project.link_count
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=DISPLAY_ROLE):
+        if role == ALIGNMENT_ROLE:
+            return self.alignments[index.column()]
+        if role != DISPLAY_ROLE and role != USER_ROLE:
+            return None
+        column = self.columns[index.column()]
+        if column is None:
+            return None
+        value = column[index.row()]
+        if not isinstance(value, str):
+            value = float(value)
+            if value != value:
+                return None
+        if role == USER_ROLE:
+            return value
+        return self.formats[index.column()].format(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+
+class ProjectPanel(QWidget):
+    """Ventana con los enlaces de un proyecto abierto; doble clic carga sus entradas en el panel."""
+
+    def __init__(self, main_window, project):
+        super().__init__(main_window, Qt.Window)
+        self.main_window = main_window
+        self.resize(1040, 560)
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableView()
+        self.table.setItemDelegateForColumn(ProjectLinksModel.STATUS_COLUMN, StatusDelegate(self.table))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setDefaultSectionSize(120)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setVisible(False)
+        self.table.doubleClicked.connect(self.on_double_clicked)
+        layout.addWidget(self.table)
+        self.set_project(project)
+
+    def set_project(self, project):
+        from uptalink.project import PROFILES_PREFIX, RASTERS_PREFIX
+        self.project = project
+        self.model = ProjectLinksModel(project, self)
+        self.table.setModel(self.model)
+        self.table.setColumnWidth(0, 140)
+        self.setWindowTitle(f"UPTALINK - Proyecto {os.path.basename(project.path)}")
+        self.summary_label.setText(
+            f"{project.link_count} enlaces, {len(project.names(PROFILES_PREFIX))} perfiles, "
+            f"{len(project.names(RASTERS_PREFIX))} rásteres"
+        )
+
+    def on_double_clicked(self, index):
+        self.main_window.fill_inputs(self.project.link(index.row()))
+
+
+# Hoja de estilo (replica el CSS proporcionado): resources/style.qss, compilada
+# en ya_rc.py con "pyside6-rcc --no-compress resources/ya.qrc -o ya_rc.py"
+STYLESHEET_RESOURCE = ":/ya/style.qss"
+
+
 class MainWindow(QMainWindow):
+    # Retardo (ms) entre la última tecla y la búsqueda
+    SEARCH_DEBOUNCE_MS = 250
+
+    # Muestras del perfil de terreno (impar para tener punto medio exacto)
+    PROFILE_SAMPLES = 201
+
+    # Retardo (ms) del recálculo automático en modo en vivo
+    LIVE_DEBOUNCE_MS = 300
+
+    # Widget de salida -> (nodo del grafo, formato)
+    OUTPUT_BINDINGS = (
+        (0, 'fspl', "{:.2f}"),
+        (1, 'total_loss', "{:.2f}"),
+        (2, 'rssi', "{:.2f}"),
+        (3, 'margin', "{:.2f}"),
+        (4, 'availability', "{:.3f}"),
+        (5, 'snr', "{:.1f}"),
+        (6, 'throughput', "{:.0f}"),
+        (7, 'fresnel', "{:.2f}"),
+        (8, 'clearance', "{:.1f}"),
+        (11, 'total_cost', "${:.2f}"),  # Costo Total Instalación
+        (13, 'status', "{}"),
+        (15, 'total_cost', "${:.2f}"),  # Presupuesto Final
+    )
+
+    # Items del Sidebar: (texto, icono); "--" es un separador y sin icono, un título
+    SIDEBAR_ITEMS = (
+        ("Inicio", "🏠"),
+        ("Suscripciones", "📈"),
+    )
+    SIDEBAR_SECTIONS = (
+        ("--", ""),
+        ("DATASHEETS", ""),
+        ("Antenas Históricas", "📡"),
+        ("Registradas", "💾"),
+        ("Guardadas", "🔖"),
+        ("--", ""),
+        ("PROYECTO", ""),
+        ("Abrir Proyecto", "📂"),
+        ("Guardar Proyecto", "📦"),
+        ("Exportar Informe", "📄"),
+        ("--", ""),
+        ("SERVICIOS", ""),
+        ("UPTALINK Premium", "👑"),
+        ("UPTALINK Lite", "🌐"),
+        ("--", ""),
+        ("SOPORTE", ""),
+        ("Configuración", "⚙️"),
+        ("Ayuda", "❓"),
+    )
+
+    # Se emite una sola vez, cuando termina el primer pintado de la ventana
+    first_painted = Signal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("UPTALINK - Diseño de Radioenlaces")
         self.resize(1280, 800)
         
-        # Configuración de la paleta de colores (Fallback por si falla QSS en algunos OS)
+        # Paleta (respaldo por si falla QSS en algunos OS) y QSS antes de crear widgets:
+        # cada widget se pule una vez al crearse en vez de re-pulir todo al final
         self.apply_dark_theme_palette()
+        self.load_styles()
+        
+        # Persistencia: la base se abre en WarmUpTask, tras el primer pintado
+        self.link_store = None
+        self.link_store_lock = threading.Lock()
+        self.equipment_catalog = None
+        self.last_link = None
+        
+        # Índice de búsqueda: se construye en segundo plano la primera vez que se busca
+        self.search_index = None
+        self.search_index_loading = False
+        # Enlaces guardados mientras se construye el índice (puede que la
+        # construcción ya haya leído la base): se añaden al terminar
+        self.pending_index_links = []
+        
+        # Tareas en segundo plano vivas (evita que Python recolecte sus señales)
+        self.running_tasks = set()
+        
+        # Cálculo en segundo plano: un hilo dedicado, solo cuenta la última generación
+        self.calc_pool = QThreadPool(self)
+        self.calc_pool.setMaxThreadCount(1)
+        self.calc_generation = 0
+        self.calc_explicit = False
+        self.calc_task = None
+        self.calc_graph = None
+        
+        # Modo en vivo: recalcula al teclear, con debounce
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.LIVE_DEBOUNCE_MS)
+        self.live_timer.timeout.connect(lambda: self.submit_calculation(explicit=False))
         
         # Setup Central Widget
         self.central_widget = QWidget()
@@ -110,15 +1077,67 @@ class MainWindow(QMainWindow):
         self.main_layout.setSpacing(0)
 
         # Definir áreas: Header, Sidebar, Main(Central Vacío), Right Panel
+        # El contenido del panel derecho y las secciones de la barra lateral
+        # se construyen tras el primer pintado (ensure_panels)
+        self.panels_ready = False
+        self.first_paint_time = None
         self.setup_header()
         self.setup_sidebar()
         self.setup_central_area() # Renombrado de setup_3d_view
         self.setup_right_panel()
         
-        # Estilos QSS (CSS para Qt)
-        self.load_styles()
+        # Ventana de simulación Monte Carlo (se crea al primer uso)
+        self.simulation_panel = None
+        
+        # Ventana de enlaces guardados (se crea al primer uso)
+        self.saved_links_panel = None
+        
+        # Proyecto abierto y su ventana
+        self.project_panel = None
+        
+        # Panel de instrumentación (Ctrl+Shift+D)
+        self.debug_panel = None
+        debug_action = QAction("Instrumentación", self)
+        debug_action.setShortcut("Ctrl+Shift+D")
+        debug_action.triggered.connect(self.show_debug_panel)
+        self.addAction(debug_action)
+        
+        # Tras el primer pintado se completan los paneles y se precargan en
+        # segundo plano los módulos del cálculo
+        self.first_painted.connect(self.ensure_panels)
+        self.first_painted.connect(self.warm_up)
+        self.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        # Solo hasta el primer pintado: después se retira el filtro
+        if watched is self and event.type() == QEvent.Paint:
+            self.removeEventFilter(self)
+            self.first_paint_time = time.perf_counter()
+            QTimer.singleShot(0, self.first_painted.emit)
+        return False
+
+    def warm_up(self):
+        self.start_task(WarmUpTask(self.get_link_store))
+
+    def ensure_panels(self):
+        """
+        Construye (una vez) el contenido del panel derecho y las secciones de
+        la barra lateral.
+
+        La ventana lo llama tras el primer pintado; quien use input_widgets u
+        output_widgets sin mostrar la ventana debe llamarlo antes.
+        """
+        if self.panels_ready:
+            return
+        self.panels_ready = True
+        self.add_sidebar_items(self.SIDEBAR_SECTIONS)
+        self.build_right_panel()
 
     def apply_dark_theme_palette(self):
+        app = QApplication.instance()
+        if app.property("uptalinkPalette") is True:
+            return
+        app.setProperty("uptalinkPalette", True)
         palette = QPalette()
         palette.setColor(QPalette.Window, QColor("#0f0f0f"))
         palette.setColor(QPalette.WindowText, QColor("#f1f1f1"))
@@ -152,6 +1171,15 @@ class MainWindow(QMainWindow):
         search_input = QLineEdit()
         search_input.setPlaceholderText("Buscar ID de enlace o coordenadas...")
         search_input.setObjectName("searchInput")
+        self.search_input = search_input
+        
+        # Debounce: solo se busca cuando el usuario deja de teclear
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        search_input.textChanged.connect(self.search_timer.start)
+        search_input.returnPressed.connect(self.run_search)
         
         # Botones header
         btn_layout = QHBoxLayout()
@@ -180,70 +1208,60 @@ class MainWindow(QMainWindow):
         self.sidebar = QWidget()
         self.sidebar.setFixedWidth(240)
         self.sidebar.setObjectName("sidebar")
-        sidebar_layout = QVBoxLayout(self.sidebar)
-        sidebar_layout.setContentsMargins(5, 10, 5, 10)
-        
-        # Items del Sidebar
-        items = [
-            ("Inicio", "🏠"),
-            ("Suscripciones", "📈"),
-            ("--", ""),
-            ("DATASHEETS", ""),
-            ("Antenas Históricas", "📡"),
-            ("Registradas", "💾"),
-            ("Guardadas", "🔖"),
-            ("--", ""),
-            ("SERVICIOS", ""),
-            ("UPTALINK Premium", "👑"),
-            ("UPTALINK Lite", "🌐"),
-            ("--", ""),
-            ("SOPORTE", ""),
-            ("Configuración", "⚙️"),
-            ("Ayuda", "❓"),
-        ]
+        self.sidebar_layout = QVBoxLayout(self.sidebar)
+        self.sidebar_layout.setContentsMargins(5, 10, 5, 10)
+        self.sidebar_layout.addStretch()
         
+        # Solo los primeros elementos; SIDEBAR_SECTIONS llega con ensure_panels
+        self.add_sidebar_items(self.SIDEBAR_ITEMS)
+        self.main_layout.addWidget(self.sidebar, 1, 0, 1, 1)
+
+    def add_sidebar_items(self, items):
+        actions = {
+            "Guardadas": self.show_saved_links,
+            "Abrir Proyecto": self.open_project,
+            "Guardar Proyecto": self.save_project,
+            "Exportar Informe": self.export_report,
+        }
         for text, icon in items:
             if text == "--":
-                line = QLabel("---")
-                line.setAlignment(Qt.AlignCenter)
-                line.setStyleSheet("color: #303030; margin: 5px 0;")
-                sidebar_layout.addWidget(line)
+                widget = QLabel("---")
+                widget.setAlignment(Qt.AlignCenter)
+                widget.setStyleSheet("color: #303030; margin: 5px 0;")
             elif icon == "":
-                title = QLabel(text)
-                title.setObjectName("sidebarSectionTitle")
-                sidebar_layout.addWidget(title)
+                widget = QLabel(text)
+                widget.setObjectName("sidebarSectionTitle")
             else:
-                btn = QPushButton(f"{icon}  {text}")
-                btn.setObjectName("sidebarBtn")
-                sidebar_layout.addWidget(btn)
-
-        sidebar_layout.addStretch()
-        self.main_layout.addWidget(self.sidebar, 1, 0, 1, 1)
+                widget = QPushButton(f"{icon}  {text}")
+                widget.setObjectName("sidebarBtn")
+                if text in actions:
+                    widget.clicked.connect(actions[text])
+            # Antes del estiramiento final, que empuja todo hacia arriba
+            self.sidebar_layout.insertWidget(self.sidebar_layout.count() - 1, widget)
 
     def setup_central_area(self):
-        # Contenedor central reemplazando el visor 3D
+        # Contenedor central con el visor 3D
         self.main_content = QWidget()
         self.main_content.setObjectName("mainContent")
         main_layout = QVBoxLayout(self.main_content)
         main_layout.setContentsMargins(0,0,0,0)
         
-        # Label de reemplazo indicando que la visualización está inhabilitada
-        placeholder_label = QLabel("Visualización 3D Inhabilitada")
-        placeholder_label.setAlignment(Qt.AlignCenter)
-        placeholder_label.setStyleSheet("color: #333333; font-size: 24px; font-weight: bold;")
+        # Visor 3D: malla con nivel de detalle renderizada por CPU
+        self.terrain_view = TerrainView(self)
         
-        main_layout.addWidget(placeholder_label)
+        main_layout.addWidget(self.terrain_view)
         self.main_layout.addWidget(self.main_content, 1, 1, 1, 1)
 
-    # def init_3d_scene(self): ... <-- ELIMINADO (Lógica de terreno y antenas)
-
     def setup_right_panel(self):
+        # Solo el marco (ancho fijo): los 32 campos llegan con ensure_panels
         self.right_panel = QScrollArea()
         self.right_panel.setWidgetResizable(True)
         self.right_panel.setFixedWidth(380)
         self.right_panel.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.right_panel.setObjectName("rightPanel")
-        
+        self.main_layout.addWidget(self.right_panel, 1, 2, 1, 1)
+
+    def build_right_panel(self):
         panel_widget = QWidget()
         self.panel_layout = QVBoxLayout(panel_widget)
         self.panel_layout.setContentsMargins(15, 15, 15, 15)
@@ -269,6 +1287,31 @@ class MainWindow(QMainWindow):
         btn_layout.addWidget(self.btn_save)
         self.panel_layout.addLayout(btn_layout)
 
+        # Modo en vivo (recalcular al escribir)
+        self.btn_live = QPushButton("⟳ Modo en Vivo")
+        self.btn_live.setObjectName("btnLive")
+        self.btn_live.setCheckable(True)
+        self.btn_live.toggled.connect(self.on_live_toggled)
+        self.panel_layout.addWidget(self.btn_live)
+
+        # Solver: valores límite para el margen requerido
+        self.btn_solve = QPushButton("🎯 Resolver Límites")
+        self.btn_solve.setObjectName("btnSolve")
+        self.btn_solve.clicked.connect(self.solve_design)
+        self.panel_layout.addWidget(self.btn_solve)
+
+        # Catálogo: radio y antenas más baratos que hacen viable el enlace
+        self.btn_equipment = QPushButton("🧰 Seleccionar Equipo")
+        self.btn_equipment.setObjectName("btnEquipment")
+        self.btn_equipment.clicked.connect(self.select_equipment)
+        self.panel_layout.addWidget(self.btn_equipment)
+
+        # Simulación Monte Carlo de la disponibilidad
+        self.btn_simulate = QPushButton("🎲 Simular Disponibilidad")
+        self.btn_simulate.setObjectName("btnSimulate")
+        self.btn_simulate.clicked.connect(self.run_simulation)
+        self.panel_layout.addWidget(self.btn_simulate)
+
         # Botón Reset
         self.btn_reset = QPushButton("🗑️ Limpiar / Reiniciar")
         self.btn_reset.setObjectName("btnReset")
@@ -277,8 +1320,6 @@ class MainWindow(QMainWindow):
         
         self.panel_layout.addStretch() # Empujar todo hacia arriba
         self.right_panel.setWidget(panel_widget)
-        
-        self.main_layout.addWidget(self.right_panel, 1, 2, 1, 1)
 
     def create_module(self, title, type_id):
         module = QFrame()
@@ -306,6 +1347,7 @@ class MainWindow(QMainWindow):
                 inp = QLineEdit()
                 inp.setPlaceholderText("0.0")
                 inp.setObjectName("inputField")
+                inp.textChanged.connect(self.on_input_changed)
                 self.input_widgets.append(inp)
                 h_layout.addWidget(lbl)
                 h_layout.addWidget(inp)
@@ -313,6 +1355,7 @@ class MainWindow(QMainWindow):
                 
         elif type_id == "outputs":
             self.output_widgets = []
+            self.output_texts = []
             labels = [
                 "Pérdida Trayecto (FSPL) (dB)", "Pérdida Total Sistema (dB)", "Nivel Rx Recibido (dBm)", "Margen de Desvanecimiento (dB)",
                 "Disponibilidad (%)", "SNR Estimado (dB)", "Throughput (Mbps)", "Radio de Fresnel (m)",
@@ -328,6 +1371,7 @@ class MainWindow(QMainWindow):
                 out.setText("-")
                 out.setObjectName("outputField")
                 self.output_widgets.append(out)
+                self.output_texts.append("-")
                 h_layout.addWidget(lbl)
                 h_layout.addWidget(out)
                 layout.addLayout(h_layout)
@@ -339,86 +1383,396 @@ class MainWindow(QMainWindow):
     # =============================================================================
 
     def get_input_value(self, index):
+        # Campo en blanco o inválido: 0, salvo los de INPUT_DEFAULTS (Temperatura)
+        default = INPUT_DEFAULTS.get(INPUT_FIELDS[index], 0.0)
         try:
             val = self.input_widgets[index].text()
-            return float(val) if val else 0.0
+            return float(val) if val else default
         except ValueError:
-            return 0.0
+            return default
+
+    def read_inputs(self):
+        """Lee los 16 campos de entrada como dict (claves de INPUT_FIELDS)."""
+        # Un solo span para los 16 get_input_value: medir cada campo costaría más que parsearlo
+        with instrument.span("ui.parse_inputs"):
+            return {name: self.get_input_value(i) for i, name in enumerate(INPUT_FIELDS)}
 
     def perform_calculation(self):
-        try:
-            # Recolectar datos
-            # Indices basados en la lista de labels JS: 0:Frec, 1:Dist, 2:Tx, 3:Ga, 4:Gb, 5:Loss, 6:Sens, 14:Cost, 15:Hours
-            freq = self.get_input_value(0)
-            dist = self.get_input_value(1)
-            p_tx = self.get_input_value(2)
-            g_a = self.get_input_value(3)
-            g_b = self.get_input_value(4)
-            cable_loss = self.get_input_value(5)
-            sens = self.get_input_value(6)
-            cost_eq = self.get_input_value(14)
-            hours = self.get_input_value(15)
-            
-            # Calcular usando Backend
-            results = LinkBudgetCalculator.calculate(freq, dist, p_tx, g_a, g_b, cable_loss, sens, cost_eq, hours)
-            
-            # Actualizar Outputs UI
-            # Mapping resultados a los widgets de output
-            # 0: FSPL, 1: TotalLoss, 2: RSSI, 3: Margin, 4: Avail, 5: SNR, 6: Throughput, 7: Fresnel
-            # 12: Costo, 13: Status, 15: Presupuesto
-            
-            self.output_widgets[0].setText(f"{results['fspl']:.2f}")
-            self.output_widgets[1].setText(f"{results['total_loss']:.2f}")
-            self.output_widgets[2].setText(f"{results['rssi']:.2f}")
-            self.output_widgets[3].setText(f"{results['margin']:.2f}")
-            self.output_widgets[4].setText(results['availability'])
-            self.output_widgets[5].setText(f"{results['snr']:.1f}")
-            self.output_widgets[6].setText(f"{results['throughput']:.0f}")
-            self.output_widgets[7].setText(f"{results['fresnel']:.2f}")
-            
-            # Costos (Output 11 y 15 en el código original JS, ajustando aquí al orden visual)
-            # El JS usa indices 12 y 15 para costos en output
-            self.output_widgets[11].setText(f"${results['total_cost']:.2f}") # Costo Total Instalación
-            self.output_widgets[15].setText(f"${results['total_cost']:.2f}") # Presupuesto Final
-            
-            # Estado
-            status_widget = self.output_widgets[13]
-            status_widget.setText(results['status'])
-            
-            # Feedback visual de color
-            color = "#00d09c" if results['is_good'] else "#ff4d4d"
-            status_widget.setStyleSheet(f"color: {color}; font-weight: bold; background: #0a0a0a; border: 1px solid #222; padding: 4px; border-radius: 4px;")
-            
-            # Actualizar Visor 3D (ELIMINADO)
-            # self.update_3d_link(results['is_good'])
-            
+        """Slot del botón Calcular."""
+        self.submit_calculation(explicit=True)
+
+    def submit_calculation(self, explicit=False):
+        """
+        Lanza el cálculo en segundo plano con las entradas actuales.
+
+        Args:
+            explicit: True si lo pidió el usuario (muestra avisos y diálogos);
+                False para el recálculo automático del modo en vivo.
+        """
+        self.live_timer.stop()
+        self.cancel_calculation()
+        self.calc_explicit = explicit
+        task = CalculationTask(self.calc_generation, self.get_calc_graph(), self.read_inputs())
+        task.signals.finished.connect(self.on_calculation_finished)
+        task.signals.error.connect(self.on_calculation_error)
+        self.calc_task = task
+        self.start_task(task, self.calc_pool)
+
+    def get_calc_graph(self):
+        # Se construye en el primer cálculo: importa el modelo (NumPy) fuera del arranque
+        if self.calc_graph is None:
+            from uptalink.calculator import build_link_graph
+            self.calc_graph = build_link_graph(self.PROFILE_SAMPLES)
+        return self.calc_graph
+
+    def cancel_calculation(self):
+        """Invalida el cálculo en curso: se saca de la cola o se marca como cancelado."""
+        self.calc_generation += 1
+        task = self.calc_task
+        self.calc_task = None
+        if task is None:
+            return
+        if self.calc_pool.tryTake(task):
+            self.running_tasks.discard(task)
+        else:
+            task.cancel()
+
+    def set_output_text(self, index, text):
+        """Cambia el texto de una salida solo si es distinto; devuelve si cambió."""
+        if self.output_texts[index] == text:
+            return False
+        self.output_texts[index] = text
+        self.output_widgets[index].setText(text)
+        return True
+
+    def set_status_state(self, state):
+        # Re-pulir solo el widget de estado y solo si su estado cambia
+        status_widget = self.output_widgets[13]
+        if status_widget.property("linkState") != state:
+            status_widget.setProperty("linkState", state)
+            status_widget.style().unpolish(status_widget)
+            status_widget.style().polish(status_widget)
+
+    def on_input_changed(self):
+        # Un cambio de entrada deja obsoleto cualquier cálculo pendiente
+        if self.calc_task is not None:
+            self.cancel_calculation()
+        if self.btn_live.isChecked():
+            self.live_timer.start()
+
+    def on_live_toggled(self, checked):
+        if checked:
+            self.submit_calculation(explicit=False)
+        else:
+            self.live_timer.stop()
+        self.show_toast("Modo en vivo activado." if checked else "Modo en vivo desactivado.")
+
+    def on_calculation_error(self, generation, error):
+        if generation != self.calc_generation:
+            return
+        self.calc_task = None
+        if not self.calc_explicit:
+            self.show_toast(str(error))
+        elif isinstance(error, ValueError):
+            QMessageBox.warning(self, "Error de Entrada", str(error))
+        else:
+            QMessageBox.critical(self, "Error", f"Ocurrió un error inesperado: {error}")
+
+    def on_calculation_finished(self, generation, results):
+        # Resultados de una generación anterior (entradas ya cambiadas): se descartan
+        if generation != self.calc_generation or results is None:
+            return
+        self.calc_task = None
+        self.apply_results(results)
+        if self.calc_explicit:
             self.show_toast("Cálculo Exitoso: Enlace Viable" if results['is_good'] else "Alerta: Enlace Débil")
-            
-        except ValueError as e:
-            QMessageBox.warning(self, "Error de Entrada", str(e))
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Ocurrió un error inesperado: {e}")
 
-    # def update_3d_link(self, is_good): ... <-- ELIMINADO
+    @instrument.probe("ui.apply_results")
+    def apply_results(self, results):
+        """Vuelca los resultados en los widgets de salida (hilo de la UI)."""
+        # Solo se llama a setText en los widgets cuyo texto visible cambia
+        updated = 0
+        for index, node, fmt in self.OUTPUT_BINDINGS:
+            updated += self.set_output_text(index, fmt.format(results[node]))
+        instrument.count("ui.output_updates", updated)
+        
+        # Feedback visual de color por propiedad dinámica (ver #outputField[linkState=...] en QSS)
+        self.set_status_state("good" if results['is_good'] else "bad")
+        
+        # Actualizar Visor 3D
+        self.terrain_view.show_link(results)
+        
+        # Último enlace calculado (lo que persiste save_link)
+        self.last_link = {name: results[name] for name in INPUT_FIELDS}
+        self.last_link.update({
+            'fspl': results['fspl'],
+            'total_loss': results['total_loss'],
+            'rssi': results['rssi'],
+            'margin': results['margin'],
+            'availability': results['availability'],
+            'snr': results['snr'],
+            'throughput': results['throughput'],
+            'fresnel': results['fresnel'],
+            'clearance': results['clearance'],
+            'total_cost': results['total_cost'],
+            'status': results['status'],
+            'budget': results['total_cost']
+        })
+
+    def solve_design(self):
+        """Muestra la distancia máxima y la potencia/ganancia mínimas para el margen requerido."""
+        inputs = self.read_inputs()
+        if inputs['freq'] <= 0:
+            QMessageBox.warning(self, "Error de Entrada", "La Frecuencia debe ser mayor a 0.")
+            return
+        from uptalink import solver
+        from uptalink.calculator import LinkBudgetCalculator
+        limits = solver.solve_link(inputs)
+
+        def fmt(value, unit):
+            return "-" if value != value else f"{value:.2f} {unit}"
+
+        lines = [
+            f"Margen requerido: > {LinkBudgetCalculator.MARGIN_THRESHOLD} dB",
+            "",
+            f"Distancia máxima: {fmt(limits['max_dist'], 'Km')}",
+            f"Potencia Tx mínima: {fmt(limits['min_p_tx'], 'dBm')}",
+            f"Ganancia mínima Ant A (con B fija): {fmt(limits['min_g_a'], 'dBi')}",
+            f"Ganancia mínima Ant B (con A fija): {fmt(limits['min_g_b'], 'dBi')}",
+            f"Ganancia mínima por antena (iguales): {fmt(limits['min_gain'], 'dBi')}",
+        ]
+        QMessageBox.information(self, "Límites de Diseño", "\n".join(lines))
+
+    def select_equipment(self):
+        """Rellena Potencia, Sensibilidad, Ganancias y Costo Equipo desde el catálogo."""
+        inputs = self.read_inputs()
+        if inputs['freq'] <= 0 or inputs['dist'] <= 0:
+            QMessageBox.warning(self, "Error de Entrada", "La Frecuencia y la Distancia deben ser mayores a 0.")
+            return
+        task = SelectEquipmentTask(self.get_equipment_catalog(), inputs['freq'], inputs['dist'], inputs['cable_loss'])
+        task.signals.finished.connect(self.on_equipment_selected)
+        task.signals.error.connect(lambda msg: QMessageBox.critical(self, "Error", f"Error del catálogo: {msg}"))
+        self.start_task(task)
+
+    def on_equipment_selected(self, best):
+        if best is None:
+            QMessageBox.information(
+                self, "Catálogo de Equipos",
+                "Ninguna combinación del catálogo es viable para esta frecuencia y distancia.\n"
+                "Importe equipos con: python -m uptalink catalog --radios radios.csv --antennas antenas.csv"
+            )
+            return
+        radio = best['radio']
+        values = {
+            'p_tx': radio['p_tx'], 'sens': radio['sens'], 'g_a': best['antenna_a']['gain'],
+            'g_b': best['antenna_b']['gain'], 'cost_eq': best['cost'],
+        }
+        for name, value in values.items():
+            self.input_widgets[INPUT_FIELDS.index(name)].setText(f"{value:g}")
+        self.show_toast(
+            f"Equipo: {radio['model']} + {best['antenna_a']['model']} / {best['antenna_b']['model']} "
+            f"(${best['cost']:,.2f}, margen {best['margin']:.1f} dB)"
+        )
+
+    def run_simulation(self):
+        inputs = self.read_inputs()
+        if inputs['freq'] <= 0 or inputs['dist'] <= 0:
+            QMessageBox.warning(self, "Error de Entrada", "La Frecuencia y la Distancia deben ser mayores a 0.")
+            return
+        if self.simulation_panel is None:
+            self.simulation_panel = SimulationPanel(self)
+        self.simulation_panel.show()
+        self.simulation_panel.raise_()
+        self.simulation_panel.start(inputs)
 
     def save_link(self):
-        if self.output_widgets[0].text() == '-':
+        if self.output_widgets[0].text() == '-' or self.last_link is None:
             QMessageBox.information(self, "Info", "Calcule antes de guardar.")
             return
-        self.show_toast("Enlace guardado en Base de Datos.")
+        link = dict(self.last_link, link_id=new_link_id())
+        
+        # La escritura corre en el pool de hilos para no bloquear el bucle de eventos
+        task = SaveLinkTask(self.get_link_store(), link)
+        task.signals.finished.connect(lambda link_id: self.on_link_saved(link))
+        task.signals.error.connect(lambda msg: QMessageBox.critical(self, "Error", f"No se pudo guardar el enlace: {msg}"))
+        self.start_task(task)
+
+    def on_link_saved(self, link):
+        # Indexado incremental: el enlace es buscable de inmediato
+        if self.search_index is not None:
+            self.search_index.add(link)
+        elif self.search_index_loading:
+            self.pending_index_links.append(link)
+        if self.saved_links_panel is not None:
+            self.saved_links_panel.model.refresh()
+        self.show_toast(f"Enlace {link['link_id']} guardado en Base de Datos.")
+
+    def show_saved_links(self):
+        if self.saved_links_panel is None:
+            self.saved_links_panel = SavedLinksPanel(self)
+        self.saved_links_panel.show()
+        self.saved_links_panel.raise_()
+
+    def load_link(self, link_id):
+        """Carga las entradas de un enlace guardado en el panel derecho."""
+        link = self.get_link_store().get(link_id)
+        if link is None:
+            self.show_toast(f"El enlace {link_id} ya no existe.")
+            return
+        self.fill_inputs(link)
+
+    def fill_inputs(self, link):
+        """Escribe en el panel derecho las entradas de un enlace (dict con INPUT_FIELDS)."""
+        for i, name in enumerate(INPUT_FIELDS):
+            value = link.get(name)
+            self.input_widgets[i].setText("" if value is None else f"{value:g}")
+        self.show_toast(f"Enlace {link.get('link_id') or ''} cargado.")
+
+    def open_project(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Abrir proyecto", "", "Proyecto UPTALINK (*.uptp)")
+        if not path:
+            return
+        from uptalink.project import ProjectFile
+        # Abrir solo lee el índice y mapea el fichero: no hace falta un hilo aparte
+        try:
+            project = ProjectFile(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"No se pudo abrir el proyecto: {e}")
+            return
+        if self.project_panel is None:
+            self.project_panel = ProjectPanel(self, project)
+        else:
+            self.project_panel.set_project(project)
+        self.project_panel.show()
+        self.project_panel.raise_()
+
+    def save_project(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Guardar proyecto", "proyecto.uptp", "Proyecto UPTALINK (*.uptp)")
+        if not path:
+            return
+        task = SaveProjectTask(self.get_link_store(), path)
+        task.signals.finished.connect(lambda written: self.on_project_saved(path, written))
+        task.signals.error.connect(lambda msg: QMessageBox.critical(self, "Error", f"No se pudo guardar el proyecto: {msg}"))
+        self.start_task(task)
+
+    def export_report(self):
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Exportar informe", "enlaces.csv", "CSV (*.csv);;KML (*.kml);;PDF (*.pdf)"
+        )
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += "." + selected.split()[0].lower()
+        store = self.get_link_store()
+        total = store.count()
+        progress = QProgressDialog(f"Exportando {total} enlaces...", "Cancelar", 0, max(total, 1), self)
+        progress.setWindowTitle("UPTALINK - Exportar")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        task = ExportTask(store, path)
+        progress.canceled.connect(task.cancel)
+        task.signals.progress.connect(progress.setValue)
+        task.signals.finished.connect(lambda count: self.on_report_exported(progress, path, count))
+        task.signals.error.connect(lambda msg: self.on_report_error(progress, msg))
+        self.start_task(task)
+
+    def on_report_exported(self, progress, path, count):
+        progress.close()
+        if count is None:
+            self.show_toast("Exportación cancelada.")
+        else:
+            self.show_toast(f"{count} enlaces exportados a {os.path.basename(path)}.")
+
+    def on_report_error(self, progress, message):
+        progress.close()
+        QMessageBox.critical(self, "Error", f"No se pudo exportar: {message}")
+
+    def on_project_saved(self, path, written):
+        # Si el proyecto está abierto se recarga su índice para mostrar la versión nueva
+        if self.project_panel is not None and os.path.abspath(self.project_panel.project.path) == os.path.abspath(path):
+            from uptalink.project import ProjectFile
+            self.project_panel.set_project(ProjectFile(path))
+        self.show_toast(f"Proyecto guardado ({written / 1e6:.1f} MB escritos).")
+
+    def get_link_store(self):
+        # Se llama desde WarmUpTask (hilo del pool) y desde la UI: el lock evita
+        # abrir dos conexiones. La UI solo abre la base si la pide antes de que
+        # WarmUpTask termine; entonces espera a esa apertura.
+        with self.link_store_lock:
+            if self.link_store is None:
+                self.link_store = LinkStore()
+            return self.link_store
+
+    def get_equipment_catalog(self):
+        if self.equipment_catalog is None:
+            from uptalink.catalog import EquipmentCatalog
+            self.equipment_catalog = EquipmentCatalog()
+        return self.equipment_catalog
+
+    def run_search(self):
+        self.search_timer.stop()
+        text = self.search_input.text().strip()
+        if not text:
+            return
+        if self.search_index is None:
+            if not self.search_index_loading:
+                self.search_index_loading = True
+                task = BuildSearchIndexTask(self.get_link_store())
+                task.signals.finished.connect(self.on_search_index_ready)
+                task.signals.error.connect(self.on_search_index_error)
+                self.start_task(task)
+            self.show_toast("Indexando enlaces guardados...")
+            return
+        
+        matches = self.search_index.search(text)
+        if matches:
+            self.show_toast(f"{len(matches)} enlace(s): " + ", ".join(matches[:5]) + (" ..." if len(matches) > 5 else ""))
+        else:
+            self.show_toast("Sin resultados.")
+
+    def on_search_index_ready(self, index):
+        # add es idempotente: da igual si la construcción ya vio alguno
+        for link in self.pending_index_links:
+            index.add(link)
+        self.pending_index_links = []
+        self.search_index = index
+        self.search_index_loading = False
+        self.run_search()
+
+    def on_search_index_error(self, msg):
+        # La próxima búsqueda reintenta; la base ya tiene los enlaces pendientes
+        self.pending_index_links = []
+        self.search_index_loading = False
+        self.show_toast(f"Error de índice: {msg}")
+
+    def show_debug_panel(self):
+        if self.debug_panel is None:
+            self.debug_panel = DebugPanel(self)
+        self.debug_panel.show()
+        self.debug_panel.raise_()
+
+    def start_task(self, task, pool=None):
+        """Lanza una tarea en un pool (por defecto el global) y la retiene hasta que termine."""
+        self.running_tasks.add(task)
+        task.signals.finished.connect(lambda *_: self.running_tasks.discard(task))
+        task.signals.error.connect(lambda *_: self.running_tasks.discard(task))
+        (pool or QThreadPool.globalInstance()).start(task)
 
     def reset_all(self):
         reply = QMessageBox.question(self, 'Confirmar', '¿Reiniciar todos los campos?',
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
+            self.btn_live.setChecked(False)
             for w in self.input_widgets:
                 w.clear()
-            for w in self.output_widgets:
-                w.setText('-')
-                w.setStyleSheet("") # Reset estilo personalizado
+            for i in range(len(self.output_widgets)):
+                self.set_output_text(i, '-')
+            self.set_status_state("")
+            self.cancel_calculation()
+            self.last_link = None
             
-            # Actualizar Visor 3D (ELIMINADO)
-            # self.update_3d_link(False)
+            # Actualizar Visor 3D
+            self.terrain_view.clear()
             
             self.show_toast("Sistema reiniciado.")
 
@@ -429,187 +1783,37 @@ class MainWindow(QMainWindow):
         # O podríamos crear un QWidget personalizado que se anime, pero StatusBar es nativo y limpio.
 
     def load_styles(self):
-        """Carga el QSS replicando el CSS proporcionado"""
-        qss = """
-        /* --- GENERAL --- */
-        QWidget {
-            background-color: #0f0f0f;
-            color: #f1f1f1;
-            font-family: 'Segoe UI', 'Roboto', sans-serif;
-            font-size: 14px;
-        }
-        
-        /* --- HEADER --- */
-        #header {
-            background-color: #0f0f0f;
-            border-bottom: 1px solid #303030;
-        }
-        
-        #logoLabel {
-            color: #f1f1f1;
-        }
-        
-        #searchInput {
-            background-color: #121212;
-            border: 1px solid #303030;
-            border-right: none;
-            padding: 6px 16px;
-            color: #f1f1f1;
-            border-radius: 40px 0 0 40px;
-        }
-        
-        #headerIconBtn, #userAvatar {
-            background-color: #181818;
-            border: none;
-            border-radius: 50%;
-            color: #f1f1f1;
-        }
-        
-        #userAvatar {
-            background-color: #3ea6ff;
-            color: #000;
-            font-weight: bold;
-        }
-        
-        #headerIconBtn:hover {
-            background-color: #272727;
-        }
-
-        /* --- SIDEBAR --- */
-        #sidebar {
-            background-color: #0f0f0f;
-            border-right: 1px solid #1e1e1e; /* Sutil borde */
-        }
-        
-        #sidebarSectionTitle {
-            color: #aaaaaa;
-            font-size: 0.8rem;
-            font-weight: bold;
-            padding-left: 10px;
-            margin-top: 10px;
-        }
-        
-        #sidebarBtn {
-            background: none;
-            border: none;
-            color: #f1f1f1;
-            text-align: left;
-            padding: 8px 12px;
-            border-radius: 10px;
-            font-size: 0.9rem;
-        }
-        
-        #sidebarBtn:hover {
-            background-color: #272727;
-        }
-
-        /* --- RIGHT PANEL --- */
-        #rightPanel {
-            background-color: #0f0f0f;
-            border-left: 1px solid #303030;
-        }
-        
-        #moduleBox {
-            background-color: #1e1e1e;
-            border-radius: 8px;
-            border: 1px solid #303030;
-        }
-        
-        #moduleTitle {
-            color: #3ea6ff;
-            font-weight: bold;
-            font-size: 0.9rem;
-            text-transform: uppercase;
-            border-bottom: 1px solid #303030;
-            padding-bottom: 8px;
-            margin-bottom: 10px;
-        }
-        
-        QLabel {
-            color: #aaaaaa;
-            font-size: 0.75rem;
-            margin-bottom: 2px;
-        }
-
-        #inputField {
-            background-color: #121212;
-            border: 1px solid #333;
-            color: #f1f1f1;
-            padding: 6px 10px;
-            border-radius: 4px;
-            font-family: 'Courier New', monospace;
-        }
-        
-        #inputField:focus {
-            border: 1px solid #3ea6ff;
-        }
-        
-        #outputField {
-            background-color: #0a0a0a;
-            color: #00d09c;
-            border: 1px solid #222;
-            padding: 6px 10px;
-            border-radius: 4px;
-            font-family: 'Courier New', monospace;
-        }
-
-        /* --- BOTONES --- */
-        QPushButton {
-            border-radius: 6px;
-            font-weight: bold;
-            padding: 10px;
-        }
-        
-        #btnCalc {
-            background-color: #3ea6ff;
-            color: #000;
-        }
-        #btnCalc:hover {
-            background-color: #66b6ff;
-        }
-        
-        #btnSave {
-            background-color: #272727;
-            color: #fff;
-            border: 1px solid #444;
-        }
-        #btnSave:hover {
-            background-color: #3a3a3a;
-        }
-        
-        #btnReset {
-            background: transparent;
-            border: 1px solid #ff4d4d;
-            color: #ff4d4d;
-            padding: 12px;
-        }
-        #btnReset:hover {
-            background-color: #ff4d4d;
-            color: white;
-        }
-        
-        /* Scrollbar */
-        QScrollBar:vertical {
-            background: #0f0f0f;
-            width: 10px;
-            margin: 0px;
-        }
-        QScrollBar::handle:vertical {
-            background: #333;
-            min-height: 20px;
-            border-radius: 5px;
-        }
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-            height: 0px;
-        }
-        """
-        self.setStyleSheet(qss)
+        """Aplica la hoja de estilo compilada a la aplicación (una sola vez por QApplication)."""
+        app = QApplication.instance()
+        # Qt analiza el QSS al asignarlo: reasignar el mismo texto repetiría el trabajo
+        if app.property("uptalinkStyled") is not True:
+            import ya_rc  # noqa: F401  (registra el recurso al importarse)
+            qss = QFile(STYLESHEET_RESOURCE)
+            qss.open(QIODevice.ReadOnly)
+            app.setStyleSheet(bytes(qss.readAll()).decode('utf-8'))
+            qss.close()
+            app.setProperty("uptalinkStyled", True)
 
 # =============================================================================
 # 4. MAIN ENTRY POINT
 # =============================================================================
 
+def print_startup_profile(marks):
+    """Imprime en stderr los tiempos de arranque (--profile-startup)."""
+    names = ("importaciones", "QApplication", "ventana", "primer pintado", "paneles")
+    steps = [(name, (marks[i + 1] - marks[i]) * 1000) for i, name in enumerate(names)]
+    print("Arranque: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in steps)
+          + f"; total {(marks[-2] - marks[0]) * 1000:.0f} ms hasta el primer pintado, "
+          f"{(marks[-1] - marks[0]) * 1000:.0f} ms con los paneles", file=sys.stderr, flush=True)
+
+
 if __name__ == "__main__":
+    # --profile-startup: informa del tiempo hasta el primer pintado
+    profile_startup = "--profile-startup" in sys.argv
+    if profile_startup:
+        sys.argv.remove("--profile-startup")
+    marks = [_STARTUP_T0, time.perf_counter()]
+
     app = QApplication(sys.argv)
     
     # Habilitar High DPI scaling
@@ -617,8 +1821,16 @@ if __name__ == "__main__":
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
         QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+    marks.append(time.perf_counter())
 
     window = MainWindow()
+    marks.append(time.perf_counter())
+    if profile_startup:
+        # Conectada después de ensure_panels: se ejecuta con los paneles ya construidos
+        def report_startup():
+            print_startup_profile(marks + [window.first_paint_time, time.perf_counter()])
+            app.quit()
+        window.first_painted.connect(report_startup)
     window.show()
     
     sys.exit(app.exec())
\ No newline at end of file
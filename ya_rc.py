@@ -0,0 +1,261 @@
+# Resource object code (Python 3)
+# Created by: object code
+# Created by: The Resource Compiler for Qt version 6.11.2
+# WARNING! All changes made in this file will be lost!
+
+from PySide6 import QtCore
+
+qt_resource_data = b"\
+\x00\x00\x0d\xd9\
+/\
+* --- GENERAL --\
+- */\x0aQWidget {\x0a \
+   background-co\
+lor: #0f0f0f;\x0a  \
+  color: #f1f1f1\
+;\x0a    font-famil\
+y: 'Segoe UI', '\
+Roboto', sans-se\
+rif;\x0a    font-si\
+ze: 14px;\x0a}\x0a\x0a/* \
+--- HEADER --- *\
+/\x0a#header {\x0a    \
+background-color\
+: #0f0f0f;\x0a    b\
+order-bottom: 1p\
+x solid #303030;\
+\x0a}\x0a\x0a#logoLabel {\
+\x0a    color: #f1f\
+1f1;\x0a}\x0a\x0a#searchI\
+nput {\x0a    backg\
+round-color: #12\
+1212;\x0a    border\
+: 1px solid #303\
+030;\x0a    border-\
+right: none;\x0a   \
+ padding: 6px 16\
+px;\x0a    color: #\
+f1f1f1;\x0a    bord\
+er-radius: 40px \
+0 0 40px;\x0a}\x0a\x0a#he\
+aderIconBtn, #us\
+erAvatar {\x0a    b\
+ackground-color:\
+ #181818;\x0a    bo\
+rder: none;\x0a    \
+border-radius: 5\
+0%;\x0a    color: #\
+f1f1f1;\x0a}\x0a\x0a#user\
+Avatar {\x0a    bac\
+kground-color: #\
+3ea6ff;\x0a    colo\
+r: #000;\x0a    fon\
+t-weight: bold;\x0a\
+}\x0a\x0a#headerIconBt\
+n:hover {\x0a    ba\
+ckground-color: \
+#272727;\x0a}\x0a\x0a/* -\
+-- SIDEBAR --- *\
+/\x0a#sidebar {\x0a   \
+ background-colo\
+r: #0f0f0f;\x0a    \
+border-right: 1p\
+x solid #1e1e1e;\
+ /* Sutil borde \
+*/\x0a}\x0a\x0a#sidebarSe\
+ctionTitle {\x0a   \
+ color: #aaaaaa;\
+\x0a    font-size: \
+0.8rem;\x0a    font\
+-weight: bold;\x0a \
+   padding-left:\
+ 10px;\x0a    margi\
+n-top: 10px;\x0a}\x0a\x0a\
+#sidebarBtn {\x0a  \
+  background: no\
+ne;\x0a    border: \
+none;\x0a    color:\
+ #f1f1f1;\x0a    te\
+xt-align: left;\x0a\
+    padding: 8px\
+ 12px;\x0a    borde\
+r-radius: 10px;\x0a\
+    font-size: 0\
+.9rem;\x0a}\x0a\x0a#sideb\
+arBtn:hover {\x0a  \
+  background-col\
+or: #272727;\x0a}\x0a\x0a\
+/* --- RIGHT PAN\
+EL --- */\x0a#right\
+Panel {\x0a    back\
+ground-color: #0\
+f0f0f;\x0a    borde\
+r-left: 1px soli\
+d #303030;\x0a}\x0a\x0a#m\
+oduleBox {\x0a    b\
+ackground-color:\
+ #1e1e1e;\x0a    bo\
+rder-radius: 8px\
+;\x0a    border: 1p\
+x solid #303030;\
+\x0a}\x0a\x0a#moduleTitle\
+ {\x0a    color: #3\
+ea6ff;\x0a    font-\
+weight: bold;\x0a  \
+  font-size: 0.9\
+rem;\x0a    text-tr\
+ansform: upperca\
+se;\x0a    border-b\
+ottom: 1px solid\
+ #303030;\x0a    pa\
+dding-bottom: 8p\
+x;\x0a    margin-bo\
+ttom: 10px;\x0a}\x0a\x0aQ\
+Label {\x0a    colo\
+r: #aaaaaa;\x0a    \
+font-size: 0.75r\
+em;\x0a    margin-b\
+ottom: 2px;\x0a}\x0a\x0a#\
+inputField {\x0a   \
+ background-colo\
+r: #121212;\x0a    \
+border: 1px soli\
+d #333;\x0a    colo\
+r: #f1f1f1;\x0a    \
+padding: 6px 10p\
+x;\x0a    border-ra\
+dius: 4px;\x0a    f\
+ont-family: 'Cou\
+rier New', monos\
+pace;\x0a}\x0a\x0a#inputF\
+ield:focus {\x0a   \
+ border: 1px sol\
+id #3ea6ff;\x0a}\x0a\x0a#\
+outputField {\x0a  \
+  background-col\
+or: #0a0a0a;\x0a   \
+ color: #00d09c;\
+\x0a    border: 1px\
+ solid #222;\x0a   \
+ padding: 6px 10\
+px;\x0a    border-r\
+adius: 4px;\x0a    \
+font-family: 'Co\
+urier New', mono\
+space;\x0a}\x0a\x0a#outpu\
+tField[linkState\
+=\x22good\x22] {\x0a    c\
+olor: #00d09c;\x0a \
+   font-weight: \
+bold;\x0a}\x0a\x0a#output\
+Field[linkState=\
+\x22bad\x22] {\x0a    col\
+or: #ff4d4d;\x0a   \
+ font-weight: bo\
+ld;\x0a}\x0a\x0a/* --- BO\
+TONES --- */\x0aQPu\
+shButton {\x0a    b\
+order-radius: 6p\
+x;\x0a    font-weig\
+ht: bold;\x0a    pa\
+dding: 10px;\x0a}\x0a\x0a\
+#btnCalc {\x0a    b\
+ackground-color:\
+ #3ea6ff;\x0a    co\
+lor: #000;\x0a}\x0a#bt\
+nCalc:hover {\x0a  \
+  background-col\
+or: #66b6ff;\x0a}\x0a\x0a\
+#btnSave {\x0a    b\
+ackground-color:\
+ #272727;\x0a    co\
+lor: #fff;\x0a    b\
+order: 1px solid\
+ #444;\x0a}\x0a#btnSav\
+e:hover {\x0a    ba\
+ckground-color: \
+#3a3a3a;\x0a}\x0a\x0a#btn\
+Solve, #btnEquip\
+ment, #btnSimula\
+te {\x0a    backgro\
+und-color: #2727\
+27;\x0a    color: #\
+fff;\x0a    border:\
+ 1px solid #444;\
+\x0a}\x0a#btnSolve:hov\
+er, #btnEquipmen\
+t:hover, #btnSim\
+ulate:hover {\x0a  \
+  background-col\
+or: #3a3a3a;\x0a}\x0a\x0a\
+#btnLive {\x0a    b\
+ackground-color:\
+ transparent;\x0a  \
+  color: #aaaaaa\
+;\x0a    border: 1p\
+x solid #444;\x0a}\x0a\
+#btnLive:checked\
+ {\x0a    backgroun\
+d-color: #0a2a20\
+;\x0a    color: #00\
+d09c;\x0a    border\
+: 1px solid #00d\
+09c;\x0a}\x0a\x0a#btnRese\
+t {\x0a    backgrou\
+nd: transparent;\
+\x0a    border: 1px\
+ solid #ff4d4d;\x0a\
+    color: #ff4d\
+4d;\x0a    padding:\
+ 12px;\x0a}\x0a#btnRes\
+et:hover {\x0a    b\
+ackground-color:\
+ #ff4d4d;\x0a    co\
+lor: white;\x0a}\x0a\x0a/\
+* Scrollbar */\x0aQ\
+ScrollBar:vertic\
+al {\x0a    backgro\
+und: #0f0f0f;\x0a  \
+  width: 10px;\x0a \
+   margin: 0px;\x0a\
+}\x0aQScrollBar::ha\
+ndle:vertical {\x0a\
+    background: \
+#333;\x0a    min-he\
+ight: 20px;\x0a    \
+border-radius: 5\
+px;\x0a}\x0aQScrollBar\
+::add-line:verti\
+cal, QScrollBar:\
+:sub-line:vertic\
+al {\x0a    height:\
+ 0px;\x0a}\x0a\
+"
+
+qt_resource_name = b"\
+\x00\x02\
+\x00\x00\x07\xf1\
+\x00y\
+\x00a\
+\x00\x09\
+\x00(\xad#\
+\x00s\
+\x00t\x00y\x00l\x00e\x00.\x00q\x00s\x00s\
+"
+
+qt_resource_struct = b"\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
+\x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x02\
+\x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x0a\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x01\xa1HG\x03\x92\
+"
+
+def qInitResources():
+    QtCore.qRegisterResourceData(0x03, qt_resource_struct, qt_resource_name, qt_resource_data)
+
+def qCleanupResources():
+    QtCore.qUnregisterResourceData(0x03, qt_resource_struct, qt_resource_name, qt_resource_data)
+
+qInitResources()